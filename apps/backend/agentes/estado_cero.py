@@ -14,6 +14,7 @@ from models.decreto_sacral import DecretoSacral  # 🏛️ Arquitectura Sagrada
 from services.claude_client import ClaudeClient
 from services.contexto import RecopiladorContexto
 from services.verificador_pilares import obtener_verificador  # 🏛️ Arquitectura Sagrada
+from services.metricas import trazar
 # from services.sumario_contexto import GestorSumarioContexto  # Archivado en Phase 3
 # from services.motor_prisma import cargar_prisma_y_configurar  # Archivado en Phase 3
 
@@ -57,6 +58,7 @@ class AgenteEstadoCero:
         # self.gestor_sumario = GestorSumarioContexto(db, claude)  # Archivado
         self.verificador_pilares = obtener_verificador()  # 🏛️ Arquitectura Sagrada
         
+    @trazar("estado_cero.iniciar_consulta")
     async def iniciar_consulta(
         self,
         momento: MomentoLiturgico,
@@ -103,6 +105,7 @@ class AgenteEstadoCero:
             completado=False
         )
     
+    @trazar("estado_cero.formular_preguntas_sacrales")
     async def formular_preguntas_sacrales(
         self,
         contexto: ContextoCompleto
@@ -273,6 +276,7 @@ Retorna SOLO las 3 preguntas en formato JSON:
             }
         ]
     
+    @trazar("estado_cero.procesar_respuestas_sacrales")
     async def procesar_respuestas_sacrales(
         self,
         estado_id: str,
@@ -309,7 +313,7 @@ Dirección emergente (1 línea, específica, accionable):"""
         
         # Usar Sonnet para síntesis (es crítico, vale la pena)
         # Pero con max_tokens reducido
-        direccion = await self.claude.generate("", messages, max_tokens=100)
+        direccion = await self.claude.generate("", messages, max_tokens=100, cache_site="estado_cero.direccion")
         
         # Guardar dirección
         if estado_db:
@@ -318,6 +322,7 @@ Dirección emergente (1 línea, específica, accionable):"""
         
         return direccion
     
+    @trazar("estado_cero.chat_clarificador")
     async def chat_clarificador(
         self,
         estado_id: str,
@@ -345,7 +350,7 @@ Respuesta práctica y concreta (2-3 líneas):"""
         messages = [{"role": "user", "content": prompt}]
         
         # Usar Haiku para chat (respuesta simple)
-        respuesta = await self.claude.generate_haiku("Chat clarificador sacral.", messages, max_tokens=150)
+        respuesta = await self.claude.generate_haiku("Chat clarificador sacral.", messages, max_tokens=150, cache_site="estado_cero.chat")
         
         # Guardar en chat
         contexto_chat.append({"role": "assistant", "content": respuesta})
@@ -354,6 +359,7 @@ Respuesta práctica y concreta (2-3 líneas):"""
         
         return respuesta
     
+    @trazar("estado_cero.definir_accion_tangible")
     async def definir_accion_tangible(
         self,
         estado_id: str,
@@ -390,7 +396,7 @@ FORMATO JSON:
 Acción:"""
 
         messages = [{"role": "user", "content": prompt}]
-        result = await self.claude.generate_json("", messages)
+        result = await self.claude.generate_json("", messages, cache_site="estado_cero.accion")
         
         accion = AccionConcreta(**result)
         
@@ -401,6 +407,7 @@ Acción:"""
         
         return accion
     
+    @trazar("estado_cero.emitir_decreto_sacral")
     async def emitir_decreto_sacral(
         self,
         estado_id: str,
@@ -1,11 +1,16 @@
 from datetime import datetime, date, timedelta
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 import json
 from sqlalchemy.orm import Session
 
 from models.schemas import ReporteDiario
-from models.database import EstadoCeroDB, SesionDB, NoNegociableTrackingDB, BiometriaDB
+from models.database import SesionDB, BiometriaDB
+from models.database_async import SesionSincrona
 from models.decreto_sacral import DecretoSacral  # 🏛️ Arquitectura Sagrada
+from models.repositorios import (
+    RepositorioBiometria, RepositorioEstadosCero,
+    RepositorioNoNegociables, RepositorioSesiones
+)
 from services.claude_client import ClaudeClient
 
 
@@ -29,9 +34,18 @@ class AgenteGuardian:
     Referencia: core/arquitectura/TRES_PODERES_GOBIERNO_DIVINO.md
     """
     
-    def __init__(self, db: Session, claude: ClaudeClient):
+    def __init__(self, db: Session, claude: ClaudeClient, adb: Optional[Any] = None):
+        """
+        Args:
+            db: Sesión síncrona (decreto: lectura y registro del veredicto)
+            claude: Cliente de Claude
+            adb: Sesión asíncrona para las lecturas del día (get_async_db).
+                Sin ella se consulta `db` a través de SesionSincrona, así
+                lecturas y escrituras van siempre a la misma base de datos.
+        """
         self.db = db
         self.claude = claude
+        self.adb = adb if adb is not None else SesionSincrona(db)
         
     async def generar_reporte_diario(self, fecha: date) -> ReporteDiario:
         """
@@ -133,28 +147,19 @@ class AgenteGuardian:
         )
     
     async def _recopilar_datos_dia(self, fecha: date) -> Dict:
-        """Recopila todos los datos del día"""
+        """Recopila todos los datos del día (sesión asíncrona: no bloquea el loop)"""
         
         # Estados Cero
-        estados_cero = self.db.query(EstadoCeroDB).filter(
-            EstadoCeroDB.fecha >= datetime.combine(fecha, datetime.min.time()),
-            EstadoCeroDB.fecha < datetime.combine(fecha + timedelta(days=1), datetime.min.time())
-        ).all()
+        estados_cero = await RepositorioEstadosCero(self.adb).del_dia(fecha)
         
         # Sesiones
-        sesiones = self.db.query(SesionDB).filter(
-            SesionDB.fecha == fecha
-        ).all()
+        sesiones = await RepositorioSesiones(self.adb).del_dia(fecha)
         
         # No-negociables
-        no_neg_tracking = self.db.query(NoNegociableTrackingDB).filter(
-            NoNegociableTrackingDB.fecha == fecha
-        ).all()
+        no_neg_tracking = await RepositorioNoNegociables(self.adb).del_dia(fecha)
         
         # Biometría
-        biometria = self.db.query(BiometriaDB).filter(
-            BiometriaDB.fecha == fecha
-        ).first()
+        biometria = await RepositorioBiometria(self.adb).del_dia(fecha)
         
         return {
             "estados_cero_completados": len(estados_cero),
@@ -200,7 +205,8 @@ TONO: Contemplativo, agradecido, honesto, curioso. Sin juicio.
         messages = [{"role": "user", "content": prompt}]
         return await self.claude.generate_json(
             system="Generas reportes contemplativos del día.",
-            messages=messages
+            messages=messages,
+            cache_site="guardian.reporte"
         )
     
     def _sesion_to_dict(self, sesion: SesionDB) -> Dict:
@@ -228,19 +234,15 @@ TONO: Contemplativo, agradecido, honesto, curioso. Sin juicio.
         hoy = date.today()
         
         # Estados Cero de hoy
-        estados_hoy = self.db.query(EstadoCeroDB).filter(
-            EstadoCeroDB.fecha >= datetime.combine(hoy, datetime.min.time())
-        ).count()
+        estados_hoy = await RepositorioEstadosCero(self.adb).contar_desde(
+            datetime.combine(hoy, datetime.min.time())
+        )
         
         # Sesiones de hoy
-        sesiones_hoy = self.db.query(SesionDB).filter(
-            SesionDB.fecha == hoy
-        ).count()
+        sesiones_hoy = await RepositorioSesiones(self.adb).contar_del_dia(hoy)
         
         # No-negociables de hoy
-        no_neg_hoy = self.db.query(NoNegociableTrackingDB).filter(
-            NoNegociableTrackingDB.fecha == hoy
-        ).all()
+        no_neg_hoy = await RepositorioNoNegociables(self.adb).del_dia(hoy)
         
         cumplidos = sum(1 for nn in no_neg_hoy if nn.completado)
         total = len(no_neg_hoy)
@@ -265,13 +267,10 @@ TONO: Contemplativo, agradecido, honesto, curioso. Sin juicio.
         fecha_inicio = date.today() - timedelta(days=dias_atras)
         
         # Recopilar datos del período
-        estados = self.db.query(EstadoCeroDB).filter(
-            EstadoCeroDB.fecha >= fecha_inicio
-        ).all()
-        
-        sesiones = self.db.query(SesionDB).filter(
-            SesionDB.fecha >= fecha_inicio
-        ).all()
+        estados = await RepositorioEstadosCero(self.adb).desde(
+            datetime.combine(fecha_inicio, datetime.min.time())
+        )
+        sesiones = await RepositorioSesiones(self.adb).desde(fecha_inicio)
         
         # Análisis básico
         promedio_estados_dia = len(estados) / dias_atras
@@ -1,5 +1,6 @@
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Any
+import asyncio
 import json
 import uuid
 from sqlalchemy.orm import Session
@@ -69,13 +70,20 @@ class AgenteOrquestador:
             from ministerios.significado import MinisterioSignificado
             from ministerios.soberania import MinisterioSoberania
             
-            self.gabinete.registrar_ministerio("mente", MinisterioMente())
-            self.gabinete.registrar_ministerio("cuerpo", MinisterioCuerpo())
-            self.gabinete.registrar_ministerio("capital", MinisterioCapital())
-            self.gabinete.registrar_ministerio("conexion", MinisterioConexion())
-            self.gabinete.registrar_ministerio("creacion", MinisterioCreacion())
-            self.gabinete.registrar_ministerio("significado", MinisterioSignificado())
-            self.gabinete.registrar_ministerio("soberania", MinisterioSoberania())
+            ministerios = {
+                "mente": MinisterioMente,
+                "cuerpo": MinisterioCuerpo,
+                "capital": MinisterioCapital,
+                "conexion": MinisterioConexion,
+                "creacion": MinisterioCreacion,
+                "significado": MinisterioSignificado,
+                "soberania": MinisterioSoberania,
+            }
+            
+            # El gabinete es global: registrar solo una vez conserva sus reportes memoizados
+            for nombre, clase in ministerios.items():
+                if not self.gabinete.tiene_ministerio(nombre):
+                    self.gabinete.registrar_ministerio(nombre, clase())
         except Exception as e:
             # Si falla, continuar sin ministerios (backwards compatibility)
             print(f"⚠️ No se pudieron registrar ministerios: {e}")
@@ -135,7 +143,7 @@ class AgenteOrquestador:
         
         # Convocar reunión ministerial (todos a la vez)
         try:
-            resultado = self.gabinete.reunion_ministerial(decreto)
+            resultado = await asyncio.to_thread(self.gabinete.reunion_ministerial, decreto)
             reportes = resultado.get("reportes", {})
             
             print(f"   Ministerios consultados: {resultado.get('ministerios_activos', 0)}")
@@ -595,7 +603,7 @@ JSON: [{{"inicio":"10:00","duracion":"2h","actividad":"..."}}]"""
         
         try:
             # Usar Haiku (más barato para esta tarea)
-            resultado = await self.claude.generate_json_haiku("Generas bloques de trabajo.", messages)
+            resultado = await self.claude.generate_json_haiku("Generas bloques de trabajo.", messages, cache_site="orquestador.bloques")
             
             if isinstance(resultado, list):
                 for i, bloque_data in enumerate(resultado[:3]):  # Máximo 3
@@ -737,7 +745,8 @@ Ejemplo: [{{"id":"b1","inicio_aprox":"10:00","duracion":"2h","actividad":"...","
         messages = [{"role": "user", "content": prompt}]
         resultado = await self.claude.generate_json(
             system="Orquestas jornadas al borde del caos.",
-            messages=messages
+            messages=messages,
+            cache_site="orquestador.plan"
         )
         
         # Construir bloques - manejar estructura de respuesta
@@ -889,7 +898,7 @@ Responde como Orquestador:
 Respuesta:"""
 
         messages = [{"role": "user", "content": prompt}]
-        return await self.claude.generate("", messages)
+        return await self.claude.generate("", messages, cache_site="orquestador.chat")
     
     def obtener_plan_actual(self) -> Optional[JornadaAlBordeCaos]:
         """Obtiene el plan actual de la jornada"""
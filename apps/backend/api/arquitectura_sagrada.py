@@ -13,13 +13,13 @@ Referencia: carta_magna.md
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta
 from typing import Dict, Any
+import asyncio
 import json
 
-from models.database import get_db, EstadoCeroDB
-from models.decreto_sacral import DecretoSacral
+from models.database_async import SesionAsync, get_async_db
+from models.repositorios import RepositorioDecretos
 from ministerios import obtener_gabinete
 from services.verificador_pilares import obtener_verificador
 from services.tiempos_liturgicos import CalculadorTiemposLiturgicos
@@ -28,7 +28,7 @@ router = APIRouter()
 
 
 @router.get("/dashboard")
-async def dashboard_arquitectura_sagrada(db: Session = Depends(get_db)):
+async def dashboard_arquitectura_sagrada(db: SesionAsync = Depends(get_async_db)):
     """
     🕌 DASHBOARD DE ARQUITECTURA SAGRADA
     
@@ -69,9 +69,7 @@ async def dashboard_arquitectura_sagrada(db: Session = Depends(get_db)):
         # 3 PODERES DE GOBIERNO
         # =====================================================================
         
-        decreto_hoy = db.query(DecretoSacral).filter(
-            DecretoSacral.fecha == date.today()
-        ).first()
+        decreto_hoy = await RepositorioDecretos(db).del_dia(date.today())
         
         if decreto_hoy:
             poderes_status = {
@@ -179,7 +177,9 @@ async def dashboard_arquitectura_sagrada(db: Session = Depends(get_db)):
         # Si hay decreto, hacer reunión ministerial
         if decreto_hoy:
             try:
-                reunion = gabinete.reunion_ministerial(decreto_hoy)
+                # Los ministerios consultan en hilos y esperan hasta su plazo:
+                # fuera del event loop para no bloquear otras peticiones
+                reunion = await asyncio.to_thread(gabinete.reunion_ministerial, decreto_hoy)
                 ministerios_status = {
                     "salud_global": reunion["salud_global"],
                     "ministerios_activos": reunion["ministerios_activos"],
@@ -266,7 +266,7 @@ async def dashboard_arquitectura_sagrada(db: Session = Depends(get_db)):
 
 
 @router.get("/salud")
-async def salud_organismo(db: Session = Depends(get_db)):
+async def salud_organismo(db: SesionAsync = Depends(get_async_db)):
     """
     🏥 Salud Global del Organismo
     
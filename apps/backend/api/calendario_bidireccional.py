@@ -70,6 +70,9 @@ async def programar_semana_estados_cero(
         
         eventos_creados = []
         
+        # Tiempos de todas las semanas en una sola pasada
+        calendar.calculador.precalcular_rango(fecha_start, fecha_start + timedelta(weeks=semanas) - timedelta(days=1))
+        
         for semana in range(semanas):
             fecha_semana = fecha_start + timedelta(weeks=semana)
             eventos = await calendar.programar_semana_estados_cero(fecha_semana)
@@ -441,6 +444,9 @@ async def programar_mes_completo(
         
         eventos_creados = []
         
+        # Tiempos de todas las semanas en una sola pasada
+        calendar.calculador.precalcular_rango(fecha_inicio, fecha_inicio + timedelta(weeks=semanas) - timedelta(days=1))
+        
         for semana in range(semanas):
             fecha_semana = fecha_inicio + timedelta(weeks=semana)
             eventos = await calendar.programar_semana_estados_cero(fecha_semana)
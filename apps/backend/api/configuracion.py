@@ -12,6 +12,7 @@ from datetime import datetime
 
 from models.database import get_db
 from pydantic import BaseModel
+from services.cache_perfiles import get_cache_perfiles
 
 
 router = APIRouter()
@@ -94,6 +95,7 @@ async def guardar_configuracion(
         
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(config_dict, f, indent=2, ensure_ascii=False)
+        get_cache_perfiles().invalidar()
         
         print(f"✅ Configuración guardada en: {config_path}")
         
@@ -240,6 +242,7 @@ async def actualizar_configuracion(
         
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(config_dict, f, indent=2, ensure_ascii=False)
+        get_cache_perfiles().invalidar()
         
         return ConfiguracionResponse(
             status="success",
@@ -273,6 +276,7 @@ async def eliminar_configuracion(
         
         if config_path.exists():
             os.remove(config_path)
+            get_cache_perfiles().invalidar()
             return {
                 "status": "success",
                 "message": "Configuración eliminada"
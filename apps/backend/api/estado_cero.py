@@ -4,7 +4,9 @@ from typing import List
 import json
 from datetime import datetime
 
-from models.database import get_db, EstadoCeroDB
+from models.database import get_db, get_cola_escritura, EstadoCeroDB
+from models.database_async import SesionAsync, get_async_db
+from models.repositorios import RepositorioEstadosCero
 from models.schemas import (
     EstadoCeroCompleto, IniciarEstadoCeroRequest,
     ResponderPreguntaRequest, ChatClarificacionRequest,
@@ -65,7 +67,7 @@ async def verificar_momento_estado_cero(permitir_recuperacion: bool = False):
     return result
 
 @router.get("/ventanas-perdidas")
-async def obtener_ventanas_perdidas(db: Session = Depends(get_db)):
+async def obtener_ventanas_perdidas(adb: SesionAsync = Depends(get_async_db)):
     """
     Retorna los Estados Cero que se perdieron hoy y pueden recuperarse.
     
@@ -80,6 +82,7 @@ async def obtener_ventanas_perdidas(db: Session = Depends(get_db)):
     ahora = calculador._hoy()
     
     ventanas_perdidas = []
+    completados = await RepositorioEstadosCero(adb).momentos_completados(hoy)
     
     for momento_nombre in ["fajr", "dhuhr", "asr", "maghrib", "isha"]:
         tiempo = getattr(tiempos, momento_nombre)
@@ -87,13 +90,7 @@ async def obtener_ventanas_perdidas(db: Session = Depends(get_db)):
         # Si la ventana ya pasó
         if ahora > tiempo.fin:
             # Verificar si se realizó el Estado Cero
-            estado_realizado = db.query(EstadoCeroDB).filter(
-                EstadoCeroDB.fecha == hoy,
-                EstadoCeroDB.momento == momento_nombre,
-                EstadoCeroDB.completado == True
-            ).first()
-            
-            if not estado_realizado:
+            if momento_nombre not in completados:
                 ventanas_perdidas.append({
                     "momento": momento_nombre,
                     "ventana_inicio": tiempo.inicio.isoformat(),
@@ -226,8 +223,8 @@ async def iniciar_estado_cero(
             chat="[]",
             completado=False
         )
-        db.add(estado_db)
-        db.commit()
+        # Inserción por la cola de escritura (commit agrupado, sin bloquear el loop)
+        await get_cola_escritura().escribir_async(lambda session: session.add(estado_db))
         
         # 🔥 Retornar formato compatible con frontend (mismo que /iniciar-test)
         return {
@@ -304,6 +301,7 @@ async def sintetizar_direccion(
     agente = AgenteEstadoCero(db, claude_client, recopilador)
     
     # Obtener estado
+    # El agente lee y escribe con la sesión síncrona: la comprobación va en la misma
     estado_db = db.query(EstadoCeroDB).filter(EstadoCeroDB.id == estado_id).first()
     if not estado_db:
         raise HTTPException(status_code=404, detail="Estado Cero no encontrado")
@@ -329,6 +327,7 @@ async def chat_clarificador(
     recopilador = RecopiladorContexto(db, calculador, calendario)
     agente = AgenteEstadoCero(db, claude_client, recopilador)
     
+    # El agente lee y escribe con la sesión síncrona: la comprobación va en la misma
     estado_db = db.query(EstadoCeroDB).filter(EstadoCeroDB.id == estado_id).first()
     if not estado_db:
         raise HTTPException(status_code=404, detail="Estado Cero no encontrado")
@@ -459,11 +458,11 @@ async def test_asr():
 @router.get("/{estado_id}")
 async def obtener_estado_cero(
     estado_id: str,
-    db: Session = Depends(get_db)
+    db: SesionAsync = Depends(get_async_db)
 ):
     """Obtiene un Estado Cero completo"""
     
-    estado_db = db.query(EstadoCeroDB).filter(EstadoCeroDB.id == estado_id).first()
+    estado_db = await RepositorioEstadosCero(db).obtener(estado_id)
     if not estado_db:
         raise HTTPException(status_code=404, detail="Estado Cero no encontrado")
     
@@ -484,11 +483,11 @@ async def obtener_estado_cero(
 @router.get("/")
 async def listar_estados_cero(
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: SesionAsync = Depends(get_async_db)
 ):
     """Lista los últimos Estados Cero"""
     
-    estados = db.query(EstadoCeroDB).order_by(EstadoCeroDB.fecha.desc()).limit(limit).all()
+    estados = await RepositorioEstadosCero(db).recientes(limit)
     
     return [
         {
@@ -13,13 +13,13 @@ Referencia: core/arquitectura/TRES_PODERES_GOBIERNO_DIVINO.md
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 from datetime import date, datetime
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
 from models.decreto_sacral import DecretoSacral
-from models.database import get_db
+from models.database_async import SesionAsync, get_async_db
+from models.repositorios import RepositorioDecretos
 
 router = APIRouter()
 
@@ -57,7 +57,7 @@ class EstadoGobiernoResponse(BaseModel):
 @router.post("/legislativo/decreto", response_model=EmitirDecretoResponse)
 async def emitir_decreto(
     request: EmitirDecretoRequest,
-    db: Session = Depends(get_db)
+    db: SesionAsync = Depends(get_async_db)
 ):
     """
     🕌 PODER LEGISLATIVO: Sultán emite decreto
@@ -76,10 +76,8 @@ async def emitir_decreto(
     """
     try:
         # Verificar que no haya decreto activo para hoy
-        decreto_existente = db.query(DecretoSacral).filter(
-            DecretoSacral.fecha == date.today(),
-            DecretoSacral.esta_activo
-        ).first()
+        decretos = RepositorioDecretos(db)
+        decreto_existente = await decretos.activo_del_dia(date.today())
         
         if decreto_existente:
             raise HTTPException(
@@ -97,9 +95,7 @@ async def emitir_decreto(
             estado="pendiente"
         )
         
-        db.add(decreto)
-        db.commit()
-        db.refresh(decreto)
+        await decretos.agregar(decreto)
         
         return EmitirDecretoResponse(
             success=True,
@@ -110,7 +106,7 @@ async def emitir_decreto(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -119,7 +115,7 @@ async def emitir_decreto(
 # ============================================================================
 
 @router.post("/ejecutivo/iniciar")
-async def iniciar_ejecucion(db: Session = Depends(get_db)):
+async def iniciar_ejecucion(db: SesionAsync = Depends(get_async_db)):
     """
     💼 PODER EJECUTIVO: Primer Ministro inicia ejecución
     
@@ -134,10 +130,7 @@ async def iniciar_ejecucion(db: Session = Depends(get_db)):
     """
     try:
         # Buscar decreto del día
-        decreto = db.query(DecretoSacral).filter(
-            DecretoSacral.fecha == date.today(),
-            DecretoSacral.estado == "pendiente"
-        ).first()
+        decreto = await RepositorioDecretos(db).del_dia(date.today(), ["pendiente"])
         
         if not decreto:
             raise HTTPException(
@@ -147,7 +140,7 @@ async def iniciar_ejecucion(db: Session = Depends(get_db)):
         
         # Iniciar ejecución
         decreto.iniciar_ejecucion()
-        db.commit()
+        await db.commit()
         
         return {
             "success": True,
@@ -163,14 +156,14 @@ async def iniciar_ejecucion(db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/ejecutivo/completar")
 async def completar_ejecucion(
     notas: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: SesionAsync = Depends(get_async_db)
 ):
     """
     💼 PODER EJECUTIVO: Primer Ministro completa ejecución
@@ -178,10 +171,7 @@ async def completar_ejecucion(
     Marca el decreto como completado.
     """
     try:
-        decreto = db.query(DecretoSacral).filter(
-            DecretoSacral.fecha == date.today(),
-            DecretoSacral.estado == "en_ejecucion"
-        ).first()
+        decreto = await RepositorioDecretos(db).del_dia(date.today(), ["en_ejecucion"])
         
         if not decreto:
             raise HTTPException(
@@ -190,7 +180,7 @@ async def completar_ejecucion(
             )
         
         decreto.completar_ejecucion(notas)
-        db.commit()
+        await db.commit()
         
         return {
             "success": True,
@@ -201,7 +191,7 @@ async def completar_ejecucion(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -214,7 +204,7 @@ async def espejo_nocturno(
     cumplimiento_score: int,
     verificacion: str,
     sabiduria: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: SesionAsync = Depends(get_async_db)
 ):
     """
     📜 PODER JUDICIAL: Escribano verifica cumplimiento
@@ -230,9 +220,7 @@ async def espejo_nocturno(
     5. Cierra ciclo con gratitud
     """
     try:
-        decreto = db.query(DecretoSacral).filter(
-            DecretoSacral.fecha == date.today()
-        ).first()
+        decreto = await RepositorioDecretos(db).del_dia(date.today())
         
         if not decreto:
             raise HTTPException(
@@ -246,7 +234,7 @@ async def espejo_nocturno(
             cumplimiento_score=cumplimiento_score,
             sabiduria=sabiduria
         )
-        db.commit()
+        await db.commit()
         
         return {
             "success": True,
@@ -259,7 +247,7 @@ async def espejo_nocturno(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -268,7 +256,7 @@ async def espejo_nocturno(
 # ============================================================================
 
 @router.get("/estado", response_model=EstadoGobiernoResponse)
-async def estado_gobierno(db: Session = Depends(get_db)):
+async def estado_gobierno(db: SesionAsync = Depends(get_async_db)):
     """
     🏛️ Estado de los 3 Poderes del Gobierno Divino
     
@@ -278,9 +266,7 @@ async def estado_gobierno(db: Session = Depends(get_db)):
     - JUDICIAL: ¿Verificación realizada?
     """
     try:
-        decreto = db.query(DecretoSacral).filter(
-            DecretoSacral.fecha == date.today()
-        ).first()
+        decreto = await RepositorioDecretos(db).del_dia(date.today())
         
         if not decreto:
             return EstadoGobiernoResponse(
@@ -324,7 +310,7 @@ async def estado_gobierno(db: Session = Depends(get_db)):
 @router.get("/historia")
 async def historia_decretos(
     limit: int = 30,
-    db: Session = Depends(get_db)
+    db: SesionAsync = Depends(get_async_db)
 ):
     """
     📚 Historia de decretos emitidos
@@ -332,9 +318,7 @@ async def historia_decretos(
     Retorna últimos N decretos con sus estados.
     """
     try:
-        decretos = db.query(DecretoSacral).order_by(
-            DecretoSacral.fecha.desc()
-        ).limit(limit).all()
+        decretos = await RepositorioDecretos(db).historial(limit)
         
         return {
             "decretos": [
@@ -4,6 +4,7 @@ from datetime import date, datetime
 from typing import Dict
 
 from models.database import get_db
+from models.database_async import SesionAsync, get_async_db
 from models.schemas import ReporteDiario
 from agentes.guardian import AgenteGuardian
 from services.claude_client import ClaudeClient
@@ -17,7 +18,8 @@ claude_client = ClaudeClient()
 @router.post("/reporte-diario")
 async def generar_reporte_diario(
     fecha: date = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Genera reporte diario para la fecha especificada
@@ -27,7 +29,7 @@ async def generar_reporte_diario(
     if fecha is None:
         fecha = date.today()
     
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     reporte = await agente.generar_reporte_diario(fecha)
     
     return reporte
@@ -35,13 +37,14 @@ async def generar_reporte_diario(
 
 @router.get("/salud-sistema")
 async def monitorear_salud_sistema(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Monitorea la salud general del sistema
     """
     
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     salud = await agente.monitorear_salud_sistema()
     
     return salud
@@ -50,13 +53,14 @@ async def monitorear_salud_sistema(
 @router.get("/patrones")
 async def detectar_patrones(
     dias_atras: int = 7,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Detecta patrones en los últimos N días
     """
     
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     patrones = await agente.detectar_patrones(dias_atras)
     
     return patrones
@@ -64,14 +68,15 @@ async def detectar_patrones(
 
 @router.get("/metricas-hoy")
 async def metricas_del_dia(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Obtiene métricas del día actual
     """
     
     hoy = date.today()
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     
     # Obtener salud del sistema
     salud = await agente.monitorear_salud_sistema()
@@ -85,13 +90,14 @@ async def metricas_del_dia(
 
 @router.get("/metricas-semana")
 async def metricas_semana_actual(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Obtiene métricas de la semana actual
     """
     
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     
     # Obtener patrones de la semana
     patrones = await agente.detectar_patrones(7)
@@ -108,13 +114,14 @@ async def metricas_semana_actual(
 
 @router.get("/estado-general")
 async def estado_general_sistema(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Estado general del sistema Campo Sagrado
     """
     
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     
     # Recopilar información completa
     salud = await agente.monitorear_salud_sistema()
@@ -140,14 +147,15 @@ async def estado_general_sistema(
 
 @router.post("/reporte-automatico")
 async def generar_reporte_automatico(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Genera reporte automático (llamado por cron/timer)
     """
     
     hoy = date.today()
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     
     try:
         # Generar reporte diario
@@ -171,13 +179,14 @@ async def generar_reporte_automatico(
 
 @router.get("/alertas")
 async def verificar_alertas(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: SesionAsync = Depends(get_async_db)
 ):
     """
     Verifica si hay alertas que requieren atención
     """
     
-    agente = AgenteGuardian(db, claude_client)
+    agente = AgenteGuardian(db, claude_client, adb)
     salud = await agente.monitorear_salud_sistema()
     
     alertas = []
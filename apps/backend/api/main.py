@@ -1,23 +1,25 @@
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from sqlalchemy.orm import Session
+import asyncio
 import os
+import pytz
 from datetime import datetime, date
 
-from models.database import get_db, init_db
+from models.database import get_db, init_db, cerrar_cola_escritura
+from models.database_async import cerrar_async_engine
 from models.schemas import HealthResponse
 from services.tiempos_liturgicos import CalculadorTiemposLiturgicos
+from services.tiempos_ubicacion import get_tiempos_por_ubicacion, ciclo_rollover
 from services.calendario_hijri import CalendarioHijri
+from services import metricas
+from middleware.metricas import MetricasMiddleware
 
 # Middleware de seguridad
 try:
-    from middleware.security import (
-        SecurityHeadersMiddleware,
-        RateLimitMiddleware,
-        RequestLoggingMiddleware,
-        SecurityValidationMiddleware
-    )
+    from middleware.security import SecurityMiddleware
     SECURITY_ENABLED = True
 except ImportError:
     print("⚠️ Middleware de seguridad no disponible")
@@ -35,22 +37,16 @@ app = FastAPI(
     redoc_url="/redoc" if os.getenv("ENV") != "production" else None,
 )
 
-# Middleware de seguridad (orden importa)
+# Middleware de seguridad: validación → rate limiting → headers → logging,
+# en una sola capa ASGI
 if SECURITY_ENABLED:
-    # 1. Validación de seguridad (primero)
-    app.add_middleware(SecurityValidationMiddleware)
-    
-    # 2. Rate limiting
-    app.add_middleware(RateLimitMiddleware)
-    
-    # 3. Security headers
-    app.add_middleware(SecurityHeadersMiddleware)
-    
-    # 4. Request logging
-    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(SecurityMiddleware)
     
     print("✅ Middleware de seguridad activado")
 
+# Métricas: latencia por ruta y span raíz (envuelve también a la seguridad)
+app.add_middleware(MetricasMiddleware)
+
 # Trusted Host (solo en producción)
 if os.getenv("ENV") == "production":
     allowed_hosts = os.getenv("ALLOWED_HOSTS", "").split(",")
@@ -82,6 +78,19 @@ TZ = os.getenv("TIMEZONE", "Europe/Madrid")
 calculador_tiempos = CalculadorTiemposLiturgicos(LAT, LON, TZ)
 calendario = CalendarioHijri()
 
+
+def calculador_para(lat: float = None, lon: float = None, tz: str = None) -> CalculadorTiemposLiturgicos:
+    """
+    Calculador de tiempos para la ubicación pedida.
+    Sin coordenadas se usa la ubicación configurada en la instalación.
+    """
+    if lat is None or lon is None:
+        return calculador_tiempos
+    try:
+        return get_tiempos_por_ubicacion().calculador(lat, lon, tz or TZ)
+    except (ValueError, pytz.UnknownTimeZoneError) as e:
+        raise HTTPException(status_code=400, detail=f"Ubicación no válida: {e}")
+
 # Incluir routers de agentes
 try:
     from api import estado_cero, orquestador, guardian, vistas_temporales, manifestaciones, octavas, universo_imaginal, configuracion, gobierno, pilares, arquitectura_sagrada
@@ -94,6 +103,7 @@ try:
     app.include_router(manifestaciones.router, prefix="/api/manifestaciones", tags=["Manifestaciones"])
     app.include_router(octavas.router, prefix="/api/octavas", tags=["Ley de la Octava"])
     # app.include_router(universo_imaginal.router, prefix="/api/universo-imaginal", tags=["Universo Imaginal"])  # Depende de universo_processor (Phase 3)
+    app.include_router(universo_imaginal.router_vault, prefix="/api/universo-imaginal", tags=["Universo Imaginal"])  # Constelaciones desde el índice del vault
     app.include_router(configuracion.router, prefix="/api/configuracion", tags=["Configuración"])
 
     # ===== ARQUITECTURA SAGRADA: 3 PODERES DE GOBIERNO =====
@@ -123,6 +133,42 @@ except Exception as e:
     traceback.print_exc()
 
 
+@app.on_event("startup")
+async def precalcular_tiempos():
+    """Carga (o calcula y guarda) la tabla de tiempos litúrgicos del año en curso"""
+    calculador_tiempos.precalcular_anio()
+    
+    # Cambio de día de las ubicaciones activas (cada hora, una vez por zona)
+    app.state.rollover_tiempos = asyncio.create_task(ciclo_rollover(get_tiempos_por_ubicacion()))
+    
+    # Liberar buckets de rate limit ya rellenados
+    if SECURITY_ENABLED:
+        from services.rate_limiter import rate_limiter
+        rate_limiter.cleanup_task = asyncio.create_task(rate_limiter.start_cleanup())
+
+
+@app.on_event("shutdown")
+async def cerrar_recursos():
+    """Cierra el pool HTTP compartido de Claude, el ciclo de tiempos y las conexiones a la base de datos"""
+    rollover = getattr(app.state, "rollover_tiempos", None)
+    if rollover:
+        rollover.cancel()
+    
+    if SECURITY_ENABLED:
+        from services.rate_limiter import rate_limiter
+        if rate_limiter.cleanup_task:
+            rate_limiter.cleanup_task.cancel()
+    
+    from services.claude_engine import get_claude_engine
+    engine = get_claude_engine()
+    if engine:
+        await engine.aclose()
+    
+    # Confirmar las escrituras pendientes antes de salir
+    await asyncio.to_thread(cerrar_cola_escritura)
+    await cerrar_async_engine()
+
+
 @app.get("/")
 async def root():
     return {
@@ -157,20 +203,36 @@ async def health_check(db: Session = Depends(get_db)):
     )
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def exportar_metricas():
+    """Histogramas de latencia en formato de exposición de Prometheus"""
+    return PlainTextResponse(metricas.exportar_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/resumen", include_in_schema=False)
+async def resumen_metricas(trazas: int = 20):
+    """Percentiles por serie y últimas trazas muestreadas (spans anidados)"""
+    return {
+        "latencias": metricas.registro.resumen(),
+        "trazas": metricas.trazas_recientes(trazas)
+    }
+
+
 @app.get("/api/tiempos-hoy")
-async def obtener_tiempos_hoy():
-    """Obtiene tiempos de rezo para hoy"""
-    tiempos = calculador_tiempos.calcular_tiempos_hoy()
+async def obtener_tiempos_hoy(lat: float = None, lon: float = None, tz: str = None):
+    """Obtiene tiempos de rezo para hoy (opcional: lat, lon, tz del usuario)"""
+    tiempos = calculador_para(lat, lon, tz).calcular_tiempos_hoy()
     return tiempos
 
 
 @app.get("/api/tiempos-precisos")
-async def obtener_tiempos_precisos(fecha: str = None):
+async def obtener_tiempos_precisos(fecha: str = None, lat: float = None, lon: float = None, tz: str = None):
     """
     Obtiene tiempos litúrgicos PRECISOS en formato legible.
     
     Query params:
     - fecha: YYYY-MM-DD (opcional, default: hoy)
+    - lat, lon, tz: Ubicación del usuario (opcional, default: instalación)
     
     Retorna tiempos calculados astronómicamente para tu ubicación.
     """
@@ -180,13 +242,13 @@ async def obtener_tiempos_precisos(fecha: str = None):
     else:
         dia = None
     
-    return calculador_tiempos.obtener_tiempos_formato_legible(dia)
+    return calculador_para(lat, lon, tz).obtener_tiempos_formato_legible(dia)
 
 
 @app.get("/api/verificar-momento")
-async def verificar_momento():
+async def verificar_momento(lat: float = None, lon: float = None, tz: str = None):
     """Verifica si AHORA es momento de Estado Cero"""
-    verificacion = calculador_tiempos.verificar_momento_estado_cero()
+    verificacion = calculador_para(lat, lon, tz).verificar_momento_estado_cero()
     return verificacion
 
 
@@ -236,18 +298,19 @@ async def obtener_año_hijri(año_hijri: int = None):
 
 
 @app.get("/api/tiempos-liturgicos/hoy")
-async def obtener_tiempos_liturgicos_hoy():
+async def obtener_tiempos_liturgicos_hoy(lat: float = None, lon: float = None, tz: str = None):
     """Obtiene los tiempos de rezo precisos para el día actual"""
-    tiempos = calculador_tiempos.calcular_tiempos_hoy()
-    momento_actual = calculador_tiempos.momento_actual()
-    proximo_rezo = calculador_tiempos.proximo_estado_cero()
+    calculador = calculador_para(lat, lon, tz)
+    tiempos = calculador.calcular_tiempos_hoy()
+    momento_actual = calculador.momento_actual()
+    proximo_rezo = calculador.proximo_estado_cero()
     
     return {
         "fecha": date.today().isoformat(),
         "ubicacion": {
-            "latitud": LAT,
-            "longitud": LON,
-            "ciudad": "San Sebastián de los Reyes"
+            "latitud": LAT if lat is None else lat,
+            "longitud": LON if lon is None else lon,
+            "ciudad": "San Sebastián de los Reyes" if lat is None else None
         },
         "tiempos_rezo": tiempos,
         "momento_actual": momento_actual["nombre"],
@@ -6,18 +6,28 @@ Endpoints para visualizar el knowledge graph de Obsidian como universo de estrel
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
+import asyncio
+import math
 import os
+import zlib
 
 # from services.universo_processor import UniversoProcessor  # Archivado en Phase 3
 from models.universo import (
     UniversoImaginal, ObtenerEstrellasRequest, ObtenerOrbitasRequest,
-    EstadisticasUniverso
+    EstadisticasUniverso, Estrella, Vector3D, Constelacion
 )
+from services.constelaciones import detectar_constelaciones
+from services.obsidian_index import obtener_indice
+from services.obsidian_parser import GrafoEnlaces, NotaObsidian, ObsidianParser
 
 
 router = APIRouter()
 
+# Endpoints que solo leen el índice del vault (no dependen de universo_processor)
+router_vault = APIRouter()
+
 # Configuración
 VAULT_PATH = os.getenv("OBSIDIAN_VAULT_PATH", "/Users/hp/Campo sagrado MVP/obsidian_vault")
 
@@ -129,9 +139,8 @@ async def obtener_estrella_detalle(estrella_id: str):
         
         # Obtener nota completa
         from services.obsidian_parser import ObsidianParser
-        parser = ObsidianParser(VAULT_PATH)
-        notas = parser.listar_notas()
-        nota = next((n for n in notas if n.filepath == estrella_id), None)
+        from services.obsidian_index import obtener_indice
+        nota = obtener_indice(ObsidianParser(VAULT_PATH)).obtener_nota(estrella_id)
         
         if nota:
             return {
@@ -151,10 +160,83 @@ async def obtener_estrella_detalle(estrella_id: str):
         )
 
 
-@router.get("/constelaciones")
+# ==================== CONSTELACIONES (índice del vault) ====================
+
+# Ángulo de cada dimensión en el plano (distribución circular uniforme)
+ANGULOS_DIMENSION = {
+    'finanzas': 0,
+    'biologia': 51.43,
+    'conocimiento': 102.86,
+    'desarrollo': 154.29,
+    'relaciones': 205.71,
+    'creatividad': 257.14,
+    'espiritualidad': 308.57
+}
+
+
+def _altura_temporal(fecha) -> float:
+    """Altura Z según antigüedad: más reciente = más arriba"""
+    if not isinstance(fecha, datetime):
+        return 0.0
+    dias = (datetime.now() - fecha).days
+    if dias <= 7:
+        return 200
+    if dias <= 30:
+        return 100
+    if dias <= 90:
+        return 0
+    if dias <= 180:
+        return -100
+    return -200
+
+
+def _estrella(nota: NotaObsidian, conexiones: int) -> Estrella:
+    """
+    Estrella de una nota con la misma disposición que UniversoProcessor:
+    radio por conexiones, ángulo por dimensión (±30° estable por filepath)
+    y altura por fecha
+    """
+    distancia = max(100, 500 - conexiones * 20)
+    variacion = zlib.crc32(nota.filepath.encode("utf-8")) % 60 - 30
+    angulo = math.radians(ANGULOS_DIMENSION.get(nota.dimension, 0) + variacion)
+    return Estrella(
+        id=nota.filepath,
+        titulo=nota.titulo,
+        contenido_preview=nota.contenido[:200],
+        dimension=nota.dimension,
+        color=nota.obtener_color(),
+        posicion=Vector3D(
+            x=distancia * math.cos(angulo),
+            y=distancia * math.sin(angulo),
+            z=_altura_temporal(nota.fecha_creacion)
+        ),
+        luminosidad=0.0,
+        enlaces=nota.enlaces,
+        tags=nota.tags,
+        metadata=nota.metadata,
+        fecha_creacion=nota.fecha_creacion if isinstance(nota.fecha_creacion, datetime) else None,
+        num_enlaces=conexiones
+    )
+
+
+def calcular_constelaciones(
+    vault_path: str,
+    metodo: str = "componentes",
+    min_estrellas: int = 2
+) -> List[Constelacion]:
+    """Constelaciones del vault a partir del índice incremental de notas"""
+    parser = ObsidianParser(vault_path)
+    notas = obtener_indice(parser).listar_notas()
+    grafo = GrafoEnlaces(notas)
+    estrellas = [_estrella(nota, grafo.grado(nota.filepath)) for nota in notas]
+    return detectar_constelaciones(estrellas, grafo, metodo=metodo, min_estrellas=min_estrellas)
+
+
+@router_vault.get("/constelaciones")
 async def obtener_constelaciones(
     dimension: Optional[str] = None,
-    min_estrellas: int = 2
+    min_estrellas: int = 2,
+    metodo: str = Query("componentes", pattern="^(componentes|comunidades)$")
 ):
     """
     Obtiene lista de constelaciones (clusters de notas relacionadas)
@@ -162,12 +244,13 @@ async def obtener_constelaciones(
     Parámetros:
     - dimension: Filtrar por dimensión principal
     - min_estrellas: Mínimo de estrellas en la constelación
+    - metodo: "componentes" (notas conectadas) o "comunidades" (grupos densos)
     """
     try:
-        processor = UniversoProcessor(VAULT_PATH)
-        universo = processor.generar_universo()
-        
-        constelaciones = universo.grafo_conocimiento.constelaciones
+        # Agrupar el vault es CPU: fuera del event loop
+        constelaciones = await asyncio.to_thread(
+            calcular_constelaciones, VAULT_PATH, metodo, min_estrellas
+        )
         
         # Filtrar por dimensión
         if dimension:
@@ -176,12 +259,6 @@ async def obtener_constelaciones(
                 if c.dimension_principal == dimension
             ]
         
-        # Filtrar por tamaño
-        constelaciones = [
-            c for c in constelaciones 
-            if len(c.estrellas) >= min_estrellas
-        ]
-        
         return {
             "total": len(constelaciones),
             "constelaciones": constelaciones
@@ -4,13 +4,21 @@
 
 Endpoints para obtener vistas semanal, mensual y anual
 con significado litúrgico profundo.
+
+Las respuestas se sirven desde snapshots ya serializados (una vez por
+fecha/semana/mes) con ETag, Last-Modified y Cache-Control; los clientes
+que envían If-None-Match reciben 304.
 """
 
-from fastapi import APIRouter, Query
-from datetime import date, datetime
+from fastapi import APIRouter, Query, Request, Response
+from datetime import date, datetime, timedelta
 from typing import Optional
 
+import pytz
+
 from services.calendario_hijri import CalendarioHijri
+from services.snapshots_temporales import get_cache_snapshots
+from services.tabla_hijri import get_tabla_hijri
 from services.tiempos_liturgicos import CalculadorTiemposLiturgicos
 import os
 
@@ -24,10 +32,29 @@ TZ = os.getenv("TIMEZONE", "Europe/Madrid")
 
 calendario = CalendarioHijri()
 calculador = CalculadorTiemposLiturgicos(LAT, LON, TZ)
+snapshots = get_cache_snapshots()
+
+# Vistas de una fecha explícita: no cambian
+MAX_AGE_FECHA_FIJA = 86400
+
+
+def _fecha_o_hoy(fecha: Optional[str]) -> date:
+    if fecha:
+        return datetime.strptime(fecha, "%Y-%m-%d").date()
+    return datetime.now(pytz.timezone(TZ)).date()
+
+
+def _max_age(fecha: Optional[str]) -> int:
+    """Segundos de validez: hasta la medianoche local si la vista es 'hoy'"""
+    if fecha:
+        return MAX_AGE_FECHA_FIJA
+    ahora = datetime.now(pytz.timezone(TZ))
+    medianoche = datetime.combine(ahora.date() + timedelta(days=1), datetime.min.time())
+    return max(60, int((pytz.timezone(TZ).localize(medianoche) - ahora).total_seconds()))
 
 
 @router.get("/contexto-temporal")
-async def obtener_contexto_temporal(fecha: Optional[str] = None):
+async def obtener_contexto_temporal(request: Request, fecha: Optional[str] = None) -> Response:
     """
     Obtiene el contexto temporal completo para una fecha.
     
@@ -40,17 +67,16 @@ async def obtener_contexto_temporal(fecha: Optional[str] = None):
     Query params:
     - fecha: YYYY-MM-DD (opcional, default: hoy)
     """
-    if fecha:
-        dia = datetime.strptime(fecha, "%Y-%m-%d").date()
-    else:
-        dia = date.today()
+    dia = _fecha_o_hoy(fecha)
     
-    contexto = calendario.obtener_contexto_temporal_completo(dia)
-    return contexto
+    snapshot = snapshots.obtener(
+        "contexto", dia, lambda: calendario.obtener_contexto_temporal_completo(dia)
+    )
+    return snapshots.responder(request, snapshot, _max_age(fecha))
 
 
 @router.get("/vista-semanal")
-async def obtener_vista_semanal(fecha_inicio: Optional[str] = None):
+async def obtener_vista_semanal(request: Request, fecha_inicio: Optional[str] = None) -> Response:
     """
     Vista semanal con propósito profundo de cada día.
     
@@ -65,14 +91,22 @@ async def obtener_vista_semanal(fecha_inicio: Optional[str] = None):
     Query params:
     - fecha_inicio: YYYY-MM-DD (opcional, ajusta a lunes de esa semana)
     """
-    if fecha_inicio:
-        dia = datetime.strptime(fecha_inicio, "%Y-%m-%d").date()
-    else:
-        dia = date.today()
+    dia = _fecha_o_hoy(fecha_inicio)
+    lunes = dia - timedelta(days=dia.weekday())
     
-    vista = calendario.obtener_vista_semanal(dia)
+    snapshot = snapshots.obtener("semanal", lunes, lambda: _generar_vista_semanal(lunes))
+    return snapshots.responder(request, snapshot, _max_age(fecha_inicio))
+
+
+def _generar_vista_semanal(lunes: date) -> dict:
+    vista = calendario.obtener_vista_semanal(lunes)
     
     # Enriquecer con tiempos de rezo para cada día
+    if vista["dias"]:
+        calculador.precalcular_rango(
+            datetime.strptime(vista["dias"][0]["fecha"], "%Y-%m-%d").date(),
+            datetime.strptime(vista["dias"][-1]["fecha"], "%Y-%m-%d").date()
+        )
     for dia_info in vista["dias"]:
         fecha_dia = datetime.strptime(dia_info["fecha"], "%Y-%m-%d").date()
         tiempos = calculador.calcular_tiempos_hoy(fecha_dia)
@@ -89,7 +123,7 @@ async def obtener_vista_semanal(fecha_inicio: Optional[str] = None):
 
 
 @router.get("/vista-mensual")
-async def obtener_vista_mensual(fecha: Optional[str] = None):
+async def obtener_vista_mensual(request: Request, fecha: Optional[str] = None) -> Response:
     """
     Vista mensual con significado litúrgico Hijri completo.
     
@@ -107,18 +141,18 @@ async def obtener_vista_mensual(fecha: Optional[str] = None):
     Query params:
     - fecha: YYYY-MM-DD (opcional, default: mes actual)
     """
-    if fecha:
-        dia = datetime.strptime(fecha, "%Y-%m-%d").date()
-    else:
-        dia = date.today()
+    dia = _fecha_o_hoy(fecha)
+    hijri = get_tabla_hijri().a_hijri(dia)
     
-    vista_mensual = calendario.obtener_vista_mensual(dia)
-    
-    return vista_mensual
+    # Todas las fechas del mismo mes lunar comparten snapshot
+    snapshot = snapshots.obtener(
+        "mensual", (hijri.year, hijri.month), lambda: calendario.obtener_vista_mensual(dia)
+    )
+    return snapshots.responder(request, snapshot, _max_age(fecha))
 
 
 @router.get("/vista-anual")
-async def obtener_vista_anual(fecha: Optional[str] = None):
+async def obtener_vista_anual(request: Request, fecha: Optional[str] = None) -> Response:
     """
     Vista anual completa con los 12 meses lunares.
     
@@ -132,18 +166,17 @@ async def obtener_vista_anual(fecha: Optional[str] = None):
     Query params:
     - fecha: YYYY-MM-DD (opcional, default: año actual)
     """
-    if fecha:
-        dia = datetime.strptime(fecha, "%Y-%m-%d").date()
-    else:
-        dia = date.today()
+    dia = _fecha_o_hoy(fecha)
+    hijri = get_tabla_hijri().a_hijri(dia)
     
-    vista_anual = calendario.obtener_vista_anual(dia)
-    
-    return vista_anual
+    snapshot = snapshots.obtener(
+        "anual", (hijri.year, dia.year), lambda: calendario.obtener_vista_anual(dia)
+    )
+    return snapshots.responder(request, snapshot, _max_age(fecha))
 
 
 @router.get("/dias-semana")
-async def obtener_todos_dias_semana():
+async def obtener_todos_dias_semana(request: Request) -> Response:
     """
     Retorna la información completa de todos los días de la semana.
     
@@ -152,6 +185,11 @@ async def obtener_todos_dias_semana():
     - Entender el propósito de cada día
     - Planificación semanal consciente
     """
+    snapshot = snapshots.obtener("dias_semana", None, _generar_dias_semana)
+    return snapshots.responder(request, snapshot, MAX_AGE_FECHA_FIJA)
+
+
+def _generar_dias_semana() -> dict:
     return {
         "dias": [
             {
@@ -170,7 +208,7 @@ async def obtener_todos_dias_semana():
 
 
 @router.get("/meses-hijri")
-async def obtener_todos_meses_hijri():
+async def obtener_todos_meses_hijri(request: Request) -> Response:
     """
     Retorna la información completa de los 12 meses Hijri.
     
@@ -179,6 +217,11 @@ async def obtener_todos_meses_hijri():
     - Entender el ciclo espiritual completo
     - Planificación a largo plazo
     """
+    snapshot = snapshots.obtener("meses_hijri", None, _generar_meses_hijri)
+    return snapshots.responder(request, snapshot, MAX_AGE_FECHA_FIJA)
+
+
+def _generar_meses_hijri() -> dict:
     return {
         "meses": [
             {
@@ -1,6 +1,8 @@
-"""Middleware de seguridad para Campo Sagrado"""
+"""Middleware de seguridad y métricas para Campo Sagrado"""
 
+from .metricas import MetricasMiddleware
 from .security import (
+    SecurityMiddleware,
     SecurityHeadersMiddleware,
     RateLimitMiddleware,
     RequestLoggingMiddleware,
@@ -8,6 +10,8 @@ from .security import (
 )
 
 __all__ = [
+    "MetricasMiddleware",
+    "SecurityMiddleware",
     "SecurityHeadersMiddleware",
     "RateLimitMiddleware",
     "RequestLoggingMiddleware",
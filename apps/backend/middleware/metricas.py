@@ -0,0 +1,41 @@
+"""
+Middleware de métricas: latencia por ruta y span raíz de cada petición
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.metricas import span, observar
+
+
+class MetricasMiddleware:
+    """
+    Middleware ASGI puro: abre el span raíz de la petición y registra su
+    duración en el histograma HTTP etiquetado por método, plantilla de ruta
+    (`/api/estados/{id}`, no la URL concreta) y status.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = [500]
+
+        async def send_con_estado(message: Message):
+            if message["type"] == "http.response.start":
+                estado[0] = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        traza = span(f"http {method}")
+        try:
+            with traza:
+                await self.app(scope, receive, send_con_estado)
+        finally:
+            # Sin ruta (404, assets): etiqueta fija para no disparar la cardinalidad
+            ruta = getattr(scope.get("route"), "path", None) or "sin_ruta"
+            traza.renombrar(f"http {method} {ruta}")
+            observar("http_request_duration_seconds", (method, ruta, str(estado[0])), traza.duracion)
@@ -6,11 +6,197 @@ Implementa headers de seguridad y protecciones
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Callable, List, Optional, Tuple
 import time
 import os
 
-from services.rate_limiter import rate_limiter, get_rate_limit_for_endpoint
+from services.rate_limiter import RATE_LIMITS, RateLimiter, rate_limiter, get_rate_limit_for_endpoint
+
+
+CSP_PRODUCCION = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: https:; "
+    "font-src 'self' data:;"
+)
+
+HSTS_PRODUCCION = "max-age=31536000; includeSubDomains"
+
+
+def _tipo_endpoint(path: str) -> str:
+    """Clase de límite de rate para una ruta"""
+    if "/api/estado-cero" in path:
+        return "estado_cero"
+    elif "/api/orquestador/planificar" in path:
+        return "planificar"
+    elif "/health" in path or "/api/health" in path:
+        return "health"
+    return "general"
+
+
+class SecurityMiddleware:
+    """
+    Middleware ASGI puro que reúne validación, rate limiting, headers de
+    seguridad y logging en una sola capa (sin BaseHTTPMiddleware: no crea
+    tareas ni envuelve el stream, así que el streaming sigue funcionando).
+
+    Orden por petición:
+    1. Validación (User-Agent, tamaño, método, HTTPS en producción)
+    2. Rate limiting por IP y clase de endpoint
+    3. Headers de seguridad, de rate limit y X-Process-Time en la respuesta
+    4. Log en desarrollo
+
+    El entorno (ENV) y los headers se resuelven una vez al construirse.
+    """
+
+    BLOCKED_USER_AGENTS = (
+        "sqlmap", "nikto", "scanner", "bot", "crawler"
+    )
+
+    MAX_BODY_SIZE = 10 * 1024 * 1024  # 10 MB
+
+    ALLOWED_METHODS = frozenset(["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"])
+
+    def __init__(self, app: ASGIApp, entorno: Optional[str] = None, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.entorno = entorno if entorno is not None else os.getenv("ENV")
+        self.limiter = limiter or rate_limiter
+        self.produccion = self.entorno == "production"
+        self.desarrollo = self.entorno == "development"
+
+        cabeceras = [
+            (b"x-content-type-options", b"nosniff"),
+            (b"x-frame-options", b"DENY"),
+            (b"x-xss-protection", b"1; mode=block"),
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        ]
+        if self.produccion:
+            cabeceras.append((b"content-security-policy", CSP_PRODUCCION.encode()))
+            cabeceras.append((b"strict-transport-security", HSTS_PRODUCCION.encode()))
+        self.cabeceras_seguridad: Tuple[Tuple[bytes, bytes], ...] = tuple(cabeceras)
+
+        # tipo → (max_requests, window_minutes, header X-RateLimit-Limit)
+        self.limites = {
+            tipo: (config["max_requests"], config["window_minutes"], str(config["max_requests"]).encode())
+            for tipo, config in ((t, get_rate_limit_for_endpoint(t)) for t in RATE_LIMITS)
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
+
+        extra: List[Tuple[bytes, bytes]] = []
+        estado = [0]
+
+        async def send_con_headers(message: Message):
+            if message["type"] == "http.response.start":
+                estado[0] = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.extend(self.cabeceras_seguridad)
+                headers.extend(extra)
+                headers.append((b"x-process-time", str(time.perf_counter() - inicio).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        rechazo = self._validar(scope, method)
+        if rechazo is None:
+            max_requests, window_minutes, limite = self.limites[_tipo_endpoint(path)]
+            allowed, remaining, reset_in = await self.limiter.check_rate_limit_async(
+                identifier=client_ip,
+                max_requests=max_requests,
+                window_minutes=window_minutes
+            )
+            if allowed:
+                extra.append((b"x-ratelimit-limit", limite))
+                extra.append((b"x-ratelimit-remaining", str(remaining).encode()))
+            else:
+                rechazo = JSONResponse(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    content={
+                        "detail": f"Demasiadas peticiones. Intenta de nuevo en {reset_in} segundos.",
+                        "retry_after": reset_in
+                    },
+                    headers={
+                        "Retry-After": str(reset_in),
+                        "X-RateLimit-Limit": str(max_requests),
+                        "X-RateLimit-Remaining": "0",
+                        "X-RateLimit-Reset": str(reset_in)
+                    }
+                )
+
+        try:
+            if rechazo is not None:
+                await rechazo(scope, receive, send_con_headers)
+            else:
+                await self.app(scope, receive, send_con_headers)
+        except Exception as e:
+            process_time = time.perf_counter() - inicio
+            # Log de error (sin stack trace completo en producción)
+            if self.desarrollo:
+                print(f"❌ {method} {path} - ERROR - {process_time:.3f}s - {str(e)}")
+            else:
+                print(f"❌ {method} {path} - ERROR - {process_time:.3f}s")
+            raise
+
+        if self.desarrollo:
+            process_time = time.perf_counter() - inicio
+            print(f"📡 {method} {path} - {estado[0]} - {process_time:.3f}s - IP: {client_ip}")
+
+    def _validar(self, scope: Scope, method: str) -> Optional[JSONResponse]:
+        """Respuesta de rechazo, o None si la petición es válida"""
+        user_agent = b""
+        content_length = b""
+        for nombre, valor in scope["headers"]:
+            if nombre == b"user-agent":
+                user_agent = valor
+            elif nombre == b"content-length":
+                content_length = valor
+
+        # 1. User-Agent sospechoso
+        user_agent = user_agent.decode("latin-1").lower()
+        for blocked in self.BLOCKED_USER_AGENTS:
+            if blocked in user_agent:
+                return JSONResponse(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    content={"detail": "Acceso denegado"}
+                )
+
+        # 2. Tamaño del body
+        if content_length.isdigit() and int(content_length) > self.MAX_BODY_SIZE:
+            return JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": "Request demasiado grande"}
+            )
+
+        # 3. Método HTTP permitido
+        if method not in self.ALLOWED_METHODS:
+            return JSONResponse(
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                content={"detail": "Método no permitido"}
+            )
+
+        # 4. En producción, HTTPS obligatorio
+        if self.produccion and scope.get("scheme") != "https":
+            return JSONResponse(
+                status_code=status.HTTP_426_UPGRADE_REQUIRED,
+                content={"detail": "HTTPS requerido"}
+            )
+
+        return None
+
+
+# ==================== MIDDLEWARE POR CAPAS (legacy) ====================
+# Implementación anterior con BaseHTTPMiddleware, una capa por función.
+# api/main.py usa SecurityMiddleware; se mantienen para compatibilidad y
+# como referencia del benchmark (scripts/benchmark_middleware.py).
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -65,7 +251,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         # Verificar rate limit
         config = get_rate_limit_for_endpoint(endpoint_type)
-        allowed, remaining, reset_in = rate_limiter.check_rate_limit(
+        allowed, remaining, reset_in = await rate_limiter.check_rate_limit_async(
             identifier=client_ip,
             max_requests=config["max_requests"],
             window_minutes=config["window_minutes"]
@@ -19,8 +19,15 @@ Organización:
 Referencia: core/arquitectura/MAPEO_7_MINISTERIOS.md
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+import contextvars
+import copy
+import threading
+import time
+
+from services.metricas import observar, span
 
 __all__ = [
     "MinisterioBase",
@@ -28,6 +35,13 @@ __all__ = [
 ]
 
 
+# Tiempo máximo (segundos) que la reunión espera a cada ministerio
+TIMEOUT_MINISTERIO = 5.0
+
+# Vigencia (segundos) del reporte de un ministerio para un mismo decreto
+SNAPSHOT_TTL = 300.0
+
+
 class MinisterioBase(ABC):
     """
     Interfaz base que todos los ministerios deben implementar.
@@ -108,6 +122,11 @@ class GabineteMinisterial:
         cuando estén implementados para evitar dependencias circulares.
         """
         self._ministerios_activos: Dict[str, MinisterioBase] = {}
+        
+        # (ministerio, clave de decreto) → (instante, reporte)
+        self._snapshots: Dict[Tuple[str, Tuple], Tuple[float, Dict[str, Any]]] = {}
+        self._snapshots_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
     
     def registrar_ministerio(self, nombre: str, ministerio: MinisterioBase):
         """
@@ -118,8 +137,22 @@ class GabineteMinisterial:
             ministerio: Instancia del ministerio
         """
         self._ministerios_activos[nombre] = ministerio
+        
+        # Los reportes del ministerio anterior ya no valen
+        with self._snapshots_lock:
+            for clave in [c for c in self._snapshots if c[0] == nombre]:
+                del self._snapshots[clave]
+    
+    def tiene_ministerio(self, nombre: str) -> bool:
+        """Indica si el ministerio ya está registrado"""
+        return nombre in self._ministerios_activos
     
-    def reunion_ministerial(self, decreto) -> Dict[str, Any]:
+    def reunion_ministerial(
+        self,
+        decreto,
+        concurrente: bool = True,
+        timeout: float = TIMEOUT_MINISTERIO
+    ) -> Dict[str, Any]:
         """
         Convoca reunión ministerial para responder a decreto del Sultán.
         
@@ -128,29 +161,60 @@ class GabineteMinisterial:
         2. Responde al decreto
         3. Reporta métricas de salud
         
+        Los ministerios se consultan en paralelo; el que no responde en
+        `timeout` segundos queda marcado con error y la reunión continúa
+        con los reportes disponibles. Cada reporte se reutiliza durante
+        SNAPSHOT_TTL segundos para el mismo decreto; la reunión devuelve
+        copias, así que modificarlas no altera el cache.
+        
         Args:
             decreto: DecretoSacral a responder
+            concurrente: Consultar ministerios en paralelo (False = en serie)
+            timeout: Plazo por ministerio en segundos
             
         Returns:
             Dict con reportes de cada ministerio, conflictos detectados,
             y propuestas de coordinación
         """
+        # Leer el decreto en este hilo (atributos ORM) antes de repartir
+        clave_decreto = self._clave_decreto(decreto)
+        
         reportes = {}
+        pendientes = {}
         
         for nombre, ministerio in self._ministerios_activos.items():
+            snapshot = self._snapshot_vigente(nombre, clave_decreto)
+            if snapshot is not None:
+                reportes[nombre] = snapshot
+            elif concurrente:
+                # copy_context: los spans del hilo cuelgan de la traza actual
+                pendientes[nombre] = self._obtener_executor().submit(
+                    contextvars.copy_context().run, self._consultar_ministerio, ministerio, decreto
+                )
+            else:
+                reportes[nombre] = self._consultar_ministerio(ministerio, decreto)
+        
+        # Todos se enviaron a la vez: el plazo de cada uno corre desde ahora
+        limite = time.monotonic() + timeout
+        for nombre, futuro in pendientes.items():
             try:
+                reportes[nombre] = futuro.result(timeout=max(0.0, limite - time.monotonic()))
+            except FuturesTimeout:
                 reportes[nombre] = {
-                    "nombre_divino": ministerio.nombre_divino,
-                    "pregunta": ministerio.pregunta_existencial,
-                    "estado": ministerio.estado_actual(),
-                    "respuesta_decreto": ministerio.responder_a_decreto(decreto),
-                    "metricas": ministerio.metricas_salud()
-                }
-            except Exception as e:
-                reportes[nombre] = {
-                    "error": f"Error al consultar ministerio: {str(e)}"
+                    "error": f"Ministerio sin respuesta tras {timeout:.1f}s",
+                    "timeout": True
                 }
         
+        # Guardar solo reportes completos
+        ahora = time.monotonic()
+        with self._snapshots_lock:
+            for nombre, reporte in reportes.items():
+                if "error" not in reporte and (nombre, clave_decreto) not in self._snapshots:
+                    self._snapshots[(nombre, clave_decreto)] = (ahora, copy.deepcopy(reporte))
+        
+        # Mantener el orden de registro en la respuesta
+        reportes = {nombre: reportes[nombre] for nombre in self._ministerios_activos if nombre in reportes}
+        
         # Detectar conflictos inter-ministeriales
         conflictos = self._detectar_conflictos(reportes)
         
@@ -165,6 +229,48 @@ class GabineteMinisterial:
             "salud_global": self._calcular_salud_global(reportes)
         }
     
+    def _consultar_ministerio(self, ministerio: MinisterioBase, decreto) -> Dict[str, Any]:
+        """Reporte completo de un ministerio (estado, respuesta, métricas)"""
+        etiqueta = type(ministerio).__name__
+        with span(f"ministerio.{etiqueta}") as medicion:
+            try:
+                reporte = {
+                    "nombre_divino": ministerio.nombre_divino,
+                    "pregunta": ministerio.pregunta_existencial,
+                    "estado": ministerio.estado_actual(),
+                    "respuesta_decreto": ministerio.responder_a_decreto(decreto),
+                    "metricas": ministerio.metricas_salud()
+                }
+            except Exception as e:
+                reporte = {
+                    "error": f"Error al consultar ministerio: {str(e)}"
+                }
+        observar("ministerio_evaluacion_duration_seconds", (etiqueta,), medicion.duracion)
+        return reporte
+    
+    def _clave_decreto(self, decreto) -> Tuple:
+        """Identidad del decreto para memoizar reportes (id + acción)"""
+        return (
+            getattr(decreto, "id", None) or id(decreto),
+            getattr(decreto, "accion_tangible", None)
+        )
+    
+    def _snapshot_vigente(self, nombre: str, clave_decreto: Tuple) -> Optional[Dict[str, Any]]:
+        with self._snapshots_lock:
+            entrada = self._snapshots.get((nombre, clave_decreto))
+            if entrada is None:
+                return None
+            if time.monotonic() - entrada[0] > SNAPSHOT_TTL:
+                del self._snapshots[(nombre, clave_decreto)]
+                return None
+            reporte = entrada[1]
+        return copy.deepcopy(reporte)
+    
+    def _obtener_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=7, thread_name_prefix="ministerio")
+        return self._executor
+    
     def _detectar_conflictos(self, reportes: Dict[str, Any]) -> list[str]:
         """
         Detecta conflictos entre ministerios.
@@ -128,9 +128,10 @@ class MinisterioCapital(MinisterioBase):
         # TODO: Obtener datos reales desde DB
         # Por ahora, simulamos con heurísticas
         
-        capital_financiero = self._estimar_capital_financiero_mock()
-        capital_energetico = self._estimar_capital_energetico()
-        capital_temporal = self._estimar_capital_temporal()
+        capital_actual = self._capital_actual()
+        capital_financiero = capital_actual["financiero"]
+        capital_energetico = capital_actual["energetico"]
+        capital_temporal = capital_actual["temporal"]
         
         return {
             "fecha": date.today().isoformat(),
@@ -165,11 +166,7 @@ class MinisterioCapital(MinisterioBase):
         tipo_movimiento = self._clasificar_movimiento(accion)
         
         # Evaluar capital disponible
-        capital_actual = {
-            "financiero": self._estimar_capital_financiero_mock(),
-            "energetico": self._estimar_capital_energetico(),
-            "temporal": self._estimar_capital_temporal()
-        }
+        capital_actual = self._capital_actual()
         
         # Evaluar riesgo
         riesgo = self._evaluar_riesgo(costo_estimado, capital_actual)
@@ -205,7 +202,7 @@ class MinisterioCapital(MinisterioBase):
         Por ahora son heurísticas.
         TODO: Integrar con datos reales de finanzas y tracking.
         """
-        capital_financiero = self._estimar_capital_financiero_mock()
+        capital_financiero = self._capital_actual()["financiero"]
         
         # Heurísticas
         salud_financiera = self._calcular_salud_financiera(capital_financiero)
@@ -224,6 +221,25 @@ class MinisterioCapital(MinisterioBase):
     # MÉTODOS INTERNOS: Gestión de Capital
     # =====================================================================
     
+    def _capital_actual(self) -> Dict[str, Any]:
+        """
+        Snapshot de los tres capitales (financiero, energético, temporal).
+        
+        Los estimadores solo dependen de la fecha y la hora, así que el
+        snapshot se reutiliza dentro de la misma hora: estado_actual,
+        responder_a_decreto y metricas_salud no recalculan lo mismo.
+        """
+        clave = datetime.now().strftime("%Y-%m-%d %H")
+        snapshot = getattr(self, "_snapshot_capital", None)
+        if snapshot is None or snapshot[0] != clave:
+            snapshot = (clave, {
+                "financiero": self._estimar_capital_financiero_mock(),
+                "energetico": self._estimar_capital_energetico(),
+                "temporal": self._estimar_capital_temporal()
+            })
+            self._snapshot_capital = snapshot
+        return snapshot[1]
+    
     def _estimar_capital_financiero_mock(self) -> Dict[str, Any]:
         """
         Estima capital financiero.
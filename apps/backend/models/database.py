@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import os
+import time
 from datetime import datetime, date
 from typing import Optional
 
-from sqlalchemy import create_engine, Column, String, DateTime, Boolean, Text, Integer, Float, Date
+from sqlalchemy import event, Column, String, DateTime, Boolean, Text, Integer, Float, Date
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from models.db_config import ColaEscritura, crear_engine
+from services.metricas import observar
+
 
 DB_PATH = os.getenv("DB_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "storage", "organismo.db"))
 DB_PATH = os.path.abspath(DB_PATH)
@@ -15,10 +19,27 @@ os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# Pragmas de producción (WAL, busy_timeout...) y pool: ver models/db_config.py
+engine = crear_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Escrituras serializadas en un hilo (se crea en el primer uso)
+_cola_escritura: Optional[ColaEscritura] = None
+
+
+# Latencia de cada consulta (histograma por operación: SELECT, INSERT...)
+@event.listens_for(engine, "before_cursor_execute")
+def _inicio_consulta(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _fin_consulta(conn, cursor, statement, parameters, context, executemany):
+    inicio = conn.info["inicio_consultas"].pop()
+    operacion = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "?"
+    observar("db_query_duration_seconds", (operacion,), time.perf_counter() - inicio)
+
 
 def init_db():
     Base.metadata.create_all(bind=engine)
@@ -32,6 +53,32 @@ def get_db():
         db.close()
 
 
+def get_cola_escritura() -> ColaEscritura:
+    """
+    Cola de escritura única del proceso (commits por lotes)
+
+    Solo pasan por aquí las inserciones que no dependen de la sesión de la
+    petición (p. ej. crear un Estado Cero). El resto de escrituras no se
+    encolan a propósito:
+    - Los agentes (estado_cero, guardian, orquestador) leen, modifican y
+      confirman el mismo objeto en su Session síncrona; encolarlo partiría
+      la lectura y la escritura en dos sesiones y perdería cambios
+      concurrentes.
+    - Los endpoints asíncronos (gobierno, repositorios) ya confirman con
+      SesionAsync, fuera del event loop.
+    """
+    global _cola_escritura
+    if _cola_escritura is None:
+        _cola_escritura = ColaEscritura(crear_engine(SQLALCHEMY_DATABASE_URL, escritor=True))
+    return _cola_escritura
+
+
+def cerrar_cola_escritura():
+    """Vacía la cola de escritura y detiene su hilo"""
+    if _cola_escritura is not None:
+        _cola_escritura.cerrar()
+
+
 class EstadoCeroDB(Base):
     __tablename__ = "estado_cero"
     id = Column(String, primary_key=True, index=True)
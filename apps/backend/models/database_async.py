@@ -0,0 +1,142 @@
+"""
+Acceso asíncrono a la base de datos del organismo
+
+Los handlers `async def` y los agentes hacían `db.query(...)` síncrono
+directamente en el event loop: cada consulta bloqueaba al resto de
+peticiones concurrentes.
+
+- async_engine: SQLAlchemy asyncio sobre aiosqlite, con los mismos pragmas
+  (WAL, busy_timeout...) y el mismo histograma por consulta que el engine
+  síncrono
+- get_async_db: dependencia FastAPI que entrega una sesión asíncrona
+- sesion_async(): la misma sesión como context manager (agentes, servicios)
+
+Si aiosqlite no está instalado, la sesión es SesionEnHilo: la Session
+síncrona ejecutada con asyncio.to_thread y la misma interfaz (execute, get,
+commit, refresh...), así que los repositorios de models/repositorios.py
+funcionan igual en ambos casos.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models.database import DB_PATH, SessionLocal, _fin_consulta, _inicio_consulta
+from models.db_config import aplicar_pragmas
+
+try:
+    import aiosqlite  # noqa: F401
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    AIOSQLITE_DISPONIBLE = True
+except ImportError:
+    AsyncSession = None
+    AIOSQLITE_DISPONIBLE = False
+
+
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+
+
+# ==================== ADAPTADOR SIN AIOSQLITE ====================
+
+class SesionEnHilo:
+    """Interfaz mínima de AsyncSession sobre una Session síncrona en un hilo"""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def _correr(self, funcion, *args):
+        return await asyncio.to_thread(funcion, *args)
+
+    def add(self, objeto: Any):
+        self._session.add(objeto)
+
+    async def execute(self, sentencia, *args, **kwargs):
+        def _ejecutar():
+            # Resultado ya leído entero: nada de fetch posterior en el loop
+            return self._session.execute(sentencia, *args, **kwargs).freeze()
+        return (await self._correr(_ejecutar))()
+
+    async def get(self, modelo, clave):
+        return await self._correr(self._session.get, modelo, clave)
+
+    async def flush(self):
+        await self._correr(self._session.flush)
+
+    async def commit(self):
+        await self._correr(self._session.commit)
+
+    async def rollback(self):
+        await self._correr(self._session.rollback)
+
+    async def refresh(self, objeto: Any):
+        await self._correr(self._session.refresh, objeto)
+
+    async def close(self):
+        await self._correr(self._session.close)
+
+    async def __aenter__(self) -> "SesionEnHilo":
+        return self
+
+    async def __aexit__(self, tipo, valor, traza):
+        await self.close()
+
+
+class SesionSincrona(SesionEnHilo):
+    """
+    La misma interfaz sobre una Session síncrona ya abierta, en el hilo actual
+
+    Para quien solo tiene una Session (scripts, tests, engines en memoria
+    cuya conexión no puede cambiar de hilo): las consultas bloquean el loop,
+    pero leen la misma base de datos y transacción que la Session.
+    """
+
+    async def _correr(self, funcion, *args):
+        return funcion(*args)
+
+
+# ==================== ENGINE Y SESIONES ====================
+
+if AIOSQLITE_DISPONIBLE:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _al_conectar(dbapi_connection, connection_record):
+        aplicar_pragmas(dbapi_connection)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _inicio_consulta)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _fin_consulta)
+
+    SesionAsync = AsyncSession
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+    SesionAsync = SesionEnHilo
+
+
+def sesion_async():
+    """
+    Sesión asíncrona nueva (usar con `async with`)
+
+    Uso:
+        async with sesion_async() as db:
+            decreto = await RepositorioDecretos(db).del_dia(date.today())
+    """
+    if AIOSQLITE_DISPONIBLE:
+        return AsyncSessionLocal()
+    return SesionEnHilo(SessionLocal(expire_on_commit=False))
+
+
+async def get_async_db() -> AsyncIterator[Any]:
+    async with sesion_async() as db:
+        yield db
+
+
+async def cerrar_async_engine():
+    """Cierra las conexiones del pool asíncrono (shutdown)"""
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -0,0 +1,233 @@
+"""
+Configuración del motor SQLite del organismo
+
+- Pragmas de producción en cada conexión nueva: WAL, synchronous=NORMAL,
+  cache de 64 MB, mmap de 256 MB, temporales en memoria y busy_timeout
+  (las escrituras concurrentes esperan en vez de fallar con
+  "database is locked")
+- Pool: QueuePool para archivo (conexiones reutilizadas entre peticiones),
+  StaticPool para `:memory:`
+- ColaEscritura: un único hilo escritor con su propio engine. Agrupa las
+  operaciones que llegan juntas en una sola transacción BEGIN IMMEDIATE
+  (cada operación en su SAVEPOINT y con la sesión vacía: si una falla, el
+  resto del lote se confirma igual) y reporta el tiempo de espera por el bloqueo:
+    - origen="cola":   desde que se encola hasta que empieza su lote
+    - origen="sqlite": lo que tarda BEGIN IMMEDIATE (otros procesos)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from services.metricas import observar
+
+
+PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,        # KiB (negativo) → 64 MB
+    "mmap_size": 268435456,      # 256 MB
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,        # ms
+    "foreign_keys": "ON",
+}
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+MAX_LOTE = 64
+ESPERA_LOTE = 0.005  # Segundos que se espera a más operaciones para el lote
+
+
+def aplicar_pragmas(dbapi_connection, pragmas: Dict[str, Any] = PRAGMAS):
+    """Ejecuta los PRAGMA sobre una conexión sqlite3 recién abierta"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for nombre, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nombre}={valor}")
+    finally:
+        cursor.close()
+
+
+def crear_engine(url: str, escritor: bool = False) -> Engine:
+    """
+    Engine SQLite con pragmas y pool adecuados
+
+    Args:
+        url: sqlite:///ruta.db o sqlite:// (memoria)
+        escritor: Engine del hilo escritor: transacciones BEGIN IMMEDIATE
+            controladas por SQLAlchemy (necesario para los SAVEPOINT)
+    """
+    en_memoria = url in ("sqlite://", "sqlite:///:memory:")
+    opciones: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if en_memoria:
+        opciones["poolclass"] = StaticPool
+    elif escritor:
+        opciones.update(poolclass=QueuePool, pool_size=1, max_overflow=0)
+    else:
+        opciones.update(poolclass=QueuePool, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
+
+    engine = create_engine(url, **opciones)
+
+    @event.listens_for(engine, "connect")
+    def _al_conectar(dbapi_connection, connection_record):
+        aplicar_pragmas(dbapi_connection, {k: v for k, v in PRAGMAS.items() if not (en_memoria and k == "journal_mode")})
+        if escritor:
+            # pysqlite abre transacciones por su cuenta; cederle el control a SQLAlchemy
+            dbapi_connection.isolation_level = None
+
+    if escritor:
+        @event.listens_for(engine, "begin")
+        def _al_empezar(conn):
+            inicio = time.perf_counter()
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            observar("db_lock_wait_seconds", ("sqlite",), time.perf_counter() - inicio)
+
+    return engine
+
+
+# ==================== COLA DE ESCRITURA ====================
+
+_FIN = object()
+
+
+class ColaEscritura:
+    """
+    Serializa las escrituras en un único hilo con commits por lotes
+
+    Uso:
+        cola.escribir(lambda session: session.add(objeto))
+        resultado = await cola.escribir_async(lambda session: ...)
+    """
+
+    def __init__(self, engine: Engine, max_lote: int = MAX_LOTE, espera_lote: float = ESPERA_LOTE):
+        self.engine = engine
+        self.max_lote = max_lote
+        self.espera_lote = espera_lote
+        self._cola: "queue.Queue" = queue.Queue()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {"operaciones": 0, "lotes": 0, "errores": 0, "espera_cola_total": 0.0}
+
+    # ==================== ENVÍO ====================
+
+    def enviar(self, operacion: Callable[[Session], Any]) -> Future:
+        """Encola una operación; el Future se resuelve tras el commit de su lote"""
+        self._asegurar_hilo()
+        futuro: Future = Future()
+        self._cola.put((operacion, futuro, time.perf_counter()))
+        return futuro
+
+    def escribir(self, operacion: Callable[[Session], Any], timeout: Optional[float] = None) -> Any:
+        """Encola y espera el resultado (bloquea el hilo actual)"""
+        return self.enviar(operacion).result(timeout=timeout)
+
+    async def escribir_async(self, operacion: Callable[[Session], Any]) -> Any:
+        """Encola y espera el resultado sin bloquear el event loop"""
+        return await asyncio.wrap_future(self.enviar(operacion))
+
+    def guardar(self, *objetos) -> Future:
+        """Inserta/actualiza objetos ORM nuevos (session.add)"""
+        return self.enviar(lambda session: session.add_all(objetos))
+
+    # ==================== HILO ESCRITOR ====================
+
+    def _asegurar_hilo(self):
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._bucle, name="db-escritor", daemon=True)
+                self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            primera = self._cola.get()
+            if primera is _FIN:
+                return
+
+            lote = [primera]
+            limite = time.perf_counter() + self.espera_lote
+            fin = False
+            while len(lote) < self.max_lote:
+                restante = limite - time.perf_counter()
+                try:
+                    siguiente = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is _FIN:
+                    fin = True
+                    break
+                lote.append(siguiente)
+
+            self._procesar(lote)
+            if fin:
+                return
+
+    def _procesar(self, lote: List[Tuple[Callable, Future, float]]):
+        inicio = time.perf_counter()
+        resultados: List[Tuple[Future, Any, Optional[BaseException]]] = []
+
+        try:
+            with Session(self.engine, expire_on_commit=False) as session:
+                session.connection()  # BEGIN IMMEDIATE (mide la espera de SQLite)
+                for operacion, futuro, encolado in lote:
+                    espera = inicio - encolado
+                    observar("db_lock_wait_seconds", ("cola",), espera)
+                    self.stats["espera_cola_total"] += espera
+                    try:
+                        with session.begin_nested():
+                            resultado = operacion(session)
+                        resultados.append((futuro, resultado, None))
+                    except Exception as e:
+                        resultados.append((futuro, None, e))
+                    finally:
+                        # Cada operación empieza con el identity map vacío: objetos de
+                        # operaciones anteriores del lote no chocan con los suyos
+                        session.expunge_all()
+                session.commit()
+        except Exception as e:
+            # Falló el commit (o el BEGIN): todo el lote falla
+            self.stats["errores"] += len(lote)
+            for _, futuro, _ in lote:
+                if not futuro.done():  # Incluye los cancelados
+                    futuro.set_exception(e)
+            return
+
+        self.stats["lotes"] += 1
+        for futuro, resultado, error in resultados:
+            self.stats["operaciones"] += 1
+            if error is not None:
+                self.stats["errores"] += 1
+            if futuro.cancelled():
+                continue  # El llamador dejó de esperar (la escritura ya está hecha)
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+
+    def cerrar(self, timeout: float = 5.0):
+        """Procesa lo pendiente y detiene el hilo escritor"""
+        if self._hilo is not None and self._hilo.is_alive():
+            self._cola.put(_FIN)
+            self._hilo.join(timeout)
+        self._hilo = None
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        operaciones = self.stats["operaciones"]
+        return {
+            **self.stats,
+            "pendientes": self._cola.qsize(),
+            "ops_por_lote": round(operaciones / self.stats["lotes"], 2) if self.stats["lotes"] else 0.0,
+            "espera_cola_media_ms": round(self.stats["espera_cola_total"] / operaciones * 1000, 3) if operaciones else 0.0,
+        }
@@ -13,10 +13,11 @@ La Capa 5 escucha sin juzgar.
 
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 from pathlib import Path
-import json
+
+from services.historial_emocional import get_serie_emocional
 
 
 class EstadoEmocionalTipo(str, Enum):
@@ -143,6 +144,8 @@ class TrackerEmocional:
     Rastrea estados emocionales a lo largo del tiempo.
 
     Permite detectar patrones, tendencias, y ciclos emocionales.
+    El histórico vive en services/historial_emocional.py (log append-only
+    con ventana en memoria y estadísticas incrementales).
     """
 
     def __init__(self, storage_path: Optional[Path] = None):
@@ -161,19 +164,7 @@ class TrackerEmocional:
             estado: EstadoEmocional a guardar
             usuario_id: ID del usuario
         """
-        archivo = self.storage_path / f"{usuario_id}_emocional.json"
-
-        # Cargar histórico existente
-        historico = []
-        if archivo.exists():
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    historico = json.load(f)
-            except:
-                historico = []
-
-        # Agregar nuevo estado
-        historico.append({
+        get_serie_emocional(self.storage_path, usuario_id).agregar({
             "timestamp": estado.timestamp.isoformat(),
             "estado": estado.estado.value,
             "intensidad": estado.intensidad,
@@ -182,16 +173,6 @@ class TrackerEmocional:
             "desencadenante": estado.desencadenante
         })
 
-        # Guardar (mantener últimos 30 días)
-        fecha_limite = datetime.now() - timedelta(days=30)
-        historico = [
-            h for h in historico
-            if datetime.fromisoformat(h["timestamp"]) >= fecha_limite
-        ]
-
-        with open(archivo, 'w', encoding='utf-8') as f:
-            json.dump(historico, f, indent=2, ensure_ascii=False)
-
     def obtener_historico(
         self,
         usuario_id: str = "default",
@@ -207,22 +188,7 @@ class TrackerEmocional:
         Returns:
             Lista de estados emocionales
         """
-        archivo = self.storage_path / f"{usuario_id}_emocional.json"
-
-        if not archivo.exists():
-            return []
-
-        try:
-            with open(archivo, 'r', encoding='utf-8') as f:
-                historico = json.load(f)
-
-            fecha_limite = datetime.now() - timedelta(days=dias)
-            return [
-                h for h in historico
-                if datetime.fromisoformat(h["timestamp"]) >= fecha_limite
-            ]
-        except:
-            return []
+        return get_serie_emocional(self.storage_path, usuario_id).historico(dias)
 
     def detectar_tendencia(self, usuario_id: str = "default") -> TendenciaEmocional:
         """
@@ -234,15 +200,12 @@ class TrackerEmocional:
         Returns:
             TendenciaEmocional detectada
         """
-        historico = self.obtener_historico(usuario_id, dias=2)
+        # Últimos 3 estados de los 2 últimos días (mantenidos al añadir)
+        intensidades = get_serie_emocional(self.storage_path, usuario_id).ultimas_intensidades()
 
-        if len(historico) < 3:
+        if len(intensidades) < 3:
             return TendenciaEmocional.ESTABLE
 
-        # Analizar últimos 3 estados
-        ultimos_3 = historico[-3:]
-        intensidades = [h["intensidad"] for h in ultimos_3]
-
         # Detectar tendencia
         if intensidades[-1] > intensidades[0] + 1:
             return TendenciaEmocional.MEJORANDO
@@ -266,32 +229,14 @@ class TrackerEmocional:
         Returns:
             Descripción del patrón o None
         """
-        historico = self.obtener_historico(usuario_id, dias=7)
-
-        if len(historico) < 10:
+        # Conteos estado×momento de la última semana (mantenidos al añadir):
+        # patrón si un momento con 3+ registros repite el mismo estado el 70%+
+        patron = get_serie_emocional(self.storage_path, usuario_id).patron_diario()
+        if patron is None:
             return None
 
-        # Agrupar por momento litúrgico
-        por_momento = {}
-        for h in historico:
-            momento = h.get("momento_liturgico")
-            if momento:
-                if momento not in por_momento:
-                    por_momento[momento] = []
-                por_momento[momento].append(h["estado"])
-
-        # Detectar si un momento tiene patrón consistente
-        for momento, estados in por_momento.items():
-            if len(estados) >= 3:
-                # Si 70%+ son el mismo estado
-                from collections import Counter
-                conteo = Counter(estados)
-                estado_comun, frecuencia = conteo.most_common(1)[0]
-
-                if frecuencia / len(estados) >= 0.7:
-                    return f"{estado_comun} recurrente en {momento}"
-
-        return None
+        estado_comun, momento = patron
+        return f"{estado_comun} recurrente en {momento}"
 
 
 # === FUNCIONES PÚBLICAS ===
@@ -0,0 +1,142 @@
+"""
+Repositorios asíncronos de las tablas del organismo
+
+Cada repositorio envuelve una sesión de models/database_async.py
+(AsyncSession o SesionEnHilo) y reúne las consultas que antes se repetían
+como `db.query(...)` en handlers y agentes.
+
+Uso:
+    async with sesion_async() as db:
+        decreto = await RepositorioDecretos(db).del_dia(date.today())
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import func, select
+
+from models.database import BiometriaDB, EstadoCeroDB, NoNegociableTrackingDB, SesionDB
+from models.decreto_sacral import DecretoSacral
+
+
+ESTADOS_DECRETO_ACTIVO = ("pendiente", "en_ejecucion")
+
+
+def _limites_dia(fecha: date):
+    """[inicio, fin) del día para columnas DateTime"""
+    inicio = datetime.combine(fecha, time.min)
+    return inicio, inicio + timedelta(days=1)
+
+
+class _Repositorio:
+    def __init__(self, db: Any):
+        self.db = db
+
+    async def _todos(self, sentencia) -> List[Any]:
+        return list((await self.db.execute(sentencia)).scalars().all())
+
+    async def _primero(self, sentencia) -> Optional[Any]:
+        return (await self.db.execute(sentencia.limit(1))).scalars().first()
+
+    async def _contar(self, modelo, *condiciones) -> int:
+        return (await self.db.execute(select(func.count()).select_from(modelo).where(*condiciones))).scalar_one()
+
+    async def agregar(self, objeto: Any) -> Any:
+        """Inserta, confirma y recarga (id autoincremental, defaults)"""
+        self.db.add(objeto)
+        await self.db.commit()
+        await self.db.refresh(objeto)
+        return objeto
+
+    async def confirmar(self):
+        await self.db.commit()
+
+    async def revertir(self):
+        await self.db.rollback()
+
+
+# ==================== ESTADO CERO ====================
+
+class RepositorioEstadosCero(_Repositorio):
+
+    async def obtener(self, estado_id: str) -> Optional[EstadoCeroDB]:
+        return await self.db.get(EstadoCeroDB, estado_id)
+
+    async def recientes(self, limite: int = 10) -> List[EstadoCeroDB]:
+        return await self._todos(
+            select(EstadoCeroDB).order_by(EstadoCeroDB.fecha.desc()).limit(limite)
+        )
+
+    async def del_dia(self, fecha: date) -> List[EstadoCeroDB]:
+        inicio, fin = _limites_dia(fecha)
+        return await self._todos(
+            select(EstadoCeroDB).where(EstadoCeroDB.fecha >= inicio, EstadoCeroDB.fecha < fin)
+        )
+
+    async def desde(self, inicio: datetime) -> List[EstadoCeroDB]:
+        return await self._todos(select(EstadoCeroDB).where(EstadoCeroDB.fecha >= inicio))
+
+    async def contar_desde(self, inicio: datetime) -> int:
+        return await self._contar(EstadoCeroDB, EstadoCeroDB.fecha >= inicio)
+
+    async def momentos_completados(self, fecha: date) -> set:
+        """Momentos litúrgicos con Estado Cero completado ese día"""
+        inicio, fin = _limites_dia(fecha)
+        resultado = await self.db.execute(
+            select(EstadoCeroDB.momento).where(
+                EstadoCeroDB.fecha >= inicio,
+                EstadoCeroDB.fecha < fin,
+                EstadoCeroDB.completado.is_(True)
+            ).distinct()
+        )
+        return set(resultado.scalars().all())
+
+
+# ==================== DECRETOS (3 PODERES) ====================
+
+class RepositorioDecretos(_Repositorio):
+
+    async def del_dia(self, fecha: date, estados: Optional[Sequence[str]] = None) -> Optional[DecretoSacral]:
+        """Decreto de la fecha (opcionalmente solo en alguno de `estados`)"""
+        sentencia = select(DecretoSacral).where(DecretoSacral.fecha == fecha)
+        if estados:
+            sentencia = sentencia.where(DecretoSacral.estado.in_(estados))
+        return await self._primero(sentencia)
+
+    async def activo_del_dia(self, fecha: date) -> Optional[DecretoSacral]:
+        return await self.del_dia(fecha, ESTADOS_DECRETO_ACTIVO)
+
+    async def historial(self, limite: int = 30) -> List[DecretoSacral]:
+        return await self._todos(
+            select(DecretoSacral).order_by(DecretoSacral.fecha.desc()).limit(limite)
+        )
+
+
+# ==================== SESIONES, BIOMETRÍA, NO-NEGOCIABLES ====================
+
+class RepositorioSesiones(_Repositorio):
+
+    async def del_dia(self, fecha: date) -> List[SesionDB]:
+        return await self._todos(select(SesionDB).where(SesionDB.fecha == fecha))
+
+    async def desde(self, fecha: date) -> List[SesionDB]:
+        return await self._todos(select(SesionDB).where(SesionDB.fecha >= fecha))
+
+    async def contar_del_dia(self, fecha: date) -> int:
+        return await self._contar(SesionDB, SesionDB.fecha == fecha)
+
+
+class RepositorioBiometria(_Repositorio):
+
+    async def del_dia(self, fecha: date) -> Optional[BiometriaDB]:
+        return await self.db.get(BiometriaDB, fecha)
+
+
+class RepositorioNoNegociables(_Repositorio):
+
+    async def del_dia(self, fecha: date) -> List[NoNegociableTrackingDB]:
+        return await self._todos(
+            select(NoNegociableTrackingDB).where(NoNegociableTrackingDB.fecha == fecha)
+        )
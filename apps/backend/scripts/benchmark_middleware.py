@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark: overhead del middleware de seguridad por petición
+=================================================================
+
+Compara, sobre una app mínima y en proceso (sin red):
+- Sin middleware (línea base)
+- Cuatro capas BaseHTTPMiddleware (implementación anterior)
+- SecurityMiddleware (una sola capa ASGI pura)
+
+Uso:
+    python scripts/benchmark_middleware.py --peticiones 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import httpx
+from fastapi import FastAPI
+
+from middleware.security import (
+    RateLimitMiddleware,
+    RequestLoggingMiddleware,
+    SecurityHeadersMiddleware,
+    SecurityMiddleware,
+    SecurityValidationMiddleware,
+)
+from services.rate_limiter import RATE_LIMITS
+
+
+def crear_app(variante: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    if variante == "capas":
+        app.add_middleware(SecurityValidationMiddleware)
+        app.add_middleware(RateLimitMiddleware)
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(RequestLoggingMiddleware)
+    elif variante == "asgi":
+        app.add_middleware(SecurityMiddleware)
+    return app
+
+
+async def medir(app: FastAPI, peticiones: int) -> float:
+    """Microsegundos por petición"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as cliente:
+        for _ in range(200):  # Calentamiento
+            await cliente.get("/api/ping")
+
+        inicio = time.perf_counter()
+        for _ in range(peticiones):
+            respuesta = await cliente.get("/api/ping")
+            assert respuesta.status_code == 200
+        return (time.perf_counter() - inicio) / peticiones * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark del middleware de seguridad")
+    parser.add_argument("--peticiones", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Que el rate limit no corte el benchmark
+    for config in RATE_LIMITS.values():
+        config["max_requests"] = 10 ** 9
+
+    resultados = {}
+    for variante in ("ninguno", "capas", "asgi"):
+        resultados[variante] = await medir(crear_app(variante), args.peticiones)
+
+    base = resultados["ninguno"]
+    print(f"📊 {args.peticiones} peticiones GET /api/ping")
+    print(f"   Sin middleware:          {base:8.1f} µs/petición")
+    print(f"   4 capas BaseHTTP:        {resultados['capas']:8.1f} µs/petición  (+{resultados['capas'] - base:.1f} µs)")
+    print(f"   SecurityMiddleware ASGI: {resultados['asgi']:8.1f} µs/petición  (+{resultados['asgi'] - base:.1f} µs)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,15 +1,292 @@
 """
 Sistema completo de audit trail para tracking de eventos
 Registra todo con precisión de microsegundos
+
+Escritura en dos capas:
+- Sidecar estructurado append-only: `Audit_Trail/.data/YYYY-MM-DD.jsonl`
+  (una línea JSON por evento, rotación por tamaño)
+- Tabla markdown diaria para Obsidian, renderizada de forma diferida desde
+  el sidecar (periódicamente y al cerrar), no en cada evento
+
+`log_event` serializa el evento (un error de serialización salta en quien
+llama, no en el escritor) y lo encola ya como línea JSON: un hilo escritor agrupa eventos en lotes. Al salir
+del proceso (`atexit`) se vacía la cola y se renderiza lo pendiente.
+
+Días registrados antes del sidecar: la primera vez que se escribe en uno,
+sus filas del markdown se importan al JSONL antes del nuevo evento, así el
+render y las lecturas conservan el histórico.
 """
 
 from pathlib import Path
 from datetime import datetime, date
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+import atexit
 import json
+import queue
+import threading
 import time
 
 
+# Parámetros del escritor
+FLUSH_INTERVAL = 1.0                    # segundos máx. que un evento espera en memoria
+MAX_BATCH = 500                         # eventos por escritura
+RENDER_INTERVAL = 30.0                  # segundos entre renders del markdown
+MAX_SIDECAR_BYTES = 10 * 1024 * 1024    # rotación del JSONL por tamaño
+
+
+def _filas_markdown(audit_file: Path, fecha_str: str) -> List[Dict]:
+    """Eventos de una tabla markdown (formato anterior al sidecar) como registros"""
+    if not audit_file.exists():
+        return []
+
+    registros = []
+    for linea in audit_file.read_text(encoding='utf-8').split('\n'):
+        linea = linea.strip()
+        if not linea.startswith('|') or not linea.endswith('|') or 'Timestamp' in linea or '---' in linea:
+            continue
+        partes = [p.strip() for p in linea[1:-1].split('|', 5)]
+        if len(partes) < 6:
+            continue
+        hora, tipo, origen, estado, duracion, metadata_str = partes
+
+        metadata_str = metadata_str.replace('\\|', '|')
+        try:
+            metadata = json.loads(metadata_str) if metadata_str != '-' else {}
+        except json.JSONDecodeError:
+            metadata = {"texto": metadata_str}
+        duracion = duracion[:-2] if duracion.endswith('ms') else duracion
+
+        registros.append({
+            "fecha": fecha_str,
+            "timestamp": f"{fecha_str}T{hora}",
+            "hora": hora,
+            "tipo": tipo,
+            "origen": origen,
+            "estado": estado,
+            "duracion_ms": int(duracion) if duracion.isdigit() else None,
+            "metadata": metadata,
+        })
+    return registros
+
+
+class _AuditWriter:
+    """
+    Escritor en segundo plano para un directorio de audit trail.
+    Una sola instancia por directorio (compartida entre AuditTrail).
+    """
+
+    def __init__(self, audit_dir: Path):
+        self.audit_dir = audit_dir
+        self.data_dir = audit_dir / ".data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        # (fecha, línea JSONL ya serializada)
+        self._cola: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._dias_sucios: set = set()
+        self._ultimo_render = time.monotonic()
+        self._cerrado = False
+
+        self._hilo = threading.Thread(target=self._loop, name=f"audit-writer:{audit_dir.name}", daemon=True)
+        self._hilo.start()
+        atexit.register(self.close)
+
+    # ==================== PRODUCTOR ====================
+
+    def put(self, fecha_str: str, linea: str):
+        if self._cerrado:
+            # Tras el cierre, escribir de forma síncrona
+            self._escribir_lote([(fecha_str, linea)])
+            self._render_pendientes()
+            return
+        self._cola.put((fecha_str, linea))
+
+    # ==================== HILO ESCRITOR ====================
+
+    def _loop(self):
+        parar = False
+        while not parar:
+            lote: List[Tuple[str, str]] = []
+            tomados = 0
+            try:
+                item = self._cola.get(timeout=FLUSH_INTERVAL)
+                tomados = 1
+                # Agrupar lo que ya esté en cola (None = centinela de cierre)
+                while item is not None:
+                    lote.append(item)
+                    if len(lote) >= MAX_BATCH:
+                        break
+                    try:
+                        item = self._cola.get_nowait()
+                    except queue.Empty:
+                        break
+                    tomados += 1
+                parar = item is None
+            except queue.Empty:
+                pass
+
+            if lote:
+                try:
+                    self._escribir_lote(lote)
+                except Exception as e:
+                    print(f"❌ Error escribiendo audit trail: {e}")
+            for _ in range(tomados):
+                self._cola.task_done()
+
+            if time.monotonic() - self._ultimo_render >= RENDER_INTERVAL:
+                self._render_pendientes()
+
+    def _sidecar(self, fecha_str: str) -> Path:
+        return self.data_dir / f"{fecha_str}.jsonl"
+
+    def _escribir_lote(self, lote: List[Tuple[str, str]]):
+        """Append de un lote (líneas ya serializadas) al JSONL de cada día, rotando por tamaño"""
+        por_dia: Dict[str, List[str]] = {}
+        for fecha_str, linea in lote:
+            por_dia.setdefault(fecha_str, []).append(linea)
+
+        with self._lock:
+            for fecha_str, lineas in por_dia.items():
+                sidecar = self._sidecar(fecha_str)
+                if not self.segmentos(fecha_str):
+                    # Primer evento del día con sidecar: conservar las filas del markdown previo
+                    legado = _filas_markdown(self.audit_dir / f"{fecha_str}.md", fecha_str)
+                    lineas = [json.dumps(r, ensure_ascii=False) + "\n" for r in legado] + lineas
+                if sidecar.exists() and sidecar.stat().st_size >= MAX_SIDECAR_BYTES:
+                    self._rotar(fecha_str)
+                with open(sidecar, 'a', encoding='utf-8') as f:
+                    f.writelines(lineas)
+                self._dias_sucios.add(fecha_str)
+
+    def _rotar(self, fecha_str: str):
+        """`fecha.jsonl` → `fecha.N.jsonl` (N creciente = más reciente)"""
+        n = len(self._segmentos_rotados(fecha_str)) + 1
+        self._sidecar(fecha_str).rename(self.data_dir / f"{fecha_str}.{n}.jsonl")
+
+    def _segmentos_rotados(self, fecha_str: str) -> List[Path]:
+        segmentos = []
+        for path in self.data_dir.glob(f"{fecha_str}.*.jsonl"):
+            sufijo = path.name[len(fecha_str) + 1:-len(".jsonl")]
+            if sufijo.isdigit():
+                segmentos.append((int(sufijo), path))
+        return [path for _, path in sorted(segmentos)]
+
+    def segmentos(self, fecha_str: str) -> List[Path]:
+        """Todos los segmentos JSONL del día, en orden cronológico"""
+        segmentos = self._segmentos_rotados(fecha_str)
+        actual = self._sidecar(fecha_str)
+        if actual.exists():
+            segmentos.append(actual)
+        return segmentos
+
+    def leer_dia(self, fecha_str: str) -> List[Dict]:
+        registros = []
+        with self._lock:
+            for segmento in self.segmentos(fecha_str):
+                with open(segmento, 'r', encoding='utf-8') as f:
+                    for linea in f:
+                        linea = linea.strip()
+                        if not linea:
+                            continue
+                        try:
+                            registros.append(json.loads(linea))
+                        except json.JSONDecodeError:
+                            continue
+        return registros
+
+    # ==================== RENDER MARKDOWN ====================
+
+    def _render_pendientes(self):
+        with self._render_lock:
+            with self._lock:
+                dias = list(self._dias_sucios)
+                self._dias_sucios.clear()
+            for fecha_str in dias:
+                try:
+                    self._render_dia(fecha_str)
+                except Exception as e:
+                    print(f"❌ Error renderizando audit trail {fecha_str}: {e}")
+            self._ultimo_render = time.monotonic()
+
+    def _render_dia(self, fecha_str: str):
+        """Reescribe la tabla markdown del día desde el sidecar"""
+        registros = self.leer_dia(fecha_str)
+
+        lineas = [
+            "---",
+            "tipo: audit-trail",
+            f"fecha: {fecha_str}",
+            f"eventos_registrados: {len(registros)}",
+            "---",
+            "",
+            f"# Audit Trail - {fecha_str}",
+            "",
+            "| Timestamp | Tipo | Origen | Estado | Duración | Metadata |",
+            "|-----------|------|--------|--------|----------|----------|",
+        ]
+        for r in registros:
+            metadata_str = json.dumps(r["metadata"], ensure_ascii=False).replace("|", "\\|")
+            lineas.append(
+                f"| {r['hora']} "
+                f"| {r['tipo']} "
+                f"| {r['origen']} "
+                f"| {r['estado']} "
+                f"| {r['duracion_ms'] if r['duracion_ms'] is not None else '-'}ms "
+                f"| {metadata_str} |"
+            )
+
+        audit_file = self.audit_dir / f"{fecha_str}.md"
+        tmp = audit_file.with_suffix(".md.tmp")
+        tmp.write_text("\n".join(lineas) + "\n", encoding='utf-8')
+        tmp.replace(audit_file)
+
+    # ==================== CONTROL ====================
+
+    def flush(self, render: bool = True):
+        """Bloquea hasta escribir todo lo encolado y (opcionalmente) renderiza el markdown"""
+        if not self._cerrado:
+            self._cola.join()
+        if render:
+            self._render_pendientes()
+
+    def close(self):
+        """Vacía la cola, renderiza y detiene el hilo (idempotente)"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._cola.put(None)
+        self._hilo.join(timeout=10)
+
+        # Eventos encolados en carrera con el cierre
+        restantes = []
+        while True:
+            try:
+                item = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                restantes.append(item)
+        if restantes:
+            self._escribir_lote(restantes)
+
+        self._render_pendientes()
+
+
+_writers: Dict[Path, _AuditWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _writer_para(audit_dir: Path) -> _AuditWriter:
+    clave = audit_dir.resolve()
+    with _writers_lock:
+        writer = _writers.get(clave)
+        if writer is None:
+            writer = _AuditWriter(audit_dir)
+            _writers[clave] = writer
+        return writer
+
+
 class AuditTrail:
     """
     Sistema completo de audit trail para tracking de eventos
@@ -21,12 +298,13 @@ class AuditTrail:
       - Estado (success, error)
       - Metadata completa
     """
-    
+
     def __init__(self, vault_path: str):
         self.vault_path = Path(vault_path)
         self.audit_dir = self.vault_path / "00_System" / "Audit_Trail"
         self.audit_dir.mkdir(parents=True, exist_ok=True)
-    
+        self._writer = _writer_para(self.audit_dir)
+
     def log_event(
         self,
         event_type: str,
@@ -37,91 +315,48 @@ class AuditTrail:
     ):
         """
         Registra evento en audit trail
-        Crea archivo diario con todos los eventos
+        No bloquea: el evento se escribe en lote por el hilo escritor.
+        La metadata se serializa aquí (TypeError si no es serializable a JSON),
+        así que cambios posteriores del llamador no afectan al registro.
         """
         timestamp = datetime.now()
         fecha_str = timestamp.strftime("%Y-%m-%d")
-        
-        # Archivo audit diario
-        audit_file = self.audit_dir / f"{fecha_str}.md"
-        
-        # Crear frontmatter si es nuevo archivo
-        if not audit_file.exists():
-            content = f"""---
-tipo: audit-trail
-fecha: {fecha_str}
-eventos_registrados: 0
----
-
-# Audit Trail - {fecha_str}
-
-| Timestamp | Tipo | Origen | Estado | Duración | Metadata |
-|-----------|------|--------|--------|----------|----------|
-"""
-            audit_file.write_text(content, encoding='utf-8')
-        
-        # Añadir línea de evento
-        metadata_str = json.dumps(metadata, ensure_ascii=False)
-        evento_linea = (
-            f"| {timestamp.strftime('%H:%M:%S.%f')[:-3]} "
-            f"| {event_type} "
-            f"| {origen} "
-            f"| {estado} "
-            f"| {duracion_ms or '-'}ms "
-            f"| {metadata_str} |\n"
-        )
-        
-        with open(audit_file, 'a', encoding='utf-8') as f:
-            f.write(evento_linea)
-        
-        # Actualizar contador en frontmatter
-        self._update_event_count(audit_file)
-    
-    def _update_event_count(self, audit_file: Path):
-        """Actualiza contador de eventos en frontmatter"""
-        content = audit_file.read_text(encoding='utf-8')
-        lines = content.split('\n')
-        
-        # Contar líneas de tabla (excluir header y separador)
-        table_lines = [l for l in lines if l.startswith('|') and 'Timestamp' not in l and '---' not in l]
-        count = len(table_lines)
-        
-        # Actualizar frontmatter
-        for i, line in enumerate(lines):
-            if 'eventos_registrados:' in line:
-                lines[i] = f"eventos_registrados: {count}"
-                break
-        
-        audit_file.write_text('\n'.join(lines), encoding='utf-8')
-    
+
+        linea = json.dumps({
+            "fecha": fecha_str,
+            "timestamp": timestamp.isoformat(),
+            "hora": timestamp.strftime('%H:%M:%S.%f')[:-3],
+            "tipo": event_type,
+            "origen": origen,
+            "estado": estado,
+            "duracion_ms": duracion_ms,
+            "metadata": metadata,
+        }, ensure_ascii=False) + "\n"
+        self._writer.put(fecha_str, linea)
+
+    def flush(self):
+        """Fuerza la escritura de eventos pendientes y el render del markdown"""
+        self._writer.flush()
+
     def get_eventos_dia(self, fecha: date) -> List[Dict]:
         """Obtiene todos los eventos de un día específico"""
         fecha_str = fecha.strftime("%Y-%m-%d")
-        audit_file = self.audit_dir / f"{fecha_str}.md"
-        
-        if not audit_file.exists():
-            return []
-        
-        content = audit_file.read_text(encoding='utf-8')
-        lines = content.split('\n')
-        
-        eventos = []
-        for line in lines:
-            if line.startswith('|') and 'Timestamp' not in line and '---' not in line:
-                parts = [p.strip() for p in line.split('|')]
-                if len(parts) >= 7:  # Incluye pipes iniciales y finales
-                    try:
-                        evento = {
-                            'timestamp': parts[1],
-                            'tipo': parts[2],
-                            'origen': parts[3],
-                            'estado': parts[4],
-                            'duracion_ms': parts[5],
-                            'metadata': json.loads(parts[6]) if parts[6] != '-' else {}
-                        }
-                        eventos.append(evento)
-                    except:
-                        continue
-        
-        return eventos
 
+        self._writer.flush(render=False)
+        registros = self._writer.leer_dia(fecha_str)
+
+        if not registros:
+            # Días sin eventos desde el sidecar: solo existe el markdown
+            registros = _filas_markdown(self.audit_dir / f"{fecha_str}.md", fecha_str)
+
+        return [
+            {
+                'timestamp': r['hora'],
+                'tipo': r['tipo'],
+                'origen': r['origen'],
+                'estado': r['estado'],
+                'duracion_ms': f"{r['duracion_ms'] if r['duracion_ms'] is not None else '-'}ms",
+                'metadata': r['metadata'] or {}
+            }
+            for r in registros
+        ]
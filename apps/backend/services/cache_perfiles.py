@@ -0,0 +1,173 @@
+"""
+Cache de perfiles de usuario para las capas 4 y 6
+
+Las capas energética y mental reabrían `configuracion_usuario.json` y
+revalidaban Diseño Humano y Perfil Cognitivo con Pydantic en cada
+petición. Aquí, por (usuario, archivo de configuración):
+
+- Se valida una vez por versión del archivo: cada acceso compara
+  (mtime_ns, tamaño) con un solo stat y recarga si cambió
+- api/configuracion.py invalida explícitamente al escribir (cubre
+  escrituras dentro del mismo tick de mtime)
+- Las instancias se comparten entre peticiones y son inmutables: copias
+  `frozen` de los modelos (también los anidados), así que nadie puede
+  modificar el perfil de otra petición
+- Los perfiles por defecto (cuando la configuración no los define) también
+  se cachean, congelados, en la misma entrada
+"""
+
+import itertools
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+from models.diseno_humano import DisenoHumano, cargar_diseno_desde_config
+from models.tipologia_cognitiva import PerfilCognitivo, cargar_perfil_cognitivo_desde_config
+
+
+RUTA_CONFIGURACION = Path(__file__).parent.parent / "storage" / "configuracion_usuario.json"
+
+_SIN_CARGAR = object()
+
+_versiones = itertools.count(1)
+
+
+# ==================== MODELOS INMUTABLES ====================
+
+_clases_congeladas: Dict[type, type] = {}
+_clases_lock = threading.Lock()
+
+
+def _clase_congelada(cls: type) -> type:
+    """Subclase `frozen` del modelo (isinstance con la original se mantiene)"""
+    congelada = _clases_congeladas.get(cls)
+    if congelada is None:
+        with _clases_lock:
+            congelada = _clases_congeladas.get(cls)
+            if congelada is None:
+                congelada = type(cls.__name__, (cls,), {
+                    "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__,
+                    "model_config": ConfigDict(**{**cls.model_config, "frozen": True}),
+                })
+                _clases_congeladas[cls] = congelada
+    return congelada
+
+
+def congelar(valor: Any) -> Any:
+    """Copia inmutable de un modelo Pydantic (recursiva, sin revalidar)"""
+    if isinstance(valor, BaseModel):
+        campos = {nombre: congelar(getattr(valor, nombre)) for nombre in type(valor).model_fields}
+        return _clase_congelada(type(valor)).model_construct(_fields_set=valor.model_fields_set, **campos)
+    if isinstance(valor, list):
+        return [congelar(v) for v in valor]
+    if isinstance(valor, dict):
+        return {k: congelar(v) for k, v in valor.items()}
+    return valor
+
+
+# ==================== CACHE ====================
+
+def _firma(ruta: Path) -> Optional[Tuple[int, int]]:
+    try:
+        info = ruta.stat()
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+@dataclass
+class _Entrada:
+    firma: Optional[Tuple[int, int]]
+    modelos: Dict[str, Any] = field(default_factory=dict)
+    version: int = field(default_factory=lambda: next(_versiones))
+
+
+class CachePerfiles:
+    """Perfiles validados y congelados por (usuario, archivo de configuración)"""
+
+    def __init__(self):
+        self._entradas: Dict[Tuple[str, Path], _Entrada] = {}
+        self._lock = threading.Lock()
+        self.stats = {"aciertos": 0, "cargas": 0, "invalidaciones": 0}
+
+    def _entrada(self, usuario_id: str, ruta: Optional[Path]) -> Tuple[_Entrada, Path]:
+        ruta = Path(ruta or RUTA_CONFIGURACION).resolve()
+        clave = (usuario_id, ruta)
+        firma = _firma(ruta)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada.firma != firma:
+                entrada = self._entradas[clave] = _Entrada(firma)
+        return entrada, ruta
+
+    def _modelo(
+        self,
+        nombre: str,
+        cargar: Callable[[str], Optional[BaseModel]],
+        usuario_id: str,
+        ruta: Optional[Path],
+        por_defecto: Optional[Callable[[], BaseModel]]
+    ) -> Optional[BaseModel]:
+        entrada, ruta = self._entrada(usuario_id, ruta)
+        modelo = entrada.modelos.get(nombre, _SIN_CARGAR)
+        if modelo is not _SIN_CARGAR:
+            self.stats["aciertos"] += 1
+            return modelo
+
+        modelo = cargar(str(ruta))
+        if modelo is None and por_defecto is not None:
+            modelo = por_defecto()
+        modelo = congelar(modelo) if modelo is not None else None
+        self.stats["cargas"] += 1
+        # Si otro hilo lo cargó a la vez, todos devuelven la misma instancia
+        return entrada.modelos.setdefault(nombre, modelo)
+
+    def diseno_humano(
+        self,
+        usuario_id: str = "default",
+        ruta: Optional[Path] = None,
+        por_defecto: Optional[Callable[[], DisenoHumano]] = None
+    ) -> Optional[DisenoHumano]:
+        """Diseño Humano del usuario (o `por_defecto()` si la configuración no lo define)"""
+        return self._modelo("diseno_humano", cargar_diseno_desde_config, usuario_id, ruta, por_defecto)
+
+    def perfil_cognitivo(
+        self,
+        usuario_id: str = "default",
+        ruta: Optional[Path] = None,
+        por_defecto: Optional[Callable[[], PerfilCognitivo]] = None
+    ) -> Optional[PerfilCognitivo]:
+        """Perfil MBTI + Eneagrama del usuario (o `por_defecto()`)"""
+        return self._modelo("perfil_cognitivo", cargar_perfil_cognitivo_desde_config, usuario_id, ruta, por_defecto)
+
+    def version(self, usuario_id: str = "default", ruta: Optional[Path] = None) -> int:
+        """Versión vigente de los perfiles (cambia al editar el archivo o invalidar)"""
+        entrada, _ = self._entrada(usuario_id, ruta)
+        return entrada.version
+
+    def invalidar(self, usuario_id: Optional[str] = None):
+        """Descarta los perfiles de un usuario (o todos)"""
+        with self._lock:
+            for clave in [c for c in self._entradas if usuario_id is None or c[0] == usuario_id]:
+                del self._entradas[clave]
+        self.stats["invalidaciones"] += 1
+
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "entradas": len(self._entradas)}
+
+
+# Instancia global (se crea en el primer uso)
+_cache: Optional[CachePerfiles] = None
+
+
+def get_cache_perfiles() -> CachePerfiles:
+    """Obtiene la instancia global de la cache de perfiles"""
+    global _cache
+    if _cache is None:
+        _cache = CachePerfiles()
+    return _cache
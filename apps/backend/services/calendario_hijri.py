@@ -27,7 +27,8 @@ from datetime import date, datetime, timedelta
 from typing import Optional
 from pydantic import BaseModel
 from enum import Enum
-import hijri_converter
+
+from services.tabla_hijri import get_tabla_hijri
 
 
 class CualidadEspiritual(str, Enum):
@@ -426,17 +427,18 @@ class CalendarioHijri:
         """
         Obtiene el mes Hijri actual usando cálculo lunar preciso.
         
-        Usa hijri-converter para conversión gregoriana → hijri real.
+        Usa la tabla Umm al-Qura precalculada (services/tabla_hijri.py).
         """
         fecha = fecha or date.today()
         
         # Convertir fecha gregoriana a Hijri
-        hijri = hijri_converter.Gregorian(fecha.year, fecha.month, fecha.day).to_hijri()
-        
+        hijri = get_tabla_hijri().a_hijri(fecha)
+        return self._mes_de(hijri)
+
+    def _mes_de(self, hijri) -> MesHijri:
+        """Mes Hijri de una fecha ya convertida"""
         # hijri.month va de 1 a 12
-        mes_numero = hijri.month
-        
-        return self.meses_hijri[mes_numero - 1]  # Lista indexada desde 0
+        return self.meses_hijri[hijri.month - 1]  # Lista indexada desde 0
 
     def obtener_dia_semana(self, fecha: Optional[date] = None) -> DiaSemana:
         """
@@ -466,11 +468,11 @@ class CalendarioHijri:
         """
         fecha = fecha or date.today()
         
-        mes = self.obtener_mes_actual(fecha)
-        dia = self.obtener_dia_semana(fecha)
+        # Obtener fecha Hijri completa (una sola conversión)
+        hijri = get_tabla_hijri().a_hijri(fecha)
         
-        # Obtener fecha Hijri completa
-        hijri = hijri_converter.Gregorian(fecha.year, fecha.month, fecha.day).to_hijri()
+        mes = self._mes_de(hijri)
+        dia = self.obtener_dia_semana(fecha)
         
         return {
             "fecha_gregoriana": fecha.isoformat(),
@@ -569,10 +571,15 @@ class CalendarioHijri:
         Para la interfaz de Vista Mensual.
         """
         fecha = fecha or date.today()
-        mes_hijri = self.obtener_mes_actual(fecha)
+        tabla = get_tabla_hijri()
         
         # Obtener fecha Hijri completa
-        hijri = hijri_converter.Gregorian(fecha.year, fecha.month, fecha.day).to_hijri()
+        hijri = tabla.a_hijri(fecha)
+        mes_hijri = self._mes_de(hijri)
+        
+        # Días del mes lunar en curso
+        inicio = fecha - timedelta(days=hijri.day - 1)
+        fin = inicio + timedelta(days=tabla.dias_mes(hijri.year, hijri.month) - 1)
         
         return {
             "año_hijri": hijri.year,
@@ -587,7 +594,13 @@ class CalendarioHijri:
             "dimension": mes_hijri.dimension_prioritaria,
             "simbolo": mes_hijri.simbolo,
             "color": mes_hijri.color,
-            "ayat": mes_hijri.ayat_clave
+            "ayat": mes_hijri.ayat_clave,
+            "inicio_gregoriano": inicio.isoformat(),
+            "fin_gregoriano": fin.isoformat(),
+            "dias": [
+                {"fecha": (inicio + timedelta(days=i)).isoformat(), "dia_hijri": h.day}
+                for i, h in enumerate(tabla.rango_hijri(inicio, fin))
+            ]
         }
 
     def obtener_vista_anual(self, fecha: Optional[date] = None) -> dict:
@@ -597,7 +610,8 @@ class CalendarioHijri:
         Para la interfaz de Vista Anual.
         """
         fecha = fecha or date.today()
-        hijri = hijri_converter.Gregorian(fecha.year, fecha.month, fecha.day).to_hijri()
+        tabla = get_tabla_hijri()
+        hijri = tabla.a_hijri(fecha)
         
         return {
             "año_hijri": hijri.year,
@@ -612,7 +626,9 @@ class CalendarioHijri:
                     "dimension": m.dimension_prioritaria,
                     "simbolo": m.simbolo,
                     "color": m.color,
-                    "ensenanza_breve": m.ensenanza_mistica[:100] + "..."
+                    "ensenanza_breve": m.ensenanza_mistica[:100] + "...",
+                    "inicio_gregoriano": tabla.a_gregoriano(hijri.year, m.numero, 1).isoformat(),
+                    "dias": tabla.dias_mes(hijri.year, m.numero)
                 }
                 for m in self.meses_hijri
             ],
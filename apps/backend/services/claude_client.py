@@ -2,8 +2,19 @@ from __future__ import annotations
 
 import os
 import json
-from typing import List, Dict, Any
-import anthropic
+from typing import Callable, List, Dict, Any, Optional
+
+from services.claude_engine import get_claude_engine
+from services.llm_cache import cached_create_sync, get_llm_cache
+from services.metricas import trazar
+
+
+def _es_json(texto: str) -> bool:
+    try:
+        json.loads(texto)
+    except (TypeError, ValueError):
+        return False
+    return True
 
 
 class ClaudeClient:
@@ -17,7 +28,8 @@ class ClaudeClient:
         
         if self.api_key:
             try:
-                self.client = anthropic.Anthropic(api_key=self.api_key)
+                # Motor async compartido: pool HTTP, límites de concurrencia y reintentos
+                self.client = get_claude_engine()
                 print("✅ Claude client inicializado con API key real")
             except Exception as e:
                 print(f"❌ Error inicializando Claude: {e}")
@@ -25,15 +37,30 @@ class ClaudeClient:
         else:
             print("⚠️ No hay API key de Anthropic, usando modo mock")
 
-    async def generate(self, system: str, messages: List[Dict[str, str]], model: str = "claude-3-5-sonnet-20241022", max_tokens: int = 1000) -> str:
+        self.cache = get_llm_cache()
+
+    @trazar("claude_client.generate")
+    async def generate(
+        self,
+        system: str,
+        messages: List[Dict[str, str]],
+        model: str = "claude-3-5-sonnet-20241022",
+        max_tokens: int = 1000,
+        temperature: Optional[float] = None,
+        cache_site: str = "default",
+        cacheable: Optional[Callable[[str], bool]] = None
+    ) -> str:
         """
-        Genera texto con Claude.
+        Genera texto con Claude sin bloquear el event loop.
         
         Args:
             system: System prompt
             messages: Lista de mensajes
             model: Modelo a usar (default: Sonnet, usa Haiku para ahorrar)
             max_tokens: Máximo de tokens de salida
+            temperature: Temperatura de muestreo (None = default de la API)
+            cache_site: Sitio de llamada, determina el TTL del cache (ver services/llm_cache.py)
+            cacheable: Si se indica, solo se guardan (y reutilizan) respuestas que lo cumplan
         """
         if self.client:
             try:
@@ -45,14 +72,32 @@ class ClaudeClient:
                         "content": msg["content"]
                     })
                 
-                response = self.client.messages.create(
+                params = {"max_tokens": max_tokens}
+                if temperature is not None:
+                    params["temperature"] = temperature
+                
+                # Cache direccionado por contenido
+                ttl = self.cache.ttl_para(cache_site, temperature)
+                clave = None
+                if ttl > 0:
+                    clave = self.cache.clave(model, system, claude_messages, **params)
+                    cacheada = await self.cache.obtener_async(clave)
+                    if cacheada is not None and (cacheable is None or cacheable(cacheada)):
+                        return cacheada
+                else:
+                    self.cache.registrar_omision()
+                
+                response = await self.client.create_message(
                     model=model,
-                    max_tokens=max_tokens,
                     system=system,
-                    messages=claude_messages
+                    messages=claude_messages,
+                    **params
                 )
                 
-                return response.content[0].text
+                texto = response.content[0].text
+                if clave and (cacheable is None or cacheable(texto)):
+                    await self.cache.guardar_async(clave, texto, ttl)
+                return texto
             except Exception as e:
                 print(f"❌ Error en Claude API: {e}")
                 # Fallback a mock
@@ -63,19 +108,20 @@ class ClaudeClient:
             ultimo = messages[-1]["content"] if messages else ""
             return f"[mock-claude] {ultimo[:140]}"
     
-    async def generate_haiku(self, system: str, messages: List[Dict[str, str]], max_tokens: int = 500) -> str:
+    async def generate_haiku(self, system: str, messages: List[Dict[str, str]], max_tokens: int = 500, cache_site: str = "default") -> str:
         """
         Genera con Haiku (12x más barato que Sonnet).
         Úsalo para tareas simples como generar preguntas.
         """
-        return await self.generate(system, messages, model="claude-3-5-haiku-20241022", max_tokens=max_tokens)
+        return await self.generate(system, messages, model="claude-3-5-haiku-20241022", max_tokens=max_tokens, cache_site=cache_site)
 
-    async def generate_json(self, system: str, messages: List[Dict[str, str]], use_haiku: bool = False):
+    async def generate_json(self, system: str, messages: List[Dict[str, str]], use_haiku: bool = False, cache_site: str = "generate_json"):
         """
         Genera JSON con Claude.
         
         Args:
             use_haiku: Si True, usa Haiku (12x más barato). Úsalo para tareas simples.
+            cache_site: Sitio de llamada para el TTL del cache
         """
         if self.client:
             try:
@@ -85,7 +131,11 @@ class ClaudeClient:
                 # Elegir modelo
                 model = "claude-3-5-haiku-20241022" if use_haiku else "claude-3-5-sonnet-20241022"
                 
-                response = await self.generate(system_with_json, messages, model=model, max_tokens=800)
+                # Solo se cachean respuestas que son JSON válido (nunca texto suelto ni el mock)
+                response = await self.generate(
+                    system_with_json, messages, model=model, max_tokens=800,
+                    cache_site=cache_site, cacheable=_es_json
+                )
                 
                 # Intentar parsear JSON
                 try:
@@ -101,9 +151,9 @@ class ClaudeClient:
         else:
             return self._get_mock_response(messages)
     
-    async def generate_json_haiku(self, system: str, messages: List[Dict[str, str]]):
+    async def generate_json_haiku(self, system: str, messages: List[Dict[str, str]], cache_site: str = "generate_json"):
         """Genera JSON con Haiku (tareas simples, 12x más barato)"""
-        return await self.generate_json(system, messages, use_haiku=True)
+        return await self.generate_json(system, messages, use_haiku=True, cache_site=cache_site)
     
     def _generar_recomendacion_simple(self, contexto: str) -> str:
         """
@@ -112,7 +162,9 @@ class ClaudeClient:
         """
         if self.client:
             try:
-                response = self.client.messages.create(
+                texto = cached_create_sync(
+                    self.client.create_message_sync,
+                    "recomendacion",
                     model="claude-3-5-sonnet-20241022",
                     max_tokens=150,
                     messages=[{
@@ -120,7 +172,7 @@ class ClaudeClient:
                         "content": contexto
                     }]
                 )
-                return response.content[0].text.strip()
+                return texto.strip()
             except Exception as e:
                 print(f"❌ Error generando recomendación: {e}")
                 return "Enfócate en las prioridades del día manteniendo energía balanceada"
@@ -0,0 +1,280 @@
+"""
+Motor asíncrono para llamadas a Claude
+
+Reemplaza las llamadas síncronas a `anthropic.Anthropic().messages.create`
+que bloqueaban el event loop de uvicorn durante cada llamada al LLM.
+
+Características:
+- Cliente `anthropic.AsyncAnthropic` sobre un pool HTTP compartido (httpx)
+- Límite de concurrencia global y por modelo (semáforos)
+- Timeout por llamada
+- Reintentos con backoff exponencial y jitter completo
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import anthropic
+import httpx
+
+from services.metricas import observar
+
+
+# Concurrencia máxima por modelo (el resto usa CONCURRENCIA_MODELO_DEFAULT)
+LIMITES_POR_MODELO: Dict[str, int] = {
+    "claude-3-5-sonnet-20241022": 4,
+    "claude-3-5-haiku-20241022": 8,
+}
+CONCURRENCIA_MODELO_DEFAULT = 4
+
+# Errores transitorios que merecen reintento
+ERRORES_REINTENTABLES = (
+    anthropic.APIConnectionError,  # Incluye APITimeoutError
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+class ClaudeEngine:
+    """
+    Motor asíncrono compartido para la API de Claude.
+
+    Los recursos ligados al event loop (cliente HTTP, semáforos) se crean
+    de forma perezosa en el primer uso y se recrean si cambia el loop
+    (p. ej. scripts que llaman a `asyncio.run` varias veces); al cambiar
+    se cierra el pool HTTP del loop anterior.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrencia: int = 8,
+        limites_por_modelo: Optional[Dict[str, int]] = None,
+        timeout: float = 60.0,
+        max_reintentos: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        max_conexiones: int = 20,
+    ):
+        self.api_key = api_key
+        self.max_concurrencia = max_concurrencia
+        self.limites_por_modelo = dict(LIMITES_POR_MODELO if limites_por_modelo is None else limites_por_modelo)
+        self.timeout = timeout
+        self.max_reintentos = max_reintentos
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_conexiones = max_conexiones
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._client: Optional[anthropic.AsyncAnthropic] = None
+        self._semaforo_global: Optional[asyncio.Semaphore] = None
+        self._semaforos_modelo: Dict[str, asyncio.Semaphore] = {}
+
+        self._client_sync: Optional[anthropic.Anthropic] = None
+        self._lock_sync = threading.Lock()
+
+        self.stats = {
+            "llamadas": 0,
+            "en_vuelo": 0,
+            "reintentos": 0,
+            "timeouts": 0,
+            "errores": 0,
+        }
+
+    # ==================== RECURSOS ====================
+
+    async def _asegurar_recursos(self) -> None:
+        """Crea cliente HTTP, cliente async y semáforos para el loop actual"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._client is not None:
+            return
+
+        await self._cerrar_http_anterior()
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_conexiones,
+                max_keepalive_connections=self.max_conexiones,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=10.0),
+        )
+        self._client = anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=self._http,
+            max_retries=0,  # Los reintentos los gestiona el motor
+            timeout=self.timeout,
+        )
+        self._semaforo_global = asyncio.Semaphore(self.max_concurrencia)
+        self._semaforos_modelo = {}
+        self._loop = loop
+
+    async def _cerrar_http_anterior(self) -> None:
+        """Cierra el pool HTTP creado en otro loop antes de sustituirlo"""
+        http, loop_anterior = self._http, self._loop
+        self._http = None
+        self._client = None
+        if http is None or http.is_closed:
+            return
+
+        if loop_anterior is not None and loop_anterior.is_running() and not loop_anterior.is_closed():
+            # El loop original sigue vivo (otro hilo): sus conexiones se cierran allí
+            asyncio.run_coroutine_threadsafe(http.aclose(), loop_anterior)
+            return
+
+        try:
+            await http.aclose()
+        except Exception:
+            # Conexiones de un loop ya cerrado: el pool queda cerrado igualmente
+            pass
+
+    def _semaforo_para(self, model: str) -> asyncio.Semaphore:
+        semaforo = self._semaforos_modelo.get(model)
+        if semaforo is None:
+            limite = self.limites_por_modelo.get(model, CONCURRENCIA_MODELO_DEFAULT)
+            semaforo = asyncio.Semaphore(limite)
+            self._semaforos_modelo[model] = semaforo
+        return semaforo
+
+    def _backoff(self, intento: int, error: Exception) -> float:
+        """Backoff exponencial con jitter completo, respetando Retry-After"""
+        espera = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** intento)))
+
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                espera = max(espera, min(float(retry_after), self.backoff_max))
+            except (TypeError, ValueError):
+                pass
+
+        return espera
+
+    # ==================== LLAMADAS ====================
+
+    async def create_message(self, **kwargs: Any) -> Any:
+        """
+        Equivalente asíncrono de `messages.create` con límites y reintentos.
+
+        Args:
+            **kwargs: Parámetros de `messages.create` (model, max_tokens, system, messages, ...)
+
+        Returns:
+            Respuesta de la API (anthropic.types.Message)
+        """
+        await self._asegurar_recursos()
+        model = kwargs.get("model", "")
+        semaforo_modelo = self._semaforo_para(model)
+
+        intento = 0
+        while True:
+            try:
+                # Primero el del modelo: quien espera a un modelo saturado
+                # no debe ocupar un hueco global que otros modelos podrían usar
+                async with semaforo_modelo, self._semaforo_global:
+                    self.stats["en_vuelo"] += 1
+                    inicio = time.perf_counter()
+                    resultado = "error"
+                    try:
+                        respuesta = await asyncio.wait_for(
+                            self._client.messages.create(**kwargs),
+                            timeout=self.timeout,
+                        )
+                        resultado = "ok"
+                        return respuesta
+                    except asyncio.TimeoutError:
+                        resultado = "timeout"
+                        raise
+                    finally:
+                        self.stats["en_vuelo"] -= 1
+                        self.stats["llamadas"] += 1
+                        observar("claude_request_duration_seconds", (model, resultado), time.perf_counter() - inicio)
+            except ERRORES_REINTENTABLES as e:
+                if isinstance(e, (asyncio.TimeoutError, anthropic.APITimeoutError)):
+                    self.stats["timeouts"] += 1
+                if intento >= self.max_reintentos:
+                    self.stats["errores"] += 1
+                    raise
+                # Dormir fuera de los semáforos para no bloquear otras llamadas
+                await asyncio.sleep(self._backoff(intento, e))
+                intento += 1
+                self.stats["reintentos"] += 1
+            except Exception:
+                self.stats["errores"] += 1
+                raise
+
+    def create_message_sync(self, **kwargs: Any) -> Any:
+        """
+        Variante síncrona para código que no corre en el event loop
+        (scripts, workers). No usar desde handlers async.
+        """
+        with self._lock_sync:
+            if self._client_sync is None:
+                self._client_sync = anthropic.Anthropic(
+                    api_key=self.api_key,
+                    max_retries=self.max_reintentos,
+                    timeout=self.timeout,
+                )
+        inicio = time.perf_counter()
+        resultado = "error"
+        try:
+            respuesta = self._client_sync.messages.create(**kwargs)
+            resultado = "ok"
+            return respuesta
+        finally:
+            observar(
+                "claude_request_duration_seconds",
+                (kwargs.get("model", ""), resultado),
+                time.perf_counter() - inicio
+            )
+
+    async def aclose(self) -> None:
+        """Cierra el pool HTTP del loop actual"""
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._client = None
+        self._loop = None
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Contadores del motor y límites configurados"""
+        return {
+            **self.stats,
+            "max_concurrencia": self.max_concurrencia,
+            "limites_por_modelo": dict(self.limites_por_modelo),
+        }
+
+
+# Instancia global (compartida por todos los ClaudeClient del proceso)
+_claude_engine: Optional[ClaudeEngine] = None
+
+
+def get_claude_engine() -> Optional[ClaudeEngine]:
+    """
+    Obtiene el motor global de Claude.
+
+    Returns:
+        ClaudeEngine o None si no hay ANTHROPIC_API_KEY
+    """
+    global _claude_engine
+
+    if _claude_engine is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            return None
+
+        _claude_engine = ClaudeEngine(
+            api_key=api_key,
+            max_concurrencia=int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "8")),
+            timeout=float(os.getenv("ANTHROPIC_TIMEOUT", "60")),
+            max_reintentos=int(os.getenv("ANTHROPIC_MAX_RETRIES", "3")),
+            max_conexiones=int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "20")),
+        )
+
+    return _claude_engine
@@ -0,0 +1,481 @@
+"""
+Constelaciones del vault: componentes conexas y comunidades de notas
+
+Sustituye el clustering de UniversoProcessor (DFS recursivo, que revienta
+el límite de recursión con cadenas largas de enlaces, y reconstrucción de
+cada cluster con búsquedas en listas, O(N·C)):
+
+- Componentes conexas con union-find iterativo (compresión por mitades +
+  unión por tamaño): O(E·α(N)), sin recursión
+- Comunidades ponderadas con propagación de etiquetas (enlace mutuo pesa
+  2, en un sentido 1): separa grupos densos dentro de una misma componente
+- Las notas se numeran 0..N-1 y los enlaces son arrays de índices; tamaño,
+  enlaces internos, densidad, centro de masa y dimensión dominante de cada
+  grupo salen de `bincount` sobre las etiquetas (con NumPy) en una pasada
+
+NumPy es opcional: sin él los agregados se calculan con bucles en Python.
+
+Benchmark (vault sintético):
+    python -m services.constelaciones --notas 50000
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_DISPONIBLE = True
+except ImportError:
+    np = None
+    NUMPY_DISPONIBLE = False
+
+from models.universo import Constelacion, Estrella, Vector3D
+from services.obsidian_parser import GrafoEnlaces
+
+
+COLOR_POR_DEFECTO = "#6B7280"
+
+MAX_ITERACIONES_PROPAGACION = 20
+
+
+# ==================== UNION-FIND ====================
+
+class UnionFind:
+    """Conjuntos disjuntos sobre 0..n-1 (sin recursión)"""
+
+    __slots__ = ("padre", "tamano")
+
+    def __init__(self, n: int):
+        self.padre = list(range(n))
+        self.tamano = [1] * n
+
+    def encontrar(self, x: int) -> int:
+        padre = self.padre
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]  # Compresión por mitades
+            x = padre[x]
+        return x
+
+    def unir(self, a: int, b: int) -> bool:
+        """Une los conjuntos de `a` y `b` (False si ya estaban unidos)"""
+        raiz_a, raiz_b = self.encontrar(a), self.encontrar(b)
+        if raiz_a == raiz_b:
+            return False
+        if self.tamano[raiz_a] < self.tamano[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.padre[raiz_b] = raiz_a
+        self.tamano[raiz_a] += self.tamano[raiz_b]
+        return True
+
+
+def _normalizar(etiquetas: Sequence[int]) -> List[int]:
+    """Renumera las etiquetas 0..k-1 por orden de primera aparición"""
+    nuevas: Dict[int, int] = {}
+    return [nuevas.setdefault(etiqueta, len(nuevas)) for etiqueta in etiquetas]
+
+
+def componentes_conexas(n: int, origenes: Sequence[int], destinos: Sequence[int]) -> List[int]:
+    """Etiqueta de componente (enlaces sin dirección) de cada nota 0..n-1"""
+    conjuntos = UnionFind(n)
+    for a, b in zip(origenes, destinos):
+        conjuntos.unir(a, b)
+    return _normalizar([conjuntos.encontrar(i) for i in range(n)])
+
+
+# ==================== PROPAGACIÓN DE ETIQUETAS ====================
+
+def propagar_etiquetas(
+    n: int,
+    origenes: Sequence[int],
+    destinos: Sequence[int],
+    max_iteraciones: int = MAX_ITERACIONES_PROPAGACION,
+    semilla: int = 0
+) -> List[int]:
+    """
+    Comunidades por propagación de etiquetas ponderada.
+
+    Cada nota adopta la etiqueta con más peso entre sus vecinas (cada
+    enlace dirigido suma 1 al par, así que un enlace mutuo pesa 2). Los
+    empates conservan la etiqueta actual o eligen la menor. El orden (o,
+    con NumPy, el subconjunto de notas que se actualiza en cada ronda) sale
+    de `semilla`: el resultado es reproducible.
+
+    Returns:
+        Etiqueta de comunidad de cada nota 0..n-1 (por orden de aparición)
+    """
+    if NUMPY_DISPONIBLE:
+        return _normalizar(_propagar_numpy(n, origenes, destinos, max_iteraciones, semilla))
+    return _normalizar(_propagar_python(n, origenes, destinos, max_iteraciones, semilla))
+
+
+def _propagar_numpy(n, origenes, destinos, max_iteraciones, semilla) -> List[int]:
+    """
+    Rondas semi-síncronas: todas las notas votan a la vez sobre arrays
+    (pesos por (nota, etiqueta vecina) con `unique` + `bincount`) y se
+    aplica el voto en una mitad aleatoria, lo que evita que dos grupos
+    intercambien etiquetas indefinidamente.
+    """
+    origenes = np.asarray(origenes, dtype=np.int64)
+    destinos = np.asarray(destinos, dtype=np.int64)
+    distintos = origenes != destinos
+    nota = np.concatenate([origenes[distintos], destinos[distintos]])
+    vecina = np.concatenate([destinos[distintos], origenes[distintos]])
+
+    etiquetas = np.arange(n, dtype=np.int64)
+    azar = np.random.default_rng(semilla)
+
+    for _ in range(max_iteraciones):
+        pares, inverso = np.unique(nota * n + etiquetas[vecina], return_inverse=True)
+        peso = np.bincount(inverso.ravel())
+        votante, etiqueta = pares // n, pares % n
+        # Medio voto extra a la etiqueta actual: gana los empates sin vencer a una mayoría
+        peso = peso + 0.5 * (etiqueta == etiquetas[votante])
+
+        orden = np.lexsort((etiqueta, -peso, votante))
+        primeros = orden[np.r_[True, votante[orden][1:] != votante[orden][:-1]]]
+        propuestas = etiquetas.copy()
+        propuestas[votante[primeros]] = etiqueta[primeros]
+
+        cambian = propuestas != etiquetas
+        if not cambian.any():
+            break
+        cambian &= (propuestas < etiquetas) | (azar.random(n) < 0.5)
+        etiquetas[cambian] = propuestas[cambian]
+
+    return etiquetas.tolist()
+
+
+def _propagar_python(n, origenes, destinos, max_iteraciones, semilla) -> List[int]:
+    """Rondas asíncronas en orden aleatorio (cada nota ve los cambios de la ronda)"""
+    vecinos: List[Dict[int, float]] = [{} for _ in range(n)]
+    for a, b in zip(origenes, destinos):
+        if a != b:
+            vecinos[a][b] = vecinos[a].get(b, 0.0) + 1.0
+            vecinos[b][a] = vecinos[b].get(a, 0.0) + 1.0
+
+    etiquetas = list(range(n))
+    orden = [i for i in range(n) if vecinos[i]]
+    azar = random.Random(semilla)
+
+    for _ in range(max_iteraciones):
+        azar.shuffle(orden)
+        cambios = 0
+        for i in orden:
+            votos: Dict[int, float] = defaultdict(float)
+            for j, peso in vecinos[i].items():
+                votos[etiquetas[j]] += peso
+            mejor = max(votos.values())
+            if votos.get(etiquetas[i]) == mejor:
+                continue
+            etiquetas[i] = min(etiqueta for etiqueta, peso in votos.items() if peso == mejor)
+            cambios += 1
+        if not cambios:
+            break
+
+    return etiquetas
+
+
+# ==================== AGREGADOS POR GRUPO ====================
+
+def resumir_grupos(
+    etiquetas: Sequence[int],
+    origenes: Sequence[int],
+    destinos: Sequence[int],
+    posiciones: Sequence[Tuple[float, float, float]],
+    dimensiones: Sequence[int]
+) -> Dict[str, list]:
+    """
+    Agregados de cada grupo 0..k-1.
+
+    Args:
+        etiquetas: Grupo de cada nota (0..k-1)
+        origenes, destinos: Enlaces dirigidos sin duplicados ni bucles
+        posiciones: (x, y, z) de cada nota
+        dimensiones: Índice de dimensión de cada nota
+
+    Returns:
+        Dict de listas por grupo: tamano, enlaces_internos, densidad,
+        centro (x, y, z) y dimension (índice dominante; empate → el menor)
+    """
+    if NUMPY_DISPONIBLE:
+        return _resumir_numpy(etiquetas, origenes, destinos, posiciones, dimensiones)
+    return _resumir_python(etiquetas, origenes, destinos, posiciones, dimensiones)
+
+
+def _resumir_numpy(etiquetas, origenes, destinos, posiciones, dimensiones) -> Dict[str, list]:
+    etiquetas = np.asarray(etiquetas, dtype=np.int64)
+    k = int(etiquetas.max()) + 1 if len(etiquetas) else 0
+    origenes = np.asarray(origenes, dtype=np.int64)
+    destinos = np.asarray(destinos, dtype=np.int64)
+    posiciones = np.asarray(posiciones, dtype=np.float64).reshape(-1, 3)
+    dimensiones = np.asarray(dimensiones, dtype=np.int64)
+    num_dimensiones = int(dimensiones.max()) + 1 if len(dimensiones) else 1
+
+    tamano = np.bincount(etiquetas, minlength=k)
+
+    grupo_origen = etiquetas[origenes]
+    internos = grupo_origen == etiquetas[destinos]
+    enlaces_internos = np.bincount(grupo_origen[internos], minlength=k)
+
+    posibles = tamano * (tamano - 1)
+    densidad = np.divide(
+        enlaces_internos, posibles,
+        out=np.zeros(k, dtype=np.float64), where=posibles > 0
+    )
+
+    centro = np.stack(
+        [np.bincount(etiquetas, weights=posiciones[:, eje], minlength=k) for eje in range(3)],
+        axis=1
+    ) / np.maximum(tamano, 1)[:, None]
+
+    conteo = np.bincount(
+        etiquetas * num_dimensiones + dimensiones, minlength=k * num_dimensiones
+    ).reshape(k, num_dimensiones)
+
+    return {
+        "tamano": tamano.tolist(),
+        "enlaces_internos": enlaces_internos.tolist(),
+        "densidad": densidad.tolist(),
+        "centro": [tuple(c) for c in centro.tolist()],
+        "dimension": conteo.argmax(axis=1).tolist(),
+    }
+
+
+def _resumir_python(etiquetas, origenes, destinos, posiciones, dimensiones) -> Dict[str, list]:
+    k = max(etiquetas) + 1 if etiquetas else 0
+    tamano = [0] * k
+    suma = [[0.0, 0.0, 0.0] for _ in range(k)]
+    conteo: List[Dict[int, int]] = [defaultdict(int) for _ in range(k)]
+    for etiqueta, (x, y, z), dimension in zip(etiquetas, posiciones, dimensiones):
+        tamano[etiqueta] += 1
+        suma[etiqueta][0] += x
+        suma[etiqueta][1] += y
+        suma[etiqueta][2] += z
+        conteo[etiqueta][dimension] += 1
+
+    enlaces_internos = [0] * k
+    for a, b in zip(origenes, destinos):
+        if etiquetas[a] == etiquetas[b]:
+            enlaces_internos[etiquetas[a]] += 1
+
+    densidad = [
+        enlaces / (t * (t - 1)) if t > 1 else 0.0
+        for enlaces, t in zip(enlaces_internos, tamano)
+    ]
+    return {
+        "tamano": tamano,
+        "enlaces_internos": enlaces_internos,
+        "densidad": densidad,
+        "centro": [tuple(s / max(t, 1) for s in suma[g]) for g, t in enumerate(tamano)],
+        "dimension": [min(c, key=lambda d: (-c[d], d)) if c else 0 for c in conteo],
+    }
+
+
+# ==================== CONSTELACIONES ====================
+
+def aristas_indexadas(
+    adyacencia: Mapping[str, Sequence[str]],
+    indice: Mapping[str, int]
+) -> Tuple[List[int], List[int]]:
+    """Enlaces dirigidos como índices (sin duplicados, bucles ni destinos desconocidos)"""
+    origenes: List[int] = []
+    destinos: List[int] = []
+    for filepath, enlaces in adyacencia.items():
+        a = indice.get(filepath)
+        if a is None:
+            continue
+        for b in {indice[destino] for destino in enlaces if destino in indice}:
+            if b != a:
+                origenes.append(a)
+                destinos.append(b)
+    return origenes, destinos
+
+
+def detectar_constelaciones(
+    estrellas: List[Estrella],
+    grafo: Union[GrafoEnlaces, Mapping[str, Sequence[str]]],
+    metodo: str = "componentes",
+    min_estrellas: int = 2
+) -> List[Constelacion]:
+    """
+    Agrupa las estrellas en constelaciones.
+
+    Args:
+        estrellas: Estrellas del universo (id = filepath de la nota)
+        grafo: GrafoEnlaces o adyacencia {filepath: [filepaths enlazados]}
+        metodo: "componentes" (conexas) o "comunidades" (propagación de etiquetas)
+        min_estrellas: Tamaño mínimo de una constelación
+
+    Returns:
+        Constelaciones de mayor a menor importancia (tamaño × densidad)
+    """
+    if metodo not in ("componentes", "comunidades"):
+        raise ValueError(f"Método de agrupación desconocido: {metodo}")
+    if not estrellas:
+        return []
+
+    indice = {estrella.id: i for i, estrella in enumerate(estrellas)}
+    origenes, destinos = aristas_indexadas(getattr(grafo, "adelante", grafo), indice)
+
+    n = len(estrellas)
+    if metodo == "componentes":
+        etiquetas = componentes_conexas(n, origenes, destinos)
+    else:
+        etiquetas = propagar_etiquetas(n, origenes, destinos)
+
+    nombres_dimension: Dict[str, int] = {}
+    dimensiones = [nombres_dimension.setdefault(e.dimension, len(nombres_dimension)) for e in estrellas]
+    dimension_por_indice = list(nombres_dimension)
+    color_por_dimension: Dict[str, str] = {}
+    for estrella in estrellas:
+        color_por_dimension.setdefault(estrella.dimension, estrella.color)
+
+    resumen = resumir_grupos(
+        etiquetas, origenes, destinos,
+        [(e.posicion.x, e.posicion.y, e.posicion.z) for e in estrellas],
+        dimensiones
+    )
+
+    miembros: List[List[str]] = [[] for _ in resumen["tamano"]]
+    for estrella, etiqueta in zip(estrellas, etiquetas):
+        miembros[etiqueta].append(estrella.id)
+
+    constelaciones = []
+    for grupo, ids in enumerate(miembros):
+        if len(ids) < min_estrellas:
+            continue
+        dimension_principal = dimension_por_indice[resumen["dimension"][grupo]]
+        densidad = resumen["densidad"][grupo]
+        x, y, z = resumen["centro"][grupo]
+
+        constelaciones.append(Constelacion(
+            id=f"constelacion-{len(constelaciones)}",
+            nombre=f"Constelación {dimension_principal.capitalize()}",
+            estrellas=ids,
+            dimension_principal=dimension_principal,
+            color=color_por_dimension.get(dimension_principal, COLOR_POR_DEFECTO),
+            centro=Vector3D(x=x, y=y, z=z),
+            densidad=round(densidad, 2),
+            importancia=len(ids) * densidad  # Tamaño × densidad
+        ))
+
+    constelaciones.sort(key=lambda c: c.importancia, reverse=True)
+    return constelaciones
+
+
+# ==================== BENCHMARK ====================
+
+def _vault_sintetico(num_notas: int, semilla: int = 7):
+    """Notas en comunidades de 20-200 enlazadas en cadena + enlaces internos y cruzados al azar"""
+    from services.obsidian_parser import NotaObsidian
+
+    dimensiones = ["finanzas", "biologia", "conocimiento", "desarrollo",
+                   "relaciones", "creatividad", "espiritualidad"]
+    azar = random.Random(semilla)
+    titulos = [f"nota-{i}" for i in range(num_notas)]
+
+    comunidades = []
+    inicio = 0
+    while inicio < num_notas:
+        fin = min(num_notas, inicio + azar.randint(20, 200))
+        comunidades.append(range(inicio, fin))
+        inicio = fin
+
+    notas = []
+    for c, comunidad in enumerate(comunidades):
+        for i in comunidad:
+            enlaces = [titulos[i - 1]] if i > comunidad.start else []
+            enlaces += [titulos[azar.choice(comunidad)] for _ in range(2)]
+            if azar.random() < 0.01:
+                enlaces.append(titulos[azar.randrange(num_notas)])
+            notas.append(NotaObsidian(
+                f"{titulos[i]}.md", titulos[i], "", {}, enlaces, [],
+                dimension=dimensiones[(c + (i % 5 == 0)) % len(dimensiones)]
+            ))
+    return notas
+
+
+def _estrellas(notas) -> List[Estrella]:
+    return [
+        Estrella.model_construct(
+            id=nota.filepath, dimension=nota.dimension, color=nota.obtener_color(),
+            posicion=Vector3D.model_construct(x=float(i % 997), y=float(i % 389), z=float(i % 5) * 100.0)
+        )
+        for i, nota in enumerate(notas)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark: constelaciones sobre un vault sintético")
+    parser.add_argument("--notas", type=int, default=50000)
+    parser.add_argument("--notas-legado", type=int, default=5000,
+                        help="Tamaño para comparar con el clustering anterior (DFS + listas)")
+    args = parser.parse_args()
+
+    notas = _vault_sintetico(args.notas)
+    estrellas = _estrellas(notas)
+
+    inicio = time.perf_counter()
+    grafo = GrafoEnlaces(notas)
+    t_grafo = time.perf_counter() - inicio
+
+    tiempos = {}
+    for metodo in ("componentes", "comunidades"):
+        inicio = time.perf_counter()
+        constelaciones = detectar_constelaciones(estrellas, grafo, metodo=metodo)
+        tiempos[metodo] = (time.perf_counter() - inicio, len(constelaciones))
+
+    print(f"🌌 Vault sintético: {args.notas} notas "
+          f"({'NumPy' if NUMPY_DISPONIBLE else 'sin NumPy'})")
+    print(f"   Grafo de enlaces:    {t_grafo * 1000:.1f} ms")
+    for metodo, (segundos, total) in tiempos.items():
+        print(f"   {metodo.capitalize():<20} {segundos * 1000:.1f} ms → {total} constelaciones")
+
+    if args.notas_legado:
+        parciales = notas[:args.notas_legado]
+        grafo = GrafoEnlaces(parciales)
+        estrellas = estrellas[:args.notas_legado]
+
+        inicio = time.perf_counter()
+        _constelaciones_legado(estrellas, grafo.adelante)
+        t_legado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        detectar_constelaciones(estrellas, grafo)
+        t_nuevo = time.perf_counter() - inicio
+
+        print(f"\n   {args.notas_legado} notas, clustering anterior: {t_legado * 1000:.1f} ms")
+        print(f"   {args.notas_legado} notas, union-find:          {t_nuevo * 1000:.1f} ms")
+        print(f"   Speedup:                          {t_legado / t_nuevo:.1f}x")
+
+
+def _constelaciones_legado(estrellas, grafo):
+    """Núcleo del clustering de UniversoProcessor anterior (solo para el benchmark)"""
+    visitados = set()
+    clusters = []
+
+    def dfs(nota_id, cluster_actual):
+        if nota_id in visitados:
+            return
+        visitados.add(nota_id)
+        cluster_actual.append(nota_id)
+        for vecino in grafo.get(nota_id, []):
+            dfs(vecino, cluster_actual)
+
+    for estrella in estrellas:
+        if estrella.id not in visitados:
+            cluster = []
+            dfs(estrella.id, cluster)
+            if len(cluster) >= 2:
+                clusters.append(cluster)
+
+    for cluster in clusters:
+        estrellas_cluster = [e for e in estrellas if e.id in cluster]
+        sum(len([d for d in grafo.get(e.id, []) if d in cluster]) for e in estrellas_cluster)
+
+
+if __name__ == "__main__":
+    main()
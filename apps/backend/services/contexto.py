@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from services.metricas import trazar
 from models.schemas import (
     ContextoCompleto, ContextoTemporal, ContextoBiologico,
     ContextoFinanciero, ContextoConocimiento, MomentoLiturgico
@@ -18,6 +20,7 @@ class RecopiladorContexto:
         self.calculador = calculador
         self.calendario = calendario
 
+    @trazar("contexto.recopilar_contexto_completo")
     async def recopilar_contexto_completo(
         self,
         momento: MomentoLiturgico,
@@ -35,8 +38,9 @@ class RecopiladorContexto:
         """
         from services.orquestador_7_capas import obtener_contexto_7_capas
 
-        # Usar función de orquestador de 7 capas para obtener contexto completo
-        contexto_7_capas = obtener_contexto_7_capas(
+        # Orquestador de 7 capas (capas cacheadas + E/S en hilo, fuera del event loop)
+        contexto_7_capas = await asyncio.to_thread(
+            obtener_contexto_7_capas,
             momento=momento.value,
             energia=energia,
             calidad_sueno=calidad_sueno,
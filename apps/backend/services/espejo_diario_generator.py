@@ -6,9 +6,10 @@ Sintetiza 5 Estados Cero en una narrativa coherente
 from pathlib import Path
 from datetime import date, datetime
 from typing import List, Dict, Optional
-import json
 import os
 
+from services.indice_estados_cero import get_indice_estados_cero
+
 # Asumiendo que estos agentes ya existen
 try:
     from agentes.analizador_patrones import AnalizadorPatrones
@@ -44,7 +45,7 @@ class EspejoDiarioGenerator:
         self.vault_path = Path(vault_path)
         self.analizador = AnalizadorPatrones(vault_path)
         self.entrelazador = EntrelazadorDominios(vault_path)
-        self.storage_path = Path("storage/estados_cero")
+        self.indice = get_indice_estados_cero()
     
     def generar_espejo_completo(self, fecha: date) -> str:
         """Genera Espejo Diario completo para una fecha"""
@@ -73,20 +74,8 @@ class EspejoDiarioGenerator:
         )
     
     def _cargar_estados_dia(self, fecha: date) -> List[Dict]:
-        """Carga todos los Estados Cero de un día"""
-        estados = []
-        fecha_str = fecha.strftime("%Y-%m-%d")
-        
-        # Buscar en storage local
-        if self.storage_path.exists():
-            for file in self.storage_path.glob("*.json"):
-                try:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if data.get('fecha') == fecha_str:
-                            estados.append(data)
-                except:
-                    continue
+        """Carga todos los Estados Cero de un día (solo los archivos de esa fecha)"""
+        estados = self.indice.estados_dia(fecha)
         
         # Ordenar por momento
         orden_momentos = {"fajr": 0, "dhuhr": 1, "asr": 2, "maghrib": 3, "isha": 4}
@@ -1,175 +1,502 @@
 """
-Sistema de cola de eventos simple basado en archivos JSON
+Sistema de cola de eventos durable basado en SQLite (WAL)
 Para el flujo Captura → Vault → Insights → Acción
+
+Reemplaza la cola de un-archivo-JSON-por-evento:
+- Encolar y desencolar usan el índice (event_type, dead, seq): sin glob ni sort
+- Entrega atómica: la reserva se hace dentro de una transacción IMMEDIATE,
+  dos workers nunca reciben el mismo evento
+- Visibility timeout + ack/nack para entrega al-menos-una-vez
+- Dead-letter tras `max_intentos` entregas fallidas
+- Migra automáticamente el layout antiguo (`<tipo>/event_*.json`); los
+  archivos ilegibles se mueven a `cuarentena/` en lugar de borrarse
+- Notificación push: `emit` despierta a los consumidores bloqueados en
+  `esperar_eventos` (Event en proceso + "timbre" unix-datagram entre procesos)
 """
 
 import json
+import os
+import select
+import socket
+import sqlite3
+import threading
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL UNIQUE,
+    event_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    visible_at REAL NOT NULL DEFAULT 0,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    dead INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_cola ON events (event_type, dead, seq);
+"""
 
 
 class EventQueue:
-    """Cola de eventos simple basada en archivos JSON"""
-    
-    def __init__(self, base_dir: str = "storage/events"):
+    """Cola de eventos durable sobre un único archivo SQLite"""
+
+    def __init__(
+        self,
+        base_dir: str = "storage/events",
+        visibility_timeout: float = 300.0,
+        max_intentos: int = 5
+    ):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
-    
+        self.db_path = self.base_dir / "events.db"
+        self.visibility_timeout = visibility_timeout
+        self.max_intentos = max_intentos
+
+        # Una conexión por hilo (sqlite3 no comparte conexiones entre hilos)
+        self._local = threading.local()
+
+        # Notificación push: productores del mismo proceso + timbres de otros procesos
+        self._aviso_local = threading.Event()
+        self.timbres_dir = self.base_dir / "timbres"
+        self._timbre: Optional[socket.socket] = None
+        self._timbre_path: Optional[Path] = None
+
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+        self._migrar_layout_archivos()
+
+    # ==================== CONEXIÓN ====================
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _nuevo_event_id() -> str:
+        # Mismo formato que la cola antigua: <epoch>_<uuid8>
+        return f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def _row_to_event(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "event_id": row["event_id"],
+            "event_type": row["event_type"],
+            "timestamp": row["timestamp"],
+            "data": json.loads(row["payload"]),
+            "intentos": row["intentos"],
+        }
+
+    # ==================== PRODUCTOR ====================
+
     def emit(self, event_type: str, data: Dict[str, Any]) -> str:
         """
-        Emite un evento creando un archivo JSON
-        
+        Emite un evento
+
         Args:
             event_type: Tipo de evento (ej: "estado_cero_completed")
             data: Datos del evento
-            
+
         Returns:
             event_id: ID único del evento creado
         """
-        # Crear ID único con timestamp y UUID
-        timestamp = int(time.time())
-        uuid_short = uuid.uuid4().hex[:8]
-        event_id = f"{timestamp}_{uuid_short}"
-        
-        # Crear directorio para el tipo de evento
-        event_dir = self.base_dir / event_type
-        event_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Crear archivo JSON
-        event_file = event_dir / f"event_{event_id}.json"
-        
-        event_data = {
-            "event_id": event_id,
-            "event_type": event_type,
-            "timestamp": datetime.now().isoformat(),
-            "data": data
-        }
-        
-        with open(event_file, 'w', encoding='utf-8') as f:
-            json.dump(event_data, f, indent=2, ensure_ascii=False)
-        
+        event_id = self._nuevo_event_id()
+
+        self._conn().execute(
+            "INSERT INTO events (event_id, event_type, timestamp, payload) VALUES (?, ?, ?, ?)",
+            (event_id, event_type, datetime.now().isoformat(), json.dumps(data, ensure_ascii=False))
+        )
+
+        self.notificar()
         return event_id
-    
-    def consume(self, event_type: str) -> Optional[Dict[str, Any]]:
+
+    # ==================== NOTIFICACIÓN ====================
+
+    def notificar(self) -> None:
+        """Despierta a los consumidores: Event local + un datagrama por timbre abierto"""
+        self._aviso_local.set()
+
+        if not hasattr(socket, "AF_UNIX") or not self.timbres_dir.exists():
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as emisor:
+            emisor.setblocking(False)
+            for timbre in self.timbres_dir.glob("*.sock"):
+                try:
+                    emisor.sendto(b"1", str(timbre))
+                except (BlockingIOError, ConnectionRefusedError, FileNotFoundError):
+                    # Buffer lleno (ya hay aviso pendiente) o consumidor muerto
+                    continue
+                except OSError:
+                    continue
+
+    def abrir_timbre(self) -> bool:
+        """
+        Abre un socket unix-datagram para recibir avisos de productores
+        en otros procesos. Un timbre por proceso consumidor.
+
+        Returns:
+            True si el timbre quedó abierto (False en plataformas sin AF_UNIX)
+        """
+        if self._timbre is not None:
+            return True
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+
+        self.timbres_dir.mkdir(parents=True, exist_ok=True)
+        path = self.timbres_dir / f"{os.getpid()}.sock"
+        path.unlink(missing_ok=True)
+
+        try:
+            timbre = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            timbre.bind(str(path))
+            timbre.setblocking(False)
+        except OSError as e:
+            print(f"⚠️ No se pudo abrir timbre de eventos: {e}")
+            return False
+
+        self._timbre = timbre
+        self._timbre_path = path
+        return True
+
+    def cerrar_timbre(self) -> None:
+        """Cierra y elimina el timbre de este proceso"""
+        if self._timbre is not None:
+            self._timbre.close()
+            self._timbre = None
+        if self._timbre_path is not None:
+            self._timbre_path.unlink(missing_ok=True)
+            self._timbre_path = None
+
+    def esperar_eventos(self, timeout: float) -> bool:
+        """
+        Bloquea hasta que se emita un evento o venza `timeout`
+
+        Returns:
+            True si hubo aviso push, False si venció el timeout
+        """
+        if self._timbre is not None:
+            listos, _, _ = select.select([self._timbre], [], [], timeout)
+            if not listos:
+                return False
+            # Vaciar avisos acumulados
+            while True:
+                try:
+                    self._timbre.recv(64)
+                except BlockingIOError:
+                    break
+            self._aviso_local.clear()
+            return True
+
+        avisado = self._aviso_local.wait(timeout)
+        self._aviso_local.clear()
+        return avisado
+
+    # ==================== CONSUMIDOR ====================
+
+    def consume_batch(
+        self,
+        event_type: str,
+        max_events: int = 10,
+        auto_ack: bool = True,
+        visibility_timeout: Optional[float] = None,
+        aceptar: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Reserva hasta `max_events` eventos visibles, en orden de llegada
+
+        Args:
+            event_type: Tipo de evento a consumir
+            max_events: Tamaño máximo del lote
+            auto_ack: Si True, los eventos se eliminan al entregarse (semántica
+                      de la cola antigua). Si False, quedan invisibles durante
+                      `visibility_timeout` hasta `ack()`/`nack()`
+            visibility_timeout: Segundos de invisibilidad (default de la cola)
+            aceptar: Filtro opcional sobre el evento (event_id, data, ...),
+                     evaluado en orden de seq dentro de la reserva; los
+                     eventos rechazados no se tocan
+
+        Returns:
+            Lista de eventos (puede estar vacía)
+        """
+        ahora = time.time()
+        vt = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if aceptar is None:
+                rows = conn.execute(
+                    """
+                    SELECT * FROM events
+                    WHERE event_type = ? AND dead = 0 AND visible_at <= ?
+                    ORDER BY seq LIMIT ?
+                    """,
+                    (event_type, ahora, max_events)
+                ).fetchall()
+            else:
+                rows = []
+                cursor = conn.execute(
+                    """
+                    SELECT * FROM events
+                    WHERE event_type = ? AND dead = 0 AND visible_at <= ?
+                    ORDER BY seq
+                    """,
+                    (event_type, ahora)
+                )
+                for row in cursor:
+                    if len(rows) >= max_events:
+                        break
+                    if aceptar(self._row_to_event(row)):
+                        rows.append(row)
+                cursor.close()
+
+            if rows:
+                seqs = [row["seq"] for row in rows]
+                marcadores = ",".join("?" * len(seqs))
+                if auto_ack:
+                    conn.execute(f"DELETE FROM events WHERE seq IN ({marcadores})", seqs)
+                else:
+                    conn.execute(
+                        f"UPDATE events SET visible_at = ?, intentos = intentos + 1 WHERE seq IN ({marcadores})",
+                        [ahora + vt, *seqs]
+                    )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        eventos = [self._row_to_event(row) for row in rows]
+        if not auto_ack:
+            for evento in eventos:
+                evento["intentos"] += 1
+        return eventos
+
+    def consume(
+        self,
+        event_type: str,
+        auto_ack: bool = True,
+        visibility_timeout: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Consume el primer evento del tipo especificado
-        
+
         Args:
             event_type: Tipo de evento a consumir
-            
+            auto_ack: Ver `consume_batch`
+            visibility_timeout: Ver `consume_batch`
+
         Returns:
             Dict con los datos del evento o None si no hay eventos
         """
-        event_dir = self.base_dir / event_type
-        
-        if not event_dir.exists():
-            return None
-        
-        # Buscar archivos de eventos ordenados por nombre (timestamp)
-        event_files = sorted(event_dir.glob("event_*.json"))
-        
-        if not event_files:
-            return None
-        
-        # Leer y eliminar el primer archivo
-        event_file = event_files[0]
-        
-        try:
-            with open(event_file, 'r', encoding='utf-8') as f:
-                event_data = json.load(f)
-            
-            # Eliminar archivo después de leerlo
-            event_file.unlink()
-            
-            return event_data
-            
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            # Si hay error, eliminar archivo corrupto
-            if event_file.exists():
-                event_file.unlink()
-            return None
-    
+        eventos = self.consume_batch(event_type, 1, auto_ack, visibility_timeout)
+        return eventos[0] if eventos else None
+
+    def ack(self, event_id: str) -> bool:
+        """Confirma el procesamiento de un evento reservado (lo elimina)"""
+        cursor = self._conn().execute("DELETE FROM events WHERE event_id = ?", (event_id,))
+        return cursor.rowcount > 0
+
+    def nack(self, event_id: str, error: Optional[str] = None, delay: float = 0.0) -> bool:
+        """
+        Devuelve un evento reservado a la cola, o lo manda a dead-letter
+        si ya agotó `max_intentos`
+
+        Returns:
+            True si el evento fue a dead-letter
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT intentos FROM events WHERE event_id = ?", (event_id,)).fetchone()
+        if row is None:
+            return False
+
+        if row["intentos"] >= self.max_intentos:
+            conn.execute(
+                "UPDATE events SET dead = 1, last_error = ? WHERE event_id = ?",
+                (error, event_id)
+            )
+            return True
+
+        conn.execute(
+            "UPDATE events SET visible_at = ?, last_error = ? WHERE event_id = ?",
+            (time.time() + delay, error, event_id)
+        )
+        return False
+
+    def liberar(self, event_id: str) -> bool:
+        """
+        Devuelve un evento reservado que no llegó a procesarse, sin contar
+        la entrega (no avanza hacia dead-letter)
+        """
+        cursor = self._conn().execute(
+            "UPDATE events SET visible_at = 0, intentos = MAX(intentos - 1, 0) WHERE event_id = ?",
+            (event_id,)
+        )
+        return cursor.rowcount > 0
+
     def peek(self, event_type: str) -> Optional[Dict[str, Any]]:
         """
         Lee el primer evento sin eliminarlo
-        
+
         Args:
             event_type: Tipo de evento a leer
-            
+
         Returns:
             Dict con los datos del evento o None si no hay eventos
         """
-        event_dir = self.base_dir / event_type
-        
-        if not event_dir.exists():
-            return None
-        
-        event_files = sorted(event_dir.glob("event_*.json"))
-        
-        if not event_files:
-            return None
-        
-        try:
-            with open(event_files[0], 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return None
-    
+        row = self._conn().execute(
+            """
+            SELECT * FROM events
+            WHERE event_type = ? AND dead = 0 AND visible_at <= ?
+            ORDER BY seq LIMIT 1
+            """,
+            (event_type, time.time())
+        ).fetchone()
+        return self._row_to_event(row) if row else None
+
+    # ==================== INSPECCIÓN ====================
+
     def list_pending(self) -> Dict[str, int]:
         """
-        Lista eventos pendientes por tipo
-        
+        Lista eventos pendientes por tipo (incluye reservados sin ack)
+
         Returns:
             Dict con {tipo_evento: cantidad_pendiente}
         """
-        pending = {}
-        
-        if not self.base_dir.exists():
-            return pending
-        
-        for event_dir in self.base_dir.iterdir():
-            if event_dir.is_dir():
-                event_files = list(event_dir.glob("event_*.json"))
-                pending[event_dir.name] = len(event_files)
-        
-        return pending
-    
+        rows = self._conn().execute(
+            "SELECT event_type, COUNT(*) AS n FROM events WHERE dead = 0 GROUP BY event_type"
+        ).fetchall()
+        return {row["event_type"]: row["n"] for row in rows}
+
+    def list_dead_letters(self, event_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lista eventos en dead-letter con su último error"""
+        query = "SELECT * FROM events WHERE dead = 1"
+        params: tuple = ()
+        if event_type:
+            query += " AND event_type = ?"
+            params = (event_type,)
+
+        eventos = []
+        for row in self._conn().execute(query + " ORDER BY seq", params):
+            evento = self._row_to_event(row)
+            evento["last_error"] = row["last_error"]
+            eventos.append(evento)
+        return eventos
+
+    def requeue_dead_letters(self, event_type: Optional[str] = None) -> int:
+        """Devuelve los eventos en dead-letter a la cola con el contador a cero"""
+        query = "UPDATE events SET dead = 0, intentos = 0, visible_at = 0 WHERE dead = 1"
+        params: tuple = ()
+        if event_type:
+            query += " AND event_type = ?"
+            params = (event_type,)
+        return self._conn().execute(query, params).rowcount
+
     def clear_events(self, event_type: str = None) -> int:
         """
         Limpia eventos del tipo especificado o todos
-        
+
         Args:
             event_type: Tipo específico o None para todos
-            
+
         Returns:
-            Número de archivos eliminados
+            Número de eventos eliminados
         """
-        deleted = 0
-        
         if event_type:
-            event_dir = self.base_dir / event_type
-            if event_dir.exists():
-                for event_file in event_dir.glob("event_*.json"):
-                    event_file.unlink()
-                    deleted += 1
+            cursor = self._conn().execute("DELETE FROM events WHERE event_type = ?", (event_type,))
         else:
-            # Limpiar todos los tipos
-            for event_dir in self.base_dir.iterdir():
-                if event_dir.is_dir():
-                    for event_file in event_dir.glob("event_*.json"):
-                        event_file.unlink()
-                        deleted += 1
-        
-        return deleted
+            cursor = self._conn().execute("DELETE FROM events")
+        return cursor.rowcount
+
+    # ==================== MIGRACIÓN ====================
+
+    def _migrar_layout_archivos(self) -> int:
+        """
+        Importa eventos del layout antiguo (`<base_dir>/<tipo>/event_*.json`)
+        preservando event_id, timestamp y orden, y elimina los archivos
+        importados. Los que no se pueden leer (corruptos, a medio escribir)
+        se mueven a `<base_dir>/cuarentena/<tipo>/` para revisión manual.
+
+        Returns:
+            Número de eventos migrados
+        """
+        archivos = sorted(self.base_dir.glob("*/event_*.json"))
+        if not archivos:
+            return 0
+
+        conn = self._conn()
+        importados: List[Path] = []
+        ilegibles: List[Path] = []
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for archivo in archivos:
+                try:
+                    with open(archivo, 'r', encoding='utf-8') as f:
+                        event_data = json.load(f)
+                except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+                    ilegibles.append(archivo)
+                    continue
+                if not isinstance(event_data, dict):
+                    ilegibles.append(archivo)
+                    continue
+
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO events (event_id, event_type, timestamp, payload)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (
+                        event_data.get("event_id") or archivo.stem[len("event_"):],
+                        event_data.get("event_type") or archivo.parent.name,
+                        event_data.get("timestamp") or datetime.now().isoformat(),
+                        json.dumps(event_data.get("data", {}), ensure_ascii=False),
+                    )
+                )
+                # Insertado o ya presente (INSERT OR IGNORE): está en la base
+                importados.append(archivo)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        # Solo borrar después de confirmar la transacción, y solo lo importado
+        for archivo in importados:
+            archivo.unlink(missing_ok=True)
+
+        for archivo in ilegibles:
+            destino = self.base_dir / "cuarentena" / archivo.parent.name / archivo.name
+            try:
+                destino.parent.mkdir(parents=True, exist_ok=True)
+                archivo.replace(destino)
+                print(f"⚠️ EventQueue: {archivo} ilegible, movido a {destino}")
+            except OSError as e:
+                print(f"⚠️ EventQueue: {archivo} ilegible y no se pudo mover a cuarentena: {e}")
+
+        if importados:
+            print(f"📦 EventQueue: {len(importados)} eventos migrados desde archivos JSON")
+        return len(importados)
 
 
-# Instancia global para uso en la aplicación
-event_queue = EventQueue()
+# Instancia global para uso en la aplicación (se crea en el primer uso)
+_event_queue: Optional[EventQueue] = None
 
 
 def get_event_queue() -> EventQueue:
     """Obtiene la instancia global de EventQueue"""
-    return event_queue
+    global _event_queue
+    if _event_queue is None:
+        _event_queue = EventQueue()
+    return _event_queue
@@ -8,13 +8,15 @@ detectados, dominios necesitando atención.
 Principio: La pregunta debe REVELAR, no CONFIRMAR.
 """
 
-import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import anthropic
 import os
 
+from services.llm_cache import cached_create_sync
+from services.indice_estados_cero import get_indice_estados_cero
+
 class GeneradorPreguntasEmergentes:
     """
     Genera preguntas únicas que operan al borde del caos.
@@ -29,7 +31,6 @@ class GeneradorPreguntasEmergentes:
 
     def __init__(self):
         self.base_path = Path(__file__).parent.parent
-        self.estados_path = self.base_path / "storage" / "estados_cero"
         self.config_path = self.base_path / "storage" / "configuracion_usuario.json"
 
         # Cargar .env explícitamente
@@ -246,7 +247,10 @@ Genera SOLO la pregunta (sin explicación adicional). La pregunta debe ser poét
 PREGUNTA EMERGENTE:"""
 
         try:
-            message = self.client.messages.create(
+            # Mismo contexto dentro de la ventana litúrgica → misma pregunta (cache)
+            texto = cached_create_sync(
+                self.client.messages.create,
+                "preguntas.emergente",
                 model="claude-3-5-sonnet-20241022",
                 max_tokens=200,
                 temperature=0.9,  # Alta creatividad
@@ -255,7 +259,7 @@ PREGUNTA EMERGENTE:"""
                 ]
             )
 
-            pregunta_generada = message.content[0].text.strip()
+            pregunta_generada = texto.strip()
 
             # Limpiar si viene con comillas
             pregunta_generada = pregunta_generada.strip('"').strip("'")
@@ -416,29 +420,9 @@ PREGUNTA EMERGENTE:"""
         dias: int = 7
     ) -> List[Dict]:
         """
-        Obtiene Estados Cero de los últimos N días.
+        Obtiene Estados Cero de los últimos N días (vía índice, más reciente primero).
         """
-        estados = []
-        fecha_limite = datetime.now() - timedelta(days=dias)
-
-        if not self.estados_path.exists():
-            return estados
-
-        # Buscar archivos de estados cero
-        for archivo in self.estados_path.glob("estado_*.json"):
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    estado = json.load(f)
-
-                    # Verificar fecha
-                    fecha_estado = datetime.fromisoformat(estado.get("timestamp", "2000-01-01"))
-                    if fecha_estado >= fecha_limite:
-                        estados.append(estado)
-            except Exception as e:
-                print(f"Error leyendo estado {archivo}: {e}")
-                continue
-
-        return sorted(estados, key=lambda x: x.get("timestamp", ""), reverse=True)
+        return get_indice_estados_cero().estados_recientes(dias=dias, usuario=usuario_id)
 
 
 # === FUNCIONES PÚBLICAS ===
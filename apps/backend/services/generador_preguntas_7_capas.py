@@ -13,8 +13,7 @@ Evolución del generador original para integrar las 7 capas jerárquicas:
 La pregunta emergente surge de la configuración completa del momento.
 """
 
-import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 import anthropic
@@ -25,6 +24,8 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from services.orquestador_7_capas import obtener_contexto_7_capas
+from services.llm_cache import cached_create_sync
+from services.indice_estados_cero import get_indice_estados_cero
 
 
 class GeneradorPreguntas7Capas:
@@ -39,7 +40,6 @@ class GeneradorPreguntas7Capas:
 
     def __init__(self):
         self.base_path = Path(__file__).parent.parent
-        self.estados_path = self.base_path / "storage" / "estados_cero"
 
         # Cargar .env
         from dotenv import load_dotenv
@@ -167,14 +167,17 @@ Genera SOLO la pregunta. Poética, directa, penetrante.
 PREGUNTA EMERGENTE:"""
 
         try:
-            message = self.client.messages.create(
+            # Mismo contexto dentro de la ventana litúrgica → misma pregunta (cache)
+            texto = cached_create_sync(
+                self.client.messages.create,
+                "preguntas.7_capas",
                 model="claude-3-5-sonnet-20241022",
                 max_tokens=200,
                 temperature=0.9,
                 messages=[{"role": "user", "content": prompt}]
             )
 
-            pregunta_generada = message.content[0].text.strip().strip('"').strip("'")
+            pregunta_generada = texto.strip().strip('"').strip("'")
 
             # Generar contexto explicativo
             contexto_explicativo = self._generar_contexto_pregunta(
@@ -357,25 +360,9 @@ PREGUNTA EMERGENTE:"""
 
     def _obtener_estados_recientes(self, usuario_id: str, dias: int = 7) -> List[Dict]:
         """
-        Obtiene Estados Cero recientes.
+        Obtiene Estados Cero recientes (vía índice, más reciente primero).
         """
-        estados = []
-        fecha_limite = datetime.now() - timedelta(days=dias)
-
-        if not self.estados_path.exists():
-            return estados
-
-        for archivo in self.estados_path.glob("estado_*.json"):
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    estado = json.load(f)
-                    fecha = datetime.fromisoformat(estado.get("timestamp", "2000-01-01"))
-                    if fecha >= fecha_limite:
-                        estados.append(estado)
-            except:
-                continue
-
-        return sorted(estados, key=lambda x: x.get("timestamp", ""), reverse=True)
+        return get_indice_estados_cero().estados_recientes(dias=dias, usuario=usuario_id)
 
 
 # === FUNCIÓN PÚBLICA ===
@@ -276,6 +276,9 @@ Este evento se genera automáticamente después de completar Maghrib.""",
         """
         eventos_creados = []
         
+        # Tiempos de los 7 días en una sola pasada
+        self.calculador.precalcular_rango(fecha_inicio, fecha_inicio + timedelta(days=6))
+        
         for i in range(7):
             fecha_actual = fecha_inicio + timedelta(days=i)
             momentos = ["fajr", "dhuhr", "asr", "maghrib", "isha"]
@@ -0,0 +1,220 @@
+"""
+Histórico emocional por usuario: log append-only + ventana en memoria
+
+TrackerEmocional cargaba el `*_emocional.json` completo, parseaba todos
+los timestamps para podar 30 días y lo reescribía entero (indentado) en
+cada construcción del contexto de 7 capas; después tendencia y patrón
+diario lo volvían a leer dos veces más. Aquí, por usuario:
+
+- Log en disco `{usuario}_emocional.jsonl`: una línea JSON compacta por
+  estado, solo se añade al final. Se compacta (reescritura atómica con la
+  ventana viva) cuando las líneas muertas superan a las vivas.
+- Ring buffer en memoria con los estados de los últimos RETENCION_DIAS
+  (acotado a MAX_ENTRADAS), compartido entre instancias del tracker.
+- Estadísticas incrementales al añadir: últimas 3 intensidades (tendencia)
+  y conteo estado×momento en la ventana de VENTANA_PATRON_DIAS (patrón
+  diario), con expiración por la izquierda. Consultas O(1) amortizado.
+
+Si otro proceso añade líneas, se leen solo los bytes nuevos (se compara el
+tamaño del archivo con el offset ya leído). El `*_emocional.json` antiguo
+se importa la primera vez que se abre la serie.
+"""
+
+import json
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+RETENCION_DIAS = 30
+VENTANA_TENDENCIA_DIAS = 2
+VENTANA_PATRON_DIAS = 7
+MAX_ENTRADAS = 5000
+
+MIN_LINEAS_COMPACTAR = 256
+
+MIN_ESTADOS_PATRON = 10
+MIN_ESTADOS_MOMENTO = 3
+UMBRAL_PATRON = 0.7
+
+
+class SerieEmocional:
+    """Histórico emocional de un usuario"""
+
+    def __init__(self, archivo: Path, archivo_legacy: Optional[Path] = None):
+        self.archivo = archivo
+        self._entradas: Deque[Tuple[datetime, Dict[str, Any]]] = deque(maxlen=MAX_ENTRADAS)
+
+        # Estadísticas incrementales
+        self._ultimas: Deque[Tuple[datetime, int]] = deque(maxlen=3)
+        self._ventana: Deque[Tuple[datetime, Optional[str], str]] = deque()
+        self._por_momento: Dict[str, Counter] = {}
+
+        self._offset = 0   # Bytes del log ya leídos
+        self._lineas = 0   # Líneas en disco (vivas + expiradas)
+        self._lock = threading.Lock()
+
+        if not self.archivo.exists() and archivo_legacy is not None and archivo_legacy.exists():
+            self._importar_legacy(archivo_legacy)
+        self._leer_desde(0)
+
+    # ==================== DISCO ====================
+
+    def _importar_legacy(self, archivo_legacy: Path):
+        try:
+            with open(archivo_legacy, 'r', encoding='utf-8') as f:
+                historico = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+        self._reescribir(h for h in historico if isinstance(h, dict) and "timestamp" in h)
+
+    def _reescribir(self, entradas):
+        """Escribe el log completo de forma atómica"""
+        temporal = self.archivo.with_suffix(".jsonl.tmp")
+        with open(temporal, 'wb') as f:
+            for datos in entradas:
+                f.write(_linea(datos))
+        os.replace(temporal, self.archivo)
+
+    def _leer_desde(self, offset: int):
+        """Ingiere las líneas completas a partir de `offset`"""
+        if offset == 0:
+            self._reiniciar()
+        try:
+            with open(self.archivo, 'rb') as f:
+                f.seek(offset)
+                contenido = f.read()
+        except FileNotFoundError:
+            return
+
+        fin = contenido.rfind(b"\n") + 1  # Una línea a medio escribir se lee la próxima vez
+        for linea in contenido[:fin].splitlines():
+            self._lineas += 1
+            try:
+                datos = json.loads(linea)
+                self._ingresar(datetime.fromisoformat(datos["timestamp"]), datos)
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._offset = offset + fin
+        self._expirar(datetime.now())
+
+    def _refrescar(self):
+        """Recoge lo que otros procesos hayan añadido (o compactado)"""
+        try:
+            tamano = self.archivo.stat().st_size
+        except FileNotFoundError:
+            tamano = 0
+        if tamano > self._offset:
+            self._leer_desde(self._offset)
+        elif tamano < self._offset:
+            self._leer_desde(0)
+
+    def _compactar(self):
+        self._reescribir(datos for _, datos in self._entradas)
+        self._offset = self.archivo.stat().st_size
+        self._lineas = len(self._entradas)
+
+    # ==================== ESTADÍSTICAS ====================
+
+    def _reiniciar(self):
+        self._entradas.clear()
+        self._ultimas.clear()
+        self._ventana.clear()
+        self._por_momento.clear()
+        self._offset = 0
+        self._lineas = 0
+
+    def _ingresar(self, momento: datetime, datos: Dict[str, Any]):
+        self._entradas.append((momento, datos))
+        self._ultimas.append((momento, datos["intensidad"]))
+
+        momento_liturgico = datos.get("momento_liturgico")
+        self._ventana.append((momento, momento_liturgico, datos["estado"]))
+        if momento_liturgico:
+            self._por_momento.setdefault(momento_liturgico, Counter())[datos["estado"]] += 1
+
+    def _expirar(self, ahora: datetime):
+        limite = ahora - timedelta(days=RETENCION_DIAS)
+        while self._entradas and self._entradas[0][0] < limite:
+            self._entradas.popleft()
+
+        limite = ahora - timedelta(days=VENTANA_PATRON_DIAS)
+        while self._ventana and self._ventana[0][0] < limite:
+            _, momento_liturgico, estado = self._ventana.popleft()
+            if momento_liturgico:
+                conteo = self._por_momento[momento_liturgico]
+                conteo[estado] -= 1
+                if conteo[estado] <= 0:
+                    del conteo[estado]
+                if not conteo:
+                    del self._por_momento[momento_liturgico]
+
+    # ==================== API ====================
+
+    def agregar(self, datos: Dict[str, Any]):
+        """Añade un estado al final del log y actualiza las estadísticas"""
+        momento = datetime.fromisoformat(datos["timestamp"])
+        with self._lock:
+            self._refrescar()
+            with open(self.archivo, 'ab') as f:
+                f.write(_linea(datos))
+                self._offset = f.tell()
+            self._lineas += 1
+            self._ingresar(momento, datos)
+            self._expirar(datetime.now())
+
+            if self._lineas >= MIN_LINEAS_COMPACTAR and self._lineas > 2 * len(self._entradas):
+                self._compactar()
+
+    def historico(self, dias: int) -> List[Dict[str, Any]]:
+        """Estados de los últimos `dias` días (orden cronológico)"""
+        limite = datetime.now() - timedelta(days=dias)
+        with self._lock:
+            self._refrescar()
+            return [datos for momento, datos in self._entradas if momento >= limite]
+
+    def ultimas_intensidades(self) -> List[int]:
+        """Intensidades de los (hasta) 3 últimos estados dentro de VENTANA_TENDENCIA_DIAS"""
+        limite = datetime.now() - timedelta(days=VENTANA_TENDENCIA_DIAS)
+        with self._lock:
+            self._refrescar()
+            return [intensidad for momento, intensidad in self._ultimas if momento >= limite]
+
+    def patron_diario(self) -> Optional[Tuple[str, str]]:
+        """(estado, momento) dominante (≥70 %) en algún momento litúrgico de la semana"""
+        with self._lock:
+            self._refrescar()
+            self._expirar(datetime.now())
+            if len(self._ventana) < MIN_ESTADOS_PATRON:
+                return None
+            for momento_liturgico, conteo in self._por_momento.items():
+                total = sum(conteo.values())
+                if total >= MIN_ESTADOS_MOMENTO:
+                    estado, frecuencia = conteo.most_common(1)[0]
+                    if frecuencia / total >= UMBRAL_PATRON:
+                        return estado, momento_liturgico
+        return None
+
+
+def _linea(datos: Dict[str, Any]) -> bytes:
+    return (json.dumps(datos, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# Series abiertas por archivo (compartidas entre instancias de TrackerEmocional)
+_series: Dict[Path, SerieEmocional] = {}
+_series_lock = threading.Lock()
+
+
+def get_serie_emocional(storage_path: Path, usuario_id: str) -> SerieEmocional:
+    """Serie del usuario en `storage_path` (se abre en el primer uso)"""
+    archivo = (Path(storage_path) / f"{usuario_id}_emocional.jsonl").resolve()
+    serie = _series.get(archivo)
+    if serie is None:
+        with _series_lock:
+            serie = _series.get(archivo)
+            if serie is None:
+                serie = _series[archivo] = SerieEmocional(archivo, archivo.with_suffix(".json"))
+    return serie
@@ -0,0 +1,389 @@
+"""
+Repositorio e índice de los Estados Cero guardados en storage/estados_cero
+
+Antes, cada consumidor (Espejo Diario, generadores de preguntas, worker de
+ingesta) recorría `storage/estados_cero/*.json` y cargaba todos los
+archivos para filtrar por fecha. Aquí un índice SQLite mantiene:
+
+- estados: una fila por archivo con (fecha, momento, timestamp, usuario),
+  con índices secundarios por (fecha, momento) y (usuario, timestamp).
+  Las consultas por día o por rango solo abren los JSON que coinciden.
+- Conteo por día: Estados Cero con `completado` y `archivado_en_obsidian`
+  (el mismo filtro que el recorrido original de los JSON), vía el índice
+  por (fecha, momento)
+- estados_archivados: ids ya procesados por el worker de ingesta (evento
+  `estado_cero_completed`); solo sirve para que una re-entrega del evento
+  no repita el trigger, no interviene en el conteo
+
+Sincronización incremental: `guardar()` indexa su propio archivo y avanza
+el mtime del directorio guardado, así que las escrituras del backend nunca
+provocan un re-escaneo. Los cambios de escritores externos (mtime del
+directorio distinto) se recogen como mucho cada `intervalo_rescan`
+segundos: se compara (mtime, tamaño) con `os.scandir` y solo se parsean
+los archivos nuevos o modificados. Quien reescriba un JSON en el sitio
+debe usar `guardar()` o `registrar()` (la escritura en el sitio no cambia
+el mtime del directorio).
+
+Reconstrucción completa desde los JSON:
+    python services/indice_estados_cero.py --rebuild
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+STORAGE_DIR = Path(__file__).parent.parent / "storage"
+
+# Segundos mínimos entre re-escaneos por cambios externos en estados_dir
+INTERVALO_RESCAN = 30.0
+
+USUARIO_DEFECTO = "default"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS estados_archivados (
+    estado_cero_id TEXT PRIMARY KEY,
+    fecha TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS estados (
+    archivo TEXT PRIMARY KEY,
+    estado_cero_id TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    momento TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    usuario TEXT NOT NULL,
+    completado INTEGER NOT NULL,
+    archivado INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tamano INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_estados_fecha_momento ON estados (fecha, momento);
+CREATE INDEX IF NOT EXISTS idx_estados_usuario_timestamp ON estados (usuario, timestamp);
+CREATE INDEX IF NOT EXISTS idx_estados_timestamp ON estados (timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+"""
+
+Fecha = Union[str, date]
+
+
+def _fecha_str(fecha: Fecha) -> str:
+    return fecha if isinstance(fecha, str) else fecha.isoformat()
+
+
+def _fila_estado(archivo: str, data: Dict[str, Any], mtime_ns: int, tamano: int) -> Optional[Tuple]:
+    """Fila de `estados` para un JSON (None si no tiene fecha)"""
+    fecha = data.get("fecha") or str(data.get("timestamp", ""))[:10]
+    if not fecha:
+        return None
+    return (
+        archivo,
+        data.get("id") or Path(archivo).stem,
+        fecha,
+        data.get("momento") or "",
+        data.get("timestamp") or "",
+        data.get("usuario_id") or data.get("usuario") or USUARIO_DEFECTO,
+        int(bool(data.get("completado", False))),
+        int(bool(data.get("archivado_en_obsidian", False))),
+        mtime_ns,
+        tamano,
+    )
+
+
+class IndiceEstadosCero:
+    """Repositorio de Estados Cero con índice por fecha, momento, timestamp y usuario"""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = STORAGE_DIR / "estados_cero_index.db",
+        estados_dir: Union[str, Path] = STORAGE_DIR / "estados_cero",
+        intervalo_rescan: float = INTERVALO_RESCAN
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.estados_dir = Path(estados_dir)
+        self.intervalo_rescan = intervalo_rescan
+        self._local = threading.local()
+        self._ultimo_scan = float("-inf")
+
+        nuevo = not self.db_path.exists()
+        self._conn().executescript(SCHEMA)
+
+        # Primer arranque: poblar desde los JSON existentes
+        if nuevo and self.estados_dir.exists():
+            self.reconstruir()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # ==================== SINCRONIZACIÓN ====================
+
+    def sincronizar(self, forzar: bool = False) -> int:
+        """
+        Pone el índice al día con `estados_dir`
+
+        Sin `forzar`, solo re-escanea si el directorio cambió y pasaron
+        `intervalo_rescan` segundos desde el último escaneo.
+
+        Returns:
+            Archivos (re)indexados o eliminados
+        """
+        try:
+            mtime_dir = self.estados_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+        conn = self._conn()
+        if not forzar:
+            fila = conn.execute("SELECT valor FROM meta WHERE clave = 'mtime_dir'").fetchone()
+            if fila and fila[0] == mtime_dir:
+                return 0
+            if time.monotonic() - self._ultimo_scan < self.intervalo_rescan:
+                return 0
+        self._ultimo_scan = time.monotonic()
+
+        conocidos = {
+            archivo: (mtime_ns, tamano)
+            for archivo, mtime_ns, tamano in conn.execute("SELECT archivo, mtime_ns, tamano FROM estados")
+        }
+
+        filas = []
+        vistos = set()
+        with os.scandir(self.estados_dir) as entradas:
+            for entrada in entradas:
+                if not entrada.name.endswith(".json") or not entrada.is_file():
+                    continue
+                vistos.add(entrada.name)
+                info = entrada.stat()
+                if not forzar and conocidos.get(entrada.name) == (info.st_mtime_ns, info.st_size):
+                    continue
+                fila = self._leer_fila(Path(entrada.path), info)
+                if fila is not None:
+                    filas.append(fila)
+
+        eliminados = [(archivo,) for archivo in conocidos if archivo not in vistos]
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("DELETE FROM estados WHERE archivo = ?", eliminados)
+            conn.executemany("INSERT OR REPLACE INTO estados VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", filas)
+            conn.execute("INSERT OR REPLACE INTO meta (clave, valor) VALUES ('mtime_dir', ?)", (mtime_dir,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return len(filas) + len(eliminados)
+
+    @staticmethod
+    def _leer_fila(ruta: Path, info: os.stat_result) -> Optional[Tuple]:
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        return _fila_estado(ruta.name, data, info.st_mtime_ns, info.st_size)
+
+    def registrar(self, ruta: Union[str, Path], mtime_dir_antes: Optional[int] = None) -> bool:
+        """
+        (Re)indexa un JSON concreto; False si no es un Estado Cero válido
+
+        Args:
+            ruta: JSON a indexar
+            mtime_dir_antes: mtime de `estados_dir` antes de escribir `ruta`.
+                Si coincide con el guardado (índice al día), se avanza al
+                actual para que la escritura no provoque un re-escaneo
+        """
+        ruta = Path(ruta)
+        fila = self._leer_fila(ruta, ruta.stat())
+        if fila is None:
+            return False
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT OR REPLACE INTO estados VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", fila)
+            if mtime_dir_antes is not None:
+                conn.execute(
+                    "UPDATE meta SET valor = ? WHERE clave = 'mtime_dir' AND valor = ?",
+                    (self.estados_dir.stat().st_mtime_ns, mtime_dir_antes)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def guardar(self, estado: Dict[str, Any]) -> Path:
+        """
+        Escribe el JSON del Estado Cero (atómico) y lo indexa
+
+        Si el índice estaba al día, el mtime guardado avanza con esta
+        escritura: la siguiente consulta no re-escanea el directorio.
+        """
+        self.estados_dir.mkdir(parents=True, exist_ok=True)
+        mtime_antes = self.estados_dir.stat().st_mtime_ns
+        ruta = self.estados_dir / f"{estado['id']}.json"
+        temporal = ruta.with_suffix(".json.tmp")
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(temporal, ruta)
+        self.registrar(ruta, mtime_dir_antes=mtime_antes)
+        return ruta
+
+    # ==================== CONSULTAS ====================
+
+    def _cargar(self, archivos: List[str]) -> List[Dict[str, Any]]:
+        """Carga solo los JSON indicados (los que siguen existiendo y son válidos)"""
+        estados = []
+        for archivo in archivos:
+            try:
+                with open(self.estados_dir / archivo, 'r', encoding='utf-8') as f:
+                    estados.append(json.load(f))
+            except (json.JSONDecodeError, OSError):
+                continue
+        return estados
+
+    def estados_dia(self, fecha: Fecha, momento: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Estados Cero de una fecha (opcionalmente de un momento), por timestamp"""
+        self.sincronizar()
+        sql = "SELECT archivo FROM estados WHERE fecha = ?"
+        parametros: List[Any] = [_fecha_str(fecha)]
+        if momento:
+            sql += " AND momento = ?"
+            parametros.append(momento)
+        filas = self._conn().execute(sql + " ORDER BY timestamp", parametros).fetchall()
+        return self._cargar([f[0] for f in filas])
+
+    def estados_rango(
+        self,
+        desde: datetime,
+        hasta: Optional[datetime] = None,
+        usuario: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Estados Cero con timestamp en [desde, hasta), más reciente primero"""
+        self.sincronizar()
+        sql = "SELECT archivo FROM estados WHERE timestamp >= ?"
+        parametros: List[Any] = [desde.isoformat()]
+        if hasta is not None:
+            sql += " AND timestamp < ?"
+            parametros.append(hasta.isoformat())
+        if usuario is not None:
+            sql += " AND usuario = ?"
+            parametros.append(usuario)
+        filas = self._conn().execute(sql + " ORDER BY timestamp DESC", parametros).fetchall()
+        return self._cargar([f[0] for f in filas])
+
+    def estados_recientes(self, dias: int = 7, usuario: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Estados Cero de los últimos `dias` días, más reciente primero"""
+        return self.estados_rango(datetime.now() - timedelta(days=dias), usuario=usuario)
+
+    # ==================== ARCHIVADOS (WORKER DE INGESTA) ====================
+
+    def registrar_archivado(self, estado_cero_id: str, fecha: str) -> Tuple[bool, int]:
+        """
+        Registra que el worker procesó un Estado Cero archivado
+
+        Antes de contar se re-indexa su JSON (si existe): quien marca
+        `archivado_en_obsidian` puede haberlo reescrito en el sitio.
+
+        Returns:
+            (nuevo, conteo_del_dia): nuevo=False si ya estaba registrado
+        """
+        ruta = self.estados_dir / f"{estado_cero_id}.json"
+        if ruta.exists():
+            self.registrar(ruta)
+
+        cursor = self._conn().execute(
+            "INSERT OR IGNORE INTO estados_archivados (estado_cero_id, fecha) VALUES (?, ?)",
+            (estado_cero_id, fecha)
+        )
+        return cursor.rowcount > 0, self.contar_dia(fecha)
+
+    def contar_dia(self, fecha: Fecha) -> int:
+        """Número de Estados Cero de `fecha` completados y archivados en Obsidian (flags del JSON)"""
+        self.sincronizar()
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM estados WHERE fecha = ? AND completado = 1 AND archivado = 1",
+            (_fecha_str(fecha),)
+        ).fetchone()
+        return row[0]
+
+    def reconstruir(self) -> Dict[str, int]:
+        """
+        Reconstruye el índice completo desde `estados_dir` (recuperación)
+
+        Returns:
+            Dict {fecha: completados}
+        """
+        self.sincronizar(forzar=True)
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM estados_archivados")
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO estados_archivados (estado_cero_id, fecha)
+                SELECT estado_cero_id, fecha FROM estados WHERE completado = 1 AND archivado = 1
+                """
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return dict(conn.execute(
+            """
+            SELECT fecha, COUNT(*) FROM estados
+            WHERE completado = 1 AND archivado = 1
+            GROUP BY fecha ORDER BY fecha
+            """
+        ).fetchall())
+
+
+# Instancia global (se crea en el primer uso)
+_indice: Optional[IndiceEstadosCero] = None
+
+
+def get_indice_estados_cero() -> IndiceEstadosCero:
+    """Obtiene la instancia global del índice"""
+    global _indice
+    if _indice is None:
+        _indice = IndiceEstadosCero()
+    return _indice
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice de Estados Cero por día")
+    parser.add_argument("--rebuild", action="store_true", help="Reconstruir desde storage/estados_cero")
+    parser.add_argument("--fecha", help="Mostrar conteo de una fecha (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    indice = get_indice_estados_cero()
+
+    if args.rebuild:
+        conteos = indice.reconstruir()
+        print(f"✅ Índice reconstruido: {sum(conteos.values())} Estados Cero archivados en {len(conteos)} días")
+    if args.fecha:
+        print(f"📅 {args.fecha}: {len(indice.estados_dia(args.fecha))} Estados Cero, "
+              f"{indice.contar_dia(args.fecha)} archivados")
+
+
+if __name__ == "__main__":
+    main()
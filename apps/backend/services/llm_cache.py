@@ -0,0 +1,277 @@
+"""
+Cache de respuestas LLM direccionada por contenido
+
+La clave es un hash SHA-256 de (modelo, system prompt, mensajes, parámetros
+de muestreo), de modo que prompts idénticos dentro de una misma ventana
+litúrgica reutilizan la respuesta en lugar de volver a pagar la llamada.
+
+Dos niveles:
+- Memoria: LRU acotado (OrderedDict)
+- Disco: SQLite (sobrevive reinicios y se comparte entre workers)
+
+Desde código async se usa `obtener_async` / `guardar_async`: la consulta y
+el commit en SQLite corren en un hilo y no bloquean el event loop (los hits
+en memoria se sirven directamente).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# TTL (segundos) por sitio de llamada. 0 = no cachear.
+TTL_POR_SITIO: Dict[str, int] = {
+    "default": 3600,
+    "generate_json": 3600,
+    "estado_cero.direccion": 1800,
+    "estado_cero.chat": 900,
+    "estado_cero.accion": 1800,
+    "guardian.reporte": 3600,
+    "orquestador.bloques": 1800,
+    "orquestador.plan": 1800,
+    "orquestador.chat": 0,
+    "preguntas.emergente": 1800,     # Una ventana litúrgica aprox.
+    "preguntas.7_capas": 1800,
+    "recomendacion": 6 * 3600,
+}
+
+# Por encima de esta temperatura no se cachea (la variedad es intencional),
+# salvo en los sitios listados aquí.
+UMBRAL_TEMPERATURA = 0.7
+SITIOS_TEMPERATURA_ALTA = {
+    "preguntas.emergente",
+    "preguntas.7_capas",
+}
+
+
+class LLMCache:
+    """Cache LRU en memoria + SQLite en disco para respuestas de Claude"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entradas: int = 512,
+        umbral_temperatura: float = UMBRAL_TEMPERATURA,
+    ):
+        self.db_path = Path(db_path) if db_path else None
+        self.max_entradas = max_entradas
+        self.umbral_temperatura = umbral_temperatura
+
+        self._memoria: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.stats = {"hits_memoria": 0, "hits_disco": 0, "misses": 0, "omitidas": 0, "guardadas": 0}
+
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    clave TEXT PRIMARY KEY,
+                    respuesta TEXT NOT NULL,
+                    expira REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    # ==================== CLAVES Y POLÍTICA ====================
+
+    @staticmethod
+    def clave(model: str, system: Optional[str], messages: List[Dict[str, Any]], **params: Any) -> str:
+        """Hash canónico de la llamada (orden de claves estable)"""
+        payload = {
+            "model": model,
+            "system": system or "",
+            "messages": messages,
+            "params": {k: v for k, v in params.items() if v is not None},
+        }
+        canonico = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+    def ttl_para(self, sitio: str, temperature: Optional[float] = None) -> int:
+        """
+        TTL efectivo para un sitio de llamada.
+
+        Returns:
+            Segundos de vida, o 0 si la llamada no debe cachearse
+        """
+        ttl = TTL_POR_SITIO.get(sitio, TTL_POR_SITIO["default"])
+        if (
+            temperature is not None
+            and temperature > self.umbral_temperatura
+            and sitio not in SITIOS_TEMPERATURA_ALTA
+        ):
+            return 0
+        return ttl
+
+    # ==================== LECTURA / ESCRITURA ====================
+
+    def obtener(self, clave: str) -> Optional[str]:
+        """Busca en memoria y después en disco. None si no hay entrada vigente."""
+        respuesta = self._obtener_memoria(clave)
+        if respuesta is not None:
+            return respuesta
+        return self._obtener_disco(clave)
+
+    async def obtener_async(self, clave: str) -> Optional[str]:
+        """Como `obtener`: los hits en memoria se sirven en el acto, la consulta a SQLite va en un hilo"""
+        respuesta = self._obtener_memoria(clave)
+        if respuesta is not None:
+            return respuesta
+        if self._conn is None:
+            return self._obtener_disco(clave)
+        return await asyncio.to_thread(self._obtener_disco, clave)
+
+    def _obtener_memoria(self, clave: str) -> Optional[str]:
+        ahora = time.time()
+        with self._lock:
+            entrada = self._memoria.get(clave)
+            if entrada is None:
+                return None
+            respuesta, expira = entrada
+            if expira > ahora:
+                self._memoria.move_to_end(clave)
+                self.stats["hits_memoria"] += 1
+                return respuesta
+            del self._memoria[clave]
+            return None
+
+    def _obtener_disco(self, clave: str) -> Optional[str]:
+        with self._lock:
+            if self._conn is not None:
+                fila = self._conn.execute(
+                    "SELECT respuesta, expira FROM llm_cache WHERE clave = ?", (clave,)
+                ).fetchone()
+                if fila and fila[1] > time.time():
+                    self._guardar_memoria(clave, fila[0], fila[1])
+                    self.stats["hits_disco"] += 1
+                    return fila[0]
+
+            self.stats["misses"] += 1
+            return None
+
+    def guardar(self, clave: str, respuesta: str, ttl: int) -> None:
+        """Guarda la respuesta en ambos niveles"""
+        if ttl <= 0:
+            return
+        expira = time.time() + ttl
+
+        with self._lock:
+            self._guardar_memoria(clave, respuesta, expira)
+            self.stats["guardadas"] += 1
+        self._guardar_disco(clave, respuesta, expira)
+
+    async def guardar_async(self, clave: str, respuesta: str, ttl: int) -> None:
+        """Como `guardar`, con la escritura en SQLite fuera del event loop"""
+        if ttl <= 0:
+            return
+        expira = time.time() + ttl
+
+        with self._lock:
+            self._guardar_memoria(clave, respuesta, expira)
+            self.stats["guardadas"] += 1
+        if self._conn is not None:
+            await asyncio.to_thread(self._guardar_disco, clave, respuesta, expira)
+
+    def _guardar_disco(self, clave: str, respuesta: str, expira: float) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (clave, respuesta, expira) VALUES (?, ?, ?)",
+                (clave, respuesta, expira),
+            )
+            self._conn.commit()
+
+    def _guardar_memoria(self, clave: str, respuesta: str, expira: float) -> None:
+        self._memoria[clave] = (respuesta, expira)
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_entradas:
+            self._memoria.popitem(last=False)
+
+    def registrar_omision(self) -> None:
+        """Cuenta una llamada que no pasó por el cache (TTL 0 / temperatura alta)"""
+        with self._lock:
+            self.stats["omitidas"] += 1
+
+    def purgar_expiradas(self) -> int:
+        """Elimina entradas expiradas de disco. Retorna cuántas se borraron."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE expira <= ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def limpiar(self) -> None:
+        """Vacía ambos niveles"""
+        with self._lock:
+            self._memoria.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Contadores de hits/misses y ratio de acierto"""
+        with self._lock:
+            hits = self.stats["hits_memoria"] + self.stats["hits_disco"]
+            total = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "entradas_memoria": len(self._memoria),
+                "hit_ratio": round(hits / total, 3) if total else 0.0,
+            }
+
+
+# Instancia global
+_llm_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Obtiene la instancia global del cache (storage/llm_cache.db)"""
+    global _llm_cache
+    if _llm_cache is None:
+        if os.getenv("LLM_CACHE_ENABLED", "true").lower() == "false":
+            _llm_cache = LLMCache(db_path=None, max_entradas=0)
+        else:
+            db_path = Path(__file__).parent.parent / "storage" / "llm_cache.db"
+            _llm_cache = LLMCache(db_path=str(db_path))
+    return _llm_cache
+
+
+def cached_create_sync(create: Callable[..., Any], sitio: str, **kwargs: Any) -> str:
+    """
+    Llama a `create(**kwargs)` (p. ej. `client.messages.create`) pasando por el cache.
+
+    Para los generadores síncronos que usan `anthropic.Anthropic` directamente.
+
+    Returns:
+        Texto de la primera parte de contenido de la respuesta
+    """
+    cache = get_llm_cache()
+    params = {k: v for k, v in kwargs.items() if k not in ("model", "system", "messages")}
+    ttl = cache.ttl_para(sitio, kwargs.get("temperature"))
+
+    if ttl <= 0:
+        cache.registrar_omision()
+        return create(**kwargs).content[0].text
+
+    clave = cache.clave(kwargs.get("model", ""), kwargs.get("system"), kwargs.get("messages", []), **params)
+    respuesta = cache.obtener(clave)
+    if respuesta is not None:
+        return respuesta
+
+    respuesta = create(**kwargs).content[0].text
+    cache.guardar(clave, respuesta, ttl)
+    return respuesta
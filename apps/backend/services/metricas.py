@@ -0,0 +1,323 @@
+"""
+Métricas y trazas del Campo Sagrado
+
+- Histogramas de latencia estilo HDR (log-lineales): 16 sub-buckets por
+  potencia de dos sobre microsegundos enteros → error relativo ≤ 6,25 %,
+  registro O(1) y memoria fija (< 500 contadores por serie)
+- Familias: peticiones HTTP por ruta, llamadas a Claude por modelo,
+  consultas SQL por operación, evaluación de cada ministerio y spans
+- Spans anidados con contextvars (atraviesan await, tareas y los hilos
+  que se lancen con `copy_context`): AgenteEstadoCero → RecopiladorContexto
+  → Orquestador7Capas → ClaudeClient
+- Muestreo: los histogramas se alimentan siempre; el árbol de spans solo
+  se guarda para una fracción METRICAS_MUESTREO de las trazas raíz
+  (p.ej. 0.01 en producción)
+
+Exportación en formato texto de Prometheus con `exportar_prometheus()`.
+"""
+
+import functools
+import inspect
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+PREFIJO = "campo_sagrado_"
+
+BITS_PRECISION = 4
+SUB_BUCKETS = 1 << BITS_PRECISION
+
+# Límites `le` (segundos) de la exportación a Prometheus
+LIMITES_PROMETHEUS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+MAX_TRAZAS = 100
+
+# nombre → (ayuda, etiquetas)
+FAMILIAS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "http_request_duration_seconds": ("Latencia de peticiones HTTP por ruta", ("method", "route", "status")),
+    "claude_request_duration_seconds": ("Latencia de llamadas a Claude por modelo", ("model", "resultado")),
+    "db_query_duration_seconds": ("Latencia de consultas SQL por operación", ("operacion",)),
+    "db_lock_wait_seconds": ("Espera por el bloqueo de escritura de SQLite", ("origen",)),
+    "ministerio_evaluacion_duration_seconds": ("Latencia de la evaluación de cada ministerio", ("ministerio",)),
+    "span_duration_seconds": ("Duración de spans instrumentados", ("span",)),
+}
+
+
+def _tasa_muestreo() -> float:
+    try:
+        return min(1.0, max(0.0, float(os.getenv("METRICAS_MUESTREO", "1.0"))))
+    except ValueError:
+        return 1.0
+
+
+# ==================== HISTOGRAMA ====================
+
+def _indice_bucket(valor: int) -> int:
+    """Índice log-lineal: exacto hasta 2·SUB_BUCKETS, luego SUB_BUCKETS por octava"""
+    desplazamiento = max(0, valor.bit_length() - BITS_PRECISION - 1)
+    return desplazamiento * SUB_BUCKETS + (valor >> desplazamiento)
+
+
+def _limite_superior(indice: int) -> int:
+    """Mayor valor (µs) que cae en el bucket `indice`"""
+    desplazamiento = max(0, indice // SUB_BUCKETS - 1)
+    mantisa = indice - desplazamiento * SUB_BUCKETS
+    return ((mantisa + 1) << desplazamiento) - 1
+
+
+class HistogramaLatencia:
+    """Histograma HDR de duraciones en microsegundos"""
+
+    __slots__ = ("conteos", "total", "suma_us", "maximo_us", "_lock")
+
+    def __init__(self):
+        self.conteos: List[int] = []
+        self.total = 0
+        self.suma_us = 0
+        self.maximo_us = 0
+        self._lock = threading.Lock()
+
+    def registrar(self, segundos: float):
+        valor = max(0, int(segundos * 1_000_000))
+        indice = _indice_bucket(valor)
+        with self._lock:
+            if indice >= len(self.conteos):
+                self.conteos.extend([0] * (indice + 1 - len(self.conteos)))
+            self.conteos[indice] += 1
+            self.total += 1
+            self.suma_us += valor
+            if valor > self.maximo_us:
+                self.maximo_us = valor
+
+    def percentil(self, p: float) -> float:
+        """Percentil `p` (0-100) en segundos"""
+        with self._lock:
+            if not self.total:
+                return 0.0
+            objetivo = max(1, int(self.total * p / 100 + 0.5))
+            acumulado = 0
+            for indice, conteo in enumerate(self.conteos):
+                acumulado += conteo
+                if acumulado >= objetivo:
+                    return min(_limite_superior(indice), self.maximo_us) / 1_000_000
+        return self.maximo_us / 1_000_000
+
+    def acumulados(self, limites: Tuple[float, ...] = LIMITES_PROMETHEUS) -> List[int]:
+        """Conteo acumulado por límite `le` (en segundos)"""
+        with self._lock:
+            conteos = list(self.conteos)
+        resultado = []
+        acumulado = 0
+        indice = 0
+        for limite in limites:
+            limite_us = limite * 1_000_000
+            while indice < len(conteos) and _limite_superior(indice) <= limite_us:
+                acumulado += conteos[indice]
+                indice += 1
+            resultado.append(acumulado)
+        return resultado
+
+    def resumen(self) -> Dict[str, float]:
+        return {
+            "total": self.total,
+            "p50_ms": round(self.percentil(50) * 1000, 3),
+            "p90_ms": round(self.percentil(90) * 1000, 3),
+            "p99_ms": round(self.percentil(99) * 1000, 3),
+            "max_ms": round(self.maximo_us / 1000, 3),
+        }
+
+
+# ==================== REGISTRO ====================
+
+class RegistroMetricas:
+    """Histogramas por familia y combinación de etiquetas"""
+
+    def __init__(self):
+        self._series: Dict[str, Dict[Tuple[str, ...], HistogramaLatencia]] = {nombre: {} for nombre in FAMILIAS}
+        self._lock = threading.Lock()
+
+    def histograma(self, familia: str, etiquetas: Tuple[str, ...]) -> HistogramaLatencia:
+        series = self._series[familia]
+        histograma = series.get(etiquetas)
+        if histograma is None:
+            with self._lock:
+                histograma = series.setdefault(etiquetas, HistogramaLatencia())
+        return histograma
+
+    def observar(self, familia: str, etiquetas: Tuple[str, ...], segundos: float):
+        self.histograma(familia, etiquetas).registrar(segundos)
+
+    def exportar_prometheus(self) -> str:
+        """Texto en formato de exposición de Prometheus (0.0.4)"""
+        lineas = []
+        for familia, (ayuda, nombres) in FAMILIAS.items():
+            nombre = PREFIJO + familia
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} histogram")
+            with self._lock:
+                series = list(self._series[familia].items())
+            for etiquetas, histograma in series:
+                base = ",".join(f'{n}="{_escapar(v)}"' for n, v in zip(nombres, etiquetas))
+                separador = "," if base else ""
+                for limite, acumulado in zip(LIMITES_PROMETHEUS, histograma.acumulados()):
+                    lineas.append(f'{nombre}_bucket{{{base}{separador}le="{limite}"}} {acumulado}')
+                lineas.append(f'{nombre}_bucket{{{base}{separador}le="+Inf"}} {histograma.total}')
+                lineas.append(f"{nombre}_sum{{{base}}} {histograma.suma_us / 1_000_000}")
+                lineas.append(f"{nombre}_count{{{base}}} {histograma.total}")
+        return "\n".join(lineas) + "\n"
+
+    def resumen(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Percentiles por familia y serie (para inspección rápida)"""
+        with self._lock:
+            copia = {familia: list(series.items()) for familia, series in self._series.items()}
+        return {
+            familia: {"|".join(etiquetas): histograma.resumen() for etiquetas, histograma in series}
+            for familia, series in copia.items()
+        }
+
+
+def _escapar(valor: Any) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+# ==================== SPANS ====================
+
+class Span:
+    """Nodo de una traza muestreada"""
+
+    __slots__ = ("nombre", "atributos", "inicio", "duracion", "hijos")
+
+    def __init__(self, nombre: str, atributos: Dict[str, Any]):
+        self.nombre = nombre
+        self.atributos = atributos
+        self.inicio = time.time()
+        self.duracion = 0.0
+        self.hijos: List["Span"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nombre": self.nombre,
+            "inicio": self.inicio,
+            "duracion_ms": round(self.duracion * 1000, 3),
+            "atributos": self.atributos,
+            "hijos": [hijo.to_dict() for hijo in self.hijos],
+        }
+
+
+# Fracción de trazas raíz muestreadas
+_tasa = _tasa_muestreo()
+
+# Span en curso: Span (traza muestreada), _SIN_MUESTREO o None (sin traza)
+_SIN_MUESTREO = object()
+_span_actual: ContextVar[Any] = ContextVar("span_actual", default=None)
+
+
+class span:
+    """
+    Mide un bloque y lo anida bajo el span en curso
+
+    Uso:
+        with span("contexto.7_capas", momento="fajr"):
+            ...
+        async with span("claude.generate", model=model):
+            ...
+    """
+
+    __slots__ = ("nombre", "atributos", "duracion", "_inicio", "_token", "_nodo")
+
+    def __init__(self, nombre: str, **atributos):
+        self.nombre = nombre
+        self.atributos = atributos
+        self.duracion = 0.0
+
+    def __enter__(self) -> "span":
+        padre = _span_actual.get()
+        if padre is None:
+            muestreada = random.random() < _tasa
+        else:
+            muestreada = padre is not _SIN_MUESTREO
+
+        self._nodo = Span(self.nombre, self.atributos) if muestreada else None
+        if self._nodo is not None and padre is not None:
+            padre.hijos.append(self._nodo)
+        self._token = _span_actual.set(self._nodo if muestreada else _SIN_MUESTREO)
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza) -> bool:
+        duracion = self.duracion = time.perf_counter() - self._inicio
+        _span_actual.reset(self._token)
+        registro.observar("span_duration_seconds", (self.nombre,), duracion)
+
+        if self._nodo is not None:
+            self._nodo.duracion = duracion
+            if tipo is not None:
+                self._nodo.atributos["error"] = tipo.__name__
+            if _span_actual.get() is None:
+                _trazas.append(self._nodo)
+        return False
+
+    async def __aenter__(self) -> "span":
+        return self.__enter__()
+
+    async def __aexit__(self, tipo, valor, traza) -> bool:
+        return self.__exit__(tipo, valor, traza)
+
+    def renombrar(self, nombre: str):
+        """Cambia el nombre en la traza (p.ej. cuando la ruta se conoce al final)"""
+        self.nombre = nombre
+        if self._nodo is not None:
+            self._nodo.nombre = nombre
+
+
+def trazar(nombre: Optional[str] = None) -> Callable:
+    """Decorador: ejecuta la función (sync o async) dentro de un span"""
+    def decorador(funcion: Callable) -> Callable:
+        nombre_span = nombre or funcion.__qualname__
+
+        if inspect.iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura_async(*args, **kwargs):
+                with span(nombre_span):
+                    return await funcion(*args, **kwargs)
+            return envoltura_async
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with span(nombre_span):
+                return funcion(*args, **kwargs)
+        return envoltura
+
+    return decorador
+
+
+def configurar_muestreo(tasa: float):
+    """Fracción de trazas raíz cuyo árbol de spans se conserva (0-1)"""
+    global _tasa
+    _tasa = min(1.0, max(0.0, tasa))
+
+
+def trazas_recientes(limite: int = 20) -> List[Dict[str, Any]]:
+    """Últimas trazas muestreadas (más reciente primero)"""
+    return [traza.to_dict() for traza in list(_trazas)[-limite:][::-1]]
+
+
+# Instancia global
+registro = RegistroMetricas()
+_trazas: Deque[Span] = deque(maxlen=MAX_TRAZAS)
+
+
+def observar(familia: str, etiquetas: Tuple[str, ...], segundos: float):
+    """Registra una duración en la familia indicada"""
+    registro.observar(familia, etiquetas, segundos)
+
+
+def exportar_prometheus() -> str:
+    return registro.exportar_prometheus()
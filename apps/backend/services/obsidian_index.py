@@ -0,0 +1,253 @@
+"""
+Índice persistente e incremental del vault de Obsidian
+
+Guarda en SQLite las notas parseadas junto con (mtime, tamaño, hash del
+contenido). Un re-escaneo solo hace `stat` de cada archivo:
+- Sin cambios de mtime/tamaño → se reutiliza la nota indexada
+- Cambió mtime/tamaño pero no el hash → solo se actualiza el stat
+- Cambió el contenido → se re-parsea
+- Ya no existe → se elimina del índice
+
+Las notas viven además en memoria, así que `listar_notas` responde en
+milisegundos; el re-escaneo se limita a uno cada `intervalo_rescan` segundos.
+
+Filtros: los mismos que `ObsidianParser.listar_notas` sin índice (archivos
+ocultos y rutas con "templates"), más las carpetas internas de Obsidian
+(`.obsidian`, `.trash`), que nunca contienen notas del vault. El resto de
+carpetas con punto (p.ej. `.diario`) sí se indexan.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from services.obsidian_parser import NotaObsidian, ObsidianParser
+
+
+INDEX_DB_PATH = Path(__file__).parent.parent / "storage" / "obsidian_index.db"
+
+# Carpetas internas de Obsidian (configuración y papelera): no se recorren
+DIRECTORIOS_EXCLUIDOS = {".obsidian", ".trash"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notas (
+    vault TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    titulo TEXT NOT NULL,
+    contenido TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    enlaces TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    PRIMARY KEY (vault, filepath)
+);
+"""
+
+
+def _json_default(valor):
+    # YAML produce date/datetime: preservar el tipo al recargar
+    if isinstance(valor, datetime):
+        return {"__datetime__": valor.isoformat()}
+    if isinstance(valor, date):
+        return {"__date__": valor.isoformat()}
+    return str(valor)
+
+
+def _json_hook(obj: Dict):
+    if "__datetime__" in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj and len(obj) == 1:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class IndiceVaultObsidian:
+    """Índice de notas de un vault, persistido en SQLite y cacheado en memoria"""
+
+    def __init__(
+        self,
+        parser: ObsidianParser,
+        db_path: Path = INDEX_DB_PATH,
+        intervalo_rescan: float = 5.0
+    ):
+        self.parser = parser
+        self.vault_path = parser.vault_path
+        self.vault_key = str(self.vault_path.resolve())
+        self.intervalo_rescan = intervalo_rescan
+
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+        # filepath relativo → (mtime_ns, size, sha256, nota)
+        self._entradas: Dict[str, Tuple[int, int, str, NotaObsidian]] = {}
+        self._ultimo_scan = 0.0
+        self._cargar_desde_db()
+
+    # ==================== CARGA ====================
+
+    def _cargar_desde_db(self):
+        filas = self._conn.execute(
+            """
+            SELECT filepath, mtime_ns, size, sha256, titulo, contenido, metadata, enlaces, tags
+            FROM notas WHERE vault = ?
+            """,
+            (self.vault_key,)
+        ).fetchall()
+
+        for filepath, mtime_ns, size, sha, titulo, contenido, metadata, enlaces, tags in filas:
+            nota = NotaObsidian(
+                filepath=filepath,
+                titulo=titulo,
+                contenido=contenido,
+                metadata=json.loads(metadata, object_hook=_json_hook),
+                enlaces=json.loads(enlaces),
+                tags=json.loads(tags)
+            )
+            self._entradas[filepath] = (mtime_ns, size, sha, nota)
+
+    # ==================== ESCANEO ====================
+
+    def _recorrer(self, extension: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """Recorre el vault con os.scandir (sin rglob), aplicando los filtros del parser"""
+        pendientes = [self.vault_path]
+        while pendientes:
+            directorio = pendientes.pop()
+            try:
+                with os.scandir(directorio) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in DIRECTORIOS_EXCLUIDOS:
+                                pendientes.append(Path(entry.path))
+                        elif entry.name.startswith('.'):
+                            continue
+                        elif entry.name.endswith(extension):
+                            if 'templates' in entry.path.lower():
+                                continue
+                            relativo = str(Path(entry.path).relative_to(self.vault_path))
+                            yield relativo, entry.stat()
+            except OSError as e:
+                print(f"⚠️ Error leyendo {directorio}: {e}")
+
+    def sincronizar(self, extension: str = ".md", forzar: bool = False) -> Dict[str, int]:
+        """
+        Re-escanea el vault y actualiza solo lo que cambió
+
+        Args:
+            extension: Extensión de las notas
+            forzar: Ignorar `intervalo_rescan`
+
+        Returns:
+            Contadores {nuevas, modificadas, eliminadas, sin_cambios}
+        """
+        with self._lock:
+            if not forzar and time.monotonic() - self._ultimo_scan < self.intervalo_rescan:
+                return {"nuevas": 0, "modificadas": 0, "eliminadas": 0, "sin_cambios": len(self._entradas)}
+
+            stats = {"nuevas": 0, "modificadas": 0, "eliminadas": 0, "sin_cambios": 0}
+            vistos = set()
+            upserts = []
+            solo_stat = []
+
+            for relativo, st in self._recorrer(extension):
+                vistos.add(relativo)
+                anterior = self._entradas.get(relativo)
+
+                if anterior and anterior[0] == st.st_mtime_ns and anterior[1] == st.st_size:
+                    stats["sin_cambios"] += 1
+                    continue
+
+                try:
+                    contenido_bytes = (self.vault_path / relativo).read_bytes()
+                except OSError as e:
+                    print(f"⚠️ Error leyendo {relativo}: {e}")
+                    continue
+                sha = hashlib.sha256(contenido_bytes).hexdigest()
+
+                if anterior and anterior[2] == sha:
+                    # Tocado pero idéntico (p.ej. sync de iCloud): no re-parsear
+                    self._entradas[relativo] = (st.st_mtime_ns, st.st_size, sha, anterior[3])
+                    solo_stat.append((st.st_mtime_ns, st.st_size, self.vault_key, relativo))
+                    stats["sin_cambios"] += 1
+                    continue
+
+                nota = self.parser.parsear_contenido(
+                    contenido_bytes.decode('utf-8', errors='replace'),
+                    self.vault_path / relativo
+                )
+                if nota is None:
+                    continue
+
+                self._entradas[relativo] = (st.st_mtime_ns, st.st_size, sha, nota)
+                upserts.append((
+                    self.vault_key, relativo, st.st_mtime_ns, st.st_size, sha,
+                    nota.titulo, nota.contenido,
+                    json.dumps(nota.metadata, ensure_ascii=False, default=_json_default),
+                    json.dumps(nota.enlaces, ensure_ascii=False),
+                    json.dumps(nota.tags, ensure_ascii=False),
+                ))
+                stats["modificadas" if anterior else "nuevas"] += 1
+
+            eliminadas = [fp for fp in self._entradas if fp not in vistos]
+            for fp in eliminadas:
+                del self._entradas[fp]
+            stats["eliminadas"] = len(eliminadas)
+
+            if upserts or solo_stat or eliminadas:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO notas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        upserts
+                    )
+                    self._conn.executemany(
+                        "UPDATE notas SET mtime_ns = ?, size = ? WHERE vault = ? AND filepath = ?",
+                        solo_stat
+                    )
+                    self._conn.executemany(
+                        "DELETE FROM notas WHERE vault = ? AND filepath = ?",
+                        [(self.vault_key, fp) for fp in eliminadas]
+                    )
+
+            self._ultimo_scan = time.monotonic()
+            return stats
+
+    # ==================== CONSULTA ====================
+
+    def listar_notas(self, extension: str = ".md") -> List[NotaObsidian]:
+        """Notas actuales del vault (re-escaneo incremental si toca)"""
+        self.sincronizar(extension)
+        with self._lock:
+            return [entrada[3] for entrada in self._entradas.values()]
+
+    def obtener_nota(self, filepath: str) -> Optional[NotaObsidian]:
+        """Nota por filepath relativo al vault, sin recorrer la lista"""
+        self.sincronizar()
+        entrada = self._entradas.get(filepath)
+        return entrada[3] if entrada else None
+
+
+# Un índice por vault en el proceso
+_indices: Dict[str, IndiceVaultObsidian] = {}
+_indices_lock = threading.Lock()
+
+
+def obtener_indice(parser: ObsidianParser) -> IndiceVaultObsidian:
+    """Obtiene (o crea) el índice compartido del vault del parser"""
+    clave = str(parser.vault_path.resolve())
+    with _indices_lock:
+        indice = _indices.get(clave)
+        if indice is None:
+            indice = IndiceVaultObsidian(parser)
+            _indices[clave] = indice
+        return indice
@@ -3,10 +3,12 @@ Parser avanzado de Obsidian Vault
 Lee notas, extrae metadata, identifica enlaces, asigna dimensiones
 """
 
+import heapq
 import os
 import re
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Union
 from datetime import datetime
 import yaml
 
@@ -143,8 +145,17 @@ class ObsidianParser:
         if not self.vault_path.exists():
             raise ValueError(f"Vault no encontrado en: {vault_path}")
     
-    def listar_notas(self, extension: str = ".md") -> List[NotaObsidian]:
-        """Lista todas las notas del vault"""
+    def listar_notas(self, extension: str = ".md", usar_indice: bool = True) -> List[NotaObsidian]:
+        """
+        Lista todas las notas del vault
+        
+        Por defecto usa el índice persistente (services/obsidian_index.py):
+        solo se re-parsean las notas que cambiaron desde el último escaneo.
+        """
+        if usar_indice:
+            from services.obsidian_index import obtener_indice
+            return obtener_indice(self).listar_notas(extension)
+        
         notas = []
         
         for archivo in self.vault_path.rglob(f"*{extension}"):
@@ -167,7 +178,15 @@ class ObsidianParser:
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 contenido_completo = f.read()
-            
+        except Exception as e:
+            print(f"Error parseando {filepath}: {e}")
+            return None
+        
+        return self.parsear_contenido(contenido_completo, filepath)
+    
+    def parsear_contenido(self, contenido_completo: str, filepath: Path) -> Optional[NotaObsidian]:
+        """Parsea el contenido ya leído de una nota"""
+        try:
             # Extraer frontmatter YAML
             metadata = self._extraer_frontmatter(contenido_completo)
             
@@ -232,25 +251,22 @@ class ObsidianParser:
     
     def obtener_grafo_enlaces(self, notas: List[NotaObsidian]) -> Dict[str, List[str]]:
         """Crea un grafo de enlaces entre notas"""
-        grafo = {}
-        
-        # Crear mapa de títulos a filepath
-        titulo_a_filepath = {nota.titulo: nota.filepath for nota in notas}
-        
-        for nota in notas:
-            enlaces_reales = []
-            
-            for enlace in nota.enlaces:
-                # Buscar nota enlazada
-                if enlace in titulo_a_filepath:
-                    enlaces_reales.append(titulo_a_filepath[enlace])
-            
-            grafo[nota.filepath] = enlaces_reales
-        
-        return grafo
+        return self.construir_grafo(notas).adelante
     
-    def obtener_backlinks(self, filepath: str, grafo: Dict[str, List[str]]) -> List[str]:
+    def construir_grafo(self, notas: List[NotaObsidian]) -> "GrafoEnlaces":
+        """Construye el grafo con índice de backlinks en una sola pasada"""
+        return GrafoEnlaces(notas)
+    
+    def obtener_backlinks(
+        self,
+        filepath: str,
+        grafo: Union["GrafoEnlaces", Dict[str, List[str]]]
+    ) -> List[str]:
         """Obtiene lista de notas que enlazan a esta nota"""
+        if isinstance(grafo, GrafoEnlaces):
+            return grafo.backlinks(filepath)
+        
+        # Grafo como dict (compatibilidad): recorrido completo
         backlinks = []
         
         for nota_origen, enlaces in grafo.items():
@@ -259,42 +275,31 @@ class ObsidianParser:
         
         return backlinks
     
-    def identificar_hubs(self, notas: List[NotaObsidian], min_enlaces: int = 3) -> List[NotaObsidian]:
-        """Identifica notas hub (muchos enlaces)"""
-        grafo = self.obtener_grafo_enlaces(notas)
-        
-        hubs = []
-        for nota in notas:
-            backlinks = self.obtener_backlinks(nota.filepath, grafo)
-            total_conexiones = len(nota.enlaces) + len(backlinks)
-            
-            if total_conexiones >= min_enlaces:
-                hubs.append(nota)
-        
-        # Ordenar por número de conexiones
-        hubs.sort(key=lambda n: len(n.enlaces) + len(self.obtener_backlinks(n.filepath, grafo)), reverse=True)
-        
-        return hubs
+    def identificar_hubs(
+        self,
+        notas: List[NotaObsidian],
+        min_enlaces: int = 3,
+        grafo: Optional["GrafoEnlaces"] = None
+    ) -> List[NotaObsidian]:
+        """Identifica notas hub (muchos enlaces), ordenadas por conexiones"""
+        grafo = grafo or self.construir_grafo(notas)
+        return grafo.hubs(min_enlaces)
     
-    def identificar_orphans(self, notas: List[NotaObsidian]) -> List[NotaObsidian]:
+    def identificar_orphans(
+        self,
+        notas: List[NotaObsidian],
+        grafo: Optional["GrafoEnlaces"] = None
+    ) -> List[NotaObsidian]:
         """Identifica notas huérfanas (sin enlaces)"""
-        grafo = self.obtener_grafo_enlaces(notas)
-        
-        orphans = []
-        for nota in notas:
-            backlinks = self.obtener_backlinks(nota.filepath, grafo)
-            
-            if len(nota.enlaces) == 0 and len(backlinks) == 0:
-                orphans.append(nota)
-        
-        return orphans
+        grafo = grafo or self.construir_grafo(notas)
+        return grafo.orphans()
     
     def obtener_estadisticas(self, notas: List[NotaObsidian]) -> Dict:
         """Obtiene estadísticas del vault"""
         if not notas:
             return {}
         
-        grafo = self.obtener_grafo_enlaces(notas)
+        grafo = self.construir_grafo(notas)
         
         # Contar por dimensión
         por_dimension = {}
@@ -312,11 +317,110 @@ class ObsidianParser:
             'promedio_enlaces_por_nota': round(total_enlaces / len(notas), 2),
             'promedio_caracteres_por_nota': round(total_caracteres / len(notas)),
             'por_dimension': por_dimension,
-            'hubs': len(self.identificar_hubs(notas)),
-            'orphans': len(self.identificar_orphans(notas))
+            'hubs': len(grafo.hubs()),
+            'orphans': len(grafo.orphans()),
+            'componentes': len(grafo.componentes())
         }
 
 
+class GrafoEnlaces:
+    """
+    Grafo de enlaces del vault con adyacencia directa e inversa
+    
+    Se construye en O(V+E) y responde backlinks y grado en O(1);
+    hubs, orphans y componentes conexas en O(V+E).
+    
+    Conexiones de una nota = enlaces escritos (incluye los que no resuelven
+    a ninguna nota) + notas distintas que la enlazan.
+    """
+    
+    def __init__(self, notas: List[NotaObsidian]):
+        self.notas: Dict[str, NotaObsidian] = {}
+        self.adelante: Dict[str, List[str]] = {}
+        self.atras: Dict[str, List[str]] = {}
+        
+        # Mapa de títulos a filepath
+        titulo_a_filepath = {nota.titulo: nota.filepath for nota in notas}
+        
+        for nota in notas:
+            self.notas[nota.filepath] = nota
+            self.atras.setdefault(nota.filepath, [])
+        
+        for nota in notas:
+            enlaces_reales = []
+            vistos: Set[str] = set()
+            
+            for enlace in nota.enlaces:
+                destino = titulo_a_filepath.get(enlace)
+                if destino is None:
+                    continue
+                enlaces_reales.append(destino)
+                if destino not in vistos:
+                    vistos.add(destino)
+                    self.atras[destino].append(nota.filepath)
+            
+            self.adelante[nota.filepath] = enlaces_reales
+    
+    def backlinks(self, filepath: str) -> List[str]:
+        """Notas que enlazan a esta nota"""
+        return list(self.atras.get(filepath, []))
+    
+    def grado(self, filepath: str) -> int:
+        """Conexiones totales de la nota (salientes + backlinks)"""
+        nota = self.notas.get(filepath)
+        if nota is None:
+            return 0
+        return len(nota.enlaces) + len(self.atras[filepath])
+    
+    def hubs(self, min_enlaces: int = 3, top: Optional[int] = None) -> List[NotaObsidian]:
+        """Notas con al menos `min_enlaces` conexiones, de más a menos conectadas"""
+        candidatos = [
+            (self.grado(filepath), nota)
+            for filepath, nota in self.notas.items()
+            if self.grado(filepath) >= min_enlaces
+        ]
+        
+        if top is not None:
+            mejores = heapq.nlargest(top, candidatos, key=lambda c: c[0])
+        else:
+            mejores = sorted(candidatos, key=lambda c: c[0], reverse=True)
+        
+        return [nota for _, nota in mejores]
+    
+    def orphans(self) -> List[NotaObsidian]:
+        """Notas sin enlaces salientes ni backlinks"""
+        return [
+            nota for filepath, nota in self.notas.items()
+            if not nota.enlaces and not self.atras[filepath]
+        ]
+    
+    def componentes(self) -> List[List[str]]:
+        """Componentes conexas (enlaces sin dirección), de mayor a menor"""
+        visitadas: Set[str] = set()
+        componentes = []
+        
+        for inicio in self.notas:
+            if inicio in visitadas:
+                continue
+            
+            visitadas.add(inicio)
+            componente = []
+            pendientes = deque([inicio])
+            
+            while pendientes:
+                actual = pendientes.popleft()
+                componente.append(actual)
+                for vecino in self.adelante[actual] + self.atras[actual]:
+                    if vecino not in visitadas:
+                        visitadas.add(vecino)
+                        pendientes.append(vecino)
+            
+            componentes.append(componente)
+        
+        componentes.sort(key=len, reverse=True)
+        return componentes
+
+
 # Función de utilidad
 def asignar_dimension_automatica(texto: str, tags: List[str] = None) -> str:
     """
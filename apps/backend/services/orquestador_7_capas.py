@@ -15,21 +15,45 @@ ARQUITECTURA DE LAS 7 CAPAS (de sutil a denso):
 
 Cada capa puede estar "activa" o "latente". El orquestador identifica
 cuáles están más resonantes y proporciona contexto rico sin determinar.
+
+Las capas que cambian poco (social, energética, mental, cósmica) se
+reutilizan durante TTL_CAPAS segundos mientras no cambie su clave (fecha,
+hora o versión del perfil); las que hacen E/S (emocional) se lanzan en un
+hilo en paralelo con el resto. La respuesta incluye el tiempo de cada capa.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 from pathlib import Path
+import contextvars
 import json
+import threading
+import time
 
 from models.estado_biologico import EstadoBiologico, crear_estado_rapido
-from models.diseno_humano import crear_diseno_daniel, cargar_diseno_desde_config
+from models.diseno_humano import crear_diseno_daniel
 from models.estado_emocional import EstadoEmocional, TrackerEmocional, EstadoEmocionalTipo
 from models.contexto_social import cargar_contexto_social_desde_config
-from models.tipologia_cognitiva import crear_perfil_entp_5w4, cargar_perfil_cognitivo_desde_config
+from models.tipologia_cognitiva import crear_perfil_entp_5w4
+from services.cache_perfiles import get_cache_perfiles
+from services.metricas import trazar
 # from services.calculador_cosmico import obtener_contexto_cosmico  # Archivado en Phase 3
 
 
+# Segundos que se reutiliza cada capa cacheable (si su clave no cambia antes)
+TTL_CAPAS = {
+    "2_social": 3600.0,
+    "4_energetica": 3600.0,
+    "6_mental": 3600.0,
+    "7_cosmica": 3600.0,
+}
+
+# Capas con E/S de archivos: se calculan en el pool, en paralelo con el resto
+CAPAS_EN_HILO = ("5_emocional",)
+MAX_HILOS_CAPAS = 4
+
+
 class Orquestador7Capas:
     """
     Orquestador maestro que recopila las 7 capas y determina
@@ -46,6 +70,12 @@ class Orquestador7Capas:
         self.longitud = longitud
         self.perfil_path = perfil_path or Path(__file__).parent.parent / "storage" / "configuracion_usuario.json"
 
+        # capa → (clave, instante, resultado)
+        self._capas: Dict[str, Tuple[Hashable, float, Dict]] = {}
+        self._capas_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @trazar("orquestador_7_capas.recopilar_capa_1_fisica")
     def recopilar_capa_1_fisica(
         self,
         momento: str,
@@ -108,6 +138,7 @@ class Orquestador7Capas:
             "activa": True  # Siempre activa
         }
 
+    @trazar("orquestador_7_capas.recopilar_capa_2_social")
     def recopilar_capa_2_social(
         self,
         fecha_hora: Optional[datetime] = None
@@ -144,6 +175,7 @@ class Orquestador7Capas:
             "activa": activa
         }
 
+    @trazar("orquestador_7_capas.recopilar_capa_3_biologica")
     def recopilar_capa_3_biologica(
         self,
         energia: Optional[int] = None,
@@ -168,13 +200,14 @@ class Orquestador7Capas:
             "activa": estado.esta_activa()
         }
 
+    @trazar("orquestador_7_capas.recopilar_capa_4_energetica")
     def recopilar_capa_4_energetica(self) -> Dict:
         """CAPA 4: Diseño Humano (MEJORADO)"""
         try:
-            # Intentar cargar desde config, si no existe usar default de Daniel
-            dh = cargar_diseno_desde_config(str(self.perfil_path))
-            if dh is None:
-                dh = crear_diseno_daniel()
+            # Desde config (cacheado e inmutable), si no existe usar default de Daniel
+            dh = get_cache_perfiles().diseno_humano(
+                ruta=self.perfil_path, por_defecto=crear_diseno_daniel
+            )
 
             return {
                 "tipo": dh.tipo.value,
@@ -200,6 +233,7 @@ class Orquestador7Capas:
                 "activa": True
             }
 
+    @trazar("orquestador_7_capas.recopilar_capa_5_emocional")
     def recopilar_capa_5_emocional(
         self,
         estado_emocional: Optional[str] = None,
@@ -252,6 +286,7 @@ class Orquestador7Capas:
                 "necesita_atencion": False
             }
 
+    @trazar("orquestador_7_capas.recopilar_capa_6_mental")
     def recopilar_capa_6_mental(
         self,
         fecha_hora: Optional[datetime] = None,
@@ -262,10 +297,10 @@ class Orquestador7Capas:
             fecha_hora = datetime.now()
 
         try:
-            # Intentar cargar perfil cognitivo, si no existe usar default ENTP 5w4
-            perfil = cargar_perfil_cognitivo_desde_config(str(self.perfil_path))
-            if perfil is None:
-                perfil = crear_perfil_entp_5w4()
+            # Perfil cognitivo desde config (cacheado), si no existe usar default ENTP 5w4
+            perfil = get_cache_perfiles().perfil_cognitivo(
+                ruta=self.perfil_path, por_defecto=crear_perfil_entp_5w4
+            )
 
             # Generar contexto mental completo
             contexto = perfil.generar_contexto_mental(
@@ -305,6 +340,7 @@ class Orquestador7Capas:
                 "activa": funcion_activa in ["Ne", "Si"]
             }
 
+    @trazar("orquestador_7_capas.recopilar_capa_7_cosmica")
     def recopilar_capa_7_cosmica(
         self,
         fecha_hora: Optional[datetime] = None
@@ -332,6 +368,7 @@ class Orquestador7Capas:
 
         return contexto
 
+    @trazar("orquestador_7_capas.recopilar_todo")
     def recopilar_todo(
         self,
         momento: str,
@@ -352,18 +389,26 @@ class Orquestador7Capas:
         if fecha_hora is None:
             fecha_hora = datetime.now()
 
+        version_perfiles = get_cache_perfiles().version(ruta=self.perfil_path)
+
+        # capa → (clave de invalidación, cálculo)
+        tareas = {
+            "1_fisica": (None, lambda: self.recopilar_capa_1_fisica(momento, fecha_hora)),
+            "2_social": (fecha_hora.date(), lambda: self.recopilar_capa_2_social(fecha_hora)),
+            "3_biologica": (None, lambda: self.recopilar_capa_3_biologica(energia, calidad_sueno, resonancia_corporal)),
+            "4_energetica": (version_perfiles, self.recopilar_capa_4_energetica),
+            "5_emocional": (None, lambda: self.recopilar_capa_5_emocional(estado_emocional, intensidad_emocional, momento, usuario_id)),
+            "6_mental": ((version_perfiles, fecha_hora.hour), lambda: self.recopilar_capa_6_mental(fecha_hora)),
+            "7_cosmica": (fecha_hora.date(), lambda: self.recopilar_capa_7_cosmica(fecha_hora))
+        }
+        capas, tiempos, cacheadas = self._recopilar_capas(tareas)
+
         contexto_completo = {
             "timestamp": fecha_hora.isoformat(),
             "momento_liturgico": momento,
-            "capas": {
-                "1_fisica": self.recopilar_capa_1_fisica(momento, fecha_hora),
-                "2_social": self.recopilar_capa_2_social(fecha_hora),
-                "3_biologica": self.recopilar_capa_3_biologica(energia, calidad_sueno, resonancia_corporal),
-                "4_energetica": self.recopilar_capa_4_energetica(),
-                "5_emocional": self.recopilar_capa_5_emocional(estado_emocional, intensidad_emocional, momento, usuario_id),
-                "6_mental": self.recopilar_capa_6_mental(fecha_hora),
-                "7_cosmica": self.recopilar_capa_7_cosmica(fecha_hora)
-            }
+            "capas": capas,
+            "tiempos_capas_ms": tiempos,
+            "capas_cacheadas": cacheadas
         }
 
         # Identificar capas activas
@@ -377,6 +422,78 @@ class Orquestador7Capas:
 
         return contexto_completo
 
+    def _recopilar_capas(
+        self,
+        tareas: Dict[str, Tuple[Hashable, Callable[[], Dict]]]
+    ) -> Tuple[Dict[str, Dict], Dict[str, float], List[str]]:
+        """
+        Calcula las capas: primero lanza las de E/S al pool, luego resuelve
+        el resto en este hilo (desde cache si están vigentes) y por último
+        recoge las del pool.
+
+        Returns:
+            (capas en el orden de `tareas`, milisegundos por capa, capas servidas desde cache)
+        """
+        capas: Dict[str, Dict] = {}
+        tiempos: Dict[str, float] = {}
+        cacheadas: List[str] = []
+
+        pendientes = {}
+        for nombre, (_, calcular) in tareas.items():
+            if nombre in CAPAS_EN_HILO:
+                # copy_context: los spans del hilo cuelgan de la traza actual
+                pendientes[nombre] = self._obtener_executor().submit(
+                    contextvars.copy_context().run, _medir, calcular
+                )
+
+        for nombre, (clave, calcular) in tareas.items():
+            if nombre in pendientes:
+                continue
+            inicio = time.perf_counter()
+            capa = self._capa_vigente(nombre, clave)
+            if capa is not None:
+                capas[nombre] = capa
+                tiempos[nombre] = (time.perf_counter() - inicio) * 1000
+                cacheadas.append(nombre)
+                continue
+
+            capas[nombre], tiempos[nombre] = _medir(calcular)
+            if nombre in TTL_CAPAS:
+                with self._capas_lock:
+                    self._capas[nombre] = (clave, time.monotonic(), capas[nombre])
+
+        for nombre, futuro in pendientes.items():
+            capas[nombre], tiempos[nombre] = futuro.result()
+
+        return (
+            {nombre: capas[nombre] for nombre in tareas},
+            {nombre: round(tiempos[nombre], 3) for nombre in tareas},
+            cacheadas
+        )
+
+    def _capa_vigente(self, nombre: str, clave: Hashable) -> Optional[Dict]:
+        ttl = TTL_CAPAS.get(nombre)
+        if ttl is None:
+            return None
+        with self._capas_lock:
+            entrada = self._capas.get(nombre)
+            if entrada is None:
+                return None
+            if entrada[0] != clave or time.monotonic() - entrada[1] > ttl:
+                del self._capas[nombre]
+                return None
+            return entrada[2]
+
+    def _obtener_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_HILOS_CAPAS, thread_name_prefix="capa")
+        return self._executor
+
+    def invalidar_capas(self):
+        """Descarta las capas cacheadas (se recalculan en la próxima recopilación)"""
+        with self._capas_lock:
+            self._capas.clear()
+
     def generar_sintesis_narrativa(self, contexto_completo: Dict) -> str:
         """
         Genera síntesis narrativa del contexto de las 7 capas.
@@ -470,8 +587,34 @@ class Orquestador7Capas:
         return dominios[:3]
 
 
+def _medir(calcular: Callable[[], Dict]) -> Tuple[Dict, float]:
+    """Resultado de la capa y milisegundos que tardó"""
+    inicio = time.perf_counter()
+    resultado = calcular()
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
 # === FUNCIÓN PÚBLICA ===
 
+# Orquestadores por ubicación (sin estado por petición: se reutilizan)
+_orquestadores: Dict[tuple, Orquestador7Capas] = {}
+MAX_ORQUESTADORES = 32
+
+
+def get_orquestador(
+    latitud: float = 40.4168,
+    longitud: float = -3.7038
+) -> Orquestador7Capas:
+    """Obtiene el orquestador compartido para una ubicación"""
+    clave = (latitud, longitud)
+    orquestador = _orquestadores.get(clave)
+    if orquestador is None:
+        if len(_orquestadores) >= MAX_ORQUESTADORES:
+            _orquestadores.clear()
+        orquestador = _orquestadores.setdefault(clave, Orquestador7Capas(latitud, longitud))
+    return orquestador
+
+
 def obtener_contexto_7_capas(
     momento: str,
     latitud: float = 40.4168,
@@ -490,7 +633,7 @@ def obtener_contexto_7_capas(
     Returns:
         Dict con las 7 capas + síntesis + dominios
     """
-    orquestador = Orquestador7Capas(latitud, longitud)
+    orquestador = get_orquestador(latitud, longitud)
     contexto = orquestador.recopilar_todo(momento, **kwargs)
 
     # Agregar síntesis y dominios
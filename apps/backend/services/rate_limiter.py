@@ -1,82 +1,234 @@
 """
 Rate Limiter para proteger endpoints de Campo Sagrado
 Previene abuso y ataques DDoS
+
+Token bucket en su forma GCRA (Generic Cell Rate Algorithm): por cada
+clave se guarda un único entero, el "tiempo teórico de llegada" (TAT) en
+nanosegundos. Cada comprobación es O(1) y no hay listas de timestamps.
+
+Backends:
+- BackendMemoria (por defecto): dict por shard con su propio lock, LRU
+  acotada y reloj monotónico
+- BackendSQLite: archivo compartido, para que los límites se mantengan
+  entre varios workers de uvicorn (RATE_LIMIT_BACKEND=sqlite). Puede
+  esperar al bloqueo del archivo: desde código async se comprueba con
+  `check_rate_limit_async`, que lo ejecuta en un hilo
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional
-from collections import defaultdict
 import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, Optional, Tuple
+
+
+RATE_LIMIT_DB_PATH = Path(__file__).parent.parent / "storage" / "rate_limit.db"
+
+NUM_SHARDS = 16
+MAX_CLAVES_POR_SHARD = 8192
+
+NS_POR_SEGUNDO = 1_000_000_000
+
+
+def _gcra(tat: Optional[int], ahora: int, intervalo: int, periodo: int) -> Tuple[bool, int]:
+    """
+    Un paso de GCRA
+
+    Args:
+        tat: Tiempo teórico de llegada guardado (None si la clave es nueva)
+        ahora: Instante actual (ns)
+        intervalo: Nanosegundos que "cuesta" una petición (periodo / max)
+        periodo: Ventana en ns (capacidad del bucket)
+
+    Returns:
+        (permitido, nuevo_tat); si no se permite, nuevo_tat es el TAT que
+        habría resultado (sirve para calcular el tiempo de espera)
+    """
+    nuevo_tat = max(tat or ahora, ahora) + intervalo
+    return nuevo_tat - ahora <= periodo, nuevo_tat
+
+
+# ==================== BACKENDS ====================
+
+class BackendMemoria:
+    """Estado en memoria del proceso, repartido en shards con lock propio"""
+
+    bloqueante = False  # O(1) sin E/S: se comprueba en el propio event loop
+
+    def __init__(self, num_shards: int = NUM_SHARDS, max_claves_por_shard: int = MAX_CLAVES_POR_SHARD):
+        self.max_claves_por_shard = max_claves_por_shard
+        self._shards = [OrderedDict() for _ in range(num_shards)]
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+
+    @staticmethod
+    def reloj() -> int:
+        return time.monotonic_ns()
+
+    def consumir(self, clave: Hashable, ahora: int, intervalo: int, periodo: int) -> Tuple[bool, int]:
+        i = hash(clave) % len(self._shards)
+        shard = self._shards[i]
+        with self._locks[i]:
+            permitido, nuevo_tat = _gcra(shard.get(clave), ahora, intervalo, periodo)
+            if permitido:
+                shard[clave] = nuevo_tat
+                shard.move_to_end(clave)
+                if len(shard) > self.max_claves_por_shard:
+                    shard.popitem(last=False)
+        return permitido, nuevo_tat
+
+    def limpiar(self, ahora: int) -> int:
+        """Elimina claves con el bucket ya lleno (TAT en el pasado)"""
+        eliminadas = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                for clave in [c for c, tat in shard.items() if tat <= ahora]:
+                    del shard[clave]
+                    eliminadas += 1
+        return eliminadas
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class BackendSQLite:
+    """
+    Estado compartido entre procesos en un archivo SQLite
+
+    Usa reloj de pared (time.time_ns): el monotónico no es comparable entre
+    procesos. Cada comprobación es una transacción BEGIN IMMEDIATE.
+    """
+
+    bloqueante = True  # BEGIN IMMEDIATE puede esperar hasta busy_timeout
 
+    def __init__(self, db_path: Path = RATE_LIMIT_DB_PATH):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=2000")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS buckets (clave TEXT PRIMARY KEY, tat INTEGER NOT NULL)")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def reloj() -> int:
+        return time.time_ns()
+
+    def consumir(self, clave: Hashable, ahora: int, intervalo: int, periodo: int) -> Tuple[bool, int]:
+        clave = repr(clave)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                fila = self._conn.execute("SELECT tat FROM buckets WHERE clave = ?", (clave,)).fetchone()
+                permitido, nuevo_tat = _gcra(fila[0] if fila else None, ahora, intervalo, periodo)
+                if permitido:
+                    self._conn.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?)", (clave, nuevo_tat))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return permitido, nuevo_tat
+
+    def limpiar(self, ahora: int) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM buckets WHERE tat <= ?", (ahora,)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+
+
+def _crear_backend():
+    """Backend según RATE_LIMIT_BACKEND (memoria | sqlite)"""
+    if os.getenv("RATE_LIMIT_BACKEND", "memoria").lower() == "sqlite":
+        return BackendSQLite(Path(os.getenv("RATE_LIMIT_DB", str(RATE_LIMIT_DB_PATH))))
+    return BackendMemoria()
+
+
+# ==================== RATE LIMITER ====================
 
 class RateLimiter:
     """
-    Rate limiter simple basado en memoria.
-    Para producción, usar Redis para persistencia distribuida.
+    Rate limiter token bucket (GCRA) con comprobaciones O(1).
+    Cada (identificador, límite) tiene su propio bucket.
     """
-    
-    def __init__(self):
-        self.requests: Dict[str, list] = defaultdict(list)
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else _crear_backend()
         self.cleanup_task = None
-    
-    def _cleanup_old_requests(self):
-        """Limpia requests antiguos cada minuto."""
-        now = datetime.utcnow()
-        for ip in list(self.requests.keys()):
-            self.requests[ip] = [
-                req_time for req_time in self.requests[ip]
-                if now - req_time < timedelta(minutes=5)
-            ]
-            if not self.requests[ip]:
-                del self.requests[ip]
-    
+
+    def _cleanup_old_requests(self) -> int:
+        """Libera los buckets que ya se han rellenado por completo."""
+        return self.backend.limpiar(self.backend.reloj())
+
     def check_rate_limit(
-        self, 
-        identifier: str, 
-        max_requests: int = 100, 
+        self,
+        identifier: str,
+        max_requests: int = 100,
         window_minutes: int = 1
     ) -> tuple[bool, int, int]:
         """
         Verifica si el identificador (IP, user_id) ha excedido el límite.
-        
+
+        Permite ráfagas de hasta `max_requests` y repone una petición cada
+        `window_minutes / max_requests`.
+
         Args:
             identifier: IP o user_id
             max_requests: Número máximo de requests permitidos
             window_minutes: Ventana de tiempo en minutos
-        
+
         Returns:
             (permitido, requests_restantes, tiempo_hasta_reset)
+
+        Raises:
+            ValueError: Si max_requests < 1 o window_minutes <= 0
         """
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=window_minutes)
-        
-        # Filtrar requests dentro de la ventana
-        self.requests[identifier] = [
-            req_time for req_time in self.requests[identifier]
-            if req_time > window_start
-        ]
-        
-        current_requests = len(self.requests[identifier])
-        
-        if current_requests >= max_requests:
-            # Calcular tiempo hasta reset
-            oldest_request = min(self.requests[identifier])
-            reset_time = oldest_request + timedelta(minutes=window_minutes)
-            seconds_until_reset = int((reset_time - now).total_seconds())
-            
-            return False, 0, seconds_until_reset
-        
-        # Agregar nueva request
-        self.requests[identifier].append(now)
-        requests_remaining = max_requests - (current_requests + 1)
-        
+        if max_requests < 1:
+            raise ValueError(f"max_requests debe ser >= 1 (recibido {max_requests})")
+        if window_minutes <= 0:
+            raise ValueError(f"window_minutes debe ser > 0 (recibido {window_minutes})")
+
+        periodo = int(window_minutes * 60 * NS_POR_SEGUNDO)
+        intervalo = periodo // max_requests
+        ahora = self.backend.reloj()
+
+        permitido, tat = self.backend.consumir(
+            (identifier, max_requests, window_minutes), ahora, intervalo, periodo
+        )
+
+        if not permitido:
+            # Segundos hasta que vuelva a caber una petición
+            espera_ns = tat - periodo - ahora
+            return False, 0, max(1, -(-espera_ns // NS_POR_SEGUNDO))
+
+        requests_remaining = (periodo - (tat - ahora)) // intervalo
         return True, requests_remaining, 0
-    
+
+    async def check_rate_limit_async(
+        self,
+        identifier: str,
+        max_requests: int = 100,
+        window_minutes: int = 1
+    ) -> tuple[bool, int, int]:
+        """
+        check_rate_limit sin bloquear el event loop.
+
+        El backend en memoria responde en el propio loop; el de SQLite
+        (bloqueante) se ejecuta en un hilo con asyncio.to_thread.
+        """
+        if getattr(self.backend, "bloqueante", False):
+            return await asyncio.to_thread(self.check_rate_limit, identifier, max_requests, window_minutes)
+        return self.check_rate_limit(identifier, max_requests, window_minutes)
+
     async def start_cleanup(self):
         """Inicia tarea de limpieza periódica."""
         while True:
             await asyncio.sleep(60)  # Cada minuto
-            self._cleanup_old_requests()
+            await asyncio.to_thread(self._cleanup_old_requests)
 
 
 # Instancia global
@@ -95,4 +247,3 @@ RATE_LIMITS = {
 def get_rate_limit_for_endpoint(endpoint_type: str = "general") -> dict:
     """Obtiene configuración de rate limit para un endpoint."""
     return RATE_LIMITS.get(endpoint_type, RATE_LIMITS["general"])
-
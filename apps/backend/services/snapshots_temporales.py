@@ -0,0 +1,152 @@
+"""
+Snapshots inmutables de las vistas temporales
+
+Las vistas (contexto, semana, mes, año...) solo cambian como mucho una vez
+al día, pero cada petición reconstruía los dicts desde los modelos Pydantic
+de CalendarioHijri. Aquí cada vista se renderiza una vez por clave
+(fecha, lunes de la semana, mes Hijri...) y se guarda ya serializada:
+
+- Cuerpo JSON en bytes (orjson si está instalado, json estándar si no)
+- ETag fuerte (hash del cuerpo) y Last-Modified (momento de generación)
+- LRU acotada a MAX_SNAPSHOTS entradas
+
+`responder()` construye la Response con ETag/Last-Modified/Cache-Control
+y devuelve 304 cuando el cliente ya tiene la versión vigente.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+    ORJSON_DISPONIBLE = True
+except ImportError:
+    orjson = None
+    ORJSON_DISPONIBLE = False
+
+
+MAX_SNAPSHOTS = 512
+
+
+def serializar(datos: Any) -> bytes:
+    """Serializa a JSON UTF-8 (mismo resultado con o sin orjson)"""
+    if ORJSON_DISPONIBLE:
+        return orjson.dumps(datos)
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Payload ya serializado de una vista"""
+    cuerpo: bytes
+    etag: str
+    generado: datetime
+
+    @property
+    def last_modified(self) -> str:
+        return format_datetime(self.generado, usegmt=True)
+
+
+class CacheSnapshots:
+    """Snapshots por (vista, clave) con LRU acotada"""
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[Hashable, Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"aciertos": 0, "generados": 0, "no_modificados": 0}
+
+    def obtener(self, vista: str, clave: Hashable, generar: Callable[[], Any]) -> Snapshot:
+        """Snapshot de la vista para la clave (lo genera la primera vez)"""
+        indice = (vista, clave)
+        with self._lock:
+            snapshot = self._snapshots.get(indice)
+            if snapshot is not None:
+                self._snapshots.move_to_end(indice)
+                self.stats["aciertos"] += 1
+                return snapshot
+
+        cuerpo = serializar(generar())
+        snapshot = Snapshot(
+            cuerpo=cuerpo,
+            etag=f'"{hashlib.blake2b(cuerpo, digest_size=12).hexdigest()}"',
+            # Resolución de segundos, como la cabecera HTTP
+            generado=datetime.now(timezone.utc).replace(microsecond=0)
+        )
+
+        with self._lock:
+            existente = self._snapshots.get(indice)
+            if existente is not None:
+                return existente  # Otra petición lo generó mientras tanto
+            self._snapshots[indice] = snapshot
+            self.stats["generados"] += 1
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def invalidar(self, vista: Optional[str] = None):
+        """Descarta los snapshots de una vista (o todos)"""
+        with self._lock:
+            if vista is None:
+                self._snapshots.clear()
+            else:
+                for indice in [i for i in self._snapshots if i[0] == vista]:
+                    del self._snapshots[indice]
+
+    def responder(self, request: Request, snapshot: Snapshot, max_age: int) -> Response:
+        """
+        Response JSON del snapshot, o 304 si el cliente ya lo tiene
+
+        If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110).
+        """
+        cabeceras = {
+            "ETag": snapshot.etag,
+            "Last-Modified": snapshot.last_modified,
+            "Cache-Control": f"public, max-age={max(0, int(max_age))}",
+        }
+
+        if _no_modificado(request, snapshot):
+            self.stats["no_modificados"] += 1
+            return Response(status_code=304, headers=cabeceras)
+
+        return Response(content=snapshot.cuerpo, media_type="application/json", headers=cabeceras)
+
+    def obtener_estadisticas(self) -> dict:
+        with self._lock:
+            return {**self.stats, "snapshots": len(self._snapshots), "orjson": ORJSON_DISPONIBLE}
+
+
+def _no_modificado(request: Request, snapshot: Snapshot) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etags = [e.strip() for e in if_none_match.split(",")]
+        # Comparación débil: W/"x" equivale a "x"
+        return "*" in etags or any(e.removeprefix("W/") == snapshot.etag for e in etags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return snapshot.generado <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+# Instancia global (se crea en el primer uso)
+_cache: Optional[CacheSnapshots] = None
+
+
+def get_cache_snapshots() -> CacheSnapshots:
+    """Obtiene la instancia global de la cache de snapshots"""
+    global _cache
+    if _cache is None:
+        _cache = CacheSnapshots()
+    return _cache
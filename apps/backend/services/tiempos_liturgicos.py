@@ -1,6 +1,14 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime, timedelta, date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import sys
+import threading
 import pytz
 from praytimes import PrayTimes
 
@@ -9,6 +17,94 @@ from models.schemas import (
 )
 
 
+# ==================== TABLAS DE TIEMPOS ====================
+
+# Orden de los tiempos en las tablas (minutos desde medianoche local)
+NOMBRES_TIEMPOS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha", "midnight")
+MOMENTOS_ESTADO_CERO = ("fajr", "dhuhr", "asr", "maghrib", "isha")
+
+# Tiempo no definido ('-----' de PrayTimes en latitudes altas)
+SIN_TIEMPO = 0xFFFF
+
+# Días sueltos memoizados fuera de las tablas anuales
+MAX_DIAS_CACHE = 1024
+
+TABLAS_DIR = Path(__file__).parent.parent / "storage" / "tiempos_liturgicos"
+
+
+class TablaTiemposAnual:
+    """
+    Tiempos de oración de un año completo para una ubicación.
+    
+    Array compacto de enteros sin signo de 16 bits: 7 tiempos por día
+    (NOMBRES_TIEMPOS) en minutos desde la medianoche local. Un año
+    ocupa ~5 KB y se serializa tal cual a disco.
+    """
+    
+    def __init__(self, clave: Tuple, anio: int, minutos: array):
+        self.clave = clave
+        self.anio = anio
+        self.inicio = date(anio, 1, 1).toordinal()
+        self.minutos = minutos
+    
+    @property
+    def dias(self) -> int:
+        return len(self.minutos) // len(NOMBRES_TIEMPOS)
+    
+    def contiene(self, fecha: date) -> bool:
+        return 0 <= fecha.toordinal() - self.inicio < self.dias
+    
+    def minutos_dia(self, fecha: date) -> Tuple[int, ...]:
+        n = len(NOMBRES_TIEMPOS)
+        i = (fecha.toordinal() - self.inicio) * n
+        return tuple(self.minutos[i:i + n])
+    
+    def guardar(self, path: Path):
+        """Cabecera JSON en la primera línea + array binario (little-endian)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        datos = array("H", self.minutos)
+        if sys.byteorder != "little":
+            datos.byteswap()
+        
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            cabecera = {"clave": list(self.clave), "anio": self.anio, "dias": self.dias}
+            f.write(json.dumps(cabecera).encode("utf-8") + b"\n")
+            f.write(datos.tobytes())
+        tmp.replace(path)
+    
+    @classmethod
+    def cargar(cls, path: Path, clave: Tuple) -> Optional["TablaTiemposAnual"]:
+        """Carga una tabla guardada; None si no existe o no corresponde a la clave"""
+        try:
+            with open(path, "rb") as f:
+                cabecera = json.loads(f.readline().decode("utf-8"))
+                datos = array("H")
+                datos.frombytes(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        if tuple(cabecera.get("clave", ())) != tuple(clave):
+            return None
+        if sys.byteorder != "little":
+            datos.byteswap()
+        if len(datos) != cabecera.get("dias", -1) * len(NOMBRES_TIEMPOS):
+            return None
+        
+        return cls(clave, cabecera["anio"], datos)
+
+
+def _numpy_disponible() -> bool:
+    from services.tiempos_vectorizados import NUMPY_DISPONIBLE
+    return NUMPY_DISPONIBLE
+
+
+# Compartido entre instancias: muchos endpoints crean su propio calculador
+_tablas: Dict[Tuple, TablaTiemposAnual] = {}
+_dias: "OrderedDict[Tuple, Tuple[int, ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
 class CalculadorTiemposLiturgicos:
     """
     Cálculos PRECISOS de tiempos litúrgicos usando astronomía real.
@@ -25,10 +121,219 @@ class CalculadorTiemposLiturgicos:
         self.timezone = pytz.timezone(timezone)
         
         # Configurar PrayTimes con método MWL (Muslim World League)
-        self.pt = PrayTimes('MWL')
+        self.metodo = 'MWL'
+        self.pt = PrayTimes(self.metodo)
+        self._pt_lock = threading.Lock()  # getTimes guarda estado en la instancia
+        
+        # Clave de las tablas memoizadas
+        self.clave = (round(latitud, 4), round(longitud, 4), self.metodo, self.timezone.zone)
+        
+        # Últimos días ya construidos como TiemposRezoDia
+        self._dias_construidos: Dict[date, TiemposRezoDia] = {}
+        
+        # Días calculados fuera (p.ej. en lote por TiemposPorUbicacion): ordinal → minutos
+        self._minutos_propios: Dict[int, Tuple[int, ...]] = {}
 
     def _hoy(self):
         return datetime.now(self.timezone)
+    
+    # ==================== TABLA DE TIEMPOS ====================
+    
+    def _calcular_minutos(self, fecha: date) -> Tuple[int, ...]:
+        """Cálculo astronómico de un día con PrayTimes (minutos desde medianoche)"""
+        # Obtener offset de timezone (ej: +2 para CEST)
+        offset_hours = self._offset_horas(fecha)
+        
+        with self._pt_lock:
+            tiempos = self.pt.getTimes(
+                (fecha.year, fecha.month, fecha.day),
+                (self.latitud, self.longitud),
+                offset_hours
+            )
+        
+        minutos = []
+        for nombre in NOMBRES_TIEMPOS:
+            try:
+                hora, minuto = map(int, tiempos[nombre].split(':'))
+                minutos.append(hora * 60 + minuto)
+            except ValueError:
+                minutos.append(SIN_TIEMPO)
+        return tuple(minutos)
+    
+    def _offset_horas(self, fecha: date) -> float:
+        """Offset UTC (horas) del día, tomado a mediodía local"""
+        dt_ref = self.timezone.localize(datetime(fecha.year, fecha.month, fecha.day, 12, 0))
+        return dt_ref.utcoffset().total_seconds() / 3600
+    
+    def _offsets_horas(self, fechas: Sequence[date]) -> List[float]:
+        """
+        Offsets UTC de muchos días ordenados sin un localize() por día.
+        
+        El offset a mediodía local solo cambia en los días que rodean una
+        transición de la zona (DST): se recalcula ahí y al inicio de cada
+        tramo consecutivo; el resto de días repite el offset anterior.
+        """
+        if not fechas:
+            return []
+        
+        transiciones = getattr(self.timezone, "_utc_transition_times", None)
+        info = getattr(self.timezone, "_transition_info", None)
+        if not transiciones or not info:
+            offset = self._offset_horas(fechas[0])  # Zona de offset fijo
+            return [offset] * len(fechas)
+        
+        # Días locales en los que una transición puede cambiar el offset
+        cambios = set()
+        desde = datetime.combine(fechas[0] - timedelta(days=2), datetime.min.time())
+        hasta = datetime.combine(fechas[-1] + timedelta(days=2), datetime.min.time())
+        i = max(bisect_right(transiciones, desde), 1)
+        while i < len(transiciones) and transiciones[i] <= hasta:
+            for utcoffset in (info[i - 1][0], info[i][0]):
+                dia = (transiciones[i] + utcoffset).date()
+                cambios.update((dia, dia + timedelta(days=1)))
+            i += 1
+        
+        offsets = []
+        anterior = None
+        for fecha in fechas:
+            if anterior is None or fecha in cambios or fecha - anterior != timedelta(days=1):
+                offset = self._offset_horas(fecha)
+            offsets.append(offset)
+            anterior = fecha
+        return offsets
+    
+    def _calcular_minutos_rango(self, fechas: Sequence[date]):
+        """Cálculo vectorizado de varios días (requiere NumPy): array (N, 7)"""
+        from services.tiempos_vectorizados import calcular_minutos_rango
+        
+        return calcular_minutos_rango(
+            [f.toordinal() for f in fechas],
+            self.latitud,
+            self.longitud,
+            self._offsets_horas(fechas),
+            self.pt.getSettings(),
+            self.pt.getOffsets()
+        )
+    
+    def _minutos_dia(self, fecha: date) -> Tuple[int, ...]:
+        """Tiempos del día: días propios → tabla anual → cache de días → cálculo"""
+        propios = self._minutos_propios.get(fecha.toordinal())
+        if propios is not None:
+            return propios
+        
+        tabla = _tablas.get(self.clave + (fecha.year,))
+        if tabla is not None and tabla.contiene(fecha):
+            return tabla.minutos_dia(fecha)
+        
+        clave_dia = self.clave + (fecha.toordinal(),)
+        with _cache_lock:
+            minutos = _dias.get(clave_dia)
+            if minutos is not None:
+                _dias.move_to_end(clave_dia)
+                return minutos
+        
+        minutos = self._calcular_minutos(fecha)
+        with _cache_lock:
+            _dias[clave_dia] = minutos
+            if len(_dias) > MAX_DIAS_CACHE:
+                _dias.popitem(last=False)
+        return minutos
+    
+    def cargar_minutos(self, minutos_por_dia: Dict[date, Tuple[int, ...]], desde: date | None = None):
+        """
+        Fija los tiempos de ciertos días ya calculados (en lote) para esta instancia.
+        
+        Args:
+            minutos_por_dia: fecha → minutos en el orden NOMBRES_TIEMPOS
+            desde: Descartar días propios anteriores a esta fecha
+        """
+        if desde is not None:
+            limite = desde.toordinal()
+            for ordinal in [o for o in self._minutos_propios if o < limite]:
+                del self._minutos_propios[ordinal]
+        for fecha, minutos in minutos_por_dia.items():
+            self._minutos_propios[fecha.toordinal()] = tuple(minutos)
+            self._dias_construidos.pop(fecha, None)
+    
+    def precalcular_anio(self, anio: int | None = None, directorio: Path | None = TABLAS_DIR) -> TablaTiemposAnual:
+        """
+        Precalcula (o carga de disco) la tabla de un año completo.
+        
+        Args:
+            anio: Año a precalcular (por defecto el actual)
+            directorio: Dónde persistir la tabla (None = solo memoria)
+        """
+        anio = anio or self._hoy().year
+        clave_tabla = self.clave + (anio,)
+        
+        tabla = _tablas.get(clave_tabla)
+        if tabla is not None:
+            return tabla
+        
+        path = None
+        if directorio is not None:
+            lat, lon, metodo, tz = self.clave
+            path = Path(directorio) / f"{anio}_{lat}_{lon}_{metodo}_{tz.replace('/', '-')}.bin"
+            tabla = TablaTiemposAnual.cargar(path, self.clave)
+        
+        if tabla is None:
+            dias = [date(anio, 1, 1) + timedelta(days=i) for i in range(date(anio, 12, 31).timetuple().tm_yday)]
+            minutos = array("H")
+            if _numpy_disponible():
+                minutos.frombytes(self._calcular_minutos_rango(dias).astype("<u2").tobytes())
+                if sys.byteorder != "little":
+                    minutos.byteswap()
+            else:
+                for dia in dias:
+                    minutos.extend(self._calcular_minutos(dia))
+            tabla = TablaTiemposAnual(self.clave, anio, minutos)
+            
+            if path is not None:
+                try:
+                    tabla.guardar(path)
+                except OSError as e:
+                    print(f"⚠️ No se pudo guardar tabla de tiempos {path}: {e}")
+        
+        with _cache_lock:
+            _tablas[clave_tabla] = tabla
+        return tabla
+
+    def precalcular_rango(self, desde: date, hasta: date):
+        """
+        Calcula de una vez los días [desde, hasta] que no estén memoizados.
+        
+        Con NumPy usa el motor vectorizado (un solo paso para todo el rango);
+        después calcular_tiempos_hoy sirve cada día desde la cache.
+        """
+        pendientes = []
+        dia = desde
+        while dia <= hasta:
+            tabla = _tablas.get(self.clave + (dia.year,))
+            if not (tabla and tabla.contiene(dia)) and self.clave + (dia.toordinal(),) not in _dias:
+                pendientes.append(dia)
+            dia += timedelta(days=1)
+        
+        if not pendientes:
+            return
+        
+        if _numpy_disponible():
+            filas = self._calcular_minutos_rango(pendientes).tolist()
+        else:
+            filas = [self._calcular_minutos(dia) for dia in pendientes]
+        
+        with _cache_lock:
+            for dia, minutos in zip(pendientes, filas):
+                _dias[self.clave + (dia.toordinal(),)] = tuple(minutos)
+            while len(_dias) > MAX_DIAS_CACHE:
+                _dias.popitem(last=False)
+    
+    def calcular_tiempos_rango(self, desde: date, hasta: date) -> List[TiemposRezoDia]:
+        """Tiempos de cada día en [desde, hasta] (ambos incluidos)"""
+        self.precalcular_rango(desde, hasta)
+        return [
+            self.calcular_tiempos_hoy(desde + timedelta(days=i))
+            for i in range((hasta - desde).days + 1)
+        ]
 
     def calcular_tiempos_hoy(self, dia: date | None = None) -> TiemposRezoDia:
         """
@@ -45,27 +350,23 @@ class CalculadorTiemposLiturgicos:
         
         fecha = dia or self._hoy().date()
         
-        # Calcular tiempos con PrayTimes
-        # Formato: (año, mes, día), (lat, lon), offset_timezone
-        # Obtener offset de timezone (ej: +2 para CEST)
-        dt_ref = self.timezone.localize(datetime(fecha.year, fecha.month, fecha.day, 12, 0))
-        offset_hours = dt_ref.utcoffset().total_seconds() / 3600
+        construido = self._dias_construidos.get(fecha)
+        if construido is not None:
+            return construido
         
-        tiempos = self.pt.getTimes(
-            (fecha.year, fecha.month, fecha.day),
-            (self.latitud, self.longitud),
-            offset_hours
-        )
+        # Tiempos memoizados (tabla anual o cache de días)
+        tiempos = dict(zip(NOMBRES_TIEMPOS, self._minutos_dia(fecha)))
         
-        # Convertir strings de tiempo a datetime con timezone
-        def parse_tiempo(tiempo_str: str) -> datetime:
-            """Convierte '06:46' a datetime con timezone"""
-            hora, minuto = map(int, tiempo_str.split(':'))
-            dt = datetime(fecha.year, fecha.month, fecha.day, hora, minuto)
+        # Convertir minutos desde medianoche a datetime con timezone
+        def parse_tiempo(minutos: int) -> datetime:
+            """Convierte 406 (06:46) a datetime con timezone"""
+            if minutos == SIN_TIEMPO:
+                raise ValueError(f"Tiempo de oración no definido para {fecha} en ({self.latitud}, {self.longitud})")
+            dt = datetime(fecha.year, fecha.month, fecha.day, minutos // 60, minutos % 60)
             return self.timezone.localize(dt)
         
         # Crear objetos TiempoRezo con ventanas precisas
-        def crear_tiempo_rezo(inicio_str: str, fin_str: str = None, duracion_ventana: int = 30) -> TiempoRezo:
+        def crear_tiempo_rezo(inicio_str: int, fin_str: int = None, duracion_ventana: int = 30) -> TiempoRezo:
             """
             Crea objeto TiempoRezo con:
             - inicio: Momento exacto astronómico
@@ -74,7 +375,7 @@ class CalculadorTiemposLiturgicos:
             """
             inicio = parse_tiempo(inicio_str)
             
-            if fin_str:
+            if fin_str is not None:
                 fin = parse_tiempo(fin_str)
             else:
                 fin = inicio + timedelta(minutes=duracion_ventana)
@@ -86,7 +387,7 @@ class CalculadorTiemposLiturgicos:
             )
         
         # Construir tiempos precisos del día
-        return TiemposRezoDia(
+        resultado = TiemposRezoDia(
             fecha=fecha,
             
             # Fajr: Desde amanecer astronómico hasta salida del sol
@@ -124,6 +425,26 @@ class CalculadorTiemposLiturgicos:
                 30
             )
         )
+        
+        if len(self._dias_construidos) >= 8:
+            self._dias_construidos.clear()
+        self._dias_construidos[fecha] = resultado
+        return resultado
+    
+    def _ventana_activa(self, tiempos: TiemposRezoDia, ahora: datetime) -> Optional[str]:
+        """
+        Momento cuya ventana [inicio, fin] contiene `ahora` (búsqueda binaria).
+        
+        Las ventanas están ordenadas y solo comparten extremos (fin de una =
+        inicio de la siguiente); en ese caso gana la anterior, como en el
+        recorrido lineal fajr → isha.
+        """
+        ventanas = [getattr(tiempos, m) for m in MOMENTOS_ESTADO_CERO]
+        k = bisect_right([t.inicio for t in ventanas], ahora)
+        for i in (k - 2, k - 1):
+            if i >= 0 and ventanas[i].inicio <= ahora <= ventanas[i].fin:
+                return MOMENTOS_ESTADO_CERO[i]
+        return None
 
     def verificar_momento_estado_cero(self, permitir_fuera_ventana: bool = False) -> VerificacionMomento:
         """
@@ -142,19 +463,17 @@ class CalculadorTiemposLiturgicos:
         tiempos = self.calcular_tiempos_hoy()
         
         # Verificar si estamos DENTRO de alguna ventana activa
-        for momento in ["fajr", "dhuhr", "asr", "maghrib", "isha"]:
+        momento = self._ventana_activa(tiempos, ahora)
+        if momento is not None:
             t = getattr(tiempos, momento)
-            
-            # Verificar si estamos en la ventana de este momento
-            if t.inicio <= ahora <= t.fin:
-                minutos = int((t.fin - ahora).total_seconds() // 60)
-                return VerificacionMomento(
-                    es_momento=True,
-                    momento=MomentoLiturgico(momento),
-                    ventana_inicio=t.inicio,
-                    ventana_fin=t.fin,
-                    minutos_restantes=minutos
-                )
+            minutos = int((t.fin - ahora).total_seconds() // 60)
+            return VerificacionMomento(
+                es_momento=True,
+                momento=MomentoLiturgico(momento),
+                ventana_inicio=t.inicio,
+                ventana_fin=t.fin,
+                minutos_restantes=minutos
+            )
         
         # Si permitir_fuera_ventana=True, verificar si PASÓ alguna ventana hoy
         if permitir_fuera_ventana:
@@ -249,18 +568,12 @@ class CalculadorTiemposLiturgicos:
             return ver.momento
         
         # Si no estamos en ventana, determinar momento del día
-        if ahora < tiempos.fajr.inicio:
+        # Último inicio <= ahora (antes de Fajr → noche, se considera Isha)
+        inicios = [getattr(tiempos, m).inicio for m in MOMENTOS_ESTADO_CERO]
+        k = bisect_right(inicios, ahora)
+        if k == 0:
             return MomentoLiturgico.ISHA  # Noche
-        elif ahora < tiempos.dhuhr.inicio:
-            return MomentoLiturgico.FAJR
-        elif ahora < tiempos.asr.inicio:
-            return MomentoLiturgico.DHUHR
-        elif ahora < tiempos.maghrib.inicio:
-            return MomentoLiturgico.ASR
-        elif ahora < tiempos.isha.inicio:
-            return MomentoLiturgico.MAGHRIB
-        else:
-            return MomentoLiturgico.ISHA
+        return MomentoLiturgico(MOMENTOS_ESTADO_CERO[k - 1])
     
     def obtener_tiempos_formato_legible(self, dia: date = None) -> dict:
         """
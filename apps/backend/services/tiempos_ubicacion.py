@@ -0,0 +1,257 @@
+"""
+Tiempos litúrgicos por ubicación (muchos usuarios, muchas coordenadas)
+
+Agrupa las ubicaciones en celdas geohash: todos los usuarios de una misma
+celda y zona horaria comparten un CalculadorTiemposLiturgicos (centrado en
+la celda) con los tiempos de hoy y mañana ya calculados. Con precisión 5
+(celdas de ~4,9 km) la diferencia con las coordenadas exactas queda muy
+por debajo de un minuto.
+
+- Coste por petición O(1): geohash de longitud fija + búsqueda en dict
+- Memoria acotada: LRU de MAX_CELDAS celdas
+- Cambio de día: `rollover()` recalcula en lote todas las celdas activas
+  (vectorizado con NumPy si está disponible); `ciclo_rollover()` lo
+  ejecuta cada hora para cubrir la medianoche de cada zona horaria
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+
+from services.tiempos_liturgicos import CalculadorTiemposLiturgicos, _numpy_disponible
+
+
+PRECISION_GEOHASH = 5
+MAX_CELDAS = 4096
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+# ==================== GEOHASH ====================
+
+def geohash(latitud: float, longitud: float, precision: int = PRECISION_GEOHASH) -> str:
+    """Codifica coordenadas en un geohash de `precision` caracteres"""
+    lat_rango = [-90.0, 90.0]
+    lon_rango = [-180.0, 180.0]
+    resultado = []
+    bits = 0
+    valor = 0
+    es_lon = True
+
+    while len(resultado) < precision:
+        rango, coordenada = (lon_rango, longitud) if es_lon else (lat_rango, latitud)
+        medio = (rango[0] + rango[1]) / 2
+        valor <<= 1
+        if coordenada >= medio:
+            valor |= 1
+            rango[0] = medio
+        else:
+            rango[1] = medio
+        es_lon = not es_lon
+
+        bits += 1
+        if bits == 5:
+            resultado.append(_BASE32[valor])
+            bits = 0
+            valor = 0
+
+    return "".join(resultado)
+
+
+def centro_geohash(codigo: str) -> Tuple[float, float]:
+    """Centro (lat, lon) de la celda de un geohash"""
+    lat_rango = [-90.0, 90.0]
+    lon_rango = [-180.0, 180.0]
+    es_lon = True
+
+    for caracter in codigo:
+        valor = _BASE32.index(caracter)
+        for desplazamiento in range(4, -1, -1):
+            rango = lon_rango if es_lon else lat_rango
+            medio = (rango[0] + rango[1]) / 2
+            if (valor >> desplazamiento) & 1:
+                rango[0] = medio
+            else:
+                rango[1] = medio
+            es_lon = not es_lon
+
+    return (lat_rango[0] + lat_rango[1]) / 2, (lon_rango[0] + lon_rango[1]) / 2
+
+
+# ==================== SERVICIO ====================
+
+class TiemposPorUbicacion:
+    """Calculadores de tiempos litúrgicos por celda geohash y zona horaria"""
+
+    def __init__(self, precision: int = PRECISION_GEOHASH, max_celdas: int = MAX_CELDAS):
+        self.precision = precision
+        self.max_celdas = max_celdas
+
+        # (geohash, timezone) → calculador de la celda
+        self._celdas: "OrderedDict[Tuple[str, str], CalculadorTiemposLiturgicos]" = OrderedDict()
+        # usuario → (lat, lon, timezone)
+        self._usuarios: Dict[str, Tuple[float, float, str]] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {"aciertos": 0, "celdas_creadas": 0, "celdas_expulsadas": 0, "rollovers": 0}
+
+    def calculador(self, latitud: float, longitud: float, timezone: str) -> CalculadorTiemposLiturgicos:
+        """
+        Calculador para unas coordenadas (el de su celda)
+
+        Raises:
+            ValueError: Coordenadas fuera de rango
+            pytz.UnknownTimeZoneError: Zona horaria desconocida
+        """
+        if not (-90.0 <= latitud <= 90.0 and -180.0 <= longitud <= 180.0):
+            raise ValueError(f"Coordenadas fuera de rango: ({latitud}, {longitud})")
+
+        clave = (geohash(latitud, longitud, self.precision), timezone)
+        with self._lock:
+            calculador = self._celdas.get(clave)
+            if calculador is not None:
+                self._celdas.move_to_end(clave)
+                self.stats["aciertos"] += 1
+                return calculador
+
+        pytz.timezone(timezone)  # Validar antes de crear la celda
+        lat_centro, lon_centro = centro_geohash(clave[0])
+        calculador = CalculadorTiemposLiturgicos(lat_centro, lon_centro, timezone)
+        self._preparar([calculador])
+
+        with self._lock:
+            existente = self._celdas.get(clave)
+            if existente is not None:
+                return existente  # Otra petición creó la celda mientras tanto
+            self._celdas[clave] = calculador
+            self.stats["celdas_creadas"] += 1
+            while len(self._celdas) > self.max_celdas:
+                self._celdas.popitem(last=False)
+                self.stats["celdas_expulsadas"] += 1
+        return calculador
+
+    def registrar_usuario(
+        self,
+        usuario_id: str,
+        latitud: float,
+        longitud: float,
+        timezone: str
+    ) -> CalculadorTiemposLiturgicos:
+        """Asocia un usuario a su ubicación y devuelve su calculador"""
+        calculador = self.calculador(latitud, longitud, timezone)
+        with self._lock:
+            self._usuarios[usuario_id] = (latitud, longitud, timezone)
+        return calculador
+
+    def calculador_usuario(self, usuario_id: str) -> Optional[CalculadorTiemposLiturgicos]:
+        """Calculador de un usuario registrado (None si no lo está)"""
+        ubicacion = self._usuarios.get(usuario_id)
+        if ubicacion is None:
+            return None
+        return self.calculador(*ubicacion)
+
+    # ==================== LOTES ====================
+
+    def rollover(self) -> int:
+        """
+        Asegura hoy y mañana (hora local) en todas las celdas activas
+
+        Las celdas de usuarios registrados que fueron expulsadas del LRU se
+        vuelven a crear. Retorna el número de celdas recalculadas.
+        """
+        with self._lock:
+            usuarios = list(self._usuarios.values())
+        for ubicacion in usuarios:
+            self.calculador(*ubicacion)
+
+        with self._lock:
+            calculadores = list(self._celdas.values())
+
+        pendientes = []
+        for calculador in calculadores:
+            hoy = calculador._hoy().date()
+            manana = hoy + timedelta(days=1)
+            propios = calculador._minutos_propios
+            if hoy.toordinal() not in propios or manana.toordinal() not in propios:
+                pendientes.append(calculador)
+
+        self._preparar(pendientes)
+        self.stats["rollovers"] += 1
+        return len(pendientes)
+
+    def _preparar(self, calculadores: List[CalculadorTiemposLiturgicos]):
+        """Calcula hoy y mañana de cada calculador, en lote por zona horaria"""
+        grupos: Dict[Tuple[str, object], List[CalculadorTiemposLiturgicos]] = {}
+        for calculador in calculadores:
+            hoy = calculador._hoy().date()
+            grupos.setdefault((calculador.timezone.zone, hoy), []).append(calculador)
+
+        for (_, hoy), grupo in grupos.items():
+            fechas = [hoy, hoy + timedelta(days=1)]
+
+            if _numpy_disponible() and len(grupo) > 1:
+                from services.tiempos_vectorizados import calcular_minutos_rango
+
+                referencia = grupo[0]
+                por_fecha = [
+                    calcular_minutos_rango(
+                        fecha.toordinal(),
+                        [c.latitud for c in grupo],
+                        [c.longitud for c in grupo],
+                        referencia._offset_horas(fecha),  # Misma zona: mismo offset
+                        referencia.pt.getSettings(),
+                        referencia.pt.getOffsets()
+                    ).tolist()
+                    for fecha in fechas
+                ]
+                for i, calculador in enumerate(grupo):
+                    calculador.cargar_minutos(
+                        {fecha: por_fecha[j][i] for j, fecha in enumerate(fechas)},
+                        desde=hoy
+                    )
+            else:
+                for calculador in grupo:
+                    calculador.cargar_minutos(
+                        {fecha: calculador._calcular_minutos(fecha) for fecha in fechas},
+                        desde=hoy
+                    )
+
+    def obtener_estadisticas(self) -> Dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "celdas_activas": len(self._celdas),
+                "usuarios_registrados": len(self._usuarios),
+                "max_celdas": self.max_celdas,
+                "precision_geohash": self.precision,
+            }
+
+
+async def ciclo_rollover(servicio: "TiemposPorUbicacion"):
+    """Ejecuta `rollover()` al inicio de cada hora (medianoche de cada zona)"""
+    while True:
+        ahora = time.time()
+        await asyncio.sleep(3600 - ahora % 3600 + 1)
+        try:
+            celdas = await asyncio.to_thread(servicio.rollover)
+            if celdas:
+                print(f"🕌 Tiempos recalculados para {celdas} celdas ({datetime.now():%H:%M})")
+        except Exception as e:
+            print(f"❌ Error en rollover de tiempos: {e}")
+
+
+# Instancia global (se crea en el primer uso)
+_servicio: Optional[TiemposPorUbicacion] = None
+
+
+def get_tiempos_por_ubicacion() -> TiemposPorUbicacion:
+    """Obtiene la instancia global del servicio"""
+    global _servicio
+    if _servicio is None:
+        _servicio = TiemposPorUbicacion()
+    return _servicio
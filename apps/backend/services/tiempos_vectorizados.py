@@ -0,0 +1,263 @@
+"""
+Motor vectorizado de tiempos de oración (NumPy)
+
+Reproduce el algoritmo de PrayTimes (posición solar de la USNO, ajuste de
+latitudes altas, redondeo a minutos) pero sobre arrays: calcula
+fajr/sunrise/dhuhr/asr/maghrib/isha/midnight de un rango completo de días
+(o de muchas ubicaciones) en una sola pasada.
+
+Los parámetros del método se leen de la instancia de PrayTimes
+(`getSettings()`), así que los resultados coinciden con `getTimes`.
+
+NumPy es opcional: sin él, NUMPY_DISPONIBLE es False y
+CalculadorTiemposLiturgicos sigue usando PrayTimes día a día.
+
+Benchmark:
+    python services/tiempos_vectorizados.py --dias 365
+"""
+
+import argparse
+import re
+import time
+from typing import Dict, Sequence
+
+try:
+    import numpy as np
+    NUMPY_DISPONIBLE = True
+except ImportError:
+    np = None
+    NUMPY_DISPONIBLE = False
+
+
+# Mismo orden y centinela que las tablas de services/tiempos_liturgicos.py
+NOMBRES_TIEMPOS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha", "midnight")
+SIN_TIEMPO = 0xFFFF
+
+# JD a las 0h de date.toordinal() == 1 (0001-01-01 gregoriano proléptico)
+JD_ORDINAL_0 = 1721424.5
+
+# Ángulo de salida/puesta del sol a elevación 0
+ANGULO_HORIZONTE = 0.833
+
+
+# ==================== UTILIDADES (grados) ====================
+
+def _eval(valor) -> float:
+    """Número inicial de un parámetro ('10 min' → 10, 18 → 18), como PrayTimes.eval"""
+    numero = re.split('[^0-9.+-]', str(valor), 1)[0]
+    return float(numero) if numero else 0.0
+
+
+def _es_minutos(valor) -> bool:
+    return isinstance(valor, str) and 'min' in valor
+
+
+def _sin(d):
+    return np.sin(np.radians(d))
+
+
+def _cos(d):
+    return np.cos(np.radians(d))
+
+
+def _fix(a, modo: float):
+    a = a - modo * np.floor(a / modo)
+    return np.where(a < 0, a + modo, a)
+
+
+def _fixhour(h):
+    return _fix(h, 24.0)
+
+
+def _posicion_solar(jd):
+    """Declinación y ecuación del tiempo (USNO, igual que PrayTimes.sunPosition)"""
+    D = jd - 2451545.0
+    g = _fix(357.529 + 0.98560028 * D, 360.0)
+    q = _fix(280.459 + 0.98564736 * D, 360.0)
+    L = _fix(q + 1.915 * _sin(g) + 0.020 * _sin(2 * g), 360.0)
+
+    e = 23.439 - 0.00000036 * D
+
+    RA = np.degrees(np.arctan2(_cos(e) * _sin(L), _cos(L))) / 15.0
+    eqt = q / 15.0 - _fixhour(RA)
+    decl = np.degrees(np.arcsin(_sin(e) * _sin(L)))
+    return decl, eqt
+
+
+# ==================== MOTOR ====================
+
+def calcular_minutos_rango(
+    ordinales: Sequence[int],
+    latitud,
+    longitud,
+    offsets_horas,
+    settings: Dict,
+    offsets_minutos: Dict = None
+):
+    """
+    Tiempos de oración en minutos desde la medianoche local.
+
+    Todos los argumentos numéricos admiten broadcasting: un rango de días
+    para una ubicación, o un día para muchas ubicaciones.
+
+    Args:
+        ordinales: date.toordinal() de cada día
+        latitud, longitud: Grados (escalares o arrays)
+        offsets_horas: Offset UTC de cada día en horas (DST incluido)
+        settings: PrayTimes.getSettings()
+        offsets_minutos: PrayTimes.getOffsets() (ajustes finos por tiempo)
+
+    Returns:
+        np.ndarray uint16 de forma (N, 7) en el orden NOMBRES_TIEMPOS;
+        SIN_TIEMPO donde PrayTimes devolvería '-----'
+    """
+    if not NUMPY_DISPONIBLE:
+        raise RuntimeError("NumPy no está instalado")
+
+    ordinales = np.asarray(ordinales, dtype=np.float64)
+    lat = np.asarray(latitud, dtype=np.float64)
+    lng = np.asarray(longitud, dtype=np.float64)
+    tz = np.asarray(offsets_horas, dtype=np.float64)
+    offsets_minutos = offsets_minutos or {}
+
+    j_date = ordinales + JD_ORDINAL_0 - lng / (15 * 24.0)
+
+    with np.errstate(invalid="ignore"):
+        def mediodia(t):
+            _, eqt = _posicion_solar(j_date + t)
+            return _fixhour(12 - eqt)
+
+        def hora_angulo(angulo, t, antihorario=False):
+            decl, _ = _posicion_solar(j_date + t)
+            noon = mediodia(t)
+            # arccos fuera de [-1, 1] → NaN (PrayTimes: ValueError → nan)
+            cos_h = (-_sin(angulo) - _sin(decl) * _sin(lat)) / (_cos(decl) * _cos(lat))
+            h = np.degrees(np.arccos(cos_h)) / 15.0
+            return noon - h if antihorario else noon + h
+
+        def hora_asr(factor, t):
+            decl, _ = _posicion_solar(j_date + t)
+            angulo = -np.degrees(np.arctan(1.0 / (factor + np.tan(np.radians(np.abs(lat - decl))))))
+            return hora_angulo(angulo, t)
+
+        factores_asr = {'Standard': 1, 'Hanafi': 2}
+        factor_asr = factores_asr.get(settings['asr'], None)
+        if factor_asr is None:
+            factor_asr = _eval(settings['asr'])
+
+        # Estimación inicial en fracción de día (una iteración, como PrayTimes)
+        fajr = hora_angulo(_eval(settings['fajr']), 5 / 24.0, antihorario=True)
+        sunrise = hora_angulo(ANGULO_HORIZONTE, 6 / 24.0, antihorario=True)
+        dhuhr = mediodia(12 / 24.0)
+        asr = hora_asr(factor_asr, 13 / 24.0)
+        sunset = hora_angulo(ANGULO_HORIZONTE, 18 / 24.0)
+        maghrib = hora_angulo(_eval(settings['maghrib']), 18 / 24.0)
+        isha = hora_angulo(_eval(settings['isha']), 18 / 24.0)
+
+        # Hora local
+        ajuste = tz - lng / 15.0
+        fajr, sunrise, dhuhr, asr, sunset, maghrib, isha = (
+            t + ajuste for t in (fajr, sunrise, dhuhr, asr, sunset, maghrib, isha)
+        )
+
+        # Latitudes altas
+        if settings.get('highLats', 'None') != 'None':
+            noche = _fixhour(sunrise - sunset)
+
+            def porcion(angulo):
+                metodo = settings['highLats']
+                if metodo == 'AngleBased':
+                    return noche * (angulo / 60.0)
+                if metodo == 'OneSeventh':
+                    return noche / 7.0
+                return noche / 2.0
+
+            def ajustar(t, base, angulo, antihorario=False):
+                p = porcion(angulo)
+                diff = _fixhour(base - t) if antihorario else _fixhour(t - base)
+                reemplazo = base - p if antihorario else base + p
+                return np.where(np.isnan(t) | (diff > p), reemplazo, t)
+
+            fajr = ajustar(fajr, sunrise, _eval(settings['fajr']), antihorario=True)
+            isha = ajustar(isha, sunset, _eval(settings['isha']))
+            maghrib = ajustar(maghrib, sunset, _eval(settings['maghrib']))
+
+        # Parámetros en minutos (mismo signo que PrayTimes.adjustTimes)
+        if _es_minutos(settings['maghrib']):
+            maghrib = sunset - _eval(settings['maghrib']) / 60.0
+        if _es_minutos(settings['isha']):
+            isha = maghrib - _eval(settings['isha']) / 60.0
+        dhuhr = dhuhr + _eval(settings['dhuhr']) / 60.0
+
+        if settings.get('midnight') == 'Jafari':
+            midnight = sunset + _fixhour(fajr - sunset) / 2
+        else:
+            midnight = sunset + _fixhour(sunrise - sunset) / 2
+
+        tiempos = []
+        for nombre, t in zip(NOMBRES_TIEMPOS, (fajr, sunrise, dhuhr, asr, maghrib, isha, midnight)):
+            t = t + offsets_minutos.get(nombre, 0) / 60.0
+
+            # Redondeo de PrayTimes.getFormattedTime: +30 s y truncar
+            t = _fixhour(t + 0.5 / 60)
+            horas = np.floor(t)
+            minutos = np.floor((t - horas) * 60)
+            total = horas * 60 + minutos
+            tiempos.append(np.where(np.isnan(total), SIN_TIEMPO, total))
+
+    n = np.broadcast(ordinales, lat, lng, tz).shape
+    return np.stack([np.broadcast_to(t, n) for t in tiempos], axis=-1).astype(np.uint16)
+
+
+# ==================== BENCHMARK ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark: PrayTimes día a día vs motor vectorizado")
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--lat", type=float, default=40.4168)
+    parser.add_argument("--lon", type=float, default=-3.7038)
+    parser.add_argument("--tz", default="Europe/Madrid")
+    args = parser.parse_args()
+
+    import sys
+    from datetime import date, timedelta
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).parent.parent))
+
+    from services.tiempos_liturgicos import CalculadorTiemposLiturgicos
+
+    calc = CalculadorTiemposLiturgicos(args.lat, args.lon, args.tz)
+    desde = date.today()
+    fechas = [desde + timedelta(days=i) for i in range(args.dias)]
+
+    inicio = time.perf_counter()
+    escalar = [calc._calcular_minutos(f) for f in fechas]
+    t_escalar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    vectorizado = calc._calcular_minutos_rango(fechas)
+    t_vector = time.perf_counter() - inicio
+
+    dif_max = 0
+    sin_tiempo_distintos = 0
+    for a, b in zip(escalar, vectorizado.tolist()):
+        for x, y in zip(a, b):
+            if x == y:
+                continue
+            if SIN_TIEMPO in (x, y):
+                # Un motor da hora y el otro no: diferencia no acotada
+                sin_tiempo_distintos += 1
+                dif_max = float("inf")
+            else:
+                dif_max = max(dif_max, abs(x - y))
+
+    print(f"📅 {args.dias} días en ({args.lat}, {args.lon}) {args.tz}")
+    print(f"   PrayTimes día a día: {t_escalar * 1000:.1f} ms")
+    print(f"   Vectorizado:         {t_vector * 1000:.1f} ms")
+    print(f"   Speedup:             {t_escalar / t_vector:.1f}x")
+    print(f"   Diferencia máxima:   {dif_max} min")
+    print(f"   Sin hora en uno:     {sin_tiempo_distintos}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Tests del Guardian: lecturas del día sobre la misma base de datos que sus escrituras.
+"""
+
+import asyncio
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from agentes.guardian import AgenteGuardian
+from models.database import Base, EstadoCeroDB, SesionDB
+from models.database_async import SesionEnHilo
+from models.db_config import crear_engine
+
+
+def _sembrar(session: Session):
+    hoy = datetime.combine(date.today(), datetime.min.time())
+    session.add_all([
+        EstadoCeroDB(id="hoy", fecha=hoy + timedelta(hours=6), momento="fajr", completado=True),
+        EstadoCeroDB(id="ayer", fecha=hoy - timedelta(hours=12), momento="isha", completado=True),
+        SesionDB(id="s1", fecha=date.today(), duracion_minutos=45),
+    ])
+    session.commit()
+
+
+async def _comprobar(agente: AgenteGuardian):
+    datos = await agente._recopilar_datos_dia(date.today())
+    assert datos["estados_cero_completados"] == 1
+    assert datos["finanzas"]["tiempo_generacion"] == 0.75
+
+    salud = await agente.monitorear_salud_sistema()
+    assert (salud["estados_cero"], salud["sesiones"]) == (1, 1)
+
+    patrones = await agente.detectar_patrones(dias_atras=7)
+    assert (patrones["total_estados_cero"], patrones["total_sesiones"]) == (2, 1)
+
+
+def test_sin_sesion_async_lee_la_sesion_inyectada():
+    """Con solo la Session (BD en memoria) el Guardian lee esa misma base de datos."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        _sembrar(db)
+        asyncio.run(_comprobar(AgenteGuardian(db, claude=None)))
+
+
+def test_sesion_async_inyectada(tmp_path):
+    """La sesión asíncrona del constructor (get_async_db en la API) es la que se consulta."""
+    engine = crear_engine(f"sqlite:///{tmp_path / 'guardian.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        _sembrar(db)
+
+    async def ejecutar():
+        async with SesionEnHilo(Session(engine, expire_on_commit=False)) as adb:
+            await _comprobar(AgenteGuardian(Session(engine), claude=None, adb=adb))
+
+    asyncio.run(ejecutar())
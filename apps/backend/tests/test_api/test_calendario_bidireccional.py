@@ -0,0 +1,64 @@
+"""
+Tests de la programación semanal/mensual del calendario bidireccional.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+pytest.importorskip("aiohttp")  # Dependencia de services.google_calendar
+
+os.environ.setdefault("OBSIDIAN_VAULT_PATH", tempfile.mkdtemp(prefix="vault_calendario_"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import calendario_bidireccional
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    rangos = []
+    semanas = []
+
+    async def programar_semana(fecha_inicio):
+        semanas.append(fecha_inicio)
+        return [f"evento_{fecha_inicio.isoformat()}"]
+
+    calendar = calendario_bidireccional.calendar
+    monkeypatch.setattr(calendar, "programar_semana_estados_cero", programar_semana)
+    monkeypatch.setattr(calendar.calculador, "precalcular_rango", lambda desde, hasta: rangos.append((desde, hasta)))
+
+    app = FastAPI()
+    app.include_router(calendario_bidireccional.router)
+    return TestClient(app), rangos, semanas
+
+
+def test_programar_semana_precalcula_el_rango(cliente):
+    """Con y sin fecha_inicio se precalculan todas las semanas y se programan."""
+    client, rangos, semanas = cliente
+
+    r = client.post("/programar-semana", params={"fecha_inicio": "2025-10-20", "semanas": 2})
+    assert r.status_code == 200
+    assert r.json()["eventos_creados"] == 2
+    assert rangos == [(date(2025, 10, 20), date(2025, 11, 2))]
+    assert semanas == [date(2025, 10, 20), date(2025, 10, 27)]
+
+    r = client.post("/programar-semana")
+    assert r.status_code == 200
+    assert rangos[-1] == (date.today(), date.today() + timedelta(days=6))
+
+
+def test_programar_mes_precalcula_sus_semanas(cliente):
+    """El mes se calienta de una vez: 5 semanas desde el día 1."""
+    client, rangos, semanas = cliente
+
+    r = client.post("/programar-mes", params={"año": 2025, "mes": 10})
+    assert r.status_code == 200
+    assert r.json()["semanas_programadas"] == 5
+    assert rangos == [(date(2025, 10, 1), date(2025, 11, 4))]
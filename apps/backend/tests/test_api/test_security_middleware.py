@@ -0,0 +1,65 @@
+"""
+Tests del middleware de seguridad ASGI (validación, rate limit, headers).
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.security import SecurityMiddleware
+from services.rate_limiter import BackendMemoria, RateLimiter
+
+
+def _cliente(entorno: str = "test", base_url: str = "http://testserver") -> TestClient:
+    app = FastAPI()
+
+    @app.get("/api/estado-cero/hoy")
+    async def estado_cero():
+        return {"ok": True}
+
+    @app.get("/api/stream")
+    async def stream():
+        async def partes():
+            for i in range(3):
+                yield f"{i}\n"
+        return StreamingResponse(partes())
+
+    app.add_middleware(SecurityMiddleware, entorno=entorno, limiter=RateLimiter(BackendMemoria()))
+    return TestClient(app, base_url=base_url)
+
+
+def test_headers_validacion_y_streaming():
+    """Añade headers de seguridad, rechaza scanners y no rompe el streaming."""
+    cliente = _cliente()
+
+    r = cliente.get("/api/estado-cero/hoy")
+    assert r.status_code == 200
+    assert r.headers["x-frame-options"] == "DENY"
+    assert r.headers["x-ratelimit-limit"] == "10"
+    assert r.headers["x-ratelimit-remaining"] == "9"
+    assert "x-process-time" in r.headers
+    assert "strict-transport-security" not in r.headers
+
+    assert cliente.get("/api/stream").text == "0\n1\n2\n"
+    assert cliente.get("/api/stream", headers={"user-agent": "sqlmap/1.7"}).status_code == 403
+    assert cliente.request("PATCH", "/api/stream").status_code == 405
+
+
+def test_rate_limit_y_produccion():
+    """Devuelve 429 con Retry-After y en producción exige HTTPS con HSTS."""
+    cliente = _cliente()
+    for _ in range(10):
+        cliente.get("/api/estado-cero/hoy")
+    r = cliente.get("/api/estado-cero/hoy")
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "6"
+    assert r.headers["x-content-type-options"] == "nosniff"
+
+    assert _cliente("production").get("/api/stream").status_code == 426
+    r = _cliente("production", "https://testserver").get("/api/stream")
+    assert r.status_code == 200
+    assert r.headers["strict-transport-security"].startswith("max-age=")
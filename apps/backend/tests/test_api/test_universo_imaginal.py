@@ -0,0 +1,49 @@
+"""
+Tests de las constelaciones calculadas desde el índice del vault.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import universo_imaginal
+from services.obsidian_index import IndiceVaultObsidian
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    (vault / "A.md").write_text("# A\n[[B]] #finanzas", encoding="utf-8")
+    (vault / "B.md").write_text("# B\n[[A]] [[C]] #finanzas", encoding="utf-8")
+    (vault / "C.md").write_text("# C\n#creatividad", encoding="utf-8")
+    (vault / "Sola.md").write_text("# Sola", encoding="utf-8")
+
+    monkeypatch.setattr(universo_imaginal, "VAULT_PATH", str(vault))
+    monkeypatch.setattr(
+        universo_imaginal, "obtener_indice",
+        lambda parser: IndiceVaultObsidian(parser, db_path=tmp_path / "indice.db")
+    )
+
+    app = FastAPI()
+    app.include_router(universo_imaginal.router_vault, prefix="/api/universo-imaginal")
+    return TestClient(app)
+
+
+def test_constelaciones_desde_el_indice(cliente):
+    """Las notas enlazadas forman una constelación; la nota aislada no."""
+    respuesta = cliente.get("/api/universo-imaginal/constelaciones")
+    assert respuesta.status_code == 200
+
+    datos = respuesta.json()
+    assert datos["total"] == 1
+    [constelacion] = datos["constelaciones"]
+    assert sorted(constelacion["estrellas"]) == ["A.md", "B.md", "C.md"]
+    assert constelacion["dimension_principal"] == "finanzas"
+
+    assert cliente.get("/api/universo-imaginal/constelaciones", params={"dimension": "biologia"}).json()["total"] == 0
+    assert cliente.get("/api/universo-imaginal/constelaciones", params={"metodo": "dfs"}).status_code == 422
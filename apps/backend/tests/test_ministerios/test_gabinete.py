@@ -0,0 +1,121 @@
+"""
+Tests del Gabinete Ministerial (plazo por reunión y cache de reportes).
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import ministerios
+from ministerios import GabineteMinisterial, MinisterioBase
+
+
+class _Ministerio(MinisterioBase):
+    """Ministerio de prueba que cuenta consultas y puede quedarse colgado."""
+
+    def __init__(self, salud: float = 80.0, bloqueo: threading.Event = None):
+        self.salud = salud
+        self.bloqueo = bloqueo
+        self.consultas = 0
+
+    @property
+    def nombre_divino(self) -> str:
+        return "Al-Ḥakam"
+
+    @property
+    def pregunta_existencial(self) -> str:
+        return "¿Responde a tiempo?"
+
+    def estado_actual(self):
+        self.consultas += 1
+        if self.bloqueo is not None:
+            self.bloqueo.wait(5)
+        return {"pendientes": ["revisar"]}
+
+    def responder_a_decreto(self, decreto):
+        return {"decreto": decreto.accion_tangible}
+
+    def metricas_salud(self):
+        return {"energia": self.salud}
+
+
+def _decreto(id=1, accion="Escribir el capítulo 3"):
+    return SimpleNamespace(id=id, accion_tangible=accion)
+
+
+def test_ministerios_lentos_comparten_un_plazo_y_no_se_cachean():
+    """Los que vencen el plazo quedan con error, la reunión sigue y no se guardan."""
+    bloqueo = threading.Event()
+    gabinete = GabineteMinisterial()
+    rapido = _Ministerio(salud=90.0)
+    lentos = [_Ministerio(bloqueo=bloqueo) for _ in range(2)]
+    gabinete.registrar_ministerio("mente", rapido)
+    gabinete.registrar_ministerio("cuerpo", lentos[0])
+    gabinete.registrar_ministerio("capital", lentos[1])
+
+    try:
+        inicio = time.monotonic()
+        reunion = gabinete.reunion_ministerial(_decreto(), timeout=0.2)
+        transcurrido = time.monotonic() - inicio
+
+        # Un único plazo para todos, no 0.2s por ministerio lento
+        assert transcurrido < 0.35
+        assert list(reunion["reportes"]) == ["mente", "cuerpo", "capital"]
+        assert reunion["reportes"]["cuerpo"]["timeout"] is True
+        assert reunion["reportes"]["capital"]["timeout"] is True
+        assert reunion["salud_global"] == 90.0
+
+        bloqueo.set()
+        reunion = gabinete.reunion_ministerial(_decreto(), timeout=1.0)
+        assert "error" not in reunion["reportes"]["cuerpo"]
+        assert rapido.consultas == 1
+        assert [m.consultas for m in lentos] == [2, 2]
+    finally:
+        bloqueo.set()
+
+
+def test_reportes_cacheados_se_devuelven_como_copias():
+    """Modificar el resultado de una reunión no altera los reportes en cache."""
+    gabinete = GabineteMinisterial()
+    ministerio = _Ministerio()
+    gabinete.registrar_ministerio("mente", ministerio)
+
+    primera = gabinete.reunion_ministerial(_decreto())
+    primera["reportes"]["mente"]["metricas"]["energia"] = 0
+    primera["reportes"]["mente"]["estado"]["pendientes"].append("intruso")
+
+    segunda = gabinete.reunion_ministerial(_decreto())
+    segunda["reportes"]["mente"]["estado"]["pendientes"].clear()
+
+    tercera = gabinete.reunion_ministerial(_decreto())
+    assert ministerio.consultas == 1
+    assert tercera["reportes"]["mente"]["metricas"] == {"energia": 80.0}
+    assert tercera["reportes"]["mente"]["estado"] == {"pendientes": ["revisar"]}
+    assert tercera["salud_global"] == 80.0
+
+
+def test_cache_por_decreto_ttl_y_registro(monkeypatch):
+    """Otro decreto, un snapshot vencido o un ministerio re-registrado vuelven a consultar."""
+    gabinete = GabineteMinisterial()
+    ministerio = _Ministerio()
+    gabinete.registrar_ministerio("mente", ministerio)
+
+    gabinete.reunion_ministerial(_decreto())
+    gabinete.reunion_ministerial(_decreto())
+    assert ministerio.consultas == 1
+
+    gabinete.reunion_ministerial(_decreto(accion="Llamar a mamá"))
+    assert ministerio.consultas == 2
+
+    monkeypatch.setattr(ministerios, "SNAPSHOT_TTL", -1.0)
+    gabinete.reunion_ministerial(_decreto())
+    assert ministerio.consultas == 3
+    monkeypatch.undo()
+
+    nuevo = _Ministerio(salud=50.0)
+    gabinete.registrar_ministerio("mente", nuevo)
+    assert gabinete.reunion_ministerial(_decreto())["salud_global"] == 50.0
+    assert nuevo.consultas == 1
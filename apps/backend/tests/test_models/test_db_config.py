@@ -0,0 +1,45 @@
+"""
+Tests de la configuración SQLite (pragmas) y de la cola de escritura.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from models.database import Base, SesionDB
+from models.db_config import ColaEscritura, crear_engine
+
+
+def test_pragmas_aplicados(tmp_path):
+    """Cada conexión abre en WAL con busy_timeout y synchronous=NORMAL."""
+    engine = crear_engine(f"sqlite:///{tmp_path / 'organismo.db'}")
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+
+
+def test_cola_agrupa_y_aisla_errores(tmp_path):
+    """Las escrituras se confirman por lotes y un fallo no arrastra al resto del lote."""
+    url = f"sqlite:///{tmp_path / 'organismo.db'}"
+    Base.metadata.create_all(crear_engine(url))
+    cola = ColaEscritura(crear_engine(url, escritor=True), espera_lote=0.05)
+    try:
+        futuros = [cola.guardar(SesionDB(id=f"s{i}", rol="test")) for i in range(50)]
+        duplicado = cola.guardar(SesionDB(id="s0"))
+        siguiente = cola.guardar(SesionDB(id="s50"))
+
+        for futuro in futuros:
+            futuro.result(timeout=5)
+        with pytest.raises(IntegrityError):
+            duplicado.result(timeout=5)
+        siguiente.result(timeout=5)
+
+        assert cola.escribir(lambda session: session.query(SesionDB).count()) == 51
+        estadisticas = cola.obtener_estadisticas()
+        assert estadisticas["lotes"] < estadisticas["operaciones"]
+    finally:
+        cola.cerrar()
@@ -0,0 +1,83 @@
+"""
+Tests de los repositorios asíncronos (con aiosqlite y con el adaptador en hilo).
+"""
+
+import asyncio
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+from sqlalchemy.orm import Session
+
+from models.database import Base, EstadoCeroDB, SesionDB
+from models.database_async import AIOSQLITE_DISPONIBLE, SesionEnHilo
+from models.db_config import crear_engine
+from models.decreto_sacral import DecretoSacral
+from models.repositorios import RepositorioDecretos, RepositorioEstadosCero, RepositorioSesiones
+
+
+def _sembrar(url: str):
+    engine = crear_engine(url)
+    Base.metadata.create_all(engine)
+    hoy = date.today()
+    with Session(engine) as session:
+        session.add_all([
+            EstadoCeroDB(id="a", fecha=datetime.combine(hoy, datetime.min.time()) + timedelta(hours=6),
+                         momento="fajr", completado=True),
+            EstadoCeroDB(id="b", fecha=datetime.combine(hoy, datetime.min.time()) + timedelta(hours=13),
+                         momento="dhuhr", completado=False),
+            EstadoCeroDB(id="c", fecha=datetime.now() - timedelta(days=2), momento="fajr", completado=True),
+            SesionDB(id="s1", fecha=hoy, duracion_minutos=30),
+            DecretoSacral(fecha=hoy, accion_tangible="Escribir", estado="completado"),
+        ])
+        session.commit()
+    return engine
+
+
+async def _comprobar(db):
+    hoy = date.today()
+    estados = RepositorioEstadosCero(db)
+    assert {e.id for e in await estados.del_dia(hoy)} == {"a", "b"}
+    assert await estados.momentos_completados(hoy) == {"fajr"}
+    assert (await estados.obtener("c")).momento == "fajr"
+    assert [e.id for e in await estados.recientes(2)] == ["b", "a"]
+    assert await RepositorioSesiones(db).contar_del_dia(hoy) == 1
+
+    decretos = RepositorioDecretos(db)
+    assert await decretos.activo_del_dia(hoy) is None
+    nuevo = await decretos.agregar(DecretoSacral(fecha=hoy, accion_tangible="Caminar", estado="pendiente"))
+    assert nuevo.id is not None
+    assert (await decretos.activo_del_dia(hoy)).accion_tangible == "Caminar"
+    assert len(await decretos.historial()) == 2
+
+
+def test_repositorios_en_hilo(tmp_path):
+    """Sin aiosqlite, la Session síncrona en un hilo ofrece la misma interfaz."""
+    engine = _sembrar(f"sqlite:///{tmp_path / 'organismo.db'}")
+
+    async def escenario():
+        async with SesionEnHilo(Session(engine, expire_on_commit=False)) as db:
+            await _comprobar(db)
+
+    asyncio.run(escenario())
+
+
+@pytest.mark.skipif(not AIOSQLITE_DISPONIBLE, reason="aiosqlite no instalado")
+def test_repositorios_aiosqlite(tmp_path):
+    """Con aiosqlite, las consultas van por AsyncSession sin bloquear el loop."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    ruta = tmp_path / "organismo.db"
+    _sembrar(f"sqlite:///{ruta}")
+
+    async def escenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{ruta}")
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                await _comprobar(db)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(escenario())
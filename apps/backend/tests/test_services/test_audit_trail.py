@@ -0,0 +1,93 @@
+"""
+Tests del audit trail (escritor en lote + migración del markdown previo).
+"""
+
+import sys
+import threading
+from datetime import date, datetime
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from services import audit_trail
+from services.audit_trail import AuditTrail
+
+
+MARKDOWN_LEGADO = """---
+tipo: audit-trail
+fecha: {fecha}
+eventos_registrados: 2
+---
+
+# Audit Trail - {fecha}
+
+| Timestamp | Tipo | Origen | Estado | Duración | Metadata |
+|-----------|------|--------|--------|----------|----------|
+| 08:00:00.000 | estado_cero | user | success | 120ms | {{"momento": "fajr"}} |
+| 09:30:00.000 | sync | worker | error | -ms | {{"nota": "a|b"}} |
+"""
+
+
+def test_primer_evento_del_dia_conserva_el_markdown_previo(tmp_path):
+    """Las filas del markdown anterior al sidecar se importan antes del nuevo evento."""
+    hoy = date.today()
+    trail = AuditTrail(str(tmp_path))
+    md = trail.audit_dir / f"{hoy.isoformat()}.md"
+    md.write_text(MARKDOWN_LEGADO.format(fecha=hoy.isoformat()), encoding="utf-8")
+
+    assert [e["tipo"] for e in trail.get_eventos_dia(hoy)] == ["estado_cero", "sync"]
+
+    trail.log_event("decreto", "user", "success", {"id": 7}, duracion_ms=5)
+    trail.flush()
+
+    eventos = trail.get_eventos_dia(hoy)
+    assert [e["tipo"] for e in eventos] == ["estado_cero", "sync", "decreto"]
+    assert eventos[0]["duracion_ms"] == "120ms" and eventos[1]["duracion_ms"] == "-ms"
+    assert eventos[1]["metadata"] == {"nota": "a|b"}
+
+    contenido = md.read_text(encoding="utf-8")
+    assert "eventos_registrados: 3" in contenido
+    assert "08:00:00.000" in contenido and "| decreto |" in contenido
+
+
+def test_escritor_en_lote_con_hilos_y_rotacion(tmp_path, monkeypatch):
+    """Eventos concurrentes llegan todos al sidecar (rotado por tamaño) y al markdown."""
+    monkeypatch.setattr(audit_trail, "MAX_SIDECAR_BYTES", 2048)
+    monkeypatch.setattr(audit_trail, "MAX_BATCH", 16)
+    trail = AuditTrail(str(tmp_path))
+
+    def registrar(hilo):
+        for i in range(50):
+            trail.log_event("evento", f"hilo-{hilo}", "success", {"i": i})
+
+    hilos = [threading.Thread(target=registrar, args=(h,)) for h in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    trail.flush()
+
+    eventos = trail.get_eventos_dia(date.today())
+    assert len(eventos) == 200
+    for h in range(4):  # Orden de llegada por productor
+        assert [e["metadata"]["i"] for e in eventos if e["origen"] == f"hilo-{h}"] == list(range(50))
+
+    assert len(trail._writer.segmentos(date.today().isoformat())) > 1
+    md = (trail.audit_dir / f"{date.today().isoformat()}.md").read_text(encoding="utf-8")
+    assert "eventos_registrados: 200" in md
+
+
+def test_metadata_no_serializable_falla_en_quien_llama(tmp_path):
+    """Un evento no serializable lanza en log_event y no tira el lote de los demás."""
+    trail = AuditTrail(str(tmp_path))
+    trail.log_event("ok", "user", "success", {"n": 1})
+    with pytest.raises(TypeError):
+        trail.log_event("malo", "user", "success", {"cuando": datetime.now()})
+    metadata = {"n": 2}
+    trail.log_event("ok2", "user", "success", metadata)
+    metadata["n"] = 99  # Mutación posterior: no afecta al registro
+    trail.flush()
+
+    eventos = trail.get_eventos_dia(date.today())
+    assert [(e["tipo"], e["metadata"]) for e in eventos] == [("ok", {"n": 1}), ("ok2", {"n": 2})]
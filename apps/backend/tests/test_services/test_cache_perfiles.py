@@ -0,0 +1,51 @@
+"""
+Tests de la cache de perfiles (capas 4 y 6).
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+from pydantic import ValidationError
+
+from models.diseno_humano import DisenoHumano, crear_diseno_daniel
+from models.tipologia_cognitiva import crear_perfil_entp_5w4
+from services.cache_perfiles import CachePerfiles
+
+
+def test_comparte_instancias_inmutables(tmp_path):
+    """Sin perfiles en la config se cachea el default, congelado y compartido."""
+    ruta = tmp_path / "configuracion_usuario.json"
+    ruta.write_text(json.dumps({"user_id": "default"}), encoding="utf-8")
+    cache = CachePerfiles()
+
+    perfil = cache.perfil_cognitivo(ruta=ruta, por_defecto=crear_perfil_entp_5w4)
+    assert cache.perfil_cognitivo(ruta=ruta, por_defecto=crear_perfil_entp_5w4) is perfil
+    assert perfil.generar_contexto_mental(hora=9) == crear_perfil_entp_5w4().generar_contexto_mental(hora=9)
+
+    dh = cache.diseno_humano(ruta=ruta, por_defecto=crear_diseno_daniel)
+    assert isinstance(dh, DisenoHumano)
+    with pytest.raises(ValidationError):
+        dh.perfil = "1/3"
+    assert cache.obtener_estadisticas()["cargas"] == 2
+
+
+def test_recarga_al_cambiar_archivo_o_invalidar(tmp_path):
+    """Un cambio de mtime/tamaño o invalidar() fuerzan una nueva carga."""
+    ruta = tmp_path / "configuracion_usuario.json"
+    ruta.write_text("{}", encoding="utf-8")
+    cache = CachePerfiles()
+
+    primero = cache.diseno_humano(ruta=ruta, por_defecto=crear_diseno_daniel)
+    ruta.write_text(json.dumps({"user_id": "default"}), encoding="utf-8")
+    mtime = ruta.stat().st_mtime_ns + 1_000_000  # Independiente de la resolución del FS
+    os.utime(ruta, ns=(mtime, mtime))
+    segundo = cache.diseno_humano(ruta=ruta, por_defecto=crear_diseno_daniel)
+    assert segundo is not primero
+
+    cache.invalidar()
+    assert cache.diseno_humano(ruta=ruta, por_defecto=crear_diseno_daniel) is not segundo
+    assert cache.obtener_estadisticas()["cargas"] == 3
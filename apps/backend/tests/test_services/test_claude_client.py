@@ -0,0 +1,77 @@
+"""
+Tests del cliente de Claude: qué respuestas de generate_json pasan por el cache.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.claude_client import ClaudeClient
+from services.llm_cache import LLMCache
+
+
+MENSAJES = [{"role": "user", "content": "Genera el plan en JSON"}]
+
+
+class _MotorFalso:
+    """Sustituto de ClaudeEngine que devuelve textos prefijados y cuenta llamadas."""
+
+    def __init__(self, *textos):
+        self.textos = list(textos)
+        self.llamadas = 0
+
+    async def create_message(self, **kwargs):
+        self.llamadas += 1
+        texto = self.textos.pop(0)
+        if isinstance(texto, Exception):
+            raise texto
+        return SimpleNamespace(content=[SimpleNamespace(text=texto)])
+
+
+def _cliente(tmp_path, motor) -> ClaudeClient:
+    cliente = ClaudeClient.__new__(ClaudeClient)
+    cliente.api_key = "test"
+    cliente.client = motor
+    cliente.cache = LLMCache(db_path=str(tmp_path / "llm_cache.db"))
+    return cliente
+
+
+def test_json_valido_se_cachea(tmp_path):
+    """Una respuesta JSON se guarda y la siguiente llamada idéntica no llega a la API."""
+    motor = _MotorFalso('{"bloques_sugeridos": []}')
+    cliente = _cliente(tmp_path, motor)
+
+    assert asyncio.run(cliente.generate_json("sys", MENSAJES)) == {"bloques_sugeridos": []}
+    assert asyncio.run(cliente.generate_json("sys", MENSAJES)) == {"bloques_sugeridos": []}
+    assert motor.llamadas == 1
+    assert cliente.cache.stats["guardadas"] == 1
+
+
+def test_texto_no_json_ni_mock_se_cachean(tmp_path):
+    """Texto que no parsea como JSON o un error de API no se guardan; se reintenta la API."""
+    motor = _MotorFalso("Claro, aquí tienes el plan:", RuntimeError("caída"), '{"ok": true}')
+    cliente = _cliente(tmp_path, motor)
+
+    mock = cliente._get_mock_response(MENSAJES)
+    assert asyncio.run(cliente.generate_json("sys", MENSAJES)) == mock
+    assert asyncio.run(cliente.generate_json("sys", MENSAJES)) == mock
+    assert cliente.cache.stats["guardadas"] == 0
+
+    assert asyncio.run(cliente.generate_json("sys", MENSAJES)) == {"ok": True}
+    assert motor.llamadas == 3
+    assert cliente.cache.stats["guardadas"] == 1
+
+
+def test_entrada_no_json_existente_se_ignora(tmp_path):
+    """Una entrada de texto suelto guardada antes del arreglo no se reutiliza en generate_json."""
+    motor = _MotorFalso('{"ok": true}')
+    cliente = _cliente(tmp_path, motor)
+    system = "sys\n\nResponde SOLO con JSON válido, sin texto adicional."
+    clave = cliente.cache.clave("claude-3-5-sonnet-20241022", system, MENSAJES, max_tokens=800)
+    cliente.cache.guardar(clave, "no es JSON", ttl=60)
+
+    assert asyncio.run(cliente.generate_json("sys", MENSAJES)) == {"ok": True}
+    assert motor.llamadas == 1
+    assert cliente.cache.obtener(clave) == '{"ok": true}'
@@ -0,0 +1,172 @@
+"""
+Tests del motor asíncrono de Claude (límites, reintentos y cambio de loop).
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from services import claude_engine
+from services.claude_engine import ClaudeEngine
+
+
+class _Mensajes:
+    def __init__(self, create):
+        self.create = create
+
+
+class _ClienteFalso:
+    """Sustituto de anthropic.AsyncAnthropic: delega en `crear` del test."""
+    crear = None
+    instancias = []
+
+    def __init__(self, http_client=None, **kwargs):
+        self.http_client = http_client
+        self.messages = _Mensajes(type(self).crear)
+        _ClienteFalso.instancias.append(self)
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    _ClienteFalso.instancias = []
+    monkeypatch.setattr(claude_engine.anthropic, "AsyncAnthropic", _ClienteFalso)
+    return _ClienteFalso
+
+
+def _motor(**kwargs):
+    kwargs.setdefault("backoff_base", 0.0)
+    return ClaudeEngine(api_key="test", **kwargs)
+
+
+def test_modelo_saturado_no_ocupa_huecos_globales(cliente):
+    """Quien espera a un modelo saturado no bloquea a otro modelo con hueco global."""
+    motor = _motor(max_concurrencia=2, limites_por_modelo={"lento": 1, "rapido": 1})
+
+    async def escenario():
+        liberar = asyncio.Event()
+        activos = {"lento": 0, "rapido": 0}
+        maximos = {"lento": 0, "rapido": 0}
+
+        async def crear(model, **kwargs):
+            activos[model] += 1
+            maximos[model] = max(maximos[model], activos[model])
+            try:
+                if model == "lento":
+                    await liberar.wait()
+                return model
+            finally:
+                activos[model] -= 1
+
+        cliente.crear = crear
+        lentas = [asyncio.create_task(motor.create_message(model="lento")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        # Una lenta en vuelo y otra esperando a su modelo: la rápida pasa igualmente
+        assert await asyncio.wait_for(motor.create_message(model="rapido"), 1) == "rapido"
+        assert motor.stats["en_vuelo"] == 1
+
+        liberar.set()
+        assert await asyncio.gather(*lentas) == ["lento", "lento"]
+        return maximos
+
+    assert asyncio.run(escenario()) == {"lento": 1, "rapido": 1}
+    assert motor.stats["en_vuelo"] == 0
+
+
+def test_limite_global(cliente):
+    """Nunca hay más llamadas en vuelo que max_concurrencia."""
+    motor = _motor(max_concurrencia=3, limites_por_modelo={})
+    en_vuelo = {"actual": 0, "maximo": 0}
+
+    async def crear(model, **kwargs):
+        en_vuelo["actual"] += 1
+        en_vuelo["maximo"] = max(en_vuelo["maximo"], en_vuelo["actual"])
+        await asyncio.sleep(0.01)
+        en_vuelo["actual"] -= 1
+        return model
+
+    async def escenario():
+        cliente.crear = crear
+        modelos = [f"m{i % 5}" for i in range(20)]
+        return await asyncio.gather(*(motor.create_message(model=m) for m in modelos))
+
+    assert len(asyncio.run(escenario())) == 20
+    assert en_vuelo["maximo"] == 3
+    assert motor.stats["llamadas"] == 20
+
+
+def test_timeout_se_reintenta_y_se_contabiliza(cliente):
+    """Un timeout cuenta como intento, timeout y reintento; el segundo intento responde."""
+    motor = _motor(timeout=0.05, max_reintentos=3)
+    intentos = []
+
+    async def crear(**kwargs):
+        intentos.append(1)
+        if len(intentos) == 1:
+            await asyncio.sleep(1)
+        return "ok"
+
+    cliente.crear = crear
+
+    assert asyncio.run(motor.create_message(model="m")) == "ok"
+    assert motor.stats["timeouts"] == 1
+    assert motor.stats["reintentos"] == 1
+    assert motor.stats["llamadas"] == 2
+    assert motor.stats["errores"] == 0
+    assert motor.stats["en_vuelo"] == 0
+
+
+def test_reintentos_agotados_y_errores_no_reintentables(cliente):
+    """Tras max_reintentos se propaga el timeout; un error no transitorio no se reintenta."""
+    motor = _motor(timeout=0.01, max_reintentos=1)
+
+    async def lenta(**kwargs):
+        await asyncio.sleep(1)
+
+    cliente.crear = lenta
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(motor.create_message(model="m"))
+
+    assert motor.stats["timeouts"] == 2
+    assert motor.stats["reintentos"] == 1
+    assert motor.stats["errores"] == 1
+
+    async def rota(**kwargs):
+        raise ValueError("petición inválida")
+
+    cliente.crear = rota
+    with pytest.raises(ValueError):
+        asyncio.run(motor.create_message(model="m"))
+
+    assert motor.stats["reintentos"] == 1
+    assert motor.stats["errores"] == 2
+    assert motor.stats["en_vuelo"] == 0
+
+
+def test_cambio_de_loop_cierra_el_pool_anterior(cliente):
+    """Cada asyncio.run recrea cliente y semáforos y cierra el httpx del loop anterior."""
+    motor = _motor()
+
+    async def crear(**kwargs):
+        return "ok"
+
+    cliente.crear = crear
+
+    asyncio.run(motor.create_message(model="m"))
+    primero = cliente.instancias[-1].http_client
+    semaforo = motor._semaforo_global
+
+    asyncio.run(motor.create_message(model="m"))
+    segundo = cliente.instancias[-1].http_client
+
+    assert len(cliente.instancias) == 2
+    assert primero is not segundo
+    assert primero.is_closed
+    assert not segundo.is_closed
+    assert motor._semaforo_global is not semaforo
+
+    asyncio.run(motor.aclose())
+    assert segundo.is_closed
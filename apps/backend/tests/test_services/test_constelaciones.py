@@ -0,0 +1,55 @@
+"""
+Tests de constelaciones (union-find, propagación de etiquetas, agregados).
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from models.universo import Estrella, Vector3D
+from services import constelaciones
+from services.constelaciones import detectar_constelaciones
+from services.obsidian_parser import GrafoEnlaces, NotaObsidian
+
+
+def _estrella(nombre: str, dimension: str, x: float = 0.0) -> Estrella:
+    return Estrella.model_construct(id=f"{nombre}.md", dimension=dimension, color=f"#{dimension}",
+                                    posicion=Vector3D(x=x, y=0.0, z=0.0))
+
+
+def test_cadena_larga_sin_recursion():
+    """Una cadena de 5000 enlaces es una sola constelación (el DFS recursivo no llegaba)."""
+    n = 5000
+    notas = [NotaObsidian(f"n{i}.md", f"n{i}", "", {}, [f"n{i + 1}"] if i + 1 < n else [], [], "finanzas")
+             for i in range(n)]
+    estrellas = [_estrella(f"n{i}", "finanzas", x=float(i)) for i in range(n)]
+
+    [constelacion] = detectar_constelaciones(estrellas, GrafoEnlaces(notas))
+    assert len(constelacion.estrellas) == n
+    assert constelacion.centro.x == pytest.approx((n - 1) / 2)
+    assert constelacion.densidad == round((n - 1) / (n * (n - 1)), 2)
+
+
+@pytest.mark.parametrize("numpy_disponible", [True, False])
+def test_comunidades_separan_grupos_densos(monkeypatch, numpy_disponible):
+    """Dos grupos completos unidos por un enlace: una componente, dos comunidades."""
+    monkeypatch.setattr(constelaciones, "NUMPY_DISPONIBLE", numpy_disponible)
+    grupos = {"a": "finanzas", "b": "creatividad"}
+    estrellas = [_estrella(f"{g}{i}", dim if i else "biologia", x=10.0 * (g == "b"))
+                 for g, dim in grupos.items() for i in range(4)]
+    adyacencia = {e.id: [o.id for o in estrellas if o.id[0] == e.id[0] and o.id != e.id] for e in estrellas}
+    adyacencia["a0.md"].append("b0.md")
+    adyacencia["solitaria.md"] = ["inexistente.md"]
+
+    [unica] = detectar_constelaciones(estrellas, adyacencia)
+    assert len(unica.estrellas) == 8 and unica.densidad == round(25 / 56, 2)
+
+    comunidades = detectar_constelaciones(estrellas, adyacencia, metodo="comunidades")
+    assert sorted(c.estrellas for c in comunidades) == [
+        [f"a{i}.md" for i in range(4)], [f"b{i}.md" for i in range(4)]
+    ]
+    assert {c.dimension_principal: (c.color, c.centro.x, c.densidad) for c in comunidades} == {
+        "finanzas": ("#finanzas", 0.0, 1.0), "creatividad": ("#creatividad", 10.0, 1.0)
+    }
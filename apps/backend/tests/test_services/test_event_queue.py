@@ -0,0 +1,129 @@
+"""
+Tests de la cola de eventos SQLite.
+"""
+
+import json
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.event_queue import EventQueue
+
+
+def test_emit_consume_fifo(tmp_path):
+    queue = EventQueue(base_dir=str(tmp_path / "events"))
+    primero = queue.emit("estado_cero_completed", {"fecha": "2025-10-15", "momento": "fajr"})
+    queue.emit("estado_cero_completed", {"fecha": "2025-10-15", "momento": "dhuhr"})
+
+    assert queue.list_pending() == {"estado_cero_completed": 2}
+    assert queue.peek("estado_cero_completed")["event_id"] == primero
+
+    evento = queue.consume("estado_cero_completed")
+    assert evento["event_id"] == primero
+    assert evento["data"]["momento"] == "fajr"
+    assert queue.list_pending() == {"estado_cero_completed": 1}
+
+
+def test_reserva_exclusiva_y_ack(tmp_path):
+    queue = EventQueue(base_dir=str(tmp_path / "events"))
+    queue.emit("t", {"n": 1})
+
+    evento = queue.consume("t", auto_ack=False, visibility_timeout=60)
+    assert evento is not None
+    # Reservado: otro consumidor no lo ve
+    assert queue.consume("t") is None
+
+    assert queue.ack(evento["event_id"])
+    assert queue.list_pending() == {}
+
+
+def test_nack_hasta_dead_letter(tmp_path):
+    queue = EventQueue(base_dir=str(tmp_path / "events"), max_intentos=2)
+    queue.emit("t", {"n": 1})
+
+    evento = queue.consume("t", auto_ack=False)
+    assert queue.nack(evento["event_id"], error="fallo 1") is False
+    evento = queue.consume("t", auto_ack=False)
+    assert queue.nack(evento["event_id"], error="fallo 2") is True
+
+    assert queue.consume("t") is None
+    muertos = queue.list_dead_letters("t")
+    assert len(muertos) == 1
+    assert muertos[0]["last_error"] == "fallo 2"
+
+    assert queue.requeue_dead_letters("t") == 1
+    assert queue.consume("t")["data"] == {"n": 1}
+
+
+def test_consume_batch(tmp_path):
+    queue = EventQueue(base_dir=str(tmp_path / "events"))
+    for n in range(5):
+        queue.emit("t", {"n": n})
+
+    lote = queue.consume_batch("t", max_events=3)
+    assert [e["data"]["n"] for e in lote] == [0, 1, 2]
+    assert queue.list_pending() == {"t": 2}
+
+
+def test_migra_layout_de_archivos(tmp_path):
+    base = tmp_path / "events"
+    tipo_dir = base / "dashboard_trigger"
+    tipo_dir.mkdir(parents=True)
+    for event_id in ["1760658790_79bd43d2", "1760658951_ccb0dd4b"]:
+        (tipo_dir / f"event_{event_id}.json").write_text(json.dumps({
+            "event_id": event_id,
+            "event_type": "dashboard_trigger",
+            "timestamp": "2025-10-17T01:53:10",
+            "data": {"tipo": "fin_dia"},
+        }))
+
+    queue = EventQueue(base_dir=str(base))
+
+    assert not list(tipo_dir.glob("event_*.json"))
+    assert queue.consume("dashboard_trigger")["event_id"] == "1760658790_79bd43d2"
+    assert queue.list_pending() == {"dashboard_trigger": 1}
+
+
+def test_emit_despierta_a_consumidor_bloqueado(tmp_path):
+    """Un emit desde otro hilo despierta a esperar_eventos vía timbre."""
+    import threading
+    import time
+
+    queue = EventQueue(base_dir=str(tmp_path / "events"))
+    assert queue.abrir_timbre()
+
+    productor = threading.Timer(0.05, queue.emit, args=("t", {"n": 1}))
+    inicio = time.monotonic()
+    productor.start()
+
+    assert queue.esperar_eventos(timeout=5.0)
+    assert time.monotonic() - inicio < 1.0
+    assert queue.esperar_eventos(timeout=0.01) is False
+    queue.cerrar_timbre()
+
+
+def test_migracion_no_borra_archivos_ilegibles(tmp_path):
+    """Un evento legado corrupto va a cuarentena; solo se borran los importados."""
+    base = tmp_path / "events"
+    tipo_dir = base / "estado_cero_completed"
+    tipo_dir.mkdir(parents=True)
+    (tipo_dir / "event_1760658790_aaaaaaaa.json").write_text(json.dumps({
+        "event_id": "1760658790_aaaaaaaa",
+        "data": {"fecha": "2025-10-15"},
+    }))
+    (tipo_dir / "event_1760658791_bbbbbbbb.json").write_text('{"event_id": "1760658791_bbb')
+    (tipo_dir / "event_1760658792_cccccccc.json").write_text('[1, 2]')
+
+    queue = EventQueue(base_dir=str(base))
+
+    assert queue.list_pending() == {"estado_cero_completed": 1}
+    assert not list(tipo_dir.glob("event_*.json"))
+    cuarentena = base / "cuarentena" / "estado_cero_completed"
+    assert sorted(p.name for p in cuarentena.iterdir()) == [
+        "event_1760658791_bbbbbbbb.json", "event_1760658792_cccccccc.json"
+    ]
+    assert (cuarentena / "event_1760658791_bbbbbbbb.json").read_text() == '{"event_id": "1760658791_bbb'
+
+    # Un segundo arranque no vuelve a tocarlos
+    assert EventQueue(base_dir=str(base)).list_pending() == {"estado_cero_completed": 1}
+    assert len(list(cuarentena.iterdir())) == 2
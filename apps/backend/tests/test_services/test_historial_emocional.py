@@ -0,0 +1,54 @@
+"""
+Tests del histórico emocional append-only.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from models.estado_emocional import TendenciaEmocional, TrackerEmocional
+from services import historial_emocional
+from services.historial_emocional import SerieEmocional
+
+
+def _datos(timestamp: datetime, estado: str, intensidad: int, momento: str) -> dict:
+    return {"timestamp": timestamp.isoformat(), "estado": estado, "intensidad": intensidad,
+            "tendencia": "estable", "momento_liturgico": momento, "desencadenante": None}
+
+
+def test_importa_legacy_y_detecta_incrementalmente(tmp_path):
+    """El JSON antiguo se importa una vez; tendencia y patrón salen de la ventana."""
+    ahora = datetime.now()
+    legacy = [_datos(ahora - timedelta(days=40), "triste", 1, "isha")]
+    legacy += [_datos(ahora - timedelta(hours=30 - i), "calma", 2, "fajr") for i in range(9)]
+    (tmp_path / "u_emocional.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    tracker = TrackerEmocional(tmp_path)
+    assert len(tracker.obtener_historico("u", dias=30)) == 9  # El de hace 40 días expira
+    assert tracker.detectar_patron_diario("u") is None        # < 10 estados en la semana
+
+    for i, intensidad in enumerate((2, 3, 4)):
+        serie = historial_emocional.get_serie_emocional(tmp_path, "u")
+        serie.agregar(_datos(ahora + timedelta(seconds=i), "calma", intensidad, "fajr"))
+
+    assert tracker.detectar_tendencia("u") == TendenciaEmocional.MEJORANDO
+    assert tracker.detectar_patron_diario("u") == "calma recurrente en fajr"
+    assert len((tmp_path / "u_emocional.jsonl").read_text(encoding="utf-8").splitlines()) == 13
+
+
+def test_lee_lo_que_añade_otro_proceso_y_compacta(tmp_path, monkeypatch):
+    """Otra serie sobre el mismo log ve solo los bytes nuevos; las líneas muertas se compactan."""
+    monkeypatch.setattr(historial_emocional, "MIN_LINEAS_COMPACTAR", 4)
+    archivo = tmp_path / "u_emocional.jsonl"
+    ahora = datetime.now()
+
+    escritor = SerieEmocional(archivo)
+    lector = SerieEmocional(archivo)
+    for i in range(3):
+        escritor.agregar(_datos(ahora - timedelta(days=31) + timedelta(seconds=i), "neutro", 3, "asr"))
+    escritor.agregar(_datos(ahora, "alegre", 4, "dhuhr"))
+
+    assert [h["estado"] for h in lector.historico(dias=30)] == ["alegre"]
+    assert len(archivo.read_text(encoding="utf-8").splitlines()) == 1  # 4 líneas, 1 viva
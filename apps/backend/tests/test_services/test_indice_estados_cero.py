@@ -0,0 +1,123 @@
+"""
+Tests del repositorio/índice de Estados Cero.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services import indice_estados_cero
+from services.indice_estados_cero import IndiceEstadosCero
+
+
+def _escribir(directorio: Path, id_: str, timestamp: datetime, momento: str, **extra):
+    datos = {"id": id_, "momento": momento, "fecha": timestamp.date().isoformat(),
+             "timestamp": timestamp.isoformat(), "completado": True, **extra}
+    (directorio / f"{id_}.json").write_text(json.dumps(datos), encoding="utf-8")
+
+
+def test_consultas_por_dia_y_rango(tmp_path):
+    """Día, momento y rango salen del índice, ordenados y filtrados por usuario."""
+    estados_dir = tmp_path / "estados_cero"
+    estados_dir.mkdir()
+    ahora = datetime.now().replace(microsecond=0)
+    _escribir(estados_dir, "ec_1", ahora - timedelta(days=10), "fajr")
+    _escribir(estados_dir, "ec_2", ahora - timedelta(hours=2), "asr")
+    _escribir(estados_dir, "ec_3", ahora - timedelta(hours=1), "maghrib", usuario_id="otra")
+
+    indice = IndiceEstadosCero(tmp_path / "indice.db", estados_dir)
+
+    recientes = indice.estados_recientes(dias=7)
+    assert [e["id"] for e in recientes] == ["ec_3", "ec_2"]
+    assert [e["id"] for e in indice.estados_recientes(dias=7, usuario="default")] == ["ec_2"]
+
+    viejo = (ahora - timedelta(days=10)).date()
+    assert [e["id"] for e in indice.estados_dia(viejo)] == ["ec_1"]
+    assert indice.estados_dia(viejo, momento="isha") == []
+
+
+def test_sincroniza_solo_cambios(tmp_path):
+    """Solo se reindexan archivos nuevos, borrados o guardados por el repositorio."""
+    estados_dir = tmp_path / "estados_cero"
+    estados_dir.mkdir()
+    ahora = datetime.now()
+    _escribir(estados_dir, "ec_1", ahora, "fajr")
+
+    indice = IndiceEstadosCero(tmp_path / "indice.db", estados_dir, intervalo_rescan=0)
+    assert indice.sincronizar() == 0  # Directorio sin cambios: no se toca
+
+    _escribir(estados_dir, "ec_2", ahora, "dhuhr")
+    (estados_dir / "ec_1.json").unlink()
+    mtime = estados_dir.stat().st_mtime_ns + 1_000_000  # Independiente de la resolución del FS
+    os.utime(estados_dir, ns=(mtime, mtime))
+    assert indice.sincronizar() == 2
+    assert [e["id"] for e in indice.estados_dia(ahora.date())] == ["ec_2"]
+
+    indice.guardar({"id": "ec_3", "momento": "isha", "fecha": ahora.date().isoformat(),
+                    "timestamp": ahora.isoformat(), "completado": True, "archivado_en_obsidian": True})
+    assert {e["id"] for e in indice.estados_dia(ahora.date())} == {"ec_2", "ec_3"}
+    assert indice.reconstruir() == {ahora.date().isoformat(): 1}
+
+
+def test_conteo_del_dia_usa_los_flags_del_json(tmp_path):
+    """El conteo del día son los JSON completados y archivados, no los eventos consumidos."""
+    estados_dir = tmp_path / "estados_cero"
+    estados_dir.mkdir()
+    ahora = datetime.now()
+    fecha = ahora.date().isoformat()
+    _escribir(estados_dir, "ec_1", ahora, "fajr", archivado_en_obsidian=True)
+    _escribir(estados_dir, "ec_2", ahora, "dhuhr")
+    _escribir(estados_dir, "ec_3", ahora, "asr", archivado_en_obsidian=True, completado=False)
+
+    indice = IndiceEstadosCero(tmp_path / "indice.db", estados_dir)
+    assert indice.contar_dia(fecha) == 1
+
+    # Un evento de un Estado Cero sin archivar no suma
+    assert indice.registrar_archivado("ec_2", fecha) == (True, 1)
+
+    # Marcado como archivado reescribiendo el JSON en el sitio: el evento lo re-indexa
+    _escribir(estados_dir, "ec_2", ahora, "dhuhr", archivado_en_obsidian=True)
+    assert indice.registrar_archivado("ec_2", fecha) == (False, 2)
+
+    # Un evento sin JSON tampoco cuenta; la re-entrega no es nueva
+    assert indice.registrar_archivado("ec_perdido", fecha) == (True, 2)
+    assert indice.registrar_archivado("ec_perdido", fecha) == (False, 2)
+    assert indice.reconstruir() == {fecha: 2}
+
+
+def test_guardar_no_provoca_reescaneos(tmp_path, monkeypatch):
+    """Las escrituras propias no re-escanean; las externas esperan al intervalo."""
+    estados_dir = tmp_path / "estados_cero"
+    estados_dir.mkdir()
+    ahora = datetime.now()
+    fecha = ahora.date().isoformat()
+    indice = IndiceEstadosCero(tmp_path / "indice.db", estados_dir, intervalo_rescan=3600)
+    indice.sincronizar(forzar=True)
+
+    escaneos = []
+    scandir = os.scandir
+
+    def contar_scandir(ruta):
+        escaneos.append(ruta)
+        return scandir(ruta)
+
+    monkeypatch.setattr(indice_estados_cero.os, "scandir", contar_scandir)
+
+    for n in range(30):
+        indice.guardar({"id": f"ec_{n}", "momento": "fajr", "fecha": fecha, "timestamp": ahora.isoformat(),
+                        "completado": True, "archivado_en_obsidian": True})
+        assert indice.contar_dia(fecha) == n + 1
+    assert len(indice.estados_dia(fecha)) == 30
+    assert escaneos == []
+
+    # Escritor externo: se recoge en el siguiente re-escaneo periódico (o forzado)
+    _escribir(estados_dir, "externo", ahora, "isha", archivado_en_obsidian=True)
+    mtime = estados_dir.stat().st_mtime_ns + 1_000_000
+    os.utime(estados_dir, ns=(mtime, mtime))
+    assert indice.contar_dia(fecha) == 30
+    indice.intervalo_rescan = 0
+    assert indice.contar_dia(fecha) == 31
+    assert len(escaneos) == 1
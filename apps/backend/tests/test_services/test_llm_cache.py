@@ -0,0 +1,108 @@
+"""
+Tests del cache de respuestas LLM (memoria LRU + SQLite).
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.llm_cache import LLMCache, UMBRAL_TEMPERATURA
+
+
+MENSAJES = [{"role": "user", "content": "Dirección emergente"}]
+
+
+def test_clave_estable_y_sensible_a_parametros():
+    """La clave no depende del orden de los parámetros, sí de sus valores."""
+    a = LLMCache.clave("haiku", "sys", MENSAJES, max_tokens=100, temperature=0.2)
+    b = LLMCache.clave("haiku", "sys", MENSAJES, temperature=0.2, max_tokens=100)
+    c = LLMCache.clave("haiku", "sys", MENSAJES, max_tokens=101, temperature=0.2)
+
+    assert a == b
+    assert a != c
+
+
+def test_hit_en_disco_tras_reinicio(tmp_path):
+    """Una entrada guardada sobrevive a una nueva instancia (nivel SQLite)."""
+    db = tmp_path / "llm_cache.db"
+    clave = LLMCache.clave("sonnet", "", MENSAJES, max_tokens=100)
+
+    LLMCache(db_path=str(db)).guardar(clave, "respuesta", ttl=60)
+    cache = LLMCache(db_path=str(db))
+
+    assert cache.obtener(clave) == "respuesta"
+    assert cache.stats["hits_disco"] == 1
+    assert cache.obtener(clave) == "respuesta"
+    assert cache.stats["hits_memoria"] == 1
+
+
+def test_lru_expulsa_la_entrada_menos_reciente():
+    cache = LLMCache(max_entradas=2)
+    cache.guardar("a", "1", ttl=60)
+    cache.guardar("b", "2", ttl=60)
+    cache.obtener("a")
+    cache.guardar("c", "3", ttl=60)
+
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") == "1"
+    assert cache.obtener("c") == "3"
+
+
+def test_temperatura_alta_no_se_cachea():
+    cache = LLMCache()
+
+    assert cache.ttl_para("default", UMBRAL_TEMPERATURA + 0.1) == 0
+    assert cache.ttl_para("preguntas.7_capas", 0.9) > 0
+    assert cache.ttl_para("orquestador.chat") == 0
+
+
+def test_guardar_async_escribe_en_disco_fuera_del_loop(tmp_path):
+    """El commit en SQLite corre en otro hilo; la memoria se actualiza al instante."""
+    db = tmp_path / "llm_cache.db"
+    cache = LLMCache(db_path=str(db))
+    hilos = []
+    guardar_disco = cache._guardar_disco
+
+    def espiar(*args):
+        hilos.append(threading.get_ident())
+        guardar_disco(*args)
+
+    cache._guardar_disco = espiar
+
+    async def escenario():
+        await cache.guardar_async("clave", "respuesta", ttl=60)
+        return threading.get_ident()
+
+    hilo_loop = asyncio.run(escenario())
+
+    assert len(hilos) == 1 and hilos[0] != hilo_loop
+    assert cache.stats["guardadas"] == 1
+    assert LLMCache(db_path=str(db)).obtener("clave") == "respuesta"
+
+
+def test_obtener_async_consulta_disco_fuera_del_loop(tmp_path):
+    """Un miss en memoria consulta SQLite en otro hilo; el hit en memoria no sale del loop."""
+    db = tmp_path / "llm_cache.db"
+    LLMCache(db_path=str(db)).guardar("clave", "respuesta", ttl=60)
+    cache = LLMCache(db_path=str(db))
+    hilos = []
+    obtener_disco = cache._obtener_disco
+
+    def espiar(clave):
+        hilos.append(threading.get_ident())
+        return obtener_disco(clave)
+
+    cache._obtener_disco = espiar
+
+    async def escenario():
+        respuestas = [await cache.obtener_async("clave"), await cache.obtener_async("clave"),
+                      await cache.obtener_async("otra")]
+        return respuestas, threading.get_ident()
+
+    respuestas, hilo_loop = asyncio.run(escenario())
+
+    assert respuestas == ["respuesta", "respuesta", None]
+    assert len(hilos) == 2 and hilo_loop not in hilos
+    assert (cache.stats["hits_disco"], cache.stats["hits_memoria"], cache.stats["misses"]) == (1, 1, 1)
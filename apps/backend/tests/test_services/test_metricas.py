@@ -0,0 +1,68 @@
+"""
+Tests de histogramas HDR, exportación Prometheus y spans anidados.
+"""
+
+import sys
+import threading
+from contextvars import copy_context
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services import metricas
+from services.metricas import HistogramaLatencia, RegistroMetricas, span, trazar
+
+
+def test_histograma_percentiles_con_error_acotado():
+    """Los percentiles quedan dentro del 6,25 % del valor real."""
+    histograma = HistogramaLatencia()
+    for ms in range(1, 1001):
+        histograma.registrar(ms / 1000)
+
+    for p, esperado in ((50, 0.5), (90, 0.9), (99, 0.99)):
+        assert abs(histograma.percentil(p) - esperado) / esperado <= 0.0625
+    assert histograma.percentil(100) == 1.0
+
+
+def test_exportacion_prometheus_acumulada():
+    """Los buckets `le` son acumulados y +Inf coincide con _count."""
+    registro = RegistroMetricas()
+    for segundos in (0.0005, 0.003, 0.2, 7.0):
+        registro.observar("db_query_duration_seconds", ("SELECT",), segundos)
+
+    texto = registro.exportar_prometheus()
+    assert '# TYPE campo_sagrado_db_query_duration_seconds histogram' in texto
+    assert 'campo_sagrado_db_query_duration_seconds_bucket{operacion="SELECT",le="0.001"} 1' in texto
+    assert 'campo_sagrado_db_query_duration_seconds_bucket{operacion="SELECT",le="0.25"} 3' in texto
+    assert 'campo_sagrado_db_query_duration_seconds_bucket{operacion="SELECT",le="+Inf"} 4' in texto
+    assert 'campo_sagrado_db_query_duration_seconds_count{operacion="SELECT"} 4' in texto
+
+
+def test_spans_anidados_y_muestreo():
+    """Los spans se anidan (también en hilos con copy_context) y el muestreo 0 no guarda árboles."""
+    def en_hilo():
+        with span("prueba.hilo"):
+            pass
+
+    @trazar("prueba.raiz")
+    def raiz():
+        with span("prueba.hijo"):
+            hilo = threading.Thread(target=copy_context().run, args=(en_hilo,))
+            hilo.start()
+            hilo.join()
+
+    metricas.configurar_muestreo(1.0)
+    raiz()
+    traza = metricas.trazas_recientes(1)[0]
+    assert traza["nombre"] == "prueba.raiz"
+    assert traza["hijos"][0]["nombre"] == "prueba.hijo"
+    assert traza["hijos"][0]["hijos"][0]["nombre"] == "prueba.hilo"
+
+    metricas.configurar_muestreo(0.0)
+    try:
+        antes = len(metricas.trazas_recientes(metricas.MAX_TRAZAS))
+        raiz()
+        assert len(metricas.trazas_recientes(metricas.MAX_TRAZAS)) == antes
+        # Los histogramas se alimentan aunque no se muestree
+        assert metricas.registro.histograma("span_duration_seconds", ("prueba.raiz",)).total == 2
+    finally:
+        metricas.configurar_muestreo(1.0)
@@ -0,0 +1,51 @@
+"""
+Tests del grafo de enlaces del vault (backlinks, hubs, orphans, componentes).
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.obsidian_parser import GrafoEnlaces, NotaObsidian, ObsidianParser
+
+
+def _nota(nombre, enlaces):
+    return NotaObsidian(f"{nombre}.md", nombre, "", {}, enlaces, [])
+
+
+def _notas():
+    return [
+        _nota("A", ["B", "C", "Inexistente"]),
+        _nota("B", ["C"]),
+        _nota("C", ["A"]),
+        _nota("D", ["E"]),
+        _nota("E", []),
+        _nota("Solitaria", []),
+    ]
+
+
+def test_backlinks_y_grado():
+    """Backlinks por nota distinta; el grado cuenta también enlaces sin resolver."""
+    grafo = GrafoEnlaces(_notas())
+
+    assert sorted(grafo.backlinks("C.md")) == ["A.md", "B.md"]
+    assert grafo.backlinks("Solitaria.md") == []
+    assert grafo.grado("A.md") == 4
+
+
+def test_hubs_orphans_componentes():
+    """Hubs ordenados por conexiones y estadísticas sobre un único grafo."""
+    notas = _notas()
+    grafo = GrafoEnlaces(notas)
+
+    assert [n.titulo for n in grafo.hubs()] == ["A", "C"]
+    assert [n.titulo for n in grafo.hubs(top=1)] == ["A"]
+    assert [n.titulo for n in grafo.orphans()] == ["Solitaria"]
+    assert [sorted(c) for c in grafo.componentes()] == [
+        ["A.md", "B.md", "C.md"], ["D.md", "E.md"], ["Solitaria.md"]
+    ]
+
+    stats = ObsidianParser(".").obtener_estadisticas(notas)
+    assert stats["hubs"] == 2
+    assert stats["orphans"] == 1
+    assert stats["componentes"] == 3
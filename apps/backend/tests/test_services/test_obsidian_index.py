@@ -0,0 +1,107 @@
+"""
+Tests del índice incremental del vault de Obsidian (SQLite + memoria).
+"""
+
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.obsidian_index import IndiceVaultObsidian
+from services.obsidian_parser import ObsidianParser
+
+
+def _escribir(vault: Path, relativo: str, contenido: str, mtime_ns: int = None) -> Path:
+    ruta = vault / relativo
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(contenido, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(ruta, ns=(mtime_ns, mtime_ns))
+    return ruta
+
+
+def _indice(tmp_path, vault: Path) -> IndiceVaultObsidian:
+    return IndiceVaultObsidian(ObsidianParser(str(vault)), db_path=tmp_path / "indice.db")
+
+
+def _titulos(indice: IndiceVaultObsidian):
+    return {nota.filepath: nota.titulo for nota in indice.listar_notas()}
+
+
+def test_alta_modificacion_y_baja(tmp_path):
+    """Cada re-escaneo solo cuenta y re-parsea lo que cambió."""
+    vault = tmp_path / "vault"
+    _escribir(vault, "A.md", "# Alfa\n[[B]]", mtime_ns=1_000_000_000)
+    _escribir(vault, "dir/B.md", "# Beta", mtime_ns=1_000_000_000)
+    indice = _indice(tmp_path, vault)
+
+    assert indice.sincronizar(forzar=True) == {"nuevas": 2, "modificadas": 0, "eliminadas": 0, "sin_cambios": 0}
+    assert _titulos(indice) == {"A.md": "Alfa", os.path.join("dir", "B.md"): "Beta"}
+
+    _escribir(vault, "A.md", "# Alfa 2\n[[B]]", mtime_ns=2_000_000_000)
+    _escribir(vault, "C.md", "# Gamma #nuevo")
+    assert indice.sincronizar(forzar=True) == {"nuevas": 1, "modificadas": 1, "eliminadas": 0, "sin_cambios": 1}
+    assert indice.obtener_nota("A.md").titulo == "Alfa 2"
+    assert indice.obtener_nota("C.md").tags == ["nuevo"]
+
+    (vault / "dir" / "B.md").unlink()
+    assert indice.sincronizar(forzar=True) == {"nuevas": 0, "modificadas": 0, "eliminadas": 1, "sin_cambios": 2}
+    assert sorted(_titulos(indice)) == ["A.md", "C.md"]
+
+
+def test_tocado_sin_cambios_no_se_reparsea(tmp_path):
+    """Un mtime nuevo con el mismo contenido solo actualiza el stat."""
+    vault = tmp_path / "vault"
+    _escribir(vault, "A.md", "# Alfa", mtime_ns=1_000_000_000)
+    indice = _indice(tmp_path, vault)
+    indice.sincronizar(forzar=True)
+    nota = indice.obtener_nota("A.md")
+
+    os.utime(vault / "A.md", ns=(3_000_000_000, 3_000_000_000))
+    assert indice.sincronizar(forzar=True)["sin_cambios"] == 1
+    assert indice.obtener_nota("A.md") is nota
+
+    # El stat actualizado se persistió: una instancia nueva no vuelve a leer
+    otro = _indice(tmp_path, vault)
+    assert otro.sincronizar(forzar=True) == {"nuevas": 0, "modificadas": 0, "eliminadas": 0, "sin_cambios": 1}
+
+
+def test_renombrar_es_baja_y_alta(tmp_path):
+    """Un renombrado elimina la ruta vieja del índice persistido y añade la nueva."""
+    vault = tmp_path / "vault"
+    _escribir(vault, "Borrador.md", "# Idea\n[[Otra]]")
+    indice = _indice(tmp_path, vault)
+    indice.sincronizar(forzar=True)
+
+    (vault / "Borrador.md").rename(vault / "Idea.md")
+    assert indice.sincronizar(forzar=True) == {"nuevas": 1, "modificadas": 0, "eliminadas": 1, "sin_cambios": 0}
+    assert indice.obtener_nota("Borrador.md") is None
+
+    otro = _indice(tmp_path, vault)
+    assert {n.filepath: (n.titulo, n.enlaces) for n in otro.listar_notas()} == {"Idea.md": ("Idea", ["Otra"])}
+
+
+def test_se_recarga_desde_sqlite_con_metadata(tmp_path):
+    """Una instancia nueva carga las notas de SQLite conservando fechas del frontmatter."""
+    vault = tmp_path / "vault"
+    _escribir(vault, "Diario.md", "---\nfecha: 2025-10-15\n---\n# Diario")
+    _indice(tmp_path, vault).sincronizar(forzar=True)
+
+    otro = _indice(tmp_path, vault)
+    nota = otro._entradas["Diario.md"][3]
+    assert nota.titulo == "Diario"
+    assert nota.metadata["fecha"].isoformat() == "2025-10-15"
+
+
+def test_filtros_de_carpetas_y_archivos(tmp_path):
+    """Se excluyen .obsidian, .trash, archivos ocultos y templates; otras carpetas con punto no."""
+    vault = tmp_path / "vault"
+    _escribir(vault, "Nota.md", "# Nota")
+    _escribir(vault, ".diario/Hoy.md", "# Hoy")
+    _escribir(vault, ".obsidian/workspace.md", "# Config")
+    _escribir(vault, ".trash/Vieja.md", "# Vieja")
+    _escribir(vault, ".oculta.md", "# Oculta")
+    _escribir(vault, "Templates/Plantilla.md", "# Plantilla")
+
+    indice = _indice(tmp_path, vault)
+    assert sorted(_titulos(indice)) == sorted(["Nota.md", os.path.join(".diario", "Hoy.md")])
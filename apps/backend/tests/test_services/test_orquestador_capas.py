@@ -0,0 +1,37 @@
+"""
+Tests de la recopilación de capas (cache por capa y tiempos).
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from models.estado_emocional import TrackerEmocional
+from services import orquestador_7_capas
+from services.cache_perfiles import get_cache_perfiles
+from services.orquestador_7_capas import Orquestador7Capas
+
+
+def test_capas_estaticas_desde_cache_hasta_que_cambia_la_clave(tmp_path, monkeypatch):
+    """Social, energética, mental y cósmica se reutilizan; la emocional se calcula siempre."""
+    monkeypatch.setattr(orquestador_7_capas, "TrackerEmocional", lambda: TrackerEmocional(tmp_path))
+    ruta = tmp_path / "configuracion_usuario.json"
+    ruta.write_text(json.dumps({"user_id": "default"}), encoding="utf-8")
+    orquestador = Orquestador7Capas(perfil_path=ruta)
+    fecha_hora = datetime(2025, 10, 20, 9, 30)
+
+    primero = orquestador.recopilar_todo("fajr", fecha_hora=fecha_hora)
+    assert primero["capas_cacheadas"] == []
+    assert set(primero["tiempos_capas_ms"]) == set(primero["capas"])
+
+    segundo = orquestador.recopilar_todo("fajr", fecha_hora=fecha_hora.replace(minute=45))
+    assert segundo["capas_cacheadas"] == ["2_social", "4_energetica", "6_mental", "7_cosmica"]
+    assert segundo["capas"]["6_mental"] is primero["capas"]["6_mental"]
+    assert len(TrackerEmocional(tmp_path).obtener_historico("default", dias=30)) == 2
+
+    # Otra hora (función cognitiva) y otra versión del perfil invalidan la capa mental/energética
+    get_cache_perfiles().invalidar()
+    tercero = orquestador.recopilar_todo("dhuhr", fecha_hora=fecha_hora.replace(hour=13))
+    assert tercero["capas_cacheadas"] == ["2_social", "7_cosmica"]
@@ -0,0 +1,99 @@
+"""
+Tests del rate limiter token bucket (GCRA).
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from services.rate_limiter import BackendMemoria, BackendSQLite, RateLimiter
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ns = 10 ** 12
+
+    def __call__(self) -> int:
+        return self.ns
+
+
+def test_rafaga_y_reposicion():
+    """Permite max_requests seguidas, bloquea la siguiente y repone con el tiempo."""
+    backend = BackendMemoria()
+    backend.reloj = RelojFalso()
+    limiter = RateLimiter(backend)
+
+    resultados = [limiter.check_rate_limit("1.2.3.4", max_requests=10) for _ in range(10)]
+    assert [r[1] for r in resultados] == list(range(9, -1, -1))
+    assert limiter.check_rate_limit("1.2.3.4", max_requests=10) == (False, 0, 6)
+
+    # Cada 6 s (60 s / 10) vuelve una petición
+    backend.reloj.ns += 6 * 10 ** 9
+    assert limiter.check_rate_limit("1.2.3.4", max_requests=10)[0]
+    assert not limiter.check_rate_limit("1.2.3.4", max_requests=10)[0]
+
+    # Otra IP u otro límite tienen su propio bucket
+    assert limiter.check_rate_limit("5.6.7.8", max_requests=10)[0]
+    assert limiter.check_rate_limit("1.2.3.4", max_requests=300)[0]
+
+
+def test_memoria_acotada_y_limpieza():
+    """La LRU por shard acota las claves y la limpieza libera buckets llenos."""
+    backend = BackendMemoria(num_shards=2, max_claves_por_shard=5)
+    backend.reloj = RelojFalso()
+    limiter = RateLimiter(backend)
+
+    for i in range(100):
+        limiter.check_rate_limit(f"ip{i}")
+    activas = len(backend)
+    assert activas <= 10
+
+    backend.reloj.ns += 60 * 10 ** 9
+    assert limiter._cleanup_old_requests() == activas
+    assert len(backend) == 0
+
+
+def test_sqlite_compartido_entre_instancias(tmp_path):
+    """Dos limiters sobre el mismo archivo comparten el bucket (varios workers)."""
+    db = tmp_path / "rate_limit.db"
+    a = RateLimiter(BackendSQLite(db))
+    b = RateLimiter(BackendSQLite(db))
+
+    assert a.check_rate_limit("ip", max_requests=3)[0]
+    assert a.check_rate_limit("ip", max_requests=3)[0]
+    assert b.check_rate_limit("ip", max_requests=3) == (True, 0, 0)
+    assert not b.check_rate_limit("ip", max_requests=3)[0]
+
+
+def test_limites_invalidos():
+    """max_requests < 1 o una ventana vacía se rechazan con ValueError (no ZeroDivisionError)."""
+    limiter = RateLimiter(BackendMemoria())
+    with pytest.raises(ValueError):
+        limiter.check_rate_limit("ip", max_requests=0)
+    with pytest.raises(ValueError):
+        limiter.check_rate_limit("ip", max_requests=10, window_minutes=0)
+
+
+def test_sqlite_se_comprueba_fuera_del_loop(tmp_path):
+    """Con el backend SQLite, la versión async consume el bucket en otro hilo."""
+    backend = BackendSQLite(tmp_path / "rate_limit.db")
+    consumir = backend.consumir
+    hilos = []
+
+    def consumir_anotando(*args):
+        hilos.append(threading.get_ident())
+        return consumir(*args)
+
+    backend.consumir = consumir_anotando
+    limiter = RateLimiter(backend)
+
+    async def escenario():
+        return await limiter.check_rate_limit_async("ip", max_requests=2), threading.get_ident()
+
+    resultado, hilo_loop = asyncio.run(escenario())
+    assert resultado == (True, 1, 0)
+    assert hilos and hilos[0] != hilo_loop
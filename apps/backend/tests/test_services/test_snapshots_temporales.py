@@ -0,0 +1,62 @@
+"""
+Tests de la cache de snapshots de vistas temporales (ETag / 304).
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from services.snapshots_temporales import CacheSnapshots
+
+
+def _app(cache: CacheSnapshots, llamadas: list) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/vista")
+    async def vista(request: Request, clave: str = "a"):
+        def generar():
+            llamadas.append(clave)
+            return {"clave": clave, "nombre": "Ramadán"}
+        return cache.responder(request, cache.obtener("vista", clave, generar), 60)
+
+    return TestClient(app)
+
+
+def test_snapshot_se_genera_una_vez_y_responde_304():
+    """El payload se genera una vez por clave y If-None-Match devuelve 304."""
+    cache = CacheSnapshots()
+    llamadas = []
+    cliente = _app(cache, llamadas)
+
+    r = cliente.get("/vista")
+    assert r.status_code == 200
+    assert r.json() == {"clave": "a", "nombre": "Ramadán"}
+    assert r.headers["cache-control"] == "public, max-age=60"
+
+    r2 = cliente.get("/vista", headers={"If-None-Match": f'W/{r.headers["etag"]}'})
+    assert r2.status_code == 304
+    assert r2.content == b""
+
+    r3 = cliente.get("/vista", headers={"If-Modified-Since": r.headers["last-modified"]})
+    assert r3.status_code == 304
+
+    assert cliente.get("/vista", headers={"If-None-Match": '"otro"'}).status_code == 200
+    assert llamadas == ["a"]
+
+
+def test_lru_acotada_e_invalidacion():
+    """La cache no supera max_snapshots e invalidar fuerza la regeneración."""
+    cache = CacheSnapshots(max_snapshots=2)
+    llamadas = []
+    cliente = _app(cache, llamadas)
+
+    for clave in ("a", "b", "c"):
+        cliente.get("/vista", params={"clave": clave})
+    assert cache.obtener_estadisticas()["snapshots"] == 2
+
+    cache.invalidar("vista")
+    cliente.get("/vista", params={"clave": "c"})
+    assert llamadas == ["a", "b", "c", "c"]
@@ -0,0 +1,36 @@
+"""
+Tests de la tabla precalculada de conversión gregoriano ↔ Hijri.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import hijri_converter
+
+from services.tabla_hijri import get_tabla_hijri
+
+
+def test_coincide_con_hijri_converter():
+    """Ambos sentidos coinciden con hijri-converter en fechas del rango."""
+    tabla = get_tabla_hijri()
+    for fecha in (date(1924, 8, 1), date(2025, 3, 1), date(2026, 10, 18), date(2077, 11, 16)):
+        esperado = hijri_converter.Gregorian(fecha.year, fecha.month, fecha.day).to_hijri()
+        hijri = tabla.a_hijri(fecha)
+        assert tuple(hijri) == (esperado.year, esperado.month, esperado.day)
+        assert tabla.a_gregoriano(*hijri) == fecha
+
+
+def test_rango_hijri_cruza_meses():
+    """rango_hijri devuelve un día por fecha y reinicia en el día 1 de cada mes."""
+    tabla = get_tabla_hijri()
+    desde = date(2026, 1, 1)
+    hasta = date(2026, 12, 31)
+    rango = tabla.rango_hijri(desde, hasta)
+
+    assert len(rango) == 365
+    for i, hijri in enumerate(rango):
+        assert hijri == tabla.a_hijri(desde + timedelta(days=i))
+    assert sum(1 for h in rango if h.day == 1) in (12, 13)
+    assert tabla.rango_hijri(hasta, desde) == []
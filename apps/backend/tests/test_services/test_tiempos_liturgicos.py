@@ -0,0 +1,60 @@
+"""
+Tests de la tabla memoizada y del motor vectorizado de tiempos litúrgicos.
+"""
+
+import sys
+from datetime import date, timedelta
+import pytest
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import services.tiempos_liturgicos as tl
+from services.tiempos_liturgicos import CalculadorTiemposLiturgicos, TablaTiemposAnual
+
+
+MADRID = (40.4168, -3.7038, "Europe/Madrid")
+
+
+def test_tabla_anual_coincide_con_calculo_directo(tmp_path):
+    """La tabla precalculada (y recargada de disco) da los mismos tiempos que PrayTimes."""
+    calc = CalculadorTiemposLiturgicos(*MADRID)
+    tabla = calc.precalcular_anio(2024, directorio=tmp_path)
+
+    assert tabla.dias == 366
+    for fecha in (date(2024, 1, 1), date(2024, 2, 29), date(2024, 10, 27), date(2024, 12, 31)):
+        assert tabla.minutos_dia(fecha) == calc._calcular_minutos(fecha)
+
+    archivo = next(tmp_path.iterdir())
+    recargada = TablaTiemposAnual.cargar(archivo, calc.clave)
+    assert recargada is not None
+    assert recargada.minutos == tabla.minutos
+
+    # Otra ubicación no reutiliza la tabla
+    assert TablaTiemposAnual.cargar(archivo, (0.0, 0.0, "MWL", "UTC")) is None
+    tl._tablas.clear()
+
+
+def test_dia_memoizado_entre_instancias():
+    """Dos calculadores de la misma ubicación comparten el cálculo del día."""
+    fecha = date(2025, 3, 21)
+    a = CalculadorTiemposLiturgicos(*MADRID)
+    b = CalculadorTiemposLiturgicos(*MADRID)
+
+    llamadas = []
+    original = b._calcular_minutos
+    b._calcular_minutos = lambda f: llamadas.append(f) or original(f)
+
+    assert a.calcular_tiempos_hoy(fecha) == b.calcular_tiempos_hoy(fecha)
+    assert llamadas == []
+
+
+def test_rango_vectorizado_coincide_con_praytimes():
+    """El motor NumPy da los mismos minutos que PrayTimes día a día."""
+    pytest.importorskip("numpy")
+    calc = CalculadorTiemposLiturgicos(*MADRID)
+    fechas = [date(2025, 1, 1) + timedelta(days=i) for i in range(365)]
+
+    vectorizado = calc._calcular_minutos_rango(fechas).tolist()
+
+    for fecha, fila in zip(fechas, vectorizado):
+        assert tuple(fila) == calc._calcular_minutos(fecha), fecha
@@ -0,0 +1,34 @@
+"""
+Tests del servicio de tiempos litúrgicos por ubicación (celdas geohash).
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.tiempos_ubicacion import TiemposPorUbicacion, centro_geohash, geohash
+
+
+def test_geohash_ida_y_vuelta():
+    """Codificación estándar y centro dentro de la misma celda."""
+    assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash(*centro_geohash("ezjmg")) == "ezjmg"
+
+
+def test_celdas_compartidas_y_lru_acotado():
+    """Usuarios cercanos comparten calculador; la LRU no supera max_celdas."""
+    servicio = TiemposPorUbicacion(max_celdas=2)
+
+    a = servicio.registrar_usuario("ana", 40.4168, -3.7038, "Europe/Madrid")
+    b = servicio.registrar_usuario("luis", 40.4170, -3.7040, "Europe/Madrid")
+    assert a is b
+
+    servicio.calculador(51.5, -0.12, "Europe/London")
+    servicio.calculador(48.85, 2.35, "Europe/Paris")
+    assert servicio.obtener_estadisticas()["celdas_activas"] == 2
+
+    # El rollover recrea las celdas de usuarios registrados con hoy y mañana
+    servicio.rollover()
+    calc = servicio.calculador_usuario("ana")
+    hoy = calc._hoy().date()
+    assert calc._minutos_propios[hoy.toordinal()] == calc._calcular_minutos(hoy)
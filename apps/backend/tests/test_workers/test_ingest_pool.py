@@ -0,0 +1,233 @@
+"""
+Tests del supervisor del pool de ingesta (sin lanzar procesos reales).
+"""
+
+import sys
+import queue as queue_lib
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.event_queue import EventQueue
+from workers import ingest_pool, ingest_worker
+from workers.ingest_pool import EVENT_TYPE, IngestPool, particion_para
+
+
+class _ProcesoFalso:
+    """Proceso que termina al hacer join (o solo con kill si está colgado)."""
+
+    def __init__(self, indice: int, colgado: bool = False):
+        self.name = f"ingest-worker-{indice}"
+        self.colgado = colgado
+        self.vivo = True
+        self.exitcode = None
+        self.matado = False
+
+    def is_alive(self):
+        return self.vivo
+
+    def join(self, timeout=None):
+        if not self.colgado:
+            self.vivo, self.exitcode = False, 0
+
+    def kill(self):
+        self.vivo, self.exitcode, self.matado = False, -9, True
+
+
+def _pool(tmp_path, monkeypatch, num_procesos=2, max_intentos=5):
+    cola = EventQueue(base_dir=str(tmp_path / "events"), max_intentos=max_intentos)
+    monkeypatch.setattr(ingest_pool, "get_event_queue", lambda: cola)
+    pool = IngestPool(num_procesos=num_procesos)
+    pool.resultados = queue_lib.Queue()
+    pool.entradas = [queue_lib.Queue() for _ in range(num_procesos)]
+    pool.procesos = [_ProcesoFalso(i) for i in range(num_procesos)]
+    return pool, cola
+
+
+def _fechas_por_particion(num_procesos=2):
+    """Una fecha para cada partición."""
+    fechas = {}
+    dia = 1
+    while len(fechas) < num_procesos:
+        fecha = f"2025-10-{dia:02d}"
+        fechas.setdefault(particion_para(fecha, num_procesos), fecha)
+        dia += 1
+    return [fechas[i] for i in range(num_procesos)]
+
+
+def _vaciar(entrada):
+    items = []
+    while not entrada.empty():
+        items.append(entrada.get_nowait())
+    return items
+
+
+def test_eventos_de_un_dia_van_en_orden_al_mismo_proceso(tmp_path, monkeypatch):
+    """Todos los eventos de una fecha llegan a su partición en orden de emisión."""
+    pool, cola = _pool(tmp_path, monkeypatch)
+    fecha_a, fecha_b = _fechas_por_particion()
+    emitidos = [cola.emit(EVENT_TYPE, {"fecha": f, "n": n}) for n, f in enumerate([fecha_a, fecha_b] * 4)]
+
+    assert pool._despachar() == 8
+
+    for indice, fecha in enumerate([fecha_a, fecha_b]):
+        recibidos = _vaciar(pool.entradas[indice])
+        assert {data["fecha"] for _, data in recibidos} == {fecha}
+        assert [event_id for event_id, _ in recibidos] == [e for e in emitidos if e in pool.en_vuelo[indice]]
+        assert [data["n"] for _, data in recibidos] == sorted(data["n"] for _, data in recibidos)
+
+
+def test_particion_llena_no_frena_a_las_demas(tmp_path, monkeypatch):
+    """Con una partición saturada se sigue reservando para las que tienen hueco."""
+    monkeypatch.setattr(ingest_pool, "MAX_EN_VUELO_POR_PROCESO", 2)
+    pool, cola = _pool(tmp_path, monkeypatch)
+    fecha_a, fecha_b = _fechas_por_particion()
+    for n in range(5):
+        cola.emit(EVENT_TYPE, {"fecha": fecha_a, "n": n})
+    cola.emit(EVENT_TYPE, {"fecha": fecha_b, "n": 5})
+
+    assert pool._despachar() == 3
+    assert [data["n"] for _, data in _vaciar(pool.entradas[0])] == [0, 1]
+    assert [data["n"] for _, data in _vaciar(pool.entradas[1])] == [5]
+
+    # Partición 0 llena: nada nuevo para ella aunque la 1 tenga hueco
+    cola.emit(EVENT_TYPE, {"fecha": fecha_b, "n": 6})
+    assert pool._despachar() == 1
+    assert [data["n"] for _, data in _vaciar(pool.entradas[1])] == [6]
+
+    # Al liberar un hueco continúa el día A, en orden
+    event_id = next(iter(pool.en_vuelo[0]))
+    pool.resultados.put((0, event_id, True, 0.01))
+    assert pool._recoger_resultados() == 1
+    assert pool._despachar() == 1
+    assert [data["n"] for _, data in _vaciar(pool.entradas[0])] == [2]
+    assert cola.list_pending() == {EVENT_TYPE: 6}
+
+
+def test_fallos_repetidos_acaban_en_dead_letter(tmp_path, monkeypatch):
+    """Un evento que falla max_intentos veces va a dead-letter y sale del vuelo."""
+    monkeypatch.setattr(ingest_worker, "REINTENTO_BASE", 0.0)
+    pool, cola = _pool(tmp_path, monkeypatch, max_intentos=2)
+    fecha = _fechas_por_particion()[0]
+    event_id = cola.emit(EVENT_TYPE, {"fecha": fecha})
+
+    for _ in range(2):
+        assert pool._despachar() == 1
+        pool.resultados.put((0, event_id, False, 0.01))
+        assert pool._recoger_resultados() == 1
+        assert not pool.en_vuelo[0]
+
+    assert pool._despachar() == 0
+    muertos = cola.list_dead_letters(EVENT_TYPE)
+    assert [e["event_id"] for e in muertos] == [event_id]
+    assert pool.obtener_metricas()["errores"] == 2
+
+
+def test_drenado_termina_lo_despachado_y_devuelve_el_resto(tmp_path, monkeypatch):
+    """Al drenar se envía el centinela, se recogen resultados y lo pendiente vuelve a la cola."""
+    monkeypatch.setattr(ingest_pool, "DRAIN_TIMEOUT", 0.3)
+    pool, cola = _pool(tmp_path, monkeypatch)
+    pool.procesos[1].colgado = True
+    fecha_a, fecha_b = _fechas_por_particion()
+    terminado = cola.emit(EVENT_TYPE, {"fecha": fecha_a})
+    pendiente = cola.emit(EVENT_TYPE, {"fecha": fecha_b})
+    assert pool._despachar() == 2
+
+    pool.resultados.put((0, terminado, True, 0.01))
+    pool._drenar()
+
+    assert [item for item in _vaciar(pool.entradas[0])][-1] is None
+    assert [item for item in _vaciar(pool.entradas[1])][-1] is None
+    assert pool.procesos[1].matado and not pool.procesos[0].matado
+    assert not any(pool.en_vuelo)
+
+    # El ack eliminó el terminado; el pendiente vuelve visible para el próximo arranque
+    evento = cola.consume(EVENT_TYPE)
+    assert evento["event_id"] == pendiente
+    assert cola.consume(EVENT_TYPE) is None
+
+
+class _WorkerFalso:
+    """IngestWorker de prueba: falla una vez los eventos marcados y anota el orden."""
+    procesados = []
+    fallos_pendientes = set()
+
+    def process_estado_cero_completed(self, data):
+        if data["n"] in _WorkerFalso.fallos_pendientes:
+            _WorkerFalso.fallos_pendientes.discard(data["n"])
+            return False
+        _WorkerFalso.procesados.append((data["fecha"], data["n"]))
+        return True
+
+
+def _correr_proceso(pool, indice=0):
+    """Ejecuta el cuerpo del proceso en este hilo hasta vaciar su entrada."""
+    pool.entradas[indice].put(None)
+    ingest_pool._proceso_worker(indice, pool.entradas[indice], pool.resultados)
+
+
+def test_fallo_bloquea_su_dia_hasta_confirmar_el_reintento(tmp_path, monkeypatch):
+    """Los eventos del día ya encolados tras un fallo no se adelantan al reintento."""
+    monkeypatch.setattr(ingest_worker, "IngestWorker", _WorkerFalso)
+    monkeypatch.setattr(ingest_pool.signal, "signal", lambda *args: None)
+    monkeypatch.setattr(ingest_worker, "REINTENTO_BASE", 0.0)
+    _WorkerFalso.procesados = []
+    _WorkerFalso.fallos_pendientes = {0}
+
+    pool, cola = _pool(tmp_path, monkeypatch, num_procesos=1)
+    for n, fecha in enumerate(["2025-10-15", "2025-10-15", "2025-10-16"]):
+        cola.emit(EVENT_TYPE, {"fecha": fecha, "n": n})
+
+    assert pool._despachar() == 3
+    _correr_proceso(pool)
+    assert pool._recoger_resultados() == 3
+
+    # Falló el 0: el 1 (mismo día) se omitió y espera; el otro día siguió
+    assert _WorkerFalso.procesados == [("2025-10-16", 2)]
+    assert list(pool.bloqueos[0]) == ["2025-10-15"]
+    assert pool.obtener_metricas()["errores"] == 1
+
+    # Solo el reintento del evento fallido puede reservarse
+    assert pool._despachar() == 1
+    _correr_proceso(pool)
+    assert pool._recoger_resultados() == 1
+    assert not pool.bloqueos[0]
+
+    assert pool._despachar() == 1
+    _correr_proceso(pool)
+    assert pool._recoger_resultados() == 1
+    assert _WorkerFalso.procesados == [("2025-10-16", 2), ("2025-10-15", 0), ("2025-10-15", 1)]
+    assert cola.list_pending() == {}
+
+
+def test_omitido_no_gasta_intentos(tmp_path):
+    """liberar devuelve el evento visible y sin contar la entrega."""
+    cola = EventQueue(base_dir=str(tmp_path / "events"), max_intentos=1)
+    event_id = cola.emit(EVENT_TYPE, {"fecha": "2025-10-15"})
+
+    for _ in range(3):
+        evento = cola.consume(EVENT_TYPE, auto_ack=False)
+        assert evento["intentos"] == 1
+        assert cola.liberar(event_id)
+
+    assert cola.nack(cola.consume(EVENT_TYPE, auto_ack=False)["event_id"]) is True
+
+
+def test_fallo_se_reintenta_con_backoff(tmp_path, monkeypatch):
+    """Un fallo deja el evento invisible un tiempo creciente con sus intentos."""
+    import time
+
+    pool, cola = _pool(tmp_path, monkeypatch, num_procesos=1)
+    event_id = cola.emit(EVENT_TYPE, {"fecha": "2025-10-15"})
+
+    assert pool._despachar() == 1
+    pool.resultados.put((0, event_id, False, 0.01))
+    antes = time.time()
+    pool._recoger_resultados()
+
+    assert pool._despachar() == 0
+    visible_at = cola._conn().execute(
+        "SELECT visible_at FROM events WHERE event_id = ?", (event_id,)
+    ).fetchone()[0]
+    assert antes + ingest_worker.REINTENTO_BASE - 0.5 <= visible_at <= time.time() + ingest_worker.REINTENTO_BASE
+    assert [ingest_worker.retraso_reintento(i) for i in (1, 2, 3)] == [2.0, 4.0, 8.0]
+    assert ingest_worker.retraso_reintento(20) == ingest_worker.REINTENTO_MAX
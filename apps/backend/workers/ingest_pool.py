@@ -0,0 +1,367 @@
+"""
+Pool multi-proceso de Workers de Ingesta
+Parte del flujo Captura → Vault → Insights → Acción
+
+Un supervisor reserva eventos `estado_cero_completed` de la cola y los
+reparte entre N procesos particionando por `fecha`: todos los eventos de un
+mismo día van al mismo proceso, en orden de llegada.
+
+- Límite de eventos en vuelo por proceso: una partición saturada no frena
+  la reserva para las demás
+- Un fallo bloquea su día hasta que el reintento se confirma: el proceso
+  omite los eventos posteriores de ese día que ya tenía encolados y el
+  supervisor los devuelve a la cola sin gastar intento
+- Drenado ordenado con SIGTERM/SIGINT: deja de reservar, termina lo encolado
+- Reinicia procesos caídos; sus eventos en vuelo se devuelven a la cola
+- Throughput por proceso (eventos/s) en el log periódico
+
+Uso:
+    python workers/ingest_pool.py --procesos 4
+"""
+
+import argparse
+import multiprocessing as mp
+import queue as queue_lib
+import signal
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Importar desde el directorio padre
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.event_queue import get_event_queue
+from workers.ingest_worker import retraso_reintento
+
+EVENT_TYPE = "estado_cero_completed"
+
+# Eventos en vuelo por proceso (limita la reserva y el trabajo a repetir tras un crash)
+MAX_EN_VUELO_POR_PROCESO = 32
+
+# Los eventos reservados pueden esperar en la cola interna del proceso
+VISIBILITY_TIMEOUT = 600.0
+
+# Margen para que los procesos terminen su cola al drenar
+DRAIN_TIMEOUT = 60.0
+
+# Un proceso que cae antes de este tiempo se reinicia con pausa (evita bucles de crash)
+VIDA_MINIMA = 1.0
+
+# Mensaje de control (supervisor → proceso): (REANUDAR, fecha) vuelve a procesar ese día
+REANUDAR = "__reanudar__"
+
+
+def particion_para(fecha: Optional[str], num_procesos: int) -> int:
+    """Partición estable (entre ejecuciones) para una fecha"""
+    return zlib.crc32((fecha or "").encode("utf-8")) % num_procesos
+
+
+def _proceso_worker(indice: int, entrada: mp.Queue, resultados: mp.Queue):
+    """
+    Cuerpo de cada proceso: procesa eventos de su partición en orden.
+
+    Tras un fallo, los eventos del mismo día que siguen en la cola se omiten
+    (resultado None) hasta recibir (REANUDAR, fecha) del supervisor, así
+    ninguno se adelanta al reintento.
+
+    Ignora SIGINT/SIGTERM: el supervisor coordina el drenado enviando None.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    from workers.ingest_worker import IngestWorker
+    worker = IngestWorker()
+    dias_fallidos = set()
+
+    while True:
+        item = entrada.get()
+        if item is None:
+            break
+
+        event_id, data = item
+        if event_id == REANUDAR:
+            dias_fallidos.discard(data)
+            continue
+        if data.get("fecha") in dias_fallidos:
+            resultados.put((indice, event_id, None, 0.0))
+            continue
+
+        inicio = time.perf_counter()
+        ok = worker.process_estado_cero_completed(data)
+        if not ok:
+            dias_fallidos.add(data.get("fecha"))
+        resultados.put((indice, event_id, ok, time.perf_counter() - inicio))
+
+
+class IngestPool:
+    """Supervisor de N procesos de ingesta con orden por día"""
+
+    def __init__(self, num_procesos: int = 4):
+        self.num_procesos = max(1, num_procesos)
+        self.queue = get_event_queue()
+        self.ctx = mp.get_context("spawn")  # Sin conexiones SQLite heredadas por fork
+
+        self.resultados: mp.Queue = self.ctx.Queue()
+        self.entradas: List[mp.Queue] = []
+        self.procesos: List[Optional[mp.Process]] = []
+        self.arranques: Dict[int, float] = {}
+
+        # event_id reservados por partición, en orden de despacho
+        self.en_vuelo: List[Dict[str, dict]] = [dict() for _ in range(self.num_procesos)]
+
+        # fecha → event_id fallido pendiente de reintento, por partición
+        self.bloqueos: List[Dict[str, str]] = [dict() for _ in range(self.num_procesos)]
+
+        self.running = False
+        self.drenando = False
+
+        self.stats = [
+            {"procesados": 0, "errores": 0, "segundos": 0.0, "reinicios": 0}
+            for _ in range(self.num_procesos)
+        ]
+        self.inicio = time.monotonic()
+
+    # ==================== PROCESOS ====================
+
+    def _arrancar(self, indice: int):
+        entrada = self.ctx.Queue()
+        proceso = self.ctx.Process(
+            target=_proceso_worker,
+            args=(indice, entrada, self.resultados),
+            name=f"ingest-worker-{indice}",
+            daemon=True,
+        )
+        proceso.start()
+        self.arranques[indice] = time.monotonic()
+
+        if indice < len(self.procesos):
+            self.entradas[indice] = entrada
+            self.procesos[indice] = proceso
+        else:
+            self.entradas.append(entrada)
+            self.procesos.append(proceso)
+
+    def _vigilar_procesos(self):
+        """Reinicia procesos caídos y devuelve sus eventos en vuelo a la cola"""
+        for indice, proceso in enumerate(self.procesos):
+            if proceso is None or proceso.is_alive():
+                continue
+            if self.drenando and proceso.exitcode == 0 and not self.en_vuelo[indice]:
+                self.procesos[indice] = None  # Salida normal tras el centinela
+                continue
+
+            pendientes = list(self.en_vuelo[indice])
+            print(
+                f"💥 {proceso.name} terminó (exit {proceso.exitcode}), "
+                f"reintentando {len(pendientes)} eventos"
+            )
+            # nack en orden de despacho: vuelven a la cola con su seq original
+            for event_id in pendientes:
+                self.queue.nack(event_id, error=f"{proceso.name} caído (exit {proceso.exitcode})")
+            self.en_vuelo[indice].clear()
+
+            self.stats[indice]["reinicios"] += 1
+            if not self.drenando:
+                if time.monotonic() - self.arranques.get(indice, 0.0) < VIDA_MINIMA:
+                    time.sleep(VIDA_MINIMA)
+                self._arrancar(indice)
+            else:
+                self.procesos[indice] = None
+
+    # ==================== DESPACHO ====================
+
+    def _capacidad(self) -> List[int]:
+        """Huecos libres de cada partición"""
+        return [MAX_EN_VUELO_POR_PROCESO - len(p) for p in self.en_vuelo]
+
+    def _despachar(self) -> int:
+        """Reserva un lote y lo reparte por partición. Retorna eventos despachados."""
+        libres = self._capacidad()
+        total = sum(n for n in libres if n > 0)
+        if total <= 0:
+            return 0
+
+        def aceptar(evento: dict) -> bool:
+            # Un día bloqueado solo acepta el reintento del evento que falló
+            fecha = evento["data"].get("fecha")
+            indice = particion_para(fecha, self.num_procesos)
+            bloqueo = self.bloqueos[indice].get(fecha)
+            if bloqueo is not None and bloqueo != evento["event_id"]:
+                return False
+            # Solo se reserva para particiones con hueco: una partición llena no
+            # frena al resto. Una vez rechazada, sus eventos posteriores también
+            # lo son, así que el orden por día se mantiene
+            if libres[indice] <= 0:
+                return False
+            libres[indice] -= 1
+            return True
+
+        lote = self.queue.consume_batch(
+            EVENT_TYPE,
+            max_events=total,
+            auto_ack=False,
+            visibility_timeout=VISIBILITY_TIMEOUT,
+            aceptar=aceptar,
+        )
+        for evento in lote:
+            indice = particion_para(evento["data"].get("fecha"), self.num_procesos)
+            self.en_vuelo[indice][evento["event_id"]] = evento
+            self.entradas[indice].put((evento["event_id"], evento["data"]))
+        return len(lote)
+
+    def _recoger_resultados(self, timeout: float = 0.0) -> int:
+        """Ack/nack de los resultados disponibles. Retorna cuántos se recogieron."""
+        recogidos = 0
+        while True:
+            try:
+                if recogidos == 0 and timeout > 0:
+                    indice, event_id, ok, segundos = self.resultados.get(timeout=timeout)
+                else:
+                    indice, event_id, ok, segundos = self.resultados.get_nowait()
+            except queue_lib.Empty:
+                return recogidos
+
+            recogidos += 1
+            evento = self.en_vuelo[indice].pop(event_id, None)
+            fecha = evento["data"].get("fecha") if evento else None
+            stats = self.stats[indice]
+            stats["segundos"] += segundos
+
+            if ok is None:
+                # Omitido tras un fallo de su día: vuelve a la cola sin gastar intento
+                self.queue.liberar(event_id)
+            elif ok:
+                self.queue.ack(event_id)
+                stats["procesados"] += 1
+                if self.bloqueos[indice].get(fecha) == event_id:
+                    del self.bloqueos[indice][fecha]
+            else:
+                stats["errores"] += 1
+                # Backoff: un fallo transitorio no agota los intentos en milisegundos
+                intentos = evento["intentos"] if evento else 1
+                if self.queue.nack(
+                    event_id,
+                    error="process_estado_cero_completed falló",
+                    delay=retraso_reintento(intentos)
+                ):
+                    print(f"☠️ Evento {event_id} enviado a dead-letter")
+                    self.bloqueos[indice].pop(fecha, None)
+                elif evento is not None:
+                    self.bloqueos[indice][fecha] = event_id
+                # Lo que el proceso omita a partir de aquí ya está devuelto o bloqueado
+                self.entradas[indice].put((REANUDAR, fecha))
+
+    # ==================== MÉTRICAS ====================
+
+    def obtener_metricas(self) -> dict:
+        """Throughput y contadores por proceso"""
+        transcurrido = max(time.monotonic() - self.inicio, 1e-9)
+        por_proceso = []
+        for indice, stats in enumerate(self.stats):
+            por_proceso.append({
+                "proceso": indice,
+                **stats,
+                "en_vuelo": len(self.en_vuelo[indice]),
+                "eventos_por_segundo": round(stats["procesados"] / transcurrido, 2),
+                "ms_por_evento": round(1000 * stats["segundos"] / stats["procesados"], 2)
+                if stats["procesados"] else 0.0,
+            })
+        return {
+            "procesos": self.num_procesos,
+            "procesados": sum(s["procesados"] for s in self.stats),
+            "errores": sum(s["errores"] for s in self.stats),
+            "por_proceso": por_proceso,
+        }
+
+    def _log_metricas(self):
+        metricas = self.obtener_metricas()
+        detalle = ", ".join(
+            f"#{p['proceso']}: {p['eventos_por_segundo']}/s" for p in metricas["por_proceso"]
+        )
+        print(f"📊 Pool procesados: {metricas['procesados']}, errores: {metricas['errores']} ({detalle})")
+
+    # ==================== LOOP ====================
+
+    def _solicitar_drenado(self, signum, frame):
+        if not self.drenando:
+            print(f"🛑 Señal {signum} recibida, drenando pool...")
+        self.drenando = True
+
+    def run(self):
+        """Loop del supervisor"""
+        print(f"🔄 Pool de ingesta iniciado con {self.num_procesos} procesos...")
+        signal.signal(signal.SIGTERM, self._solicitar_drenado)
+        signal.signal(signal.SIGINT, self._solicitar_drenado)
+
+        for indice in range(self.num_procesos):
+            self._arrancar(indice)
+
+        self.queue.abrir_timbre()
+        self.running = True
+        ultimo_log = time.monotonic()
+
+        while self.running and not self.drenando:
+            self._vigilar_procesos()
+            self._recoger_resultados()
+
+            if self._despachar() == 0:
+                if any(self.en_vuelo):
+                    self._recoger_resultados(timeout=0.1)
+                else:
+                    self.queue.esperar_eventos(timeout=1.0)
+
+            if time.monotonic() - ultimo_log >= 60:
+                self._log_metricas()
+                ultimo_log = time.monotonic()
+
+        self._drenar()
+        self.queue.cerrar_timbre()
+        self._log_metricas()
+        print("✅ Pool finalizado")
+
+    def _drenar(self):
+        """Termina el trabajo ya despachado y detiene los procesos"""
+        self.drenando = True
+        for entrada, proceso in zip(self.entradas, self.procesos):
+            if proceso is not None and proceso.is_alive():
+                entrada.put(None)
+
+        limite = time.monotonic() + DRAIN_TIMEOUT
+        while any(self.en_vuelo) and time.monotonic() < limite:
+            self._recoger_resultados(timeout=0.2)
+            self._vigilar_procesos()
+
+        for proceso in self.procesos:
+            if proceso is None:
+                continue
+            proceso.join(timeout=max(0.0, limite - time.monotonic()))
+            if proceso.is_alive():
+                print(f"⚠️ {proceso.name} no terminó a tiempo, forzando cierre")
+                proceso.kill()
+                proceso.join()
+
+        # Lo que quede sin ack vuelve a la cola para el próximo arranque
+        for en_vuelo in self.en_vuelo:
+            for event_id in en_vuelo:
+                self.queue.nack(event_id, error="pool detenido antes de procesar")
+            en_vuelo.clear()
+
+    def stop(self):
+        """Detiene el pool (drenado ordenado)"""
+        self.drenando = True
+        self.queue.notificar()
+
+
+def main():
+    """Función principal para ejecutar el pool"""
+    parser = argparse.ArgumentParser(description="Pool multi-proceso de ingesta de Estados Cero")
+    parser.add_argument("--procesos", type=int, default=mp.cpu_count(), help="Número de procesos worker")
+    args = parser.parse_args()
+
+    IngestPool(num_procesos=args.procesos).run()
+
+
+if __name__ == "__main__":
+    main()
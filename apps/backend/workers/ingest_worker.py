@@ -4,7 +4,7 @@ Parte del flujo Captura → Vault → Insights → Acción
 """
 
 import time
-import json
+from collections import deque
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional
@@ -14,6 +14,20 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.event_queue import get_event_queue
+from services.indice_estados_cero import get_indice_estados_cero
+
+# Timeout de espera cuando no llega aviso push (backoff adaptativo)
+POLL_MIN = 0.5
+POLL_MAX = 30.0
+
+# Espera antes de reintentar un evento fallido (exponencial por intento)
+REINTENTO_BASE = 2.0
+REINTENTO_MAX = 300.0
+
+
+def retraso_reintento(intentos: int) -> float:
+    """Segundos hasta que un evento fallido vuelve a ser visible (2s, 4s, 8s... hasta 5 min)"""
+    return min(REINTENTO_MAX, REINTENTO_BASE * (2 ** max(0, intentos - 1)))
 
 
 class IngestWorker:
@@ -21,9 +35,15 @@ class IngestWorker:
     
     def __init__(self):
         self.queue = get_event_queue()
+        self.indice = get_indice_estados_cero()
         self.running = False
         self.processed_count = 0
         self.error_count = 0
+        
+        # Métricas de latencia en cola y despertares
+        self.latencias_ms = deque(maxlen=1000)
+        self.despertares_push = 0
+        self.despertares_poll = 0
     
     def process_estado_cero_completed(self, event_data: dict) -> bool:
         """
@@ -54,9 +74,10 @@ class IngestWorker:
             # 3. [FUTURO] Chunk + embed → vector DB
             # vector_store.embed_document(content, metadata)
             
-            # 4. Trigger análisis si 5 Estados Cero del día
-            count = self.count_estados_cero_dia(fecha)
-            if count == 5:
+            # 4. Registrar en índice por día y trigger análisis si 5 Estados Cero del día
+            #    (solo en la primera entrega: una re-entrega no repite el trigger)
+            nuevo, count = self.indice.registrar_archivado(estado_cero_id, fecha)
+            if nuevo and count == 5:
                 print(f"🎯 Día completo detectado ({fecha}): {count} Estados Cero")
                 self.queue.emit("dashboard_trigger", {
                     "fecha": fecha,
@@ -135,53 +156,103 @@ class IngestWorker:
             fecha: Fecha en formato YYYY-MM-DD
             
         Returns:
-            Número de Estados Cero del día
+            Número de Estados Cero del día completados y archivados
+            en Obsidian (vía índice por fecha)
         """
         try:
-            # Buscar en storage/estados_cero
-            storage_dir = Path("storage/estados_cero")
-            if not storage_dir.exists():
-                return 0
-            
-            count = 0
-            for archivo in storage_dir.glob("*.json"):
-                try:
-                    with open(archivo, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    if (data.get('fecha') == fecha and 
-                        data.get('completado', False) and 
-                        data.get('archivado_en_obsidian', False)):
-                        count += 1
-                        
-                except (json.JSONDecodeError, KeyError):
-                    continue
-            
-            return count
-            
+            return self.indice.contar_dia(fecha)
         except Exception as e:
             print(f"⚠️ Error contando Estados Cero del día {fecha}: {e}")
             return 0
     
+    def _registrar_latencia(self, event: dict):
+        """Registra la latencia en cola (emit → consume) del evento en ms"""
+        try:
+            encolado = datetime.fromisoformat(event['timestamp'])
+        except (KeyError, TypeError, ValueError):
+            return
+        latencia_ms = (datetime.now() - encolado).total_seconds() * 1000
+        self.latencias_ms.append(max(latencia_ms, 0.0))
+    
+    def obtener_metricas(self) -> dict:
+        """
+        Métricas del worker: procesados, errores, despertares y latencia en cola
+        
+        Returns:
+            Dict con contadores y percentiles p50/p95/max de latencia (ms)
+        """
+        latencias = sorted(self.latencias_ms)
+        
+        def percentil(p: float) -> float:
+            if not latencias:
+                return 0.0
+            return round(latencias[min(len(latencias) - 1, int(p * len(latencias)))], 1)
+        
+        return {
+            "procesados": self.processed_count,
+            "errores": self.error_count,
+            "despertares_push": self.despertares_push,
+            "despertares_poll": self.despertares_poll,
+            "latencia_cola_ms": {
+                "muestras": len(latencias),
+                "p50": percentil(0.50),
+                "p95": percentil(0.95),
+                "max": round(latencias[-1], 1) if latencias else 0.0,
+            },
+        }
+    
     def run(self):
-        """Loop principal del worker"""
+        """
+        Loop principal del worker
+        
+        Espera bloqueado en `queue.esperar_eventos` y despierta en cuanto se
+        emite un evento. Si no llega aviso push, el timeout crece con backoff
+        adaptativo (POLL_MIN → POLL_MAX) como red de seguridad.
+        """
         print("🔄 Worker de ingesta iniciado...")
         self.running = True
         
+        if not self.queue.abrir_timbre():
+            print("⚠️ Timbre no disponible, usando solo avisos locales + polling adaptativo")
+        
+        espera = POLL_MIN
+        ultimo_log = time.monotonic()
+        
         while self.running:
             try:
-                # Consumir eventos de Estados Cero completados
-                event = self.queue.consume("estado_cero_completed")
+                # Reservar evento (ack explícito: si el worker cae, el evento reaparece)
+                event = self.queue.consume("estado_cero_completed", auto_ack=False)
                 
                 if event:
-                    self.process_estado_cero_completed(event['data'])
+                    self._registrar_latencia(event)
+                    if self.process_estado_cero_completed(event['data']):
+                        self.queue.ack(event['event_id'])
+                    elif self.queue.nack(
+                        event['event_id'],
+                        error="process_estado_cero_completed falló",
+                        delay=retraso_reintento(event['intentos'])
+                    ):
+                        print(f"☠️ Evento {event['event_id']} enviado a dead-letter")
+                    espera = POLL_MIN
+                    continue
+                
+                # Cola vacía: dormir hasta aviso push o timeout
+                if self.queue.esperar_eventos(timeout=espera):
+                    self.despertares_push += 1
+                    espera = POLL_MIN
                 else:
-                    # No hay eventos, esperar un poco
-                    time.sleep(5)
+                    self.despertares_poll += 1
+                    espera = min(espera * 2, POLL_MAX)
                 
                 # Log de estado cada 60 segundos
-                if self.processed_count > 0 and self.processed_count % 10 == 0:
-                    print(f"📊 Worker procesados: {self.processed_count}, errores: {self.error_count}")
+                if time.monotonic() - ultimo_log >= 60 and self.processed_count > 0:
+                    metricas = self.obtener_metricas()
+                    print(
+                        f"📊 Worker procesados: {metricas['procesados']}, errores: {metricas['errores']}, "
+                        f"latencia cola p50/p95: {metricas['latencia_cola_ms']['p50']}/"
+                        f"{metricas['latencia_cola_ms']['p95']} ms"
+                    )
+                    ultimo_log = time.monotonic()
                 
             except KeyboardInterrupt:
                 print("🛑 Worker interrumpido por usuario")
@@ -190,11 +261,14 @@ class IngestWorker:
                 print(f"❌ Error en loop principal del worker: {e}")
                 time.sleep(10)  # Esperar más tiempo en caso de error
         
+        self.queue.cerrar_timbre()
         print(f"✅ Worker finalizado. Total procesados: {self.processed_count}, errores: {self.error_count}")
     
     def stop(self):
         """Detiene el worker"""
         self.running = False
+        # Despertar el loop si está bloqueado esperando eventos
+        self.queue.notificar()
 
 
 def main():